@@ -0,0 +1,38 @@
+"""add_report_watermark_indexes
+
+Revision ID: 2a9a6c5387d3
+Revises: 6c1e8f3b9a27
+Create Date: 2026-10-20 10:02:17.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a9a6c5387d3'
+down_revision: Union[str, None] = '6c1e8f3b9a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Tables read by reports, whose latest change per tenant watermarks the report cache
+WATERMARKED_TABLES = ('loans', 'users', 'instances', 'holdings', 'items', 'fee_policies', 'funds')
+
+
+def upgrade() -> None:
+    """
+    Index (tenant_id, updated_date) of every table a report reads, so the
+    report cache watermark is an index lookup instead of a table scan.
+    """
+    for table in WATERMARKED_TABLES:
+        op.create_index(f'ix_{table}_tenant_updated_date', table, ['tenant_id', 'updated_date'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    Remove the report watermark indexes.
+    """
+    for table in reversed(WATERMARKED_TABLES):
+        op.drop_index(f'ix_{table}_tenant_updated_date', table_name=table)
@@ -0,0 +1,56 @@
+"""add_report_schedules
+
+Revision ID: 3a7f1c9d4e62
+Revises: 9e4b7c2a5f18
+Create Date: 2026-10-19 19:05:12.384117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a7f1c9d4e62'
+down_revision: Union[str, None] = '9e4b7c2a5f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add the report schedule table read by the off-peak report task.
+    """
+    op.create_table('report_schedules',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('report_type', sa.String(length=50), nullable=False),
+    sa.Column('parameters', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('export_format', sa.String(length=20), nullable=False),
+    sa.Column('recipients', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('schedule', sa.String(length=100), nullable=False),
+    sa.Column('enabled', sa.Boolean(), nullable=False),
+    sa.Column('last_run_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('next_run_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_job_id', sa.UUID(), nullable=True),
+    sa.Column('created_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.Column('created_by_user_id', sa.UUID(), nullable=True),
+    sa.Column('updated_by_user_id', sa.UUID(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_report_schedules_tenant_id'), 'report_schedules', ['tenant_id'], unique=False)
+    op.create_index('ix_report_schedules_due', 'report_schedules', ['enabled', 'next_run_at'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    Remove the report schedule table.
+    """
+    op.drop_index('ix_report_schedules_due', table_name='report_schedules')
+    op.drop_index(op.f('ix_report_schedules_tenant_id'), table_name='report_schedules')
+    op.drop_table('report_schedules')
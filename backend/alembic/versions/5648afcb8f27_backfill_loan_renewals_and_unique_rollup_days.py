@@ -0,0 +1,75 @@
+"""backfill_loan_renewals_and_unique_rollup_days
+
+Revision ID: 5648afcb8f27
+Revises: 2a9a6c5387d3
+Create Date: 2026-10-20 14:26:51.093417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5648afcb8f27'
+down_revision: Union[str, None] = '2a9a6c5387d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Log the renewals made before the renewal log existed, key the daily
+    circulation rollup on (tenant, day, dimensions) and make the next
+    rollup run rebuild every day.
+
+    Pre-log renewals only have a count on the loan, so one row per missing
+    renewal is dated at the loan's last update (its latest renewal at the
+    earliest), falling back to the loan date.
+    """
+    op.execute(
+        """
+        INSERT INTO loan_renewals (id, loan_id, renewed_at, previous_due_date, due_date, tenant_id)
+        SELECT gen_random_uuid(), loans.id, coalesce(loans.updated_date, loans.loan_date), NULL,
+               loans.due_date, loans.tenant_id
+        FROM loans
+        CROSS JOIN LATERAL generate_series(
+            1,
+            (CASE WHEN loans.renewal_count ~ '^[0-9]+$' THEN loans.renewal_count::integer ELSE 0 END)
+            - (SELECT count(*) FROM loan_renewals WHERE loan_renewals.loan_id = loans.id)
+        )
+        WHERE loans.renewal_count ~ '^[0-9]+$' AND loans.renewal_count::integer > 0
+        """
+    )
+
+    # Duplicates from overlapping runs: keep one row per key
+    op.execute(
+        """
+        DELETE FROM circulation_daily_stats AS duplicate
+        USING circulation_daily_stats AS kept
+        WHERE duplicate.tenant_id = kept.tenant_id
+          AND duplicate.day = kept.day
+          AND duplicate.location_id IS NOT DISTINCT FROM kept.location_id
+          AND duplicate.patron_group_id IS NOT DISTINCT FROM kept.patron_group_id
+          AND duplicate.material_type_id IS NOT DISTINCT FROM kept.material_type_id
+          AND duplicate.id > kept.id
+        """
+    )
+    op.create_index(
+        'uq_circulation_daily_stats_tenant_day_dimensions',
+        'circulation_daily_stats',
+        ['tenant_id', 'day', 'location_id', 'patron_group_id', 'material_type_id'],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+
+    # The backfilled renewals are older than the rollup watermark
+    op.execute("DELETE FROM job_watermarks WHERE name = 'circulation_rollup'")
+
+
+def downgrade() -> None:
+    """
+    Remove the rollup key. Backfilled renewals cannot be told apart from
+    logged ones and are kept.
+    """
+    op.drop_index('uq_circulation_daily_stats_tenant_day_dimensions', table_name='circulation_daily_stats')
@@ -0,0 +1,58 @@
+"""add_background_jobs
+
+Revision ID: 5d2c8e1f7a46
+Revises: 8b3f2d6a91c5
+Create Date: 2026-10-19 17:41:05.209384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2c8e1f7a46'
+down_revision: Union[str, None] = '8b3f2d6a91c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add the background job table used to track bulk user imports.
+    """
+    op.create_table('background_jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('job_type', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'COMPLETED', 'FAILED', name='jobstatus'), nullable=False),
+    sa.Column('parameters', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('total_rows', sa.Integer(), nullable=True),
+    sa.Column('processed_rows', sa.Integer(), nullable=False),
+    sa.Column('succeeded_rows', sa.Integer(), nullable=False),
+    sa.Column('failed_rows', sa.Integer(), nullable=False),
+    sa.Column('errors', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.Column('created_by_user_id', sa.UUID(), nullable=True),
+    sa.Column('updated_by_user_id', sa.UUID(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_background_jobs_tenant_id'), 'background_jobs', ['tenant_id'], unique=False)
+    op.create_index('ix_background_jobs_tenant_type_created', 'background_jobs', ['tenant_id', 'job_type', 'created_date'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    Remove the background job table.
+    """
+    op.drop_index('ix_background_jobs_tenant_type_created', table_name='background_jobs')
+    op.drop_index(op.f('ix_background_jobs_tenant_id'), table_name='background_jobs')
+    op.drop_table('background_jobs')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=True)
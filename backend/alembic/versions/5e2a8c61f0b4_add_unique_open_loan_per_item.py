@@ -0,0 +1,43 @@
+"""add_unique_open_loan_per_item
+
+Revision ID: 5e2a8c61f0b4
+Revises: b3c9e4a17d20
+Create Date: 2026-10-19 12:20:05.771903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a8c61f0b4'
+down_revision: Union[str, None] = 'b3c9e4a17d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Allow at most one open loan per item.
+
+    Backstop for concurrent checkouts of the same item.
+
+    NOTE: Close duplicate open loans of an item before running this
+    migration, otherwise the index cannot be built.
+    """
+    op.create_index(
+        'uq_loans_open_item',
+        'loans',
+        ['item_id'],
+        unique=True,
+        postgresql_where=sa.text("status = 'OPEN'")
+    )
+
+
+def downgrade() -> None:
+    """
+    Remove the open loan uniqueness index.
+    """
+    op.drop_index('uq_loans_open_item', table_name='loans')
@@ -0,0 +1,76 @@
+"""add_circulation_daily_stats
+
+Revision ID: 6c1e8f3b9a27
+Revises: 3a7f1c9d4e62
+Create Date: 2026-10-19 21:14:38.502961
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1e8f3b9a27'
+down_revision: Union[str, None] = '3a7f1c9d4e62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add the loan renewal log, the daily circulation rollup and the loan
+    indexes the incremental rollup job scans.
+    """
+    op.create_table('loan_renewals',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('loan_id', sa.UUID(), nullable=False),
+    sa.Column('renewed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('previous_due_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('due_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['loan_id'], ['loans.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_loan_renewals_loan_id'), 'loan_renewals', ['loan_id'], unique=False)
+    op.create_index(op.f('ix_loan_renewals_tenant_id'), 'loan_renewals', ['tenant_id'], unique=False)
+    op.create_index('ix_loan_renewals_renewed_at', 'loan_renewals', ['renewed_at'], unique=False)
+
+    op.create_table('circulation_daily_stats',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('location_id', sa.UUID(), nullable=True),
+    sa.Column('patron_group_id', sa.UUID(), nullable=True),
+    sa.Column('material_type_id', sa.UUID(), nullable=True),
+    sa.Column('checkouts', sa.Integer(), nullable=False),
+    sa.Column('checkins', sa.Integer(), nullable=False),
+    sa.Column('renewals', sa.Integer(), nullable=False),
+    sa.Column('overdue', sa.Integer(), nullable=False),
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_circulation_daily_stats_tenant_id'), 'circulation_daily_stats', ['tenant_id'], unique=False)
+    op.create_index('ix_circulation_daily_stats_tenant_day', 'circulation_daily_stats', ['tenant_id', 'day'], unique=False)
+
+    op.create_index('ix_loans_updated_date', 'loans', ['updated_date'], unique=False)
+    op.create_index('ix_loans_tenant_loan_date', 'loans', ['tenant_id', 'loan_date'], unique=False)
+    op.create_index('ix_loans_tenant_return_date', 'loans', ['tenant_id', 'return_date'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    Remove the circulation rollup, the renewal log and their loan indexes.
+    """
+    op.drop_index('ix_loans_tenant_return_date', table_name='loans')
+    op.drop_index('ix_loans_tenant_loan_date', table_name='loans')
+    op.drop_index('ix_loans_updated_date', table_name='loans')
+
+    op.drop_index('ix_circulation_daily_stats_tenant_day', table_name='circulation_daily_stats')
+    op.drop_index(op.f('ix_circulation_daily_stats_tenant_id'), table_name='circulation_daily_stats')
+    op.drop_table('circulation_daily_stats')
+
+    op.drop_index('ix_loan_renewals_renewed_at', table_name='loan_renewals')
+    op.drop_index(op.f('ix_loan_renewals_tenant_id'), table_name='loan_renewals')
+    op.drop_index(op.f('ix_loan_renewals_loan_id'), table_name='loan_renewals')
+    op.drop_table('loan_renewals')
@@ -0,0 +1,64 @@
+"""add_user_search_text_trigram_index
+
+Revision ID: 8b3f2d6a91c5
+Revises: e7a0b95c3d14
+Create Date: 2026-10-19 16:58:12.730941
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3f2d6a91c5'
+down_revision: Union[str, None] = 'e7a0b95c3d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+USER_SEARCH_TEXT = (
+    "lower("
+    "coalesce(username, '') || ' ' || "
+    "coalesce(email, '') || ' ' || "
+    "coalesce(barcode, '') || ' ' || "
+    "coalesce(personal ->> 'firstName', '') || ' ' || "
+    "coalesce(personal ->> 'lastName', '')"
+    ")"
+)
+
+
+def upgrade() -> None:
+    """
+    Index user search.
+
+    - pg_trgm extension
+    - users.search_text: stored generated column of normalized identifiers and names
+    - GIN trigram index on users.search_text for substring search
+    - lower(email) index for exact, case-insensitive email lookups
+
+    NOTE: Adding the stored column rewrites the users table.
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        'users',
+        sa.Column('search_text', sa.Text(), sa.Computed(USER_SEARCH_TEXT, persisted=True), nullable=True)
+    )
+    op.create_index(
+        'ix_users_search_text_trgm',
+        'users',
+        ['search_text'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'search_text': 'gin_trgm_ops'}
+    )
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=False)
+
+
+def downgrade() -> None:
+    """
+    Remove user search indexes and column (the extension is left installed).
+    """
+    op.drop_index('ix_users_email_lower', table_name='users')
+    op.drop_index('ix_users_search_text_trgm', table_name='users')
+    op.drop_column('users', 'search_text')
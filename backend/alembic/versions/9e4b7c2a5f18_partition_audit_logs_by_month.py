@@ -0,0 +1,128 @@
+"""partition_audit_logs_by_month
+
+Revision ID: 9e4b7c2a5f18
+Revises: 5d2c8e1f7a46
+Create Date: 2026-10-19 18:20:44.517903
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b7c2a5f18'
+down_revision: Union[str, None] = '5d2c8e1f7a46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created ahead of the current one (AUDIT_LOG_PARTITIONS_AHEAD)
+PARTITIONS_AHEAD = 3
+
+COLUMNS = "id, timestamp, actor, action, target, resource_type, details, status, tenant_id, ip_address, user_agent"
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _bound(month: datetime) -> str:
+    return f"'{month:%Y-%m-%d %H:%M:%S}+00'"
+
+
+def upgrade() -> None:
+    """
+    Rebuild audit_logs as a table range-partitioned by month.
+
+    The primary key becomes (id, timestamp) since it must include the
+    partition key. The five single-column indexes are replaced by
+    (tenant_id, timestamp DESC) and a BRIN index on timestamp. Existing
+    rows are copied into one partition per month they span.
+    """
+    op.drop_index('ix_audit_logs_action', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_actor', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_resource_type', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_tenant_id', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_timestamp', table_name='audit_logs')
+    op.rename_table('audit_logs', 'audit_logs_unpartitioned')
+    op.execute("ALTER TABLE audit_logs_unpartitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey")
+
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id UUID NOT NULL,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+            actor UUID,
+            action auditaction NOT NULL,
+            target VARCHAR(500),
+            resource_type VARCHAR(100),
+            details JSON,
+            status auditstatus NOT NULL,
+            tenant_id UUID,
+            ip_address VARCHAR(50),
+            user_agent VARCHAR(500),
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute('CREATE INDEX ix_audit_logs_tenant_timestamp ON audit_logs (tenant_id, timestamp DESC)')
+    op.execute('CREATE INDEX ix_audit_logs_timestamp_brin ON audit_logs USING brin (timestamp)')
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    now = datetime.now(timezone.utc)
+    current = datetime(now.year, now.month, 1, tzinfo=timezone.utc)
+    oldest = op.get_bind().execute(sa.text("SELECT min(timestamp) FROM audit_logs_unpartitioned")).scalar()
+    if oldest is not None:
+        oldest = oldest.astimezone(timezone.utc)
+        month = min(datetime(oldest.year, oldest.month, 1, tzinfo=timezone.utc), current)
+    else:
+        month = current
+
+    last = _add_months(current, PARTITIONS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE audit_logs_p{month:%Y%m} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(_add_months(month, 1))})"
+        )
+        month = _add_months(month, 1)
+
+    op.execute(f"INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_unpartitioned")
+    op.drop_table('audit_logs_unpartitioned')
+
+
+def downgrade() -> None:
+    """
+    Restore the unpartitioned audit_logs table and its indexes.
+
+    Partitions already archived by the retention task are not restored.
+    """
+    op.rename_table('audit_logs', 'audit_logs_partitioned')
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey")
+    op.execute("ALTER INDEX ix_audit_logs_tenant_timestamp RENAME TO ix_audit_logs_partitioned_tenant_timestamp")
+    op.execute("ALTER INDEX ix_audit_logs_timestamp_brin RENAME TO ix_audit_logs_partitioned_timestamp_brin")
+
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id UUID NOT NULL,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+            actor UUID,
+            action auditaction NOT NULL,
+            target VARCHAR(500),
+            resource_type VARCHAR(100),
+            details JSON,
+            status auditstatus NOT NULL,
+            tenant_id UUID,
+            ip_address VARCHAR(50),
+            user_agent VARCHAR(500),
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute(f"INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_partitioned")
+    op.execute("DROP TABLE audit_logs_partitioned CASCADE")
+
+    op.create_index(op.f('ix_audit_logs_action'), 'audit_logs', ['action'], unique=False)
+    op.create_index(op.f('ix_audit_logs_actor'), 'audit_logs', ['actor'], unique=False)
+    op.create_index(op.f('ix_audit_logs_resource_type'), 'audit_logs', ['resource_type'], unique=False)
+    op.create_index(op.f('ix_audit_logs_tenant_id'), 'audit_logs', ['tenant_id'], unique=False)
+    op.create_index(op.f('ix_audit_logs_timestamp'), 'audit_logs', ['timestamp'], unique=False)
@@ -0,0 +1,75 @@
+"""integer_request_queue_positions
+
+Revision ID: a71d3f95c2e8
+Revises: 5e2a8c61f0b4
+Create Date: 2026-10-19 13:41:52.604417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a71d3f95c2e8'
+down_revision: Union[str, None] = '5e2a8c61f0b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Store request queue positions as integers.
+
+    - requests.position becomes INTEGER (it was compared as text, so "10" < "2")
+    - queued positions are renumbered 1..n per item
+    - (item_id, status, position) serves the per-item queue lookups
+    """
+    op.alter_column(
+        'requests',
+        'position',
+        existing_type=sa.String(length=50),
+        type_=sa.Integer(),
+        existing_nullable=True,
+        postgresql_using="CASE WHEN position ~ '^[0-9]+$' THEN position::integer END"
+    )
+
+    op.execute("""
+        UPDATE requests r
+        SET position = ranked.rank
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY item_id ORDER BY position NULLS LAST, request_date
+            ) AS rank
+            FROM requests
+            WHERE status IN ('OPEN', 'AWAITING_PICKUP', 'IN_TRANSIT')
+        ) ranked
+        WHERE r.id = ranked.id
+    """)
+    op.execute("""
+        UPDATE requests SET position = NULL
+        WHERE status NOT IN ('OPEN', 'AWAITING_PICKUP', 'IN_TRANSIT')
+    """)
+
+    op.create_index(
+        'ix_requests_item_status_position',
+        'requests',
+        ['item_id', 'status', 'position'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """
+    Store request queue positions as strings again.
+    """
+    op.drop_index('ix_requests_item_status_position', table_name='requests')
+    op.alter_column(
+        'requests',
+        'position',
+        existing_type=sa.Integer(),
+        type_=sa.String(length=50),
+        existing_nullable=True,
+        postgresql_using="position::varchar"
+    )
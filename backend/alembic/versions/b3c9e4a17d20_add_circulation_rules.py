@@ -0,0 +1,79 @@
+"""add_circulation_rules
+
+Revision ID: b3c9e4a17d20
+Revises: f9ef7d252ec6
+Create Date: 2026-10-19 11:04:27.318842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c9e4a17d20'
+down_revision: Union[str, None] = 'f9ef7d252ec6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add circulation rules and fixed due date schedules.
+
+    - circulation_rules maps (patron group, material type, loan type,
+      location) criteria to a loan policy
+    - fixed_due_date_schedules caps due dates (e.g. end of semester)
+    """
+    op.create_table(
+        'fixed_due_date_schedules',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('schedules', sa.JSON(), nullable=False),
+        sa.Column('created_date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_by_user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('updated_by_user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        op.f('ix_fixed_due_date_schedules_tenant_id'),
+        'fixed_due_date_schedules',
+        ['tenant_id'],
+        unique=False
+    )
+
+    op.create_table(
+        'circulation_rules',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('patron_group_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('material_type_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('loan_type_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('location_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('loan_policy_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_by_user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('updated_by_user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_circulation_rules_tenant_id'), 'circulation_rules', ['tenant_id'], unique=False)
+    op.create_index(op.f('ix_circulation_rules_loan_policy_id'), 'circulation_rules', ['loan_policy_id'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    Remove circulation rules and fixed due date schedules.
+    """
+    op.drop_index(op.f('ix_circulation_rules_loan_policy_id'), table_name='circulation_rules')
+    op.drop_index(op.f('ix_circulation_rules_tenant_id'), table_name='circulation_rules')
+    op.drop_table('circulation_rules')
+    op.drop_index(op.f('ix_fixed_due_date_schedules_tenant_id'), table_name='fixed_due_date_schedules')
+    op.drop_table('fixed_due_date_schedules')
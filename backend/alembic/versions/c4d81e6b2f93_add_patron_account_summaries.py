@@ -0,0 +1,51 @@
+"""add_patron_account_summaries
+
+Revision ID: c4d81e6b2f93
+Revises: a71d3f95c2e8
+Create Date: 2026-10-19 15:02:37.418260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d81e6b2f93'
+down_revision: Union[str, None] = 'a71d3f95c2e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add the maintained per-patron account summary table.
+
+    Rows are not backfilled here: a patron's row is built on first access
+    or mutation, and the nightly rebuild task fills in the rest.
+    """
+    op.create_table('patron_account_summaries',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('open_loans', sa.Integer(), nullable=False),
+    sa.Column('overdue_loans', sa.Integer(), nullable=False),
+    sa.Column('open_requests', sa.Integer(), nullable=False),
+    sa.Column('total_fees', sa.Integer(), nullable=False),
+    sa.Column('open_fees', sa.Integer(), nullable=False),
+    sa.Column('total_owed', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_paid', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('oldest_fee_date', sa.DateTime(), nullable=True),
+    sa.Column('updated_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index(op.f('ix_patron_account_summaries_tenant_id'), 'patron_account_summaries', ['tenant_id'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    Remove the patron account summary table.
+    """
+    op.drop_index(op.f('ix_patron_account_summaries_tenant_id'), table_name='patron_account_summaries')
+    op.drop_table('patron_account_summaries')
@@ -0,0 +1,38 @@
+"""add_patron_group_block_limits
+
+Revision ID: e7a0b95c3d14
+Revises: c4d81e6b2f93
+Create Date: 2026-10-19 16:10:48.205113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a0b95c3d14'
+down_revision: Union[str, None] = 'c4d81e6b2f93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add automated patron block limits to patron groups.
+
+    All limits are nullable; NULL means the group has no such limit.
+    """
+    op.add_column('patron_groups', sa.Column('max_loans', sa.Integer(), nullable=True))
+    op.add_column('patron_groups', sa.Column('max_overdue_loans', sa.Integer(), nullable=True))
+    op.add_column('patron_groups', sa.Column('max_outstanding_fee_balance', sa.Numeric(precision=12, scale=2), nullable=True))
+
+
+def downgrade() -> None:
+    """
+    Remove patron block limits from patron groups.
+    """
+    op.drop_column('patron_groups', 'max_outstanding_fee_balance')
+    op.drop_column('patron_groups', 'max_overdue_loans')
+    op.drop_column('patron_groups', 'max_loans')
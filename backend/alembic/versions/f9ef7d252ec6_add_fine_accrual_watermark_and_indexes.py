@@ -0,0 +1,67 @@
+"""add_fine_accrual_watermark_and_indexes
+
+Revision ID: f9ef7d252ec6
+Revises: 40bee24ed2c9
+Create Date: 2026-10-19 09:12:41.530118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f9ef7d252ec6'
+down_revision: Union[str, None] = '40bee24ed2c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Support incremental overdue fine accrual.
+
+    - job_watermarks stores the last run of incremental jobs
+    - loans (tenant_id, status, due_date) serves the overdue range scans
+    - fees gets at most one automated overdue fine per loan, which is the
+      conflict target of the accrual upsert
+    """
+    op.create_table(
+        'job_watermarks',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('last_run_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('updated_date', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+    op.create_index(
+        'ix_loans_tenant_status_due_date',
+        'loans',
+        ['tenant_id', 'status', 'due_date'],
+        unique=False
+    )
+
+    # The fees table is created by the application (init_db) rather than by
+    # an earlier migration, so only index it when it is already there
+    if sa.inspect(op.get_bind()).has_table('fees'):
+        op.create_index(
+            'uq_fees_automated_overdue_loan',
+            'fees',
+            ['loan_id'],
+            unique=True,
+            postgresql_where=sa.text("automated AND fee_type = 'OVERDUE'")
+        )
+
+
+def downgrade() -> None:
+    """
+    Remove fine accrual support.
+    """
+    if sa.inspect(op.get_bind()).has_table('fees'):
+        op.drop_index('uq_fees_automated_overdue_loan', table_name='fees')
+
+    op.drop_index('ix_loans_tenant_status_due_date', table_name='loans')
+    op.drop_table('job_watermarks')
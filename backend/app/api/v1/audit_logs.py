@@ -4,17 +4,26 @@ Audit logs API endpoints for viewing system activity logs.
 
 from datetime import datetime
 from typing import Optional, List
-from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_
 from pydantic import BaseModel
 import uuid
 
 from app.db.session import get_db
-from app.models.audit import AuditLog, AuditAction, AuditStatus
+from app.models.audit import AuditAction, AuditStatus
+from app.models.job import BackgroundJob, JobStatus
 from app.models.user import User
 from app.api.v1.auth import get_current_user
-from app.core.deps import require_permission
+from app.core.deps import get_current_tenant, require_permission
+from app.schemas.job import BackgroundJobResponse
+from app.services.audit_export_service import (
+    JOB_TYPE as AUDIT_EXPORT_JOB, AuditExportService, export_path, stream_csv
+)
+from app.services.audit_query_service import AuditQueryService, audit_filters, encode_cursor, page_query
+from app.tasks.audit_tasks import export_audit_logs as export_audit_logs_task
 
 router = APIRouter()
 
@@ -43,18 +52,64 @@ class PaginatedAuditLogsResponse(BaseModel):
     meta: dict
 
 
+def parse_audit_filter_params(
+    action: Optional[str] = None,
+    resource_type: Optional[str] = None,
+    user_id: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    search: Optional[str] = None,
+) -> dict:
+    """Validate audit log filter query parameters into audit_filters params."""
+    params = {}
+
+    if action:
+        try:
+            params["action"] = AuditAction[action.upper()].name
+        except KeyError:
+            raise HTTPException(status_code=400, detail=f"Invalid action type: {action}")
+
+    if resource_type:
+        params["resource_type"] = resource_type
+
+    if user_id:
+        try:
+            params["actor"] = str(uuid.UUID(user_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid user ID format")
+
+    if start_date:
+        try:
+            params["start"] = datetime.fromisoformat(start_date.replace('Z', '+00:00')).isoformat()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid start_date format. Use ISO format.")
+
+    if end_date:
+        try:
+            params["end"] = datetime.fromisoformat(end_date.replace('Z', '+00:00')).isoformat()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid end_date format. Use ISO format.")
+
+    if search:
+        params["search"] = search
+
+    return params
+
+
 @router.get("/audit-logs", response_model=PaginatedAuditLogsResponse)
 async def get_audit_logs(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from meta.next_cursor of the previous page"),
     action: Optional[str] = Query(None, description="Filter by action type"),
     resource_type: Optional[str] = Query(None, description="Filter by resource type"),
     user_id: Optional[str] = Query(None, description="Filter by user ID"),
     start_date: Optional[str] = Query(None, description="Start date (ISO format)"),
     end_date: Optional[str] = Query(None, description="End date (ISO format)"),
     search: Optional[str] = Query(None, description="Search by resource ID or target"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_permission("audit.read")),
+    tenant_id: str = Depends(get_current_tenant),
 ):
     """
     Get audit logs with filtering and pagination.
@@ -62,8 +117,10 @@ async def get_audit_logs(
     **Permissions Required:** audit.read
 
     **Query Parameters:**
-    - page: Page number (default: 1)
+    - page: Page number (default: 1), ignored when a cursor is given
     - page_size: Items per page (default: 20, max: 100)
+    - cursor: Continue after the last log of a previous page (`meta.next_cursor`);
+      stays fast at any depth, unlike page numbers
     - action: Filter by action type (CREATE, UPDATE, DELETE, LOGIN, LOGOUT)
     - resource_type: Filter by resource type (User, Item, Loan, etc.)
     - user_id: Filter by actor user ID
@@ -71,64 +128,34 @@ async def get_audit_logs(
     - end_date: Filter logs until this date (ISO format)
     - search: Search by resource ID or target path
 
-    **Returns:** Paginated list of audit logs
+    **Returns:** Paginated list of audit logs. `meta.total_items` is exact up
+    to AUDIT_LOG_EXACT_COUNT_LIMIT and a planner estimate beyond it
+    (`meta.total_is_estimate`).
     """
-    # Build query
-    query = db.query(AuditLog)
-
-    # Apply filters
-    filters = []
-
-    if action:
-        try:
-            filters.append(AuditLog.action == AuditAction[action.upper()])
-        except KeyError:
-            raise HTTPException(status_code=400, detail=f"Invalid action type: {action}")
-
-    if resource_type:
-        filters.append(AuditLog.resource_type == resource_type)
-
-    if user_id:
-        try:
-            filters.append(AuditLog.actor == uuid.UUID(user_id))
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid user ID format")
-
-    if start_date:
-        try:
-            start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            filters.append(AuditLog.timestamp >= start_dt)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid start_date format. Use ISO format.")
-
-    if end_date:
-        try:
-            end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            filters.append(AuditLog.timestamp <= end_dt)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid end_date format. Use ISO format.")
-
-    if search:
-        filters.append(AuditLog.target.ilike(f"%{search}%"))
+    filters = audit_filters(
+        uuid.UUID(tenant_id),
+        parse_audit_filter_params(action, resource_type, user_id, start_date, end_date, search),
+    )
 
-    if filters:
-        query = query.filter(and_(*filters))
+    try:
+        query = page_query(filters, page_size, cursor=cursor, offset=(page - 1) * page_size)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    # Get total count
-    total_items = query.count()
+    result = await db.execute(query)
+    audit_logs = result.scalars().all()
+    has_more = len(audit_logs) > page_size
+    audit_logs = audit_logs[:page_size]
 
-    # Apply pagination and ordering
-    offset = (page - 1) * page_size
-    audit_logs = query.order_by(desc(AuditLog.timestamp)).offset(offset).limit(page_size).all()
+    usernames = await AuditQueryService.actor_names(db, (log.actor for log in audit_logs))
+    total_items, total_is_estimate = await AuditQueryService.count(db, filters)
 
-    # Join with users to get usernames
-    enriched_logs = []
-    for log in audit_logs:
-        log_dict = {
+    enriched_logs = [
+        {
             "id": str(log.id),
             "timestamp": log.timestamp,
             "actor": str(log.actor) if log.actor else None,
-            "username": None,
+            "username": usernames.get(log.actor),
             "action": log.action.value if log.action else None,
             "target": log.target,
             "resource_type": log.resource_type,
@@ -137,14 +164,8 @@ async def get_audit_logs(
             "ip_address": log.ip_address,
             "user_agent": log.user_agent,
         }
-
-        # Get username if actor exists
-        if log.actor:
-            user = db.query(User).filter(User.id == log.actor).first()
-            if user:
-                log_dict["username"] = user.username
-
-        enriched_logs.append(log_dict)
+        for log in audit_logs
+    ]
 
     # Calculate pagination metadata
     total_pages = (total_items + page_size - 1) // page_size
@@ -156,115 +177,121 @@ async def get_audit_logs(
             "page_size": page_size,
             "total_items": total_items,
             "total_pages": total_pages,
+            "total_is_estimate": total_is_estimate,
+            "next_cursor": encode_cursor(audit_logs[-1]) if has_more else None,
         }
     }
 
 
 @router.post("/audit-logs/export")
 async def export_audit_logs(
+    request: Request,
     format: str = Query("csv", description="Export format: csv or excel"),
+    background: bool = Query(False, description="Export in a background job (for very large ranges)"),
+    compress: bool = Query(False, description="Gzip the download if the client accepts it"),
     action: Optional[str] = Query(None),
     resource_type: Optional[str] = Query(None),
     user_id: Optional[str] = Query(None),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_permission("audit.read")),
+    tenant_id: str = Depends(get_current_tenant),
 ):
     """
-    Export audit logs to CSV or Excel format.
+    Export audit logs to CSV.
 
     **Permissions Required:** audit.read
 
-    **Returns:** File download
+    Every matching log is exported, streamed from a server-side cursor in
+    chunks, so memory use does not grow with the range. With `background`
+    the export is written to a gzipped file by a worker instead; poll
+    `GET /audit-logs/exports/{job_id}` and download it from
+    `GET /audit-logs/exports/{job_id}/download`.
+
+    **Returns:** File download, or the queued job (202) in background mode
     """
-    from fastapi.responses import StreamingResponse
-    import io
-    import csv
+    params = parse_audit_filter_params(action, resource_type, user_id, start_date, end_date, search)
 
-    # Build query (same as get_audit_logs)
-    query = db.query(AuditLog)
-    filters = []
+    if background:
+        job = await AuditExportService.create_job(db, uuid.UUID(tenant_id), current_user.id, params)
+        export_audit_logs_task.delay(str(job.id))
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=jsonable_encoder(BackgroundJobResponse.model_validate(job)),
+        )
 
-    if action:
-        try:
-            filters.append(AuditLog.action == AuditAction[action.upper()])
-        except KeyError:
-            raise HTTPException(status_code=400, detail=f"Invalid action type: {action}")
+    # Excel exports are served as CSV
+    filename = f"audit_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
 
-    if resource_type:
-        filters.append(AuditLog.resource_type == resource_type)
+    gzip = compress and "gzip" in request.headers.get("accept-encoding", "")
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
 
-    if user_id:
-        try:
-            filters.append(AuditLog.actor == uuid.UUID(user_id))
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid user ID format")
+    return StreamingResponse(
+        stream_csv(uuid.UUID(tenant_id), params, compress=gzip),
+        media_type="text/csv",
+        headers=headers
+    )
 
-    if start_date:
-        try:
-            start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            filters.append(AuditLog.timestamp >= start_dt)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid start_date format")
 
-    if end_date:
-        try:
-            end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            filters.append(AuditLog.timestamp <= end_dt)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid end_date format")
+async def get_audit_export_job(db: AsyncSession, job_id: uuid.UUID, tenant_id: str) -> BackgroundJob:
+    """Get a tenant's audit export job or raise 404."""
+    result = await db.execute(
+        select(BackgroundJob).where(
+            and_(
+                BackgroundJob.id == job_id,
+                BackgroundJob.job_type == AUDIT_EXPORT_JOB,
+                BackgroundJob.tenant_id == uuid.UUID(tenant_id)
+            )
+        )
+    )
+    job = result.scalar_one_or_none()
 
-    if search:
-        filters.append(AuditLog.target.ilike(f"%{search}%"))
-
-    if filters:
-        query = query.filter(and_(*filters))
-
-    # Get all logs (limited to 10000 for safety)
-    audit_logs = query.order_by(desc(AuditLog.timestamp)).limit(10000).all()
-
-    # Generate CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # Write header
-    writer.writerow(['Timestamp', 'Username', 'Action', 'Resource Type', 'Resource ID', 'Status', 'IP Address', 'Details'])
-
-    # Write rows
-    for log in audit_logs:
-        username = None
-        if log.actor:
-            user = db.query(User).filter(User.id == log.actor).first()
-            if user:
-                username = user.username
-
-        writer.writerow([
-            log.timestamp.isoformat() if log.timestamp else '',
-            username or 'System',
-            log.action.value if log.action else '',
-            log.resource_type or '',
-            log.target or '',
-            log.status.value if log.status else '',
-            log.ip_address or '',
-            str(log.details) if log.details else '{}'
-        ])
-
-    # Prepare response
-    output.seek(0)
-
-    if format.lower() == 'excel':
-        # For Excel, we'd need openpyxl or xlsxwriter
-        # For now, return CSV with different content type
-        filename = f"audit_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        media_type = "text/csv"
-    else:
-        filename = f"audit_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        media_type = "text/csv"
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
 
-    return StreamingResponse(
-        io.BytesIO(output.getvalue().encode('utf-8')),
-        media_type=media_type,
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    return job
+
+
+@router.get("/audit-logs/exports/{job_id}", response_model=BackgroundJobResponse)
+async def get_audit_export(
+    job_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("audit.read")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """
+    Get the status of a background audit log export.
+
+    **Permissions Required:** audit.read
+    """
+    return await get_audit_export_job(db, job_id, tenant_id)
+
+
+@router.get("/audit-logs/exports/{job_id}/download")
+async def download_audit_export(
+    job_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("audit.read")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """
+    Download the gzipped CSV of a completed background audit log export.
+
+    **Permissions Required:** audit.read
+    """
+    job = await get_audit_export_job(db, job_id, tenant_id)
+
+    path = export_path(job.id)
+    if job.status != JobStatus.COMPLETED or not path.exists():
+        raise HTTPException(status_code=409, detail="Export is not available")
+
+    return FileResponse(
+        path,
+        media_type="application/gzip",
+        filename=f"audit_logs_{job.created_date:%Y%m%d_%H%M%S}.csv.gz"
     )
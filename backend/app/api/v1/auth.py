@@ -11,11 +11,12 @@ from sqlalchemy.orm import selectinload
 from pydantic import BaseModel
 
 from app.db.session import get_db
-from app.core.security import verify_password, create_access_token, create_refresh_token
+from app.core.security import create_access_token, create_refresh_token
 from app.core.config import settings
 from app.core.deps import get_current_user
 from app.models.user import User
 from app.schemas.user import UserResponse
+from app.services.password_hashing_service import get_password_hashing_service
 
 router = APIRouter()
 
@@ -45,7 +46,7 @@ async def login(
     )
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    if not user or not await get_password_hashing_service().verify(login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -4,29 +4,50 @@ Check-out, check-in, renewals, loans, and requests management.
 """
 
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import math
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, insert, update, case, and_, or_, func
+from sqlalchemy.exc import IntegrityError
 from uuid import UUID
 
 from app.db.session import get_db
 from app.models.user import User
-from app.models.inventory import Item
-from app.models.circulation import Loan, Request, LoanPolicy, LoanStatus, RequestStatus
+from app.models.patron_account import PatronAccountSummary
+from app.models.inventory import Item, Holding, Instance
+from app.models.circulation import (
+    Loan, LoanRenewal, Request, LoanPolicy, LoanStatus, RequestStatus,
+    CirculationRule, FixedDueDateSchedule, OPEN_LOAN_ITEM_INDEX
+)
 from app.schemas.circulation import (
     CheckOutRequest, CheckOutResponse,
     CheckInRequest, CheckInResponse,
     RenewRequest, RenewResponse,
+    RenewAllRequest, RenewBatchRequest, RenewResult, BatchRenewResponse,
+    PatronBlockCheckRequest, PatronBlockCheckResponse, PatronBlockDecision,
     LoanResponse, RequestResponse,
-    RequestCreate, RequestUpdate,
-    LoanPolicyCreate, LoanPolicyUpdate, LoanPolicyResponse
+    RequestCreate, RequestUpdate, RequestMove, RequestQueueReorder,
+    LoanPolicyCreate, LoanPolicyUpdate, LoanPolicyResponse,
+    CirculationRuleCreate, CirculationRuleResponse,
+    FixedDueDateScheduleCreate, FixedDueDateScheduleResponse
 )
 from app.schemas.common import PaginatedResponse, PaginationMeta
 from app.core.deps import get_current_user, get_current_tenant, require_permission
 from app.utils.pagination import paginate
 from app.services.audit_service import AuditService
+from app.services.domain_events import publish
+from app.services.fine_accrual_service import get_fine_accrual_service
+from app.services.hold_queue_service import HoldQueueService, QUEUE_STATUSES
+from app.services.patron_account_service import PatronAccountService
+from app.services.patron_block_service import PatronBlockService
+from app.services.circulation_rules_service import (
+    calculate_due_date,
+    calculate_renewal_due_date,
+    get_circulation_rules_engine,
+    item_criteria,
+    resolve_from_table,
+)
 
 router = APIRouter()
 
@@ -46,27 +67,54 @@ async def check_out_item(
     Check out an item to a user.
 
     - Validates item availability
+    - Evaluates automated patron blocks
     - Creates a loan record
     - Updates item status to "checked out"
     - Calculates due date based on loan policy
     """
-    # Find item by barcode
-    item_result = await db.execute(
-        select(Item).where(
+    tenant_uuid = UUID(tenant_id)
+
+    # Fetch the item, the borrower, their account summary and the title in
+    # one round trip. The item row stays locked until commit, so concurrent
+    # checkouts of the same barcode queue here and the second one sees the
+    # item checked out.
+    row = (await db.execute(
+        select(Item, User, PatronAccountSummary, Instance.title)
+        .select_from(Item)
+        .join(User, and_(User.barcode == checkout_data.user_barcode, User.tenant_id == tenant_uuid))
+        .outerjoin(PatronAccountSummary, PatronAccountSummary.user_id == User.id)
+        .outerjoin(Holding, Holding.id == Item.holding_id)
+        .outerjoin(Instance, Instance.id == Holding.instance_id)
+        .where(
             and_(
                 Item.barcode == checkout_data.item_barcode,
-                Item.tenant_id == UUID(tenant_id)
+                Item.tenant_id == tenant_uuid
             )
         )
-    )
-    item = item_result.scalar_one_or_none()
-
-    if not item:
+        .with_for_update(of=Item)
+    )).one_or_none()
+
+    if not row:
+        item_exists = await db.scalar(
+            select(Item.id).where(
+                and_(
+                    Item.barcode == checkout_data.item_barcode,
+                    Item.tenant_id == tenant_uuid
+                )
+            )
+        )
+        if not item_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Item with barcode '{checkout_data.item_barcode}' not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Item with barcode '{checkout_data.item_barcode}' not found"
+            detail=f"User with barcode '{checkout_data.user_barcode}' not found"
         )
 
+    item, user, summary, item_title = row
+
     # Check if item is available
     if item.status != "available":
         raise HTTPException(
@@ -74,92 +122,78 @@ async def check_out_item(
             detail=f"Item is not available for checkout. Current status: {item.status}"
         )
 
-    # Find user by barcode
-    user_result = await db.execute(
-        select(User).where(
-            and_(
-                User.barcode == checkout_data.user_barcode,
-                User.tenant_id == UUID(tenant_id)
-            )
-        )
-    )
-    user = user_result.scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User with barcode '{checkout_data.user_barcode}' not found"
-        )
-
-    if not user.active:
+    # Patron blocks from the maintained counters and cached group limits
+    blocks = await PatronBlockService.check(db, tenant_uuid, user, summary)
+    if blocks:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User account is inactive"
+            detail="; ".join(block["message"] for block in blocks)
         )
 
-    # Check for existing open loan
-    existing_loan = await db.execute(
-        select(Loan).where(
-            and_(
-                Loan.item_id == item.id,
-                Loan.status == LoanStatus.OPEN,
-                Loan.tenant_id == UUID(tenant_id)
-            )
-        )
-    )
-    if existing_loan.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Item is already checked out"
-        )
+    # Resolve the loan policy from the compiled circulation rules
+    policy = await get_circulation_rules_engine().resolve(db, tenant_uuid, user.patron_group_id, item)
 
-    # Calculate due date (default: 14 days from now)
     loan_date = datetime.utcnow()
     if checkout_data.due_date:
         due_date = checkout_data.due_date
     else:
-        # TODO: Get from loan policy based on patron group and material type
-        due_date = loan_date + timedelta(days=14)
-
-    # Create loan record
-    loan = Loan(
-        user_id=user.id,
-        item_id=item.id,
-        loan_date=loan_date,
-        due_date=due_date,
-        status=LoanStatus.OPEN,
-        renewal_count="0",
-        max_renewals="3",
-        checkout_service_point_id=checkout_data.service_point_id,
-        tenant_id=UUID(tenant_id)
-    )
-
-    db.add(loan)
+        due_date = calculate_due_date(policy, loan_date)
+
+    # Create loan record. The partial unique index on open loans rejects a
+    # second open loan for the item even if the item status is stale.
+    try:
+        loan_id = await db.scalar(
+            insert(Loan).values(
+                user_id=user.id,
+                item_id=item.id,
+                loan_date=loan_date,
+                due_date=due_date,
+                status=LoanStatus.OPEN,
+                renewal_count="0",
+                max_renewals=str(policy["max_renewals"]),
+                checkout_service_point_id=checkout_data.service_point_id,
+                tenant_id=tenant_uuid
+            ).returning(Loan.id)
+        )
+    except IntegrityError as e:
+        await db.rollback()
+        if OPEN_LOAN_ITEM_INDEX in str(e.orig):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Item is already checked out"
+            )
+        raise
 
     # Update item status
     item.status = "checked_out"
+    await PatronAccountService.apply_delta(db, user.id, open_loans=1)
+
+    publish(
+        db, "loan.checked_out", tenant_id, loan_id,
+        item_id=str(item.id), user_id=str(user.id),
+        due_date=due_date.isoformat(), item_status=item.status
+    )
 
     await db.commit()
-    await db.refresh(loan)
 
     # Log audit
     await AuditService.log_action(
         db=db,
         actor=current_user.username,
         action="CHECK_OUT",
-        target=str(loan.id),
+        target=str(loan_id),
         resource_type="loan",
         details={
             "item_barcode": item.barcode,
             "user_barcode": user.barcode,
             "due_date": due_date.isoformat()
         },
-        tenant_id=UUID(tenant_id),
+        tenant_id=tenant_uuid,
     )
 
     # Build response
     return CheckOutResponse(
-        loan_id=loan.id,
+        loan_id=loan_id,
         item_id=item.id,
         user_id=user.id,
         item_barcode=item.barcode,
@@ -167,7 +201,7 @@ async def check_out_item(
         loan_date=loan_date,
         due_date=due_date,
         status=LoanStatus.OPEN,
-        item_title=item.holding.instance.title if item.holding and item.holding.instance else None,
+        item_title=item_title,
         user_name=f"{user.personal.get('firstName', '')} {user.personal.get('lastName', '')}"
     )
 
@@ -232,15 +266,13 @@ async def check_in_item(
     # Set return date
     return_date = checkin_data.check_in_date or datetime.utcnow()
 
-    # Check if overdue
+    # Check if overdue; the fine follows the tenant's overdue fee policy
     was_overdue = return_date > loan.due_date
     fine_amount = None
 
     if was_overdue:
-        # Calculate fine (e.g., $0.50 per day)
-        days_overdue = (return_date - loan.due_date).days
-        fine_amount = days_overdue * 0.50
-        # TODO: Create fine/fee record in fees table
+        fine = await get_fine_accrual_service().assess_loan(db, loan, return_date)
+        fine_amount = float(fine) if fine is not None else None
 
     # Update loan
     loan.return_date = return_date
@@ -249,16 +281,7 @@ async def check_in_item(
 
     # Update item status
     # Check if there are pending requests for this item
-    pending_request = await db.execute(
-        select(Request).where(
-            and_(
-                Request.item_id == item.id,
-                Request.status == RequestStatus.OPEN,
-                Request.tenant_id == UUID(tenant_id)
-            )
-        ).order_by(Request.position)
-    )
-    next_request = pending_request.scalar_one_or_none()
+    next_request = await HoldQueueService.next_request(db, item.id)
 
     if next_request:
         item.status = "awaiting_pickup"
@@ -266,6 +289,15 @@ async def check_in_item(
     else:
         item.status = "available"
 
+    await PatronAccountService.apply_delta(db, loan.user_id, open_loans=-1, refresh_overdue=True)
+
+    publish(
+        db, "loan.checked_in", tenant_id, loan.id,
+        item_id=str(item.id), user_id=str(loan.user_id),
+        was_overdue=was_overdue, fine_amount=fine_amount, item_status=item.status,
+        request_id=str(next_request.id) if next_request else None
+    )
+
     await db.commit()
     await db.refresh(loan)
 
@@ -304,6 +336,151 @@ async def check_in_item(
 # RENEW
 # ============================================================================
 
+def _can_renew_any_loan(current_user: User) -> bool:
+    """
+    Resolve the caller's renewal scope.
+
+    Returns:
+        True for staff (circulation.renew), False for patrons who may only
+        renew their own loans (circulation.renew_own)
+
+    Raises:
+        HTTPException: 403 without either permission
+    """
+    user_permissions = {perm.name for role in current_user.roles for perm in role.permissions}
+
+    if "circulation.renew" in user_permissions:
+        return True
+    if "circulation.renew_own" in user_permissions:
+        return False
+
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="No renewal permission. Required: circulation.renew or circulation.renew_own"
+    )
+
+
+async def _renew_open_loans(
+    db: AsyncSession,
+    tenant_id: str,
+    current_user: User,
+    *conditions
+) -> BatchRenewResponse:
+    """
+    Renew every open loan matching `conditions`.
+
+    Eligibility (policy, renewal count, waiting holds) of all loans is read
+    in one grouped query and the renewals are written in one UPDATE.
+    """
+    tenant_uuid = UUID(tenant_id)
+
+    rows = (await db.execute(
+        select(Loan, Item, User.patron_group_id, func.count(Request.id))
+        .join(Item, Item.id == Loan.item_id)
+        .join(User, User.id == Loan.user_id)
+        .outerjoin(
+            Request,
+            and_(Request.item_id == Loan.item_id, Request.status == RequestStatus.OPEN)
+        )
+        .where(
+            and_(
+                Loan.tenant_id == tenant_uuid,
+                Loan.status == LoanStatus.OPEN,
+                *conditions
+            )
+        )
+        .group_by(Loan.id, Item.id, User.patron_group_id)
+        .order_by(Loan.due_date)
+    )).all()
+
+    rules = await get_circulation_rules_engine().get_table(db, tenant_uuid)
+    renewal_date = datetime.utcnow()
+
+    results = []
+    renewals = {}
+    for loan, item, patron_group_id, waiting_requests in rows:
+        policy = resolve_from_table(rules, patron_group_id, *item_criteria(item))
+        renewal_count = int(loan.renewal_count or 0)
+        max_renewals = policy["max_renewals"]
+
+        error = None
+        if not policy["renewable"]:
+            error = "Loan policy does not allow renewals"
+        elif renewal_count >= max_renewals:
+            error = f"Maximum renewals ({max_renewals}) reached"
+        elif waiting_requests:
+            error = "Cannot renew - item has pending requests"
+
+        result = RenewResult(
+            loan_id=loan.id,
+            item_id=item.id,
+            item_barcode=item.barcode,
+            renewed=error is None,
+            previous_due_date=loan.due_date,
+            renewal_count=renewal_count,
+            max_renewals=max_renewals,
+            error=error,
+        )
+        if error is None:
+            result.new_due_date = calculate_renewal_due_date(policy, renewal_date)
+            result.renewal_count = renewal_count + 1
+            renewals[loan.id] = result
+        results.append(result)
+
+    if renewals:
+        await db.execute(
+            update(Loan)
+            .where(Loan.id.in_(list(renewals)))
+            .values(
+                due_date=case({i: r.new_due_date for i, r in renewals.items()}, value=Loan.id),
+                renewal_count=case({i: str(r.renewal_count) for i, r in renewals.items()}, value=Loan.id),
+                max_renewals=case({i: str(r.max_renewals) for i, r in renewals.items()}, value=Loan.id),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.add_all([
+            LoanRenewal(
+                loan_id=loan_id,
+                tenant_id=tenant_uuid,
+                renewed_at=renewal_date,
+                previous_due_date=renewal.previous_due_date,
+                due_date=renewal.new_due_date,
+            )
+            for loan_id, renewal in renewals.items()
+        ])
+        for user_id in {loan.user_id for loan, _, _, _ in rows if loan.id in renewals}:
+            await PatronAccountService.apply_delta(db, user_id, refresh_overdue=True)
+        for loan, _, _, _ in rows:
+            if loan.id in renewals:
+                renewal = renewals[loan.id]
+                publish(
+                    db, "loan.renewed", tenant_id, loan.id,
+                    item_id=str(renewal.item_id), user_id=str(loan.user_id),
+                    due_date=renewal.new_due_date.isoformat(), renewal_count=renewal.renewal_count
+                )
+        await db.commit()
+
+        # Log audit
+        await AuditService.log_action(
+            db=db,
+            actor=current_user.username,
+            action="RENEW",
+            target=",".join(str(loan_id) for loan_id in renewals),
+            resource_type="loan",
+            details={
+                "renewed": len(renewals),
+                "failed": len(results) - len(renewals),
+            },
+            tenant_id=tenant_uuid,
+        )
+
+    return BatchRenewResponse(
+        renewed_count=len(renewals),
+        failed_count=len(results) - len(renewals),
+        results=results,
+    )
+
+
 @router.post("/renew", response_model=RenewResponse)
 async def renew_loan(
     renew_data: RenewRequest,
@@ -337,9 +514,11 @@ async def renew_loan(
             detail=f"Item with barcode '{renew_data.item_barcode}' not found"
         )
 
-    # Find the open loan
+    # Find the open loan together with the borrower's patron group
     loan_result = await db.execute(
-        select(Loan).where(
+        select(Loan, User.patron_group_id)
+        .join(User, User.id == Loan.user_id)
+        .where(
             and_(
                 Loan.item_id == item.id,
                 Loan.status == LoanStatus.OPEN,
@@ -347,40 +526,36 @@ async def renew_loan(
             )
         )
     )
-    loan = loan_result.scalar_one_or_none()
+    loan_row = loan_result.one_or_none()
 
-    if not loan:
+    if not loan_row:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No open loan found for this item"
         )
+    loan, patron_group_id = loan_row
 
     # Check permissions: staff can renew any loan, patrons can only renew their own
-    user_permissions = set()
-    for role in current_user.roles:
-        for perm in role.permissions:
-            user_permissions.add(perm.name)
-
-    has_staff_permission = "circulation.renew" in user_permissions
-    has_patron_permission = "circulation.renew_own" in user_permissions
-
-    if not has_staff_permission and not has_patron_permission:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No renewal permission. Required: circulation.renew or circulation.renew_own"
-        )
+    has_staff_permission = _can_renew_any_loan(current_user)
 
     # If user only has patron permission, verify they own the loan
-    if has_patron_permission and not has_staff_permission:
+    if not has_staff_permission:
         if loan.user_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Can only renew own items"
             )
 
-    # Check renewal eligibility
+    # Check renewal eligibility against the current loan policy
+    policy = await get_circulation_rules_engine().resolve(db, UUID(tenant_id), patron_group_id, item)
+    if not policy["renewable"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Loan policy does not allow renewals"
+        )
+
     current_renewals = int(loan.renewal_count)
-    max_renewals = int(loan.max_renewals)
+    max_renewals = policy["max_renewals"]
 
     if current_renewals >= max_renewals:
         raise HTTPException(
@@ -407,13 +582,26 @@ async def renew_loan(
     # Save old due date
     previous_due_date = loan.due_date
 
-    # Calculate new due date (extend by loan period, e.g., 14 days)
-    # TODO: Get from loan policy
-    new_due_date = datetime.utcnow() + timedelta(days=14)
+    # Calculate new due date from the policy's renewal period
+    new_due_date = calculate_renewal_due_date(policy, datetime.utcnow())
 
     # Update loan
     loan.due_date = new_due_date
     loan.renewal_count = str(current_renewals + 1)
+    loan.max_renewals = str(max_renewals)
+    db.add(LoanRenewal(
+        loan_id=loan.id,
+        tenant_id=loan.tenant_id,
+        previous_due_date=previous_due_date,
+        due_date=new_due_date,
+    ))
+    await PatronAccountService.apply_delta(db, loan.user_id, refresh_overdue=True)
+
+    publish(
+        db, "loan.renewed", tenant_id, loan.id,
+        item_id=str(item.id), user_id=str(loan.user_id),
+        due_date=new_due_date.isoformat(), renewal_count=current_renewals + 1
+    )
 
     await db.commit()
     await db.refresh(loan)
@@ -445,6 +633,113 @@ async def renew_loan(
     )
 
 
+@router.post("/renew/all", response_model=BatchRenewResponse)
+async def renew_all_loans(
+    renew_data: RenewAllRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """
+    Renew every open loan of a borrower.
+
+    - Patrons renew their own loans; staff may pass another user_id
+    - Returns a result per loan; ineligible loans are reported, not raised
+    """
+    has_staff_permission = _can_renew_any_loan(current_user)
+
+    user_id = renew_data.user_id or current_user.id
+    if user_id != current_user.id and not has_staff_permission:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Can only renew own items"
+        )
+
+    return await _renew_open_loans(db, tenant_id, current_user, Loan.user_id == user_id)
+
+
+@router.post("/renew/batch", response_model=BatchRenewResponse)
+async def renew_loans_batch(
+    renew_data: RenewBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """
+    Renew the given loans.
+
+    - Patrons can only renew their own loans
+    - Returns a result per requested loan
+    """
+    has_staff_permission = _can_renew_any_loan(current_user)
+
+    conditions = [Loan.id.in_(renew_data.loan_ids)]
+    if not has_staff_permission:
+        conditions.append(Loan.user_id == current_user.id)
+
+    response = await _renew_open_loans(db, tenant_id, current_user, *conditions)
+
+    # Report requested loans that are not open (or not the caller's)
+    found = {result.loan_id for result in response.results}
+    for loan_id in dict.fromkeys(renew_data.loan_ids):
+        if loan_id not in found:
+            response.results.append(RenewResult(loan_id=loan_id, renewed=False, error="Open loan not found"))
+            response.failed_count += 1
+
+    return response
+
+
+# ============================================================================
+# PATRON BLOCKS
+# ============================================================================
+
+@router.post("/patron-blocks/check", response_model=PatronBlockCheckResponse)
+async def check_patron_blocks(
+    check_data: PatronBlockCheckRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("circulation.checkout")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """
+    Check whether patrons may check out items.
+
+    - Accepts up to 100 user IDs and 100 user barcodes
+    - Returns a decision per patron with the blocks that apply
+    - Unknown patrons are reported with found = false
+    """
+    if not check_data.user_ids and not check_data.user_barcodes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide user_ids or user_barcodes"
+        )
+
+    checked = await PatronBlockService.check_many(
+        db, UUID(tenant_id), check_data.user_ids, check_data.user_barcodes
+    )
+    # Summaries built for first-time patrons
+    await db.commit()
+
+    results = [
+        PatronBlockDecision(
+            user_id=user.id,
+            user_barcode=user.barcode,
+            can_checkout=not blocks,
+            blocks=blocks,
+        )
+        for user, blocks in checked["users"]
+    ]
+    results.extend(
+        PatronBlockDecision(user_id=user_id, found=False, can_checkout=False)
+        for user_id in checked["missing_ids"]
+    )
+    results.extend(
+        PatronBlockDecision(user_barcode=barcode, found=False, can_checkout=False)
+        for barcode in checked["missing_barcodes"]
+    )
+
+    return PatronBlockCheckResponse(results=results)
+
+
 # ============================================================================
 # LOANS
 # ============================================================================
@@ -553,17 +848,9 @@ async def create_request(
             detail="User already has an open request for this item"
         )
 
-    # Get the next position in queue
-    position_result = await db.execute(
-        select(func.count()).where(
-            and_(
-                Request.item_id == request_data.item_id,
-                Request.status == RequestStatus.OPEN,
-                Request.tenant_id == UUID(tenant_id)
-            )
-        )
-    )
-    position = position_result.scalar() + 1
+    # Append to the end of the item's queue
+    await HoldQueueService.lock(db, item.id)
+    position = await HoldQueueService.next_position(db, item.id)
 
     # Create request
     new_request = Request(
@@ -573,13 +860,20 @@ async def create_request(
         request_date=datetime.utcnow(),
         request_expiration_date=request_data.request_expiration_date,
         status=RequestStatus.OPEN,
-        position=str(position),
+        position=position,
         fulfillment_preference=request_data.fulfillment_preference,
         pickup_service_point_id=request_data.pickup_service_point_id,
         tenant_id=UUID(tenant_id)
     )
 
     db.add(new_request)
+    await db.flush()
+    await PatronAccountService.apply_delta(db, new_request.user_id, open_requests=1)
+    publish(
+        db, "request.created", tenant_id, new_request.id,
+        item_id=str(item.id), user_id=str(user.id), position=position
+    )
+
     await db.commit()
     await db.refresh(new_request)
 
@@ -598,7 +892,9 @@ async def create_request(
         tenant_id=UUID(tenant_id),
     )
 
-    return RequestResponse.model_validate(new_request)
+    response = RequestResponse.model_validate(new_request)
+    response.queue_length = position
+    return response
 
 
 @router.get("/requests", response_model=PaginatedResponse[RequestResponse])
@@ -628,10 +924,14 @@ async def list_requests(
 
     result = await paginate(db, query, page, page_size)
 
+    # Queue lengths of every item on the page in one grouped query
+    queue_lengths = await HoldQueueService.queue_lengths(db, [req.item_id for req in result.data])
+
     # Enrich with user/item data
     requests = []
     for req in result.data:
         req_dict = RequestResponse.model_validate(req).model_dump()
+        req_dict['queue_length'] = queue_lengths.get(req.item_id, 0)
 
         # Get item info
         item = await db.get(Item, req.item_id)
@@ -667,7 +967,15 @@ async def cancel_request(
             detail="Request not found"
         )
 
+    # Leave the queue and move everyone behind up one place
+    await HoldQueueService.lock(db, request.item_id)
+    await db.refresh(request)
+    was_queued = request.status in QUEUE_STATUSES
+    await HoldQueueService.remove(db, request)
     request.status = RequestStatus.CANCELLED
+    if was_queued:
+        await PatronAccountService.apply_delta(db, request.user_id, open_requests=-1)
+    publish(db, "request.cancelled", tenant_id, request.id, item_id=str(request.item_id))
 
     await db.commit()
 
@@ -683,6 +991,108 @@ async def cancel_request(
     )
 
 
+@router.get("/items/{item_id}/request-queue", response_model=list[RequestResponse])
+async def get_request_queue(
+    item_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("circulation.checkout")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """Get an item's request queue in order."""
+    item = await db.get(Item, item_id)
+    if not item or item.tenant_id != UUID(tenant_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Item not found"
+        )
+
+    queue = await HoldQueueService.get_queue(db, item_id)
+    return [
+        RequestResponse.model_validate(req).model_copy(update={"queue_length": len(queue)})
+        for req in queue
+    ]
+
+
+@router.put("/items/{item_id}/request-queue", response_model=list[RequestResponse])
+async def reorder_request_queue(
+    item_id: UUID,
+    reorder_data: RequestQueueReorder,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("circulation.checkout")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """Reorder an item's request queue."""
+    item = await db.get(Item, item_id)
+    if not item or item.tenant_id != UUID(tenant_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Item not found"
+        )
+
+    await HoldQueueService.lock(db, item_id)
+    await HoldQueueService.reorder(db, item_id, reorder_data.request_ids)
+    publish(db, "request.reordered", tenant_id, None, item_id=str(item_id))
+    await db.commit()
+
+    queue = await HoldQueueService.get_queue(db, item_id)
+
+    # Log audit
+    await AuditService.log_action(
+        db=db,
+        actor=current_user.username,
+        action="UPDATE",
+        target=str(item_id),
+        resource_type="request_queue",
+        details={"request_ids": [str(request_id) for request_id in reorder_data.request_ids]},
+        tenant_id=UUID(tenant_id),
+    )
+
+    return [
+        RequestResponse.model_validate(req).model_copy(update={"queue_length": len(queue)})
+        for req in queue
+    ]
+
+
+@router.post("/requests/{request_id}/move", response_model=RequestResponse)
+async def move_request(
+    request_id: UUID,
+    move_data: RequestMove,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("circulation.checkout")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """Move a request to another position in its item's queue."""
+    request = await db.get(Request, request_id)
+
+    if not request or request.tenant_id != UUID(tenant_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Request not found"
+        )
+
+    await HoldQueueService.lock(db, request.item_id)
+    await db.refresh(request)
+    previous_position = request.position
+    position = await HoldQueueService.move(db, request, move_data.position)
+    publish(db, "request.reordered", tenant_id, request.id, item_id=str(request.item_id), position=position)
+
+    await db.commit()
+    await db.refresh(request)
+
+    # Log audit
+    await AuditService.log_action(
+        db=db,
+        actor=current_user.username,
+        action="UPDATE",
+        target=str(request_id),
+        resource_type="request",
+        details={"previous_position": previous_position, "position": position},
+        tenant_id=UUID(tenant_id),
+    )
+
+    return RequestResponse.model_validate(request)
+
+
 # ============================================================================
 # LOAN POLICIES
 # ============================================================================
@@ -781,6 +1191,7 @@ async def create_loan_policy(
     db.add(policy)
     await db.commit()
     await db.refresh(policy)
+    get_circulation_rules_engine().invalidate(tenant_id)
 
     # Log audit
     await AuditService.log_action(
@@ -829,6 +1240,7 @@ async def update_loan_policy(
 
     await db.commit()
     await db.refresh(policy)
+    get_circulation_rules_engine().invalidate(tenant_id)
 
     # Log audit
     await AuditService.log_action(
@@ -867,8 +1279,23 @@ async def delete_loan_policy(
             detail="Loan policy not found"
         )
 
+    rule_count = await db.scalar(
+        select(func.count()).select_from(CirculationRule).where(
+            and_(
+                CirculationRule.loan_policy_id == policy_id,
+                CirculationRule.tenant_id == UUID(tenant_id)
+            )
+        )
+    )
+    if rule_count:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Loan policy is used by {rule_count} circulation rule(s)"
+        )
+
     await db.delete(policy)
     await db.commit()
+    get_circulation_rules_engine().invalidate(tenant_id)
 
     # Log audit
     await AuditService.log_action(
@@ -882,6 +1309,213 @@ async def delete_loan_policy(
     )
 
 
+# ============================================================================
+# FIXED DUE DATE SCHEDULES
+# ============================================================================
+
+@router.get("/fixed-due-date-schedules", response_model=list[FixedDueDateScheduleResponse])
+async def list_fixed_due_date_schedules(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("circulation.checkout")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """List fixed due date schedules."""
+    result = await db.execute(
+        select(FixedDueDateSchedule)
+        .where(FixedDueDateSchedule.tenant_id == UUID(tenant_id))
+        .order_by(FixedDueDateSchedule.name)
+    )
+    return result.scalars().all()
+
+
+@router.post(
+    "/fixed-due-date-schedules",
+    response_model=FixedDueDateScheduleResponse,
+    status_code=status.HTTP_201_CREATED
+)
+async def create_fixed_due_date_schedule(
+    schedule_data: FixedDueDateScheduleCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("circulation.checkout")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """Create a fixed due date schedule."""
+    for window in schedule_data.schedules:
+        if window.from_date > window.to_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Schedule window starting {window.from_date} ends before it starts"
+            )
+
+    schedule = FixedDueDateSchedule(
+        **schedule_data.model_dump(mode="json", by_alias=True),
+        tenant_id=UUID(tenant_id),
+        created_by_user_id=current_user.id,
+    )
+
+    db.add(schedule)
+    await db.commit()
+    await db.refresh(schedule)
+    get_circulation_rules_engine().invalidate(tenant_id)
+
+    # Log audit
+    await AuditService.log_action(
+        db=db,
+        actor=current_user.username,
+        action="CREATE",
+        target=str(schedule.id),
+        resource_type="fixed_due_date_schedule",
+        details={"name": schedule.name},
+        tenant_id=UUID(tenant_id),
+    )
+
+    return schedule
+
+
+@router.delete("/fixed-due-date-schedules/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_fixed_due_date_schedule(
+    schedule_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("circulation.checkout")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """Delete a fixed due date schedule."""
+    schedule = await db.scalar(
+        select(FixedDueDateSchedule).where(
+            and_(
+                FixedDueDateSchedule.id == schedule_id,
+                FixedDueDateSchedule.tenant_id == UUID(tenant_id)
+            )
+        )
+    )
+
+    if not schedule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Fixed due date schedule not found"
+        )
+
+    await db.delete(schedule)
+    await db.commit()
+    get_circulation_rules_engine().invalidate(tenant_id)
+
+    # Log audit
+    await AuditService.log_action(
+        db=db,
+        actor=current_user.username,
+        action="DELETE",
+        target=str(schedule_id),
+        resource_type="fixed_due_date_schedule",
+        details={},
+        tenant_id=UUID(tenant_id),
+    )
+
+
+# ============================================================================
+# CIRCULATION RULES
+# ============================================================================
+
+@router.get("/rules", response_model=list[CirculationRuleResponse])
+async def list_circulation_rules(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("circulation.checkout")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """List circulation rules, highest priority first."""
+    result = await db.execute(
+        select(CirculationRule)
+        .where(CirculationRule.tenant_id == UUID(tenant_id))
+        .order_by(CirculationRule.priority.desc(), CirculationRule.created_date)
+    )
+    return result.scalars().all()
+
+
+@router.post("/rules", response_model=CirculationRuleResponse, status_code=status.HTTP_201_CREATED)
+async def create_circulation_rule(
+    rule_data: CirculationRuleCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("circulation.checkout")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """Create a circulation rule mapping loan criteria to a loan policy."""
+    policy = await db.scalar(
+        select(LoanPolicy).where(
+            and_(
+                LoanPolicy.id == rule_data.loan_policy_id,
+                LoanPolicy.tenant_id == UUID(tenant_id)
+            )
+        )
+    )
+    if not policy:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Loan policy not found"
+        )
+
+    rule = CirculationRule(
+        **rule_data.model_dump(),
+        tenant_id=UUID(tenant_id),
+        created_by_user_id=current_user.id,
+    )
+
+    db.add(rule)
+    await db.commit()
+    await db.refresh(rule)
+    get_circulation_rules_engine().invalidate(tenant_id)
+
+    # Log audit
+    await AuditService.log_action(
+        db=db,
+        actor=current_user.username,
+        action="CREATE",
+        target=str(rule.id),
+        resource_type="circulation_rule",
+        details={"loan_policy": policy.code, "priority": rule.priority},
+        tenant_id=UUID(tenant_id),
+    )
+
+    return rule
+
+
+@router.delete("/rules/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_circulation_rule(
+    rule_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("circulation.checkout")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """Delete a circulation rule."""
+    rule = await db.scalar(
+        select(CirculationRule).where(
+            and_(
+                CirculationRule.id == rule_id,
+                CirculationRule.tenant_id == UUID(tenant_id)
+            )
+        )
+    )
+
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Circulation rule not found"
+        )
+
+    await db.delete(rule)
+    await db.commit()
+    get_circulation_rules_engine().invalidate(tenant_id)
+
+    # Log audit
+    await AuditService.log_action(
+        db=db,
+        actor=current_user.username,
+        action="DELETE",
+        target=str(rule_id),
+        resource_type="circulation_rule",
+        details={},
+        tenant_id=UUID(tenant_id),
+    )
+
+
 # ============================================================================
 # ADDITIONAL CIRCULATION ENDPOINTS (BUG-010 FIX)
 # ============================================================================
@@ -915,6 +1549,7 @@ async def fulfill_request(
     # Update request status
     request.status = RequestStatus.AWAITING_PICKUP
     request.fulfillment_date = datetime.utcnow()
+    publish(db, "request.fulfilled", tenant_id, request.id, item_id=str(request.item_id))
 
     await db.commit()
     await db.refresh(request)
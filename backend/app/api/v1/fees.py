@@ -30,6 +30,9 @@ from app.schemas.fee import (
     UserFeesSummary,
 )
 from app.schemas.common import PaginatedResponse, PaginationMeta
+from app.services.domain_events import publish
+from app.services.fine_accrual_service import get_fine_accrual_service
+from app.services.patron_account_service import PatronAccountService
 
 router = APIRouter()
 
@@ -148,6 +151,15 @@ async def create_fee(
     )
 
     db.add(fee)
+    await db.flush()
+    await PatronAccountService.apply_delta(
+        db, fee.user_id,
+        total_fees=1, open_fees=1, total_owed=fee.remaining, fee_date=fee.fee_date
+    )
+    publish(
+        db, "fee.created", fee.tenant_id, fee.id,
+        user_id=str(fee.user_id), amount=str(fee.amount), status=fee.status
+    )
     await db.commit()
     await db.refresh(fee)
 
@@ -183,6 +195,9 @@ async def update_fee(
         setattr(fee, field, value)
 
     fee.updated_by = current_user.id
+    if "status" in update_data:
+        await PatronAccountService.rebuild(db, user_ids=[fee.user_id])
+    publish(db, "fee.updated", fee.tenant_id, fee.id, user_id=str(fee.user_id), status=fee.status)
 
     await db.commit()
     await db.refresh(fee)
@@ -220,6 +235,8 @@ async def delete_fee(
         )
 
     await db.delete(fee)
+    await PatronAccountService.rebuild(db, user_ids=[fee.user_id])
+    publish(db, "fee.deleted", fee.tenant_id, fee.id, user_id=str(fee.user_id))
     await db.commit()
 
 
@@ -227,6 +244,18 @@ async def delete_fee(
 # Payment Endpoints
 # ============================================================================
 
+async def _apply_payment_to_summary(db: AsyncSession, fee: Fee, amount: Decimal, was_open: bool):
+    """Carry a payment or waiver over to the patron's account summary."""
+    closed = was_open and fee.status == FeeStatus.CLOSED
+    await PatronAccountService.apply_delta(
+        db, fee.user_id,
+        total_owed=-amount if was_open else Decimal("0"),
+        total_paid=amount,
+        open_fees=-1 if closed else 0,
+        refresh_oldest_fee=closed,
+    )
+
+
 @router.post("/fees/{fee_id}/payments", response_model=PaymentResponse, status_code=status.HTTP_201_CREATED)
 async def create_payment(
     fee_id: UUID,
@@ -277,6 +306,7 @@ async def create_payment(
         )
 
     # Update fee amounts
+    was_open = fee.status == FeeStatus.OPEN
     fee.paid_amount += payment_data.amount
     fee.remaining -= payment_data.amount
 
@@ -302,6 +332,14 @@ async def create_payment(
     db.add(payment)
     fee.updated_by = current_user.id
 
+    await db.flush()
+    await _apply_payment_to_summary(db, fee, payment.amount, was_open)
+    publish(
+        db, "payment.created", fee.tenant_id, payment.id,
+        fee_id=str(fee.id), user_id=str(fee.user_id), amount=str(payment.amount),
+        method=payment.payment_method, remaining=str(fee.remaining), fee_status=fee.status
+    )
+
     await db.commit()
     await db.refresh(payment)
 
@@ -384,6 +422,7 @@ async def waive_fee(
         )
 
     # Update fee
+    was_open = fee.status == FeeStatus.OPEN
     fee.remaining -= waive_amount
     fee.paid_amount += waive_amount  # Treated as "paid" for accounting
 
@@ -408,6 +447,14 @@ async def waive_fee(
     db.add(payment)
     fee.updated_by = current_user.id
 
+    await db.flush()
+    await _apply_payment_to_summary(db, fee, payment.amount, was_open)
+    publish(
+        db, "payment.created", fee.tenant_id, payment.id,
+        fee_id=str(fee.id), user_id=str(fee.user_id), amount=str(payment.amount),
+        method=payment.payment_method, remaining=str(fee.remaining), fee_status=fee.status
+    )
+
     await db.commit()
     await db.refresh(payment)
 
@@ -439,29 +486,17 @@ async def get_user_fees_summary(
             detail="User not found"
         )
 
-    # Get all fees for user
-    fees_query = select(Fee).where(
-        and_(
-            Fee.user_id == user_id,
-            Fee.tenant_id == current_user.tenant_id
-        )
-    )
-    result = await db.execute(fees_query)
-    all_fees = result.scalars().all()
-
-    # Calculate summary
-    open_fees = [f for f in all_fees if f.status == FeeStatus.OPEN]
-    total_owed = sum(f.remaining for f in open_fees)
-    total_paid = sum(f.paid_amount for f in all_fees)
-    oldest_fee_date = min((f.fee_date for f in open_fees), default=None)
+    # Read the maintained account summary instead of summing every fee
+    summary = await PatronAccountService.get(db, user_id)
+    await db.commit()
 
     return UserFeesSummary(
         user_id=user_id,
-        total_fees=len(all_fees),
-        open_fees=len(open_fees),
-        total_owed=total_owed,
-        total_paid=total_paid,
-        oldest_fee_date=oldest_fee_date,
+        total_fees=summary.total_fees,
+        open_fees=summary.open_fees,
+        total_owed=summary.total_owed,
+        total_paid=summary.total_paid,
+        oldest_fee_date=summary.oldest_fee_date,
     )
 
 
@@ -563,6 +598,7 @@ async def create_fee_policy(
     db.add(policy)
     await db.commit()
     await db.refresh(policy)
+    get_fine_accrual_service().invalidate_policy(current_user.tenant_id)
 
     return policy
 
@@ -599,6 +635,7 @@ async def update_fee_policy(
 
     await db.commit()
     await db.refresh(policy)
+    get_fine_accrual_service().invalidate_policy(current_user.tenant_id)
 
     return policy
 
@@ -627,3 +664,4 @@ async def delete_fee_policy(
 
     await db.delete(policy)
     await db.commit()
+    get_fine_accrual_service().invalidate_policy(current_user.tenant_id)
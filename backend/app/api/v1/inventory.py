@@ -31,6 +31,7 @@ from app.schemas.inventory import (
 )
 from app.schemas.common import PaginatedResponse
 from app.utils.pagination import paginate
+from app.services.domain_events import publish
 
 router = APIRouter()
 
@@ -74,6 +75,8 @@ async def create_instance(
             created_by_user_id=current_user.id,
         )
         db.add(instance)
+        await db.flush()
+        publish(db, "instance.created", instance.tenant_id, instance.id)
         await db.commit()
         await db.refresh(instance)
         return instance
@@ -137,6 +140,7 @@ async def update_instance(
             setattr(instance, field, value)
 
         instance.updated_by_user_id = current_user.id
+        publish(db, "instance.updated", instance.tenant_id, instance.id)
         await db.commit()
         await db.refresh(instance)
         return instance
@@ -173,6 +177,7 @@ async def delete_instance(
         )
 
     await db.delete(instance)
+    publish(db, "instance.deleted", instance.tenant_id, instance.id)
     await db.commit()
 
 
@@ -193,6 +198,9 @@ async def bulk_create_instances(
         for inst in instances_in
     ]
     db.add_all(instances)
+    await db.flush()
+    for instance in instances:
+        publish(db, "instance.created", instance.tenant_id, instance.id)
     await db.commit()
 
     for instance in instances:
@@ -384,6 +392,8 @@ async def create_item(
         created_by_user_id=current_user.id,
     )
     db.add(item)
+    await db.flush()
+    publish(db, "item.created", item.tenant_id, item.id, holding_id=str(item.holding_id), status=item.status)
     await db.commit()
     await db.refresh(item)
     return item
@@ -465,6 +475,7 @@ async def update_item(
         setattr(item, field, value)
 
     item.updated_by_user_id = current_user.id
+    publish(db, "item.updated", item.tenant_id, item.id, holding_id=str(item.holding_id), status=item.status)
     await db.commit()
     await db.refresh(item)
     return item
@@ -489,6 +500,7 @@ async def delete_item(
         )
 
     await db.delete(item)
+    publish(db, "item.deleted", item.tenant_id, item.id, holding_id=str(item.holding_id))
     await db.commit()
 
 
@@ -600,6 +612,8 @@ async def bulk_import_items(
             })
             failure_count += 1
 
+    if imported_ids:
+        publish(db, "item.bulk_imported", tenant_id, None, item_ids=imported_ids)
     await db.commit()
 
     # Log audit
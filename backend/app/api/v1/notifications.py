@@ -5,7 +5,7 @@ CRUD operations and WebSocket notification management
 
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from datetime import datetime
@@ -14,6 +14,7 @@ from app.core.deps import get_current_user, get_current_tenant, get_db
 from app.models.user import User
 from app.models.notification import Notification, NotificationType
 from app.services.websocket_service import get_websocket_service
+from app.services.notification_counter_service import get_notification_counter_service
 from pydantic import BaseModel
 
 
@@ -129,21 +130,14 @@ async def get_unread_count(
     tenant_id: str = Depends(get_current_tenant),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get count of unread notifications for current user"""
-    query = select(func.count(Notification.id)).where(
-        and_(
-            Notification.user_id == current_user.id,
-            Notification.tenant_id == UUID(tenant_id),
-            Notification.is_read == False,
-            or_(
-                Notification.expires_at == None,
-                Notification.expires_at > datetime.utcnow()
-            )
-        )
-    )
+    """
+    Get count of unread notifications for current user
 
-    result = await db.execute(query)
-    count = result.scalar()
+    Served from the Redis counter; connected clients also receive
+    `unread_count` WebSocket events whenever it changes.
+    """
+    counter_service = get_notification_counter_service()
+    count = await counter_service.get_unread_count(db, tenant_id, current_user.id)
 
     return {"unread_count": count}
 
@@ -184,6 +178,7 @@ async def create_notification(
         user_id=str(notification_data.user_id),
         notification=notification.to_dict()
     )
+    await get_notification_counter_service().increment(tenant_id, notification_data.user_id)
 
     return notification
 
@@ -215,12 +210,16 @@ async def mark_notification_as_read(
         )
 
     # Update read status
+    was_unread = not notification.is_read
     notification.is_read = True
     notification.read_at = datetime.utcnow()
 
     await db.commit()
     await db.refresh(notification)
 
+    if was_unread:
+        await get_notification_counter_service().increment(tenant_id, current_user.id, -1)
+
     return notification
 
 
@@ -249,6 +248,8 @@ async def mark_all_notifications_as_read(
     result = await db.execute(stmt)
     await db.commit()
 
+    await get_notification_counter_service().set_count(tenant_id, current_user.id, 0)
+
     return {"message": f"Marked {result.rowcount} notifications as read"}
 
 
@@ -278,9 +279,13 @@ async def delete_notification(
             detail="Notification not found"
         )
 
+    was_unread = not notification.is_read
     await db.delete(notification)
     await db.commit()
 
+    if was_unread:
+        await get_notification_counter_service().increment(tenant_id, current_user.id, -1)
+
     return {"message": "Notification deleted successfully"}
 
 
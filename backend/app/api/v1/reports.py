@@ -3,23 +3,26 @@ Reports API Endpoints
 Generate and export various reports
 """
 
-from datetime import datetime
+from datetime import date, datetime, timezone
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse
 from sqlalchemy import select, func, and_, or_, case
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 from pydantic import BaseModel
 from uuid import UUID
 import uuid
-import io
 
 from app.db.session import get_db
 from app.core.deps import get_current_user, get_current_tenant, require_permission
+from app.models.audit import AuditAction
+from app.models.job import BackgroundJob, JobStatus
+from app.models.report import ReportSchedule
 from app.models.user import User
-from app.models.circulation import Loan, LoanStatus, Request as Hold, RequestStatus as HoldStatus
+from app.models.circulation import Request as Hold, RequestStatus as HoldStatus
 from app.models.inventory import Item, Instance
+from app.models.patron_account import PatronAccountSummary
 # TODO: The following models don't exist yet:
 # from app.models.patron_group import PatronGroup
 # from app.models.purchase_order import PurchaseOrder, POStatus
@@ -34,14 +37,27 @@ except ImportError:
 INVOICE_MODEL_AVAILABLE = False
 Invoice = None
 InvoiceStatus = None
+from app.schemas.job import BackgroundJobResponse
 from app.schemas.report import (
-    ReportType, ExportFormat, ReportData,
+    ReportType, ExportFormat, ReportJobCreate,
     CirculationReportRequest, CollectionReportRequest,
     FinancialReportRequest, OverdueReportRequest,
     CirculationStats, CollectionStats, FinancialStats, UserStats,
-    DashboardStats
+    DashboardStats, CirculationStatsSeries
 )
-from app.services.export_service import get_export_service
+from app.services.circulation_rollup_service import GROUPINGS as ROLLUP_GROUPINGS, CirculationRollupService
+from app.services.cache_service import dashboard_stats_key, get_cache_service
+from app.services.report_artifact_store import get_report_artifact_store
+from app.services.report_service import (
+    JOB_TYPE as REPORT_JOB,
+    REPORTS,
+    ReportService,
+    next_run_after,
+    normalized_parameters,
+    parse_report_request,
+)
+from app.tasks.report_tasks import generate_report as generate_report_task
+from app.core.config import settings
 
 router = APIRouter()
 
@@ -54,38 +70,27 @@ async def get_dashboard_statistics(
     """
     Get comprehensive dashboard statistics
 
-    Returns combined statistics for circulation, collection, financial, and users
+    Returns combined statistics for circulation, collection, financial, and users.
+    Cached per tenant; circulation, inventory and fee events invalidate the entry.
     """
-    try:
-        # Circulation stats
-        total_checkouts = await db.scalar(
-            select(func.count(Loan.id)).where(Loan.tenant_id == current_user.tenant_id)
-        ) or 0
-
-        active_loans = await db.scalar(
-            select(func.count(Loan.id)).where(
-                and_(
-                    Loan.tenant_id == current_user.tenant_id,
-                    Loan.status == LoanStatus.CHECKED_OUT
-                )
-            )
-        ) or 0
-
-        overdue_loans = await db.scalar(
-            select(func.count(Loan.id)).where(
-                and_(
-                    Loan.tenant_id == current_user.tenant_id,
-                    Loan.status == LoanStatus.CHECKED_OUT,
-                    Loan.due_date < datetime.utcnow().date()
-                )
-            )
-        ) or 0
+    cache = get_cache_service()
+    cache_key = dashboard_stats_key(current_user.tenant_id)
+    cached = await cache.get(cache_key)
+    if cached:
+        return DashboardStats(**cached)
 
-        total_renewals = await db.scalar(
-            select(func.sum(Loan.renewal_count)).where(
-                Loan.tenant_id == current_user.tenant_id
-            )
-        ) or 0
+    try:
+        # Circulation stats: event totals from the daily rollup, current
+        # loans from patron account summaries
+        totals = await CirculationRollupService.totals(db, current_user.tenant_id)
+
+        active_loans, overdue_loans, users_with_overdues = (await db.execute(
+            select(
+                func.coalesce(func.sum(PatronAccountSummary.open_loans), 0),
+                func.coalesce(func.sum(PatronAccountSummary.overdue_loans), 0),
+                func.count().filter(PatronAccountSummary.overdue_loans > 0),
+            ).where(PatronAccountSummary.tenant_id == current_user.tenant_id)
+        )).one()
 
         holds_placed = await db.scalar(
             select(func.count(Hold.id)).where(
@@ -103,9 +108,9 @@ async def get_dashboard_statistics(
         ) or 0
 
         circulation = CirculationStats(
-            total_checkouts=total_checkouts,
-            total_checkins=total_checkouts - active_loans,  # Approximate
-            total_renewals=total_renewals,
+            total_checkouts=totals["checkouts"],
+            total_checkins=totals["checkins"],
+            total_renewals=totals["renewals"],
             active_loans=active_loans,
             overdue_loans=overdue_loans,
             holds_placed=holds_placed,
@@ -190,34 +195,76 @@ async def get_dashboard_statistics(
             )
         ) or 0
 
-        users_with_overdues = await db.scalar(
-            select(func.count(func.distinct(Loan.user_id))).where(
-                and_(
-                    Loan.tenant_id == current_user.tenant_id,
-                    Loan.status == LoanStatus.CHECKED_OUT,
-                    Loan.due_date < datetime.utcnow().date()
-                )
-            )
-        ) or 0
-
         users = UserStats(
             total_users=total_users,
             active_users=active_users,
             users_with_overdues=users_with_overdues
         )
 
-        return DashboardStats(
+        stats = DashboardStats(
             circulation=circulation,
             collection=collection,
             financial=financial,
             users=users,
             generated_at=datetime.utcnow()
         )
+        await cache.set(cache_key, stats.model_dump(mode="json"), expire=settings.DASHBOARD_STATS_CACHE_TTL_SECONDS)
+
+        return stats
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate dashboard stats: {str(e)}")
 
 
+@router.get("/circulation-stats", response_model=CirculationStatsSeries)
+async def get_circulation_statistics(
+    group_by: str = Query("month", description=f"One of: {', '.join(ROLLUP_GROUPINGS)}"),
+    start_date: Optional[date] = Query(None, description="First day (UTC), inclusive"),
+    end_date: Optional[date] = Query(None, description="Last day (UTC), inclusive"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("reports.view")),
+    tenant_id: str = Depends(get_current_tenant)
+):
+    """
+    Circulation totals over any range, grouped by period or dimension.
+
+    **Permissions Required:** reports.view
+
+    Reads the daily rollup, so months or years of activity cost a few
+    thousand rows; today's figures lag by up to one rollup interval.
+    """
+    if group_by not in ROLLUP_GROUPINGS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"group_by must be one of: {', '.join(ROLLUP_GROUPINGS)}"
+        )
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date is after end_date")
+
+    tenant_uuid = UUID(tenant_id)
+    rows = await CirculationRollupService.series(db, tenant_uuid, group_by, start_date, end_date)
+    totals = await CirculationRollupService.totals(db, tenant_uuid, start_date, end_date)
+
+    return CirculationStatsSeries(
+        group_by=group_by,
+        start_date=start_date,
+        end_date=end_date,
+        rows=rows,
+        totals=totals
+    )
+
+
+async def report_file_response(db: AsyncSession, tenant_id, request: BaseModel) -> FileResponse:
+    """Serve a report from the artifact cache, generating it on a miss."""
+    artifact = await ReportService.generate(db, tenant_id, request)
+    path = get_report_artifact_store().path(artifact["artifact"], artifact["extension"])
+
+    if request.export_format == ExportFormat.JSON:
+        return FileResponse(path, media_type=artifact["media_type"])
+
+    return FileResponse(path, media_type=artifact["media_type"], filename=artifact["filename"])
+
+
 @router.post("/circulation")
 async def generate_circulation_report(
     request: CirculationReportRequest,
@@ -226,90 +273,14 @@ async def generate_circulation_report(
 ):
     """
     Generate circulation report with optional export
+
+    Identical requests are served from the report cache until the loans,
+    users or titles change.
     """
     try:
-        # Build query
-        query = select(Loan).where(Loan.tenant_id == current_user.tenant_id)
-
-        # Apply filters
-        if request.filters:
-            if request.filters.date_range:
-                if request.filters.date_range.start_date:
-                    query = query.where(Loan.checkout_date >= request.filters.date_range.start_date)
-                if request.filters.date_range.end_date:
-                    query = query.where(Loan.checkout_date <= request.filters.date_range.end_date)
-
-            if request.filters.user_id:
-                query = query.where(Loan.user_id == request.filters.user_id)
-
-            if request.filters.status:
-                query = query.where(Loan.status == request.filters.status)
-
-        # Add pagination
-        if request.filters:
-            query = query.offset(request.filters.offset).limit(request.filters.limit)
-
-        # Execute query with joins
-        query = query.options(
-            joinedload(Loan.user),
-            joinedload(Loan.item).joinedload(Item.instance)
-        )
-
-        result = await db.execute(query)
-        loans = result.scalars().all()
-
-        # Convert to report data
-        data = []
-        for loan in loans:
-            data.append({
-                'loan_id': str(loan.id),
-                'user': loan.user.username if loan.user else 'Unknown',
-                'item_title': loan.item.instance.title if loan.item and loan.item.instance else 'Unknown',
-                'checkout_date': loan.checkout_date.isoformat() if loan.checkout_date else None,
-                'due_date': loan.due_date.isoformat() if loan.due_date else None,
-                'return_date': loan.return_date.isoformat() if loan.return_date else None,
-                'status': loan.status.value if loan.status else None,
-                'renewal_count': loan.renewal_count or 0
-            })
-
-        # Create report
-        report_data = ReportData(
-            report_type=ReportType.CIRCULATION,
-            title="Circulation Report",
-            description="Report of circulation activity including checkouts, checkins, and renewals",
-            generated_at=datetime.utcnow(),
-            filters_applied=request.filters.model_dump() if request.filters else {},
-            total_records=len(data),
-            data=data
-        )
-
-        # Export if requested
-        if request.export_format != ExportFormat.JSON:
-            export_service = get_export_service()
-            file_content = export_service.export_report(report_data, request.export_format)
-
-            # Determine content type and filename
-            if request.export_format == ExportFormat.CSV:
-                media_type = "text/csv"
-                extension = "csv"
-            elif request.export_format == ExportFormat.EXCEL:
-                media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                extension = "xlsx"
-            elif request.export_format == ExportFormat.PDF:
-                media_type = "application/pdf"
-                extension = "pdf"
-
-            filename = f"circulation_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
-
-            return StreamingResponse(
-                io.BytesIO(file_content),
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
-
-        # Return JSON
-        return report_data
-
+        return await report_file_response(db, current_user.tenant_id, request)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate circulation report: {str(e)}")
 
@@ -322,100 +293,13 @@ async def generate_collection_report(
 ):
     """
     Generate collection/inventory report with optional export
+
+    Identical requests are served from the report cache until the instances change.
     """
     try:
-        # Build query
-        query = select(Instance).where(Instance.tenant_id == current_user.tenant_id)
-
-        # Apply filters
-        if request.filters:
-            if request.filters.instance_id:
-                query = query.where(Instance.id == request.filters.instance_id)
-
-        # Add pagination
-        if request.filters:
-            query = query.offset(request.filters.offset).limit(request.filters.limit)
-
-        result = await db.execute(query)
-        instances = result.scalars().all()
-
-        # Convert to report data
-        data = []
-        for instance in instances:
-            data.append({
-                'instance_id': str(instance.id),
-                'title': instance.title,
-                'subtitle': instance.subtitle,
-                'author': instance.author,
-                'publisher': instance.publisher,
-                'publication_year': instance.publication_year,
-                'isbn': instance.isbn,
-                'instance_type': instance.instance_type,
-                'language': instance.language,
-                'subjects': ', '.join(instance.subjects) if instance.subjects else None
-            })
-
-        # Calculate summary stats if requested
-        summary = None
-        if request.include_statistics:
-            total_count = len(data)
-            types_count = {}
-            languages_count = {}
-
-            for item in data:
-                # Count by type
-                item_type = item.get('instance_type', 'Unknown')
-                types_count[item_type] = types_count.get(item_type, 0) + 1
-
-                # Count by language
-                lang = item.get('language', 'Unknown')
-                languages_count[lang] = languages_count.get(lang, 0) + 1
-
-            summary = {
-                'total_instances': total_count,
-                'by_type': types_count,
-                'by_language': languages_count
-            }
-
-        # Create report
-        report_data = ReportData(
-            report_type=ReportType.COLLECTION,
-            title="Collection Report",
-            description="Report of library collection/inventory",
-            generated_at=datetime.utcnow(),
-            filters_applied=request.filters.model_dump() if request.filters else {},
-            total_records=len(data),
-            data=data,
-            summary=summary
-        )
-
-        # Export if requested
-        if request.export_format != ExportFormat.JSON:
-            export_service = get_export_service()
-            file_content = export_service.export_report(report_data, request.export_format)
-
-            # Determine content type and filename
-            if request.export_format == ExportFormat.CSV:
-                media_type = "text/csv"
-                extension = "csv"
-            elif request.export_format == ExportFormat.EXCEL:
-                media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                extension = "xlsx"
-            elif request.export_format == ExportFormat.PDF:
-                media_type = "application/pdf"
-                extension = "pdf"
-
-            filename = f"collection_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
-
-            return StreamingResponse(
-                io.BytesIO(file_content),
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
-
-        # Return JSON
-        return report_data
-
+        return await report_file_response(db, current_user.tenant_id, request)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate collection report: {str(e)}")
 
@@ -428,206 +312,136 @@ async def generate_overdue_report(
 ):
     """
     Generate overdue items report with optional export
+
+    Identical requests are served from the report cache until the loans,
+    users, titles or fee policies change or the day rolls over.
     """
     try:
-        # Build query for overdue items
-        today = datetime.utcnow().date()
-        min_due_date = today - timedelta(days=request.min_days_overdue)
+        return await report_file_response(db, current_user.tenant_id, request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate overdue report: {str(e)}")
 
-        query = select(Loan).where(
-            and_(
-                Loan.tenant_id == current_user.tenant_id,
-                Loan.status == LoanStatus.CHECKED_OUT,
-                Loan.due_date < today,
-                Loan.due_date <= min_due_date
-            )
-        )
 
-        # Apply filters
-        if request.filters:
-            if request.filters.user_id:
-                query = query.where(Loan.user_id == request.filters.user_id)
+@router.post("/financial")
+async def generate_financial_report(
+    request: FinancialReportRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Generate financial/acquisitions report with optional export
 
-        # Add pagination
-        if request.filters:
-            query = query.offset(request.filters.offset).limit(request.filters.limit)
+    Identical requests are served from the report cache until the funds change.
+    """
+    try:
+        return await report_file_response(db, current_user.tenant_id, request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate financial report: {str(e)}")
 
-        # Execute query with joins
-        query = query.options(
-            joinedload(Loan.user),
-            joinedload(Loan.item).joinedload(Item.instance)
-        )
 
-        result = await db.execute(query)
-        overdue_loans = result.scalars().all()
-
-        # Convert to report data
-        data = []
-        total_fines = 0.0
-
-        for loan in overdue_loans:
-            days_overdue = (today - loan.due_date).days
-            fine_amount = days_overdue * 0.25 if request.include_fines else 0.0  # $0.25 per day
-            total_fines += fine_amount
-
-            data.append({
-                'loan_id': str(loan.id),
-                'user': loan.user.username if loan.user else 'Unknown',
-                'user_email': loan.user.email if loan.user else None,
-                'item_title': loan.item.instance.title if loan.item and loan.item.instance else 'Unknown',
-                'checkout_date': loan.checkout_date.isoformat() if loan.checkout_date else None,
-                'due_date': loan.due_date.isoformat() if loan.due_date else None,
-                'days_overdue': days_overdue,
-                'fine_amount': fine_amount if request.include_fines else None
-            })
-
-        # Calculate summary
-        summary = {
-            'total_overdue_items': len(data),
-            'total_fines': total_fines if request.include_fines else None,
-            'average_days_overdue': sum(item['days_overdue'] for item in data) / len(data) if data else 0
-        }
+# ============================================================================
+# REPORT JOBS
+# ============================================================================
 
-        # Create report
-        report_data = ReportData(
-            report_type=ReportType.OVERDUE,
-            title="Overdue Items Report",
-            description=f"Report of items overdue by at least {request.min_days_overdue} day(s)",
-            generated_at=datetime.utcnow(),
-            filters_applied=request.filters.model_dump() if request.filters else {},
-            total_records=len(data),
-            data=data,
-            summary=summary
+@router.post("/jobs", response_model=BackgroundJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_report_job(
+    job_data: ReportJobCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("reports.generate")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """
+    Queue a report for generation by a worker.
+
+    **Permissions Required:** reports.generate
+
+    If the same report was already produced from unchanged data, the job
+    completes immediately (200) and its artifact can be downloaded at once;
+    otherwise it is queued (202). Poll `GET /reports/jobs/{job_id}` and
+    download from `GET /reports/jobs/{job_id}/download`.
+    """
+    try:
+        request = parse_report_request(
+            job_data.report_type,
+            {**job_data.parameters, "export_format": job_data.export_format},
         )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    job, queued = await ReportService.create_job(db, uuid.UUID(tenant_id), current_user.id, request)
+
+    if queued:
+        generate_report_task.delay(str(job.id))
+        return job
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=jsonable_encoder(BackgroundJobResponse.model_validate(job)),
+    )
+
 
-        # Export if requested
-        if request.export_format != ExportFormat.JSON:
-            export_service = get_export_service()
-            file_content = export_service.export_report(report_data, request.export_format)
-
-            # Determine content type and filename
-            if request.export_format == ExportFormat.CSV:
-                media_type = "text/csv"
-                extension = "csv"
-            elif request.export_format == ExportFormat.EXCEL:
-                media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                extension = "xlsx"
-            elif request.export_format == ExportFormat.PDF:
-                media_type = "application/pdf"
-                extension = "pdf"
-
-            filename = f"overdue_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
-
-            return StreamingResponse(
-                io.BytesIO(file_content),
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
+async def get_report_job_or_404(db: AsyncSession, job_id: uuid.UUID, tenant_id: str) -> BackgroundJob:
+    """Get a tenant's report job or raise 404."""
+    result = await db.execute(
+        select(BackgroundJob).where(
+            and_(
+                BackgroundJob.id == job_id,
+                BackgroundJob.job_type == REPORT_JOB,
+                BackgroundJob.tenant_id == uuid.UUID(tenant_id)
             )
+        )
+    )
+    job = result.scalar_one_or_none()
 
-        # Return JSON
-        return report_data
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate overdue report: {str(e)}")
+    return job
 
 
-@router.post("/financial")
-async def generate_financial_report(
-    request: FinancialReportRequest,
+@router.get("/jobs/{job_id}", response_model=BackgroundJobResponse)
+async def get_report_job(
+    job_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_permission("reports.view")),
+    tenant_id: str = Depends(get_current_tenant),
 ):
     """
-    Generate financial/acquisitions report with optional export
+    Get the status of a report job.
+
+    **Permissions Required:** reports.view
     """
-    try:
-        if not FUND_MODEL_AVAILABLE or not Fund:
-            raise HTTPException(
-                status_code=503,
-                detail="Financial reports not available - Fund model not configured"
-            )
+    return await get_report_job_or_404(db, job_id, tenant_id)
 
-        # Query funds data
-        funds_query = select(Fund).where(Fund.tenant_id == current_user.tenant_id)
-        funds_result = await db.execute(funds_query)
-        funds = funds_result.scalars().all()
 
-        # Convert funds to report data
-        data = []
-        total_allocated = 0.0
-        total_expended = 0.0
-        total_available = 0.0
-
-        for fund in funds:
-            allocated = float(fund.allocated_amount or 0)
-            # Fund model doesn't have expended_amount yet - using 0
-            expended = 0.0
-            available = allocated - expended
-
-            total_allocated += allocated
-            total_expended += expended
-            total_available += available
-
-            data.append({
-                'fund_id': str(fund.id),
-                'fund_name': fund.name,
-                'fund_code': fund.code,
-                'status': getattr(fund, 'fund_status', 'active'),
-                'allocated_amount': allocated,
-                'expended_amount': expended,
-                'available_amount': available,
-                'description': fund.description
-            })
-
-        # Calculate summary
-        summary = {
-            'total_allocated': total_allocated,
-            'total_expended': total_expended,
-            'total_available': total_available,
-            'expenditure_rate': (total_expended / total_allocated * 100) if total_allocated > 0 else 0
-        }
+@router.get("/jobs/{job_id}/download")
+async def download_report_job(
+    job_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("reports.view")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """
+    Download the artifact of a completed report job.
 
-        # Create report
-        report_data = ReportData(
-            report_type=ReportType.FINANCIAL,
-            title="Financial Report",
-            description="Report of fund allocation and expenditures",
-            generated_at=datetime.utcnow(),
-            filters_applied=request.filters.model_dump() if request.filters else {},
-            total_records=len(data),
-            data=data,
-            summary=summary
-        )
+    **Permissions Required:** reports.view
 
-        # Export if requested
-        if request.export_format != ExportFormat.JSON:
-            export_service = get_export_service()
-            file_content = export_service.export_report(report_data, request.export_format)
-
-            # Determine content type and filename
-            if request.export_format == ExportFormat.CSV:
-                media_type = "text/csv"
-                extension = "csv"
-            elif request.export_format == ExportFormat.EXCEL:
-                media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                extension = "xlsx"
-            elif request.export_format == ExportFormat.PDF:
-                media_type = "application/pdf"
-                extension = "pdf"
-
-            filename = f"financial_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
-
-            return StreamingResponse(
-                io.BytesIO(file_content),
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
+    Artifacts are purged after REPORT_ARTIFACT_MAX_AGE_DAYS (410).
+    """
+    job = await get_report_job_or_404(db, job_id, tenant_id)
 
-        # Return JSON
-        return report_data
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail="Report is not available")
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate financial report: {str(e)}")
+    path = get_report_artifact_store().get(job.result["artifact"], job.result["extension"])
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Report has expired")
+
+    return FileResponse(path, media_type=job.result["media_type"], filename=job.result["filename"])
 
 
 # ============================================================================
@@ -651,28 +465,28 @@ async def list_report_templates(
             "name": "Circulation Report",
             "description": "Report on checkouts, check-ins, and renewals",
             "parameters": ["date_range", "user_group", "location"],
-            "export_formats": ["json", "csv", "excel", "pdf"]
+            "export_formats": ["json", "csv", "excel", "pdf", "parquet", "arrow"]
         },
         {
             "id": "collection",
             "name": "Collection Statistics",
             "description": "Inventory statistics by type, location, and status",
             "parameters": ["instance_type", "location", "status"],
-            "export_formats": ["json", "csv", "excel", "pdf"]
+            "export_formats": ["json", "csv", "excel", "pdf", "parquet", "arrow"]
         },
         {
             "id": "overdue",
             "name": "Overdue Items Report",
             "description": "List of overdue items with patron information",
             "parameters": ["min_days_overdue", "include_fines"],
-            "export_formats": ["json", "csv", "excel", "pdf"]
+            "export_formats": ["json", "csv", "excel", "pdf", "parquet", "arrow"]
         },
         {
             "id": "financial",
             "name": "Financial Report",
             "description": "Revenue and expenses for acquisitions and fees",
             "parameters": ["date_range", "fund_id", "vendor_id"],
-            "export_formats": ["json", "csv", "excel", "pdf"]
+            "export_formats": ["json", "csv", "excel", "pdf", "parquet", "arrow"]
         },
         {
             "id": "user_activity",
@@ -718,10 +532,31 @@ class ReportScheduleResponse(BaseModel):
     enabled: bool
     last_run: Optional[datetime]
     next_run: Optional[datetime]
-    created_by: str
+    last_job_id: Optional[UUID]
+    created_by: Optional[UUID]
     created_date: datetime
 
 
+def schedule_response(schedule: ReportSchedule) -> ReportScheduleResponse:
+    """Response of a stored report schedule."""
+    return ReportScheduleResponse(
+        id=schedule.id,
+        template_id=schedule.report_type,
+        name=schedule.name,
+        description=schedule.description,
+        schedule=schedule.schedule,
+        parameters=schedule.parameters,
+        export_format=schedule.export_format,
+        recipients=schedule.recipients,
+        enabled=schedule.enabled,
+        last_run=schedule.last_run_at,
+        next_run=schedule.next_run_at,
+        last_job_id=schedule.last_job_id,
+        created_by=schedule.created_by_user_id,
+        created_date=schedule.created_date,
+    )
+
+
 @router.post("/schedule", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def schedule_report(
     schedule_data: ReportScheduleCreate,
@@ -732,44 +567,58 @@ async def schedule_report(
     """
     Schedule a report to run periodically (BUG-010 FIX).
 
-    Creates a scheduled job to generate and email reports automatically.
+    Due reports are produced by a worker during the off-peak window
+    (REPORT_OFF_PEAK_HOURS) and kept in the report cache.
     """
     # Validate cron expression
     try:
-        from croniter import croniter
-        from datetime import datetime as dt
-
-        if not croniter.is_valid(schedule_data.schedule):
-            raise ValueError("Invalid cron expression")
-
-        # Calculate next run time
-        cron = croniter(schedule_data.schedule, dt.now())
-        next_run = cron.get_next(datetime)
-
+        next_run = next_run_after(schedule_data.schedule, datetime.now(timezone.utc))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid schedule format: {str(e)}. Expected cron expression (e.g., '0 9 * * 1' for Monday 9 AM)"
         )
 
-    # Validate template ID
-    valid_templates = ["circulation", "collection", "overdue", "financial", "user_activity", "acquisitions"]
+    # Validate template ID and parameters
+    valid_templates = [report_type.value for report_type in REPORTS]
     if schedule_data.template_id not in valid_templates:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid template_id. Must be one of: {', '.join(valid_templates)}"
         )
 
-    # Create schedule record (simplified - would need actual scheduled_reports table)
-    schedule_id = uuid.uuid4()
+    try:
+        request = parse_report_request(
+            ReportType(schedule_data.template_id),
+            {**schedule_data.parameters, "export_format": schedule_data.export_format},
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    schedule = ReportSchedule(
+        id=uuid.uuid4(),
+        name=schedule_data.name,
+        description=schedule_data.description,
+        report_type=schedule_data.template_id,
+        parameters=normalized_parameters(request),
+        export_format=schedule_data.export_format.value,
+        recipients=schedule_data.recipients,
+        schedule=schedule_data.schedule,
+        enabled=schedule_data.enabled,
+        next_run_at=next_run,
+        tenant_id=UUID(tenant_id),
+        created_by_user_id=current_user.id,
+    )
+    db.add(schedule)
+    await db.commit()
 
     # Log audit
     from app.services.audit_service import AuditService
     await AuditService.log_action(
         db=db,
         actor=current_user.id,
-        action="SCHEDULE_REPORT",
-        target=str(schedule_id),
+        action=AuditAction.CREATE,
+        target=str(schedule.id),
         resource_type="report_schedule",
         details={
             "template_id": schedule_data.template_id,
@@ -781,7 +630,7 @@ async def schedule_report(
 
     return {
         "message": "Report scheduled successfully",
-        "schedule_id": str(schedule_id),
+        "schedule_id": str(schedule.id),
         "template_id": schedule_data.template_id,
         "name": schedule_data.name,
         "schedule": schedule_data.schedule,
@@ -789,3 +638,51 @@ async def schedule_report(
         "enabled": schedule_data.enabled,
         "recipients": schedule_data.recipients
     }
+
+
+@router.get("/schedules", response_model=List[ReportScheduleResponse])
+async def list_report_schedules(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("reports.view")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """
+    List the tenant's report schedules.
+
+    **Permissions Required:** reports.view
+    """
+    result = await db.execute(
+        select(ReportSchedule)
+        .where(ReportSchedule.tenant_id == UUID(tenant_id))
+        .order_by(ReportSchedule.name)
+    )
+    return [schedule_response(schedule) for schedule in result.scalars().all()]
+
+
+@router.delete("/schedules/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_report_schedule(
+    schedule_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("reports.generate")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """
+    Delete a report schedule.
+
+    **Permissions Required:** reports.generate
+    """
+    result = await db.execute(
+        select(ReportSchedule).where(
+            and_(
+                ReportSchedule.id == schedule_id,
+                ReportSchedule.tenant_id == UUID(tenant_id)
+            )
+        )
+    )
+    schedule = result.scalar_one_or_none()
+
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Report schedule not found")
+
+    await db.delete(schedule)
+    await db.commit()
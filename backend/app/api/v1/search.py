@@ -10,7 +10,7 @@ from uuid import UUID
 
 from app.core.deps import get_current_user, get_current_tenant
 from app.models.user import User
-from app.services.elasticsearch_service import get_elasticsearch_service
+from app.services.elasticsearch_service import get_elasticsearch_service, instance_to_dict
 
 
 router = APIRouter()
@@ -229,34 +229,7 @@ async def reindex_all_instances(
         instances = result.scalars().all()
 
         # Convert to dict
-        instances_data = []
-        for instance in instances:
-            instance_dict = {
-                "id": instance.id,
-                "title": instance.title,
-                "subtitle": instance.subtitle,
-                "index_title": instance.index_title,
-                "series": instance.series,
-                "edition": instance.edition,
-                "publication": instance.publication,
-                "publication_period": instance.publication_period,
-                "contributors": instance.contributors,
-                "subjects": instance.subjects,
-                "classifications": instance.classifications,
-                "languages": instance.languages,
-                "instance_type_id": instance.instance_type_id,
-                "instance_format_ids": instance.instance_format_ids,
-                "identifiers": instance.identifiers,
-                "cataloged_date": instance.cataloged_date,
-                "staff_suppress": instance.staff_suppress,
-                "discovery_suppress": instance.discovery_suppress,
-                "source": instance.source,
-                "tags": instance.tags,
-                "tenant_id": instance.tenant_id,
-                "created_date": instance.created_date,
-                "updated_date": instance.updated_date
-            }
-            instances_data.append(instance_dict)
+        instances_data = [instance_to_dict(instance) for instance in instances]
 
         # Bulk index
         result = await es_service.bulk_index_instances(instances_data)
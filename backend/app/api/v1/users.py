@@ -3,28 +3,98 @@ Users API endpoints.
 Complete CRUD operations, search, and filtering for users, patron groups, and departments.
 """
 
-from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Dict, Optional, List, Sequence
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_, func, and_
 from uuid import UUID
 
 from app.db.session import get_db
 from app.models.user import User, PatronGroup, Department, Address, UserType
+from app.models.permission import Role, user_roles
 from app.schemas.user import (
-    UserCreate, UserUpdate, UserResponse, UserListItem,
+    UserCreate, UserUpdate, UserResponse, UserListItem, PersonalInfo, RoleSummary,
     PatronGroupCreate, PatronGroupUpdate, PatronGroupResponse,
     DepartmentCreate, DepartmentUpdate, DepartmentResponse,
-    BulkUserCreate, PasswordChange
+    BulkUserCreate, PasswordChange, PatronAccountSummaryResponse
 )
 from app.schemas.common import PaginatedResponse, BulkOperationResponse, ErrorResponse
+from app.schemas.job import BackgroundJobResponse
+from app.models.job import BackgroundJob
 from app.core.deps import get_current_user, get_current_tenant, require_permission
-from app.core.security import get_password_hash, verify_password, validate_password_strength
+from app.core.security import validate_password_strength
 from app.utils.pagination import paginate
 from app.services.audit_service import AuditService
+from app.services.password_hashing_service import get_password_hashing_service
+from app.services.circulation_rules_service import get_circulation_rules_engine
+from app.services.patron_account_service import PatronAccountService
+from app.services.user_search_service import UserSearchService
+from app.services.user_import_service import (
+    JOB_TYPE as USER_IMPORT_JOB, detect_format, get_user_import_service
+)
+from app.tasks.user_import_tasks import import_users
 
 router = APIRouter()
 
+# Columns rendered by UserListItem; list views never load User entities
+USER_LIST_COLUMNS = (
+    User.id,
+    User.username,
+    User.email,
+    User.barcode,
+    User.active,
+    User.user_type,
+    User.personal,
+    User.patron_group_id,
+    PatronGroup.group_name.label("patron_group_name"),
+    User.created_date,
+)
+
+
+async def load_role_summaries(db: AsyncSession, user_ids: Sequence[UUID]) -> Dict[UUID, List[RoleSummary]]:
+    """Role names of several users in one query (permissions are not loaded)."""
+    if not user_ids:
+        return {}
+
+    result = await db.execute(
+        select(user_roles.c.user_id, Role.id, Role.name, Role.display_name)
+        .join(Role, Role.id == user_roles.c.role_id)
+        .where(user_roles.c.user_id.in_(user_ids))
+        .order_by(Role.display_name)
+    )
+    roles: Dict[UUID, List[RoleSummary]] = {}
+    for user_id, role_id, name, display_name in result.all():
+        roles.setdefault(user_id, []).append(
+            RoleSummary.model_construct(id=role_id, name=name, display_name=display_name)
+        )
+    return roles
+
+
+def build_user_list_items(rows, roles: Dict[UUID, List[RoleSummary]]) -> List[UserListItem]:
+    """
+    Build list items from USER_LIST_COLUMNS rows.
+
+    The values come straight from typed columns, so the items are
+    constructed without validation; the response model still validates
+    them once on the way out.
+    """
+    return [
+        UserListItem.model_construct(
+            id=row.id,
+            username=row.username,
+            email=row.email,
+            barcode=row.barcode,
+            active=row.active,
+            user_type=row.user_type.value if isinstance(row.user_type, UserType) else row.user_type,
+            personal=PersonalInfo.model_construct(**(row.personal or {})),
+            patron_group_id=row.patron_group_id,
+            patron_group_name=row.patron_group_name,
+            roles=roles.get(row.id, []),
+            created_date=row.created_date,
+        )
+        for row in rows
+    ]
+
 
 # ============================================================================
 # USER ENDPOINTS
@@ -45,26 +115,20 @@ async def list_users(
     """
     List users with pagination, search, and filtering.
 
-    - **search**: Search by username, email, or name (firstName/lastName in personal)
+    - **search**: Search by username, email, barcode or name (firstName/lastName in personal);
+      an exact barcode, username or email match short-circuits the text search
     - **active**: Filter by active status
     - **user_type**: Filter by user type (staff, patron, etc.)
     - **patron_group_id**: Filter by patron group
     """
-    query = select(User).where(User.tenant_id == UUID(tenant_id))
+    # Project only the listed columns plus the patron group name
+    query = (
+        select(*USER_LIST_COLUMNS)
+        .outerjoin(PatronGroup, PatronGroup.id == User.patron_group_id)
+        .where(User.tenant_id == UUID(tenant_id))
+    )
 
     # Apply filters
-    if search:
-        search_term = f"%{search}%"
-        query = query.where(
-            or_(
-                User.username.ilike(search_term),
-                User.email.ilike(search_term),
-                User.barcode.ilike(search_term),
-                func.jsonb_extract_path_text(User.personal, 'firstName').ilike(search_term),
-                func.jsonb_extract_path_text(User.personal, 'lastName').ilike(search_term),
-            )
-        )
-
     if active is not None:
         query = query.where(User.active == active)
 
@@ -74,27 +138,20 @@ async def list_users(
     if patron_group_id:
         query = query.where(User.patron_group_id == patron_group_id)
 
-    # Eager load relationships to avoid lazy loading errors
-    from sqlalchemy.orm import selectinload
-    from app.models.permission import Role
-    query = query.options(
-        selectinload(User.patron_group),
-        selectinload(User.roles).selectinload(Role.permissions)
-    )
+    # Search last, so the exact match probe sees the other filters;
+    # ranked results are ordered by relevance before creation date
+    if search:
+        query = await UserSearchService.apply(db, query, search)
+
     query = query.order_by(User.created_date.desc())
 
     # Paginate
-    result = await paginate(db, query, page, page_size)
+    result = await paginate(db, query, page, page_size, scalars=False)
 
-    # Transform to include patron group name
-    users = []
-    for user in result.data:
-        user_dict = UserListItem.model_validate(user).model_dump()
-        if user.patron_group:
-            user_dict['patron_group_name'] = user.patron_group.group_name
-        users.append(UserListItem(**user_dict))
+    # Role names of the page in one query
+    roles = await load_role_summaries(db, [row.id for row in result.data])
 
-    return PaginatedResponse(data=users, meta=result.meta)
+    return PaginatedResponse(data=build_user_list_items(result.data, roles), meta=result.meta)
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -169,7 +226,7 @@ async def create_user(
 
     # Create user
     user_dict = user_data.model_dump(exclude={'password', 'addresses', 'role_ids'})
-    user_dict['hashed_password'] = get_password_hash(user_data.password)
+    user_dict['hashed_password'] = await get_password_hashing_service().hash(user_data.password)
     user_dict['tenant_id'] = UUID(tenant_id)
     user_dict['created_by_user_id'] = current_user.id
 
@@ -255,6 +312,34 @@ async def get_user(
     return UserResponse(**user_dict)
 
 
+@router.get("/{user_id}/account-summary", response_model=PatronAccountSummaryResponse)
+async def get_user_account_summary(
+    user_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("users.read")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """Get a patron's open loans, overdue loans, open requests and fee totals."""
+    user_exists = await db.scalar(
+        select(User.id).where(
+            and_(
+                User.id == user_id,
+                User.tenant_id == UUID(tenant_id)
+            )
+        )
+    )
+    if not user_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    summary = await PatronAccountService.get(db, user_id)
+    await db.commit()
+
+    return summary
+
+
 @router.put("/{user_id}", response_model=UserResponse)
 async def update_user(
     user_id: UUID,
@@ -331,7 +416,7 @@ async def update_user(
     if user_data.password:
         # Validate password strength (BUG-008)
         validate_password_strength(user_data.password)
-        update_data['hashed_password'] = get_password_hash(user_data.password)
+        update_data['hashed_password'] = await get_password_hashing_service().hash(user_data.password)
 
     # Update roles if provided
     if user_data.role_ids is not None:
@@ -435,8 +520,26 @@ async def bulk_create_users(
     failure_count = 0
     errors = []
 
+    # Validate every user first so passwords can be hashed in one parallel batch
+    accepted = []
+    seen = {"username": set(), "email": set(), "barcode": set()}
     for idx, user_data in enumerate(bulk_data.users):
         try:
+            # Duplicates within the payload (none of them is flushed yet)
+            keys = {"username": user_data.username, "email": user_data.email.lower(), "barcode": user_data.barcode}
+            repeated = next(
+                (field for field, value in keys.items() if value is not None and value in seen[field]),
+                None,
+            )
+            if repeated:
+                errors.append(ErrorResponse(
+                    code="DUPLICATE_USER",
+                    message=f"User at index {idx} repeats a {repeated} earlier in the request",
+                    details={repeated: keys[repeated]}
+                ))
+                failure_count += 1
+                continue
+
             # Check if user exists
             existing = await db.execute(
                 select(User).where(
@@ -462,9 +565,28 @@ async def bulk_create_users(
             # Validate password strength (BUG-008)
             validate_password_strength(user_data.password)
 
+            for field, value in keys.items():
+                if value is not None:
+                    seen[field].add(value)
+            accepted.append((idx, user_data))
+
+        except Exception as e:
+            errors.append(ErrorResponse(
+                code="CREATION_ERROR",
+                message=f"Failed to create user at index {idx}",
+                details={"error": str(e)}
+            ))
+            failure_count += 1
+
+    hashed_passwords = await get_password_hashing_service().hash_many(
+        [user_data.password for _, user_data in accepted]
+    )
+
+    for (idx, user_data), hashed_password in zip(accepted, hashed_passwords):
+        try:
             # Create user
             user_dict = user_data.model_dump(exclude={'password', 'addresses'})
-            user_dict['hashed_password'] = get_password_hash(user_data.password)
+            user_dict['hashed_password'] = hashed_password
             user_dict['tenant_id'] = UUID(tenant_id)
             user_dict['created_by_user_id'] = current_user.id
 
@@ -495,6 +617,83 @@ async def bulk_create_users(
     )
 
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+@router.post("/imports", response_model=BackgroundJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def import_users_file(
+    file: UploadFile = File(..., description="CSV (with header row) or NDJSON file of users"),
+    on_existing: str = Query("skip", pattern="^(skip|update)$", description="Skip or update users whose username exists"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("users.create")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """
+    Import users from a file in the background.
+
+    The file is stored and imported by a worker in batches; poll
+    `GET /users/imports/{job_id}` for progress and per-row errors.
+    """
+    fmt = detect_format(file.filename, file.content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported file type, expected .csv or .ndjson"
+        )
+
+    async def chunks():
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+    try:
+        job = await get_user_import_service().create_job(
+            db,
+            tenant_id=UUID(tenant_id),
+            created_by=current_user.id,
+            filename=file.filename,
+            fmt=fmt,
+            on_existing=on_existing,
+            chunks=chunks(),
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+
+    import_users.delay(str(job.id))
+
+    return job
+
+
+@router.get("/imports/{job_id}", response_model=BackgroundJobResponse)
+async def get_user_import(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("users.create")),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    """Get the progress and row errors of a user import."""
+    result = await db.execute(
+        select(BackgroundJob).where(
+            and_(
+                BackgroundJob.id == job_id,
+                BackgroundJob.job_type == USER_IMPORT_JOB,
+                BackgroundJob.tenant_id == UUID(tenant_id)
+            )
+        )
+    )
+    job = result.scalar_one_or_none()
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+
+    return job
+
+
 @router.post("/{user_id}/change-password", status_code=status.HTTP_204_NO_CONTENT)
 async def change_password(
     user_id: UUID,
@@ -521,7 +720,8 @@ async def change_password(
         )
 
     # Verify old password
-    if not verify_password(password_data.old_password, user.hashed_password):
+    hashing_service = get_password_hashing_service()
+    if not await hashing_service.verify(password_data.old_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect password"
@@ -531,7 +731,7 @@ async def change_password(
     validate_password_strength(password_data.new_password)
 
     # Update password
-    user.hashed_password = get_password_hash(password_data.new_password)
+    user.hashed_password = await hashing_service.hash(password_data.new_password)
     user.updated_by_user_id = current_user.id
 
     await db.commit()
@@ -604,6 +804,7 @@ async def create_patron_group(
     db.add(group)
     await db.commit()
     await db.refresh(group)
+    get_circulation_rules_engine().invalidate(tenant_id)
 
     return PatronGroupResponse.model_validate(group)
 
@@ -640,6 +841,7 @@ async def update_patron_group(
 
     await db.commit()
     await db.refresh(group)
+    get_circulation_rules_engine().invalidate(tenant_id)
 
     return PatronGroupResponse.model_validate(group)
 
@@ -680,6 +882,7 @@ async def delete_patron_group(
 
     await db.delete(group)
     await db.commit()
+    get_circulation_rules_engine().invalidate(tenant_id)
 
 
 # ============================================================================
@@ -15,6 +15,12 @@ celery_app = Celery(
     include=[
         'app.tasks.email_tasks',
         'app.tasks.notification_tasks',
+        'app.tasks.search_tasks',
+        'app.tasks.fine_tasks',
+        'app.tasks.patron_tasks',
+        'app.tasks.user_import_tasks',
+        'app.tasks.audit_tasks',
+        'app.tasks.report_tasks',
     ]
 )
 
@@ -34,6 +40,36 @@ celery_app.conf.update(
 
 # Periodic tasks schedule
 celery_app.conf.beat_schedule = {
+    # Accrue overdue fines nightly, after the UTC day boundary
+    'accrue-overdue-fines': {
+        'task': 'app.tasks.fine_tasks.accrue_overdue_fines',
+        'schedule': crontab(hour=0, minute=15),
+    },
+    # Verify patron account summaries nightly, after fine accrual
+    'rebuild-patron-account-summaries': {
+        'task': 'app.tasks.patron_tasks.rebuild_patron_account_summaries',
+        'schedule': crontab(hour=0, minute=45),
+    },
+    # Recount overdue loans in patron account summaries hourly
+    'refresh-overdue-counts': {
+        'task': 'app.tasks.patron_tasks.refresh_overdue_counts',
+        'schedule': crontab(minute=5),
+    },
+    # Fold recent circulation into the daily statistics rollup
+    'refresh-circulation-rollups': {
+        'task': 'app.tasks.report_tasks.refresh_circulation_rollups',
+        'schedule': crontab(minute='*/15'),
+    },
+    # Create upcoming audit log partitions and archive expired ones daily
+    'maintain-audit-log-partitions': {
+        'task': 'app.tasks.audit_tasks.maintain_audit_log_partitions',
+        'schedule': crontab(hour=1, minute=30),
+    },
+    # Produce scheduled reports and purge old artifacts during off-peak hours
+    'run-report-schedules': {
+        'task': 'app.tasks.report_tasks.run_report_schedules',
+        'schedule': crontab(minute='*/15', hour=settings.REPORT_OFF_PEAK_HOURS),
+    },
     # Send overdue notifications daily at 9 AM
     'send-overdue-notifications': {
         'task': 'app.tasks.notification_tasks.send_overdue_notifications',
@@ -44,6 +80,21 @@ celery_app.conf.beat_schedule = {
         'task': 'app.tasks.notification_tasks.send_hold_available_notifications',
         'schedule': crontab(minute=0, hour='*/4'),
     },
+    # Emit notification digests whose coalescing window has elapsed
+    'flush-notification-digests': {
+        'task': 'app.tasks.notification_tasks.flush_notification_digests',
+        'schedule': crontab(minute='*'),
+    },
+    # Recount cached unread notification counters
+    'reconcile-unread-counters': {
+        'task': 'app.tasks.notification_tasks.reconcile_unread_counters',
+        'schedule': crontab(minute='*/15'),
+    },
+    # Apply queued instance changes to the search index
+    'drain-search-outbox': {
+        'task': 'app.tasks.search_tasks.drain_search_outbox',
+        'schedule': crontab(minute='*'),
+    },
     # Clean up old notifications weekly on Sunday at midnight
     'cleanup-old-notifications': {
         'task': 'app.tasks.notification_tasks.cleanup_old_notifications',
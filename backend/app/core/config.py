@@ -54,6 +54,11 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Password hashing worker pool ("thread" or "process"; 0 workers = CPU count)
+    PASSWORD_HASHING_EXECUTOR: str = "thread"
+    PASSWORD_HASHING_MAX_WORKERS: int = 0
+    PASSWORD_HASHING_MAX_QUEUE: int = 64
+
     # SMTP/Email Configuration
     SMTP_HOST: str = "smtp.gmail.com"
     SMTP_PORT: int = 587
@@ -64,6 +69,59 @@ class Settings(BaseSettings):
     SMTP_USE_TLS: bool = True
     SMTP_USE_SSL: bool = False
 
+    # Notification digesting (coalesce bursts per user and type)
+    NOTIFICATION_DIGEST_ENABLED: bool = True
+    NOTIFICATION_DIGEST_WINDOW_SECONDS: int = 300
+    NOTIFICATION_DIGEST_MAX_BUFFERED: int = 10000
+    NOTIFICATION_UNREAD_COUNT_TTL_SECONDS: int = 86400
+
+    # WebSocket fan-out across server processes
+    WEBSOCKET_REDIS_MANAGER_ENABLED: bool = True
+    WEBSOCKET_REDIS_CHANNEL: str = "socketio"
+
+    # Fines
+    DEFAULT_OVERDUE_FINE_PER_DAY: float = 0.50  # Used when a tenant has no active overdue FeePolicy
+    FEE_POLICY_CACHE_TTL_SECONDS: int = 300
+    FINE_ACCRUAL_BATCH_SIZE: int = 1000
+
+    # Circulation rules
+    CIRCULATION_RULES_CACHE_TTL_SECONDS: int = 300
+
+    # Circulation statistics rollup (re-scan window covering transactions open at the last run)
+    CIRCULATION_ROLLUP_OVERLAP_MINUTES: int = 10
+
+    # Bulk user import (upload dir must be shared by API and Celery workers)
+    USER_IMPORT_DIR: str = "storage/imports"
+    USER_IMPORT_MAX_UPLOAD_SIZE: int = 209715200  # 200MB
+    USER_IMPORT_BATCH_SIZE: int = 1000
+    USER_IMPORT_MAX_ERRORS: int = 1000
+    USER_IMPORT_HASHING_EXECUTOR: str = "process"
+    USER_IMPORT_HASHING_WORKERS: int = 0
+
+    # Audit log partitions (monthly; archives must be on persistent storage)
+    AUDIT_LOG_PARTITIONS_AHEAD: int = 3
+    AUDIT_LOG_RETENTION_MONTHS: int = 24  # 0 keeps every partition
+    AUDIT_LOG_ARCHIVE_DIR: str = "storage/audit-archive"
+    AUDIT_LOG_EXACT_COUNT_LIMIT: int = 10000  # Larger totals are planner estimates
+
+    # Audit log exports (export dir must be shared by API and Celery workers)
+    AUDIT_EXPORT_DIR: str = "storage/exports/audit"
+    AUDIT_EXPORT_FETCH_SIZE: int = 2000  # Rows per server-side cursor fetch
+    AUDIT_EXPORT_CHUNK_SIZE: int = 65536  # Bytes of CSV per streamed chunk
+    AUDIT_EXPORT_RETENTION_HOURS: int = 48
+
+    # Reports (artifact dir must be shared by API and Celery workers)
+    DASHBOARD_STATS_CACHE_TTL_SECONDS: int = 300
+    REPORT_ARTIFACT_DIR: str = "storage/reports"
+    REPORT_ARTIFACT_MAX_AGE_DAYS: int = 7
+    REPORT_OFF_PEAK_HOURS: str = "1-5"  # UTC hours (crontab syntax) scheduled reports run in
+    REPORT_SCHEDULE_LOOKAHEAD_HOURS: int = 24  # Produce scheduled reports due within this window
+    REPORT_EXPORT_FETCH_SIZE: int = 2000  # Rows per cursor fetch when streaming a report
+    REPORT_EXPORT_ROW_GROUP_SIZE: int = 50000  # Rows per Parquet row group / Arrow record batch
+    REPORT_EXPORT_WORKERS: int = 0  # Export render processes; 0 = one per CPU
+    REPORT_EXPORT_MAX_QUEUE: int = 16  # Renders waiting beyond this are rejected with 503
+    REPORT_EMAIL_MAX_ATTACHMENT_MB: int = 10  # Larger scheduled reports are emailed without the file
+
     # CORS
     BACKEND_CORS_ORIGINS: Annotated[List[str], BeforeValidator(parse_cors)] = ["http://localhost:3000"]
 
@@ -2,11 +2,15 @@
 Database session management.
 """
 
-from typing import AsyncGenerator
+import asyncio
+from typing import AsyncGenerator, Awaitable, TypeVar
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.db.base import Base
 from app.core.config import settings
 
+T = TypeVar("T")
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
@@ -47,9 +51,16 @@ async def init_db():
             circulation, acquisition, course, audit
         )
 
+        # Extensions used by indexes (trigram user search)
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
         # Create tables
         await conn.run_sync(Base.metadata.create_all)
 
+        # Partitions of the current and next months of audit logs
+        from app.services.audit_partition_service import AuditPartitionService
+        await AuditPartitionService.ensure_partitions(conn)
+
 
 def get_session():
     """Get a database session for use in Celery tasks."""
@@ -59,3 +70,23 @@ def get_session():
 async def close_db():
     """Close database connections."""
     await engine.dispose()
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine from a synchronous Celery task.
+
+    Each call gets its own event loop, so pooled connections bound to that
+    loop are disposed before it closes.
+    """
+    async def _runner():
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(_runner())
+    finally:
+        loop.close()
@@ -54,8 +54,31 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"Warning: WebSocket initialization failed: {e}")
 
+    # Start notification digest flushing
+    if settings.NOTIFICATION_DIGEST_ENABLED:
+        from app.services.notification_digest import get_notification_digest_service
+        get_notification_digest_service().start()
+        print("Notification digest service started!")
+
     yield
     # Shutdown
+    if settings.NOTIFICATION_DIGEST_ENABLED:
+        from app.services.notification_digest import get_notification_digest_service
+        digest_service = get_notification_digest_service()
+        try:
+            await digest_service.stop()
+        finally:
+            await digest_service.close()
+
+    from app.services.notification_counter_service import get_notification_counter_service
+    await get_notification_counter_service().close()
+
+    from app.services.password_hashing_service import get_password_hashing_service
+    get_password_hashing_service().shutdown()
+
+    from app.services.export_executor import get_export_executor
+    get_export_executor().shutdown()
+
     await close_db()
     await close_elasticsearch()
 
@@ -117,6 +140,17 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/executors", tags=["Health"])
+async def executor_health():
+    """Worker pool metrics (in-flight calls, queue depth, rejections)."""
+    from app.services.export_executor import get_export_executor
+    from app.services.password_hashing_service import get_password_hashing_service
+    return {
+        "password_hashing": get_password_hashing_service().metrics(),
+        "export": get_export_executor().metrics(),
+    }
+
+
 @app.get("/favicon.ico", include_in_schema=False)
 async def favicon():
     """Return a simple SVG favicon."""
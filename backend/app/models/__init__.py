@@ -12,6 +12,9 @@ from app.models import (
     fee,
     audit,
     notification,
+    job,
+    patron_account,
+    report,
 )
 
 __all__ = [
@@ -26,4 +29,7 @@ __all__ = [
     "fee",
     "audit",
     "notification",
+    "job",
+    "patron_account",
+    "report",
 ]
@@ -4,7 +4,7 @@ Based on FOLIO mod-orders schema.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey, JSON, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey, JSON, Boolean, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -104,6 +104,10 @@ class Vendor(Base, TimestampMixin, TenantMixin):
 class Fund(Base, TimestampMixin, TenantMixin):
     """Fund model for budget management."""
     __tablename__ = "funds"
+    __table_args__ = (
+        # Report cache watermarks read the latest change of a tenant
+        Index("ix_funds_tenant_updated_date", "tenant_id", "updated_date"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     code = Column(String(50), unique=True, nullable=False, index=True)
@@ -3,7 +3,7 @@ Audit log model for tracking all system actions.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, JSON, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, JSON, Enum as SQLEnum, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 import enum
@@ -30,21 +30,25 @@ class AuditStatus(str, enum.Enum):
 class AuditLog(Base):
     """
     Audit log model for comprehensive activity tracking.
+
+    Append-only and range-partitioned by month on timestamp; partitions are
+    created ahead of time and archived by AuditPartitionService.
     """
     __tablename__ = "audit_logs"
 
+    # The partition key has to be part of the primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     # When
-    timestamp = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False, index=True)
+    timestamp = Column(DateTime(timezone=True), primary_key=True, default=datetime.utcnow, nullable=False)
 
     # Who
-    actor = Column(UUID(as_uuid=True), index=True)  # User ID
+    actor = Column(UUID(as_uuid=True))  # User ID
 
     # What
-    action = Column(SQLEnum(AuditAction), nullable=False, index=True)
+    action = Column(SQLEnum(AuditAction), nullable=False)
     target = Column(String(500))  # Resource path, e.g., "instances/123"
-    resource_type = Column(String(100), index=True)  # e.g., "instance", "user"
+    resource_type = Column(String(100))  # e.g., "instance", "user"
 
     # Details
     details = Column(JSON, default=dict)  # Additional metadata
@@ -53,11 +57,19 @@ class AuditLog(Base):
     status = Column(SQLEnum(AuditStatus), default=AuditStatus.SUCCESS, nullable=False)
 
     # Tenant
-    tenant_id = Column(UUID(as_uuid=True), index=True)
+    tenant_id = Column(UUID(as_uuid=True))
 
     # Request metadata
     ip_address = Column(String(50))
     user_agent = Column(String(500))
 
+    # Two indexes to maintain per insert: reads are per tenant, newest first,
+    # and time-range scans use the small BRIN index (rows arrive in time order)
+    __table_args__ = (
+        Index('ix_audit_logs_tenant_timestamp', tenant_id, timestamp.desc()),
+        Index('ix_audit_logs_timestamp_brin', timestamp, postgresql_using='brin'),
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
+    )
+
     def __repr__(self):
         return f"<AuditLog(action={self.action}, target={self.target}, status={self.status})>"
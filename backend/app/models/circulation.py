@@ -4,7 +4,7 @@ Based on FOLIO mod-circulation schema.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Enum as SQLEnum, Integer, Boolean, Text
+from sqlalchemy import Column, String, Date, DateTime, ForeignKey, JSON, Enum as SQLEnum, Integer, Boolean, Text, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -30,11 +30,27 @@ class RequestStatus(str, enum.Enum):
     CANCELLED = "cancelled"
 
 
+# At most one open loan per item; the checkout race backstop
+OPEN_LOAN_ITEM_INDEX = "uq_loans_open_item"
+OPEN_LOAN_INDEX_WHERE = text("status = 'OPEN'")
+
+
 class Loan(Base, TimestampMixin, TenantMixin):
     """
     Loan model for tracking borrowed items.
     """
     __tablename__ = "loans"
+    __table_args__ = (
+        # Overdue scans (fine accrual, overdue reports) filter on status and due date
+        Index("ix_loans_tenant_status_due_date", "tenant_id", "status", "due_date"),
+        Index(OPEN_LOAN_ITEM_INDEX, "item_id", unique=True, postgresql_where=OPEN_LOAN_INDEX_WHERE),
+        # Circulation rollups find changed loans and recount checkouts/checkins per day
+        Index("ix_loans_updated_date", "updated_date"),
+        Index("ix_loans_tenant_loan_date", "tenant_id", "loan_date"),
+        Index("ix_loans_tenant_return_date", "tenant_id", "return_date"),
+        # Report cache watermarks read the latest change of a tenant
+        Index("ix_loans_tenant_updated_date", "tenant_id", "updated_date"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
@@ -64,11 +80,77 @@ class Loan(Base, TimestampMixin, TenantMixin):
         return f"<Loan(user_id={self.user_id}, item_id={self.item_id}, status={self.status})>"
 
 
+class LoanRenewal(Base, TenantMixin):
+    """
+    One renewal of a loan.
+
+    Loans only keep a renewal count; this append-only log dates each
+    renewal so circulation rollups can count renewals per day.
+    """
+    __tablename__ = "loan_renewals"
+    __table_args__ = (
+        Index("ix_loan_renewals_renewed_at", "renewed_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    loan_id = Column(UUID(as_uuid=True), ForeignKey("loans.id", ondelete="CASCADE"), nullable=False, index=True)
+    renewed_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    previous_due_date = Column(DateTime(timezone=True))
+    due_date = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<LoanRenewal(loan_id={self.loan_id}, renewed_at={self.renewed_at})>"
+
+
+class CirculationDailyStats(Base, TenantMixin):
+    """
+    Daily circulation totals per location, patron group and material type.
+
+    Derived from loans and loan renewals by CirculationRollupService, which
+    recomputes only the days touched since its last run; reports over long
+    ranges sum these rows instead of scanning loans. Days are UTC and the
+    dimensions are the item's and patron's current ones.
+    """
+    __tablename__ = "circulation_daily_stats"
+    __table_args__ = (
+        Index("ix_circulation_daily_stats_tenant_day", "tenant_id", "day"),
+        # One row per day and dimensions (NULL dimensions included), so a
+        # re-run replaces rows instead of adding them
+        Index(
+            "uq_circulation_daily_stats_tenant_day_dimensions",
+            "tenant_id", "day", "location_id", "patron_group_id", "material_type_id",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    day = Column(Date, nullable=False)
+
+    # Dimensions (NULL when the item or patron has none)
+    location_id = Column(UUID(as_uuid=True))
+    patron_group_id = Column(UUID(as_uuid=True))
+    material_type_id = Column(UUID(as_uuid=True))
+
+    # Measures
+    checkouts = Column(Integer, nullable=False, default=0)
+    checkins = Column(Integer, nullable=False, default=0)
+    renewals = Column(Integer, nullable=False, default=0)
+    overdue = Column(Integer, nullable=False, default=0)  # Loans due that day and not returned on time
+
+    def __repr__(self):
+        return f"<CirculationDailyStats(tenant_id={self.tenant_id}, day={self.day}, checkouts={self.checkouts})>"
+
+
 class Request(Base, TimestampMixin, TenantMixin):
     """
     Request model for item holds/reservations.
     """
     __tablename__ = "requests"
+    __table_args__ = (
+        # Per-item hold queue lookups (next request, append, compaction)
+        Index("ix_requests_item_status_position", "item_id", "status", "position"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
@@ -82,8 +164,8 @@ class Request(Base, TimestampMixin, TenantMixin):
     # Status
     status = Column(SQLEnum(RequestStatus), default=RequestStatus.OPEN, nullable=False, index=True)
 
-    # Position in queue
-    position = Column(String(50))
+    # Position in the item's queue (1..n, NULL once the request leaves it)
+    position = Column(Integer)
 
     # Fulfillment preference
     fulfillment_preference = Column(String(50))  # Hold Shelf, Delivery
@@ -145,3 +227,51 @@ class LoanPolicy(Base, TimestampMixin, UserTrackingMixin, TenantMixin):
 
     def __repr__(self):
         return f"<LoanPolicy(name={self.name}, code={self.code})>"
+
+
+class FixedDueDateSchedule(Base, TimestampMixin, UserTrackingMixin, TenantMixin):
+    """
+    Fixed due date schedule (e.g. end of semester).
+
+    A loan taken out inside a window is due no later than that window's
+    due date. Windows are stored as a list of
+    {"from": ISO date, "to": ISO date, "due": ISO date} entries.
+    """
+
+    __tablename__ = "fixed_due_date_schedules"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String(255), nullable=False)
+    description = Column(Text)
+    schedules = Column(JSON, nullable=False, default=list)
+
+    def __repr__(self):
+        return f"<FixedDueDateSchedule(name={self.name})>"
+
+
+class CirculationRule(Base, TimestampMixin, UserTrackingMixin, TenantMixin):
+    """
+    Circulation rule mapping loan criteria to a loan policy.
+
+    Empty criteria match anything. When several rules match, the highest
+    priority wins, then the most specific one.
+    """
+
+    __tablename__ = "circulation_rules"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # Match criteria (NULL = any)
+    patron_group_id = Column(UUID(as_uuid=True))
+    material_type_id = Column(UUID(as_uuid=True))
+    loan_type_id = Column(UUID(as_uuid=True))
+    location_id = Column(UUID(as_uuid=True))
+
+    # Policy applied to matching loans
+    loan_policy_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+
+    priority = Column(Integer, nullable=False, default=0)
+    is_active = Column(Boolean, default=True)
+
+    def __repr__(self):
+        return f"<CirculationRule(loan_policy_id={self.loan_policy_id}, priority={self.priority})>"
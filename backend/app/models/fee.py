@@ -4,7 +4,7 @@ Based on FOLIO mod-feesfines schema.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, String, Numeric, Boolean, ForeignKey, DateTime, Text, Integer, Enum as SQLEnum
+from sqlalchemy import Column, String, Numeric, Boolean, ForeignKey, DateTime, Text, Integer, Index, Enum as SQLEnum, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -43,6 +43,10 @@ class PaymentMethod(str, enum.Enum):
     REFUND = "refund"
 
 
+# Automated overdue fines: at most one per loan, updated in place by accrual
+OVERDUE_FEE_INDEX_WHERE = text("automated AND fee_type = 'OVERDUE'")
+
+
 class Fee(Base, TimestampMixin, UserTrackingMixin, TenantMixin):
     """
     Fee/Fine record for user charges.
@@ -52,6 +56,14 @@ class Fee(Base, TimestampMixin, UserTrackingMixin, TenantMixin):
     """
 
     __tablename__ = "fees"
+    __table_args__ = (
+        Index(
+            "uq_fees_automated_overdue_loan",
+            "loan_id",
+            unique=True,
+            postgresql_where=OVERDUE_FEE_INDEX_WHERE,
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -146,6 +158,10 @@ class FeePolicy(Base, TimestampMixin, UserTrackingMixin, TenantMixin):
     """
 
     __tablename__ = "fee_policies"
+    __table_args__ = (
+        # Report cache watermarks read the latest change of a tenant
+        Index("ix_fee_policies_tenant_updated_date", "tenant_id", "updated_date"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
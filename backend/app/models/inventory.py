@@ -4,7 +4,7 @@ Based on FOLIO mod-inventory schema.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, JSON, Text, Enum as SQLEnum, UniqueConstraint
+from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, JSON, Text, Index, Enum as SQLEnum, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -47,6 +47,10 @@ class Instance(Base, TimestampMixin, UserTrackingMixin, TenantMixin):
     """
 
     __tablename__ = "instances"
+    __table_args__ = (
+        # Report cache watermarks read the latest change of a tenant
+        Index("ix_instances_tenant_updated_date", "tenant_id", "updated_date"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -117,6 +121,10 @@ class Holding(Base, TimestampMixin, UserTrackingMixin, TenantMixin):
     """
 
     __tablename__ = "holdings"
+    __table_args__ = (
+        # Report cache watermarks read the latest change of a tenant
+        Index("ix_holdings_tenant_updated_date", "tenant_id", "updated_date"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     instance_id = Column(UUID(as_uuid=True), ForeignKey("instances.id"), nullable=False, index=True)
@@ -188,6 +196,8 @@ class Item(Base, TimestampMixin, UserTrackingMixin, TenantMixin):
     # Table-level constraints for multi-tenancy
     __table_args__ = (
         UniqueConstraint('tenant_id', 'barcode', name='uq_items_barcode_tenant'),
+        # Report cache watermarks read the latest change of a tenant
+        Index('ix_items_tenant_updated_date', 'tenant_id', 'updated_date'),
     )
 
     # Status
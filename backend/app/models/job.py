@@ -0,0 +1,76 @@
+"""
+Background job bookkeeping models.
+"""
+
+from datetime import datetime
+import enum
+import uuid
+from sqlalchemy import Column, String, DateTime, Integer, Text, Enum as SQLEnum, Index
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app.db.base import Base
+from app.models.base import TimestampMixin, TenantMixin, UserTrackingMixin
+
+
+class JobStatus(str, enum.Enum):
+    """Background job status enumeration."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class JobWatermark(Base):
+    """
+    High-water mark of an incremental background job.
+
+    Incremental jobs only process rows that changed since `last_run_at`
+    and advance it once a run commits.
+    """
+    __tablename__ = "job_watermarks"
+
+    name = Column(String(100), primary_key=True)
+    last_run_at = Column(DateTime(timezone=True), nullable=False)
+    details = Column(JSONB, nullable=True, default=dict)
+    updated_date = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<JobWatermark(name={self.name}, last_run_at={self.last_run_at})>"
+
+
+class BackgroundJob(Base, TimestampMixin, TenantMixin, UserTrackingMixin):
+    """
+    A user-started job that runs on a Celery worker (e.g. a bulk user import).
+
+    Workers update the row as they go, so clients poll it for progress and
+    per-row errors.
+    """
+    __tablename__ = "background_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_type = Column(String(100), nullable=False)
+    status = Column(SQLEnum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+
+    # Input (file location, options) and outcome (counts by kind)
+    parameters = Column(JSONB, nullable=False, default=dict)
+    result = Column(JSONB, nullable=False, default=dict)
+
+    # Progress
+    total_rows = Column(Integer)
+    processed_rows = Column(Integer, nullable=False, default=0)
+    succeeded_rows = Column(Integer, nullable=False, default=0)
+    failed_rows = Column(Integer, nullable=False, default=0)
+
+    # Per-row errors (capped) and the fatal error of a failed job
+    errors = Column(JSONB, nullable=False, default=list)
+    error_message = Column(Text)
+
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index('ix_background_jobs_tenant_type_created', 'tenant_id', 'job_type', 'created_date'),
+    )
+
+    def __repr__(self):
+        return f"<BackgroundJob(id={self.id}, job_type={self.job_type}, status={self.status})>"
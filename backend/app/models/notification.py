@@ -76,7 +76,7 @@ class Notification(Base, TenantMixin, TimestampMixin):
             "type": self.type.value,
             "title": self.title,
             "message": self.message,
-            "metadata": self.metadata or {},
+            "metadata": self.notification_metadata or {},
             "is_read": self.is_read,
             "read_at": self.read_at.isoformat() if self.read_at else None,
             "entity_type": self.entity_type,
@@ -0,0 +1,41 @@
+"""
+Patron account summary model.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+from app.models.base import TenantMixin
+
+
+class PatronAccountSummary(Base, TenantMixin):
+    """
+    Per-patron totals of loans, holds and fees.
+
+    Maintained incrementally by circulation and fee mutations (see
+    PatronAccountService) and verified by a nightly rebuild, so account
+    views and patron blocks read a single row.
+    """
+    __tablename__ = "patron_account_summaries"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    # Circulation
+    open_loans = Column(Integer, nullable=False, default=0)
+    overdue_loans = Column(Integer, nullable=False, default=0)
+    open_requests = Column(Integer, nullable=False, default=0)
+
+    # Fees
+    total_fees = Column(Integer, nullable=False, default=0)
+    open_fees = Column(Integer, nullable=False, default=0)
+    total_owed = Column(Numeric(12, 2), nullable=False, default=Decimal("0.00"))
+    total_paid = Column(Numeric(12, 2), nullable=False, default=Decimal("0.00"))
+    oldest_fee_date = Column(DateTime)
+
+    updated_date = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<PatronAccountSummary(user_id={self.user_id}, open_loans={self.open_loans}, total_owed={self.total_owed})>"
@@ -0,0 +1,44 @@
+"""
+Report scheduling models.
+"""
+
+from sqlalchemy import Column, String, Text, Boolean, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+import uuid
+
+from app.db.base import Base
+from app.models.base import TimestampMixin, TenantMixin, UserTrackingMixin
+
+
+class ReportSchedule(Base, TimestampMixin, TenantMixin, UserTrackingMixin):
+    """
+    A report produced periodically from a cron expression.
+
+    Due schedules are queued as report jobs during the off-peak window, so
+    the artifact is ready (and cached) by the time it is wanted.
+    """
+    __tablename__ = "report_schedules"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String(255), nullable=False)
+    description = Column(Text)
+
+    # What to produce: a report type with its request parameters and format
+    report_type = Column(String(50), nullable=False)
+    parameters = Column(JSONB, nullable=False, default=dict)
+    export_format = Column(String(20), nullable=False)
+    recipients = Column(JSONB, nullable=False, default=list)  # Email addresses
+
+    # When
+    schedule = Column(String(100), nullable=False)  # Cron expression
+    enabled = Column(Boolean, default=True, nullable=False)
+    last_run_at = Column(DateTime(timezone=True))
+    next_run_at = Column(DateTime(timezone=True))
+    last_job_id = Column(UUID(as_uuid=True))
+
+    __table_args__ = (
+        Index('ix_report_schedules_due', 'enabled', 'next_run_at'),
+    )
+
+    def __repr__(self):
+        return f"<ReportSchedule(name={self.name}, report_type={self.report_type}, schedule={self.schedule})>"
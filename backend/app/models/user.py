@@ -5,9 +5,12 @@ Based on FOLIO mod-users schema.
 
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum as SQLEnum, Table, UniqueConstraint
+from sqlalchemy import (
+    Column, String, Boolean, DateTime, ForeignKey, Integer, Numeric, Text, Computed, Index,
+    Enum as SQLEnum, Table, UniqueConstraint, func
+)
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import uuid
 import enum
 
@@ -33,6 +36,19 @@ user_tenants = Table(
 )
 
 
+# Normalized text the user search matches against (see UserSearchService).
+# Only immutable functions are allowed in a generated column.
+USER_SEARCH_TEXT = (
+    "lower("
+    "coalesce(username, '') || ' ' || "
+    "coalesce(email, '') || ' ' || "
+    "coalesce(barcode, '') || ' ' || "
+    "coalesce(personal ->> 'firstName', '') || ' ' || "
+    "coalesce(personal ->> 'lastName', '')"
+    ")"
+)
+
+
 class User(Base, TimestampMixin, TenantMixin):
     """
     User model representing library users (patrons and staff).
@@ -47,10 +63,21 @@ class User(Base, TimestampMixin, TenantMixin):
     email = Column(String(255), index=True, nullable=False)  # UNIQUE constraint via table args
     barcode = Column(String(255), index=True)  # UNIQUE constraint via table args
 
+    # Search (trigram indexed, requires the pg_trgm extension); only used in
+    # WHERE/ORDER BY, so it is not loaded with the user
+    search_text = deferred(Column(Text, Computed(USER_SEARCH_TEXT, persisted=True)))
+
     # Table-level constraints for multi-tenancy
     __table_args__ = (
         UniqueConstraint('tenant_id', 'email', name='uq_users_email_tenant'),
         UniqueConstraint('tenant_id', 'barcode', name='uq_users_barcode_tenant'),
+        Index(
+            'ix_users_search_text_trgm', 'search_text',
+            postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'}
+        ),
+        Index('ix_users_email_lower', func.lower(email)),
+        # Report cache watermarks read the latest change of a tenant
+        Index('ix_users_tenant_updated_date', 'tenant_id', 'updated_date'),
     )
 
     # User status
@@ -126,6 +153,11 @@ class PatronGroup(Base, TimestampMixin, TenantMixin):
     loan_period_days = Column(String(50), default="14")
     renewals_allowed = Column(Boolean, default=True)
 
+    # Automated patron block limits (NULL = no limit)
+    max_loans = Column(Integer)
+    max_overdue_loans = Column(Integer)
+    max_outstanding_fee_balance = Column(Numeric(12, 2))
+
     # Relationships
     users = relationship("User", back_populates="patron_group")
 
@@ -2,8 +2,8 @@
 Circulation-related Pydantic schemas for request/response validation.
 """
 
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional
+from datetime import date, datetime
 from uuid import UUID
 from pydantic import BaseModel, Field
 from enum import Enum
@@ -109,6 +109,66 @@ class RenewResponse(BaseModel):
         from_attributes = True
 
 
+class RenewAllRequest(BaseModel):
+    """Schema for renewing every open loan of a borrower."""
+    user_id: Optional[UUID] = Field(None, description="Borrower (staff only; defaults to the caller)")
+
+
+class RenewBatchRequest(BaseModel):
+    """Schema for renewing several loans at once."""
+    loan_ids: List[UUID] = Field(..., min_length=1, max_length=100, description="Loans to renew")
+
+
+class RenewResult(BaseModel):
+    """Outcome of renewing one loan in a batch."""
+    loan_id: UUID
+    item_id: Optional[UUID] = None
+    item_barcode: Optional[str] = None
+    renewed: bool
+    previous_due_date: Optional[datetime] = None
+    new_due_date: Optional[datetime] = None
+    renewal_count: Optional[int] = None
+    max_renewals: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BatchRenewResponse(BaseModel):
+    """Schema for batch renewal response."""
+    renewed_count: int
+    failed_count: int
+    results: List[RenewResult]
+
+
+# ============================================================================
+# PATRON BLOCK SCHEMAS
+# ============================================================================
+
+class PatronBlock(BaseModel):
+    """A block preventing a patron from borrowing."""
+    code: str = Field(..., description="inactive, expired, max_loans, max_overdue_loans or max_outstanding_fee_balance")
+    message: str
+
+
+class PatronBlockCheckRequest(BaseModel):
+    """Schema for checking several patrons before checkout (e.g. at a kiosk)."""
+    user_ids: List[UUID] = Field(default_factory=list, max_length=100)
+    user_barcodes: List[str] = Field(default_factory=list, max_length=100)
+
+
+class PatronBlockDecision(BaseModel):
+    """Checkout decision for one patron."""
+    user_id: Optional[UUID] = None
+    user_barcode: Optional[str] = None
+    found: bool = True
+    can_checkout: bool
+    blocks: List[PatronBlock] = []
+
+
+class PatronBlockCheckResponse(BaseModel):
+    """Schema for batch patron block check response."""
+    results: List[PatronBlockDecision]
+
+
 # ============================================================================
 # LOAN SCHEMAS
 # ============================================================================
@@ -183,13 +243,24 @@ class RequestUpdate(BaseModel):
     pickup_service_point_id: Optional[UUID] = None
 
 
+class RequestMove(BaseModel):
+    """Schema for moving a request within its item's queue."""
+    position: int = Field(..., ge=1, description="New 1-based queue position")
+
+
+class RequestQueueReorder(BaseModel):
+    """Schema for replacing the order of an item's request queue."""
+    request_ids: List[UUID] = Field(..., description="Every queued request of the item, in the new order")
+
+
 class RequestResponse(RequestBase):
     """Schema for request response."""
     id: UUID
     request_date: datetime
     request_expiration_date: Optional[datetime] = None
     status: RequestStatus
-    position: int
+    position: Optional[int] = None
+    queue_length: Optional[int] = None
     created_date: datetime
     updated_date: Optional[datetime] = None
     tenant_id: UUID
@@ -270,6 +341,9 @@ class LoanPolicyBase(BaseModel):
     recall_return_interval_duration: Optional[int] = Field(None, ge=1)
     recall_return_interval_interval: Optional[str] = None
 
+    # Fixed due date schedule (optional)
+    fixed_due_date_schedule_id: Optional[UUID] = Field(None, description="Caps due dates at the schedule's fixed due dates")
+
     # Active status
     is_active: bool = Field(True, description="Whether policy is active")
 
@@ -293,6 +367,7 @@ class LoanPolicyUpdate(BaseModel):
     grace_period_interval: Optional[str] = None
     recall_return_interval_duration: Optional[int] = None
     recall_return_interval_interval: Optional[str] = None
+    fixed_due_date_schedule_id: Optional[UUID] = None
     is_active: Optional[bool] = None
 
 
@@ -307,3 +382,70 @@ class LoanPolicyResponse(LoanPolicyBase):
 
     class Config:
         from_attributes = True
+
+
+# ============================================================================
+# FIXED DUE DATE SCHEDULE SCHEMAS
+# ============================================================================
+
+class FixedDueDateWindow(BaseModel):
+    """A loan taken out between `from` and `to` is due no later than `due`."""
+    from_date: date = Field(..., alias="from")
+    to_date: date = Field(..., alias="to")
+    due: date
+
+    model_config = {"populate_by_name": True}
+
+
+class FixedDueDateScheduleBase(BaseModel):
+    """Base fixed due date schedule schema."""
+    name: str = Field(..., max_length=255)
+    description: Optional[str] = None
+    schedules: List[FixedDueDateWindow] = Field(..., min_length=1)
+
+
+class FixedDueDateScheduleCreate(FixedDueDateScheduleBase):
+    """Schema for creating a fixed due date schedule."""
+    pass
+
+
+class FixedDueDateScheduleResponse(FixedDueDateScheduleBase):
+    """Schema for fixed due date schedule response."""
+    id: UUID
+    created_date: datetime
+    updated_date: Optional[datetime] = None
+    tenant_id: UUID
+
+    class Config:
+        from_attributes = True
+
+
+# ============================================================================
+# CIRCULATION RULE SCHEMAS
+# ============================================================================
+
+class CirculationRuleBase(BaseModel):
+    """Base circulation rule schema. Empty criteria match any value."""
+    patron_group_id: Optional[UUID] = None
+    material_type_id: Optional[UUID] = None
+    loan_type_id: Optional[UUID] = None
+    location_id: Optional[UUID] = None
+    loan_policy_id: UUID
+    priority: int = Field(0, description="Higher priority rules win over more specific ones")
+    is_active: bool = True
+
+
+class CirculationRuleCreate(CirculationRuleBase):
+    """Schema for creating a circulation rule."""
+    pass
+
+
+class CirculationRuleResponse(CirculationRuleBase):
+    """Schema for circulation rule response."""
+    id: UUID
+    created_date: datetime
+    updated_date: Optional[datetime] = None
+    tenant_id: UUID
+
+    class Config:
+        from_attributes = True
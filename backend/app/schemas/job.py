@@ -0,0 +1,39 @@
+"""
+Background job Pydantic schemas for request/response validation.
+"""
+
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class JobRowError(BaseModel):
+    """Error of one input row."""
+    row: int
+    code: str
+    message: str
+    details: Optional[Dict[str, Any]] = None
+
+
+class BackgroundJobResponse(BaseModel):
+    """Schema for background job status."""
+    id: UUID
+    job_type: str
+    status: str
+    parameters: Dict[str, Any] = {}
+    result: Dict[str, Any] = {}
+    total_rows: Optional[int] = None
+    processed_rows: int = 0
+    succeeded_rows: int = 0
+    failed_rows: int = 0
+    errors: List[JobRowError] = []
+    error_message: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_date: datetime
+    updated_date: Optional[datetime] = None
+    tenant_id: UUID
+
+    class Config:
+        from_attributes = True
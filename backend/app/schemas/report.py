@@ -4,7 +4,7 @@ Report schemas for reporting and analytics
 
 from datetime import date, datetime
 from enum import Enum
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from pydantic import BaseModel, Field
 from uuid import UUID
 
@@ -27,6 +27,8 @@ class ExportFormat(str, Enum):
     EXCEL = "excel"
     PDF = "pdf"
     JSON = "json"
+    PARQUET = "parquet"
+    ARROW = "arrow"  # Arrow IPC file
 
 
 class DateRange(BaseModel):
@@ -64,7 +66,10 @@ class CollectionReportRequest(BaseModel):
     filters: Optional[ReportFilters] = Field(default_factory=ReportFilters)
     export_format: ExportFormat = ExportFormat.CSV
     include_statistics: bool = Field(True, description="Include statistical summary")
-    group_by: Optional[str] = Field(None, description="Group by field (type, language, subject)")
+    include_details: bool = Field(True, description="Include instance rows (the summary covers every matching instance)")
+    group_by: Optional[Literal["type", "language", "subject"]] = Field(
+        None, description="Limit the summary to one breakdown (type, language, subject)"
+    )
 
 
 class FinancialReportRequest(BaseModel):
@@ -85,6 +90,13 @@ class OverdueReportRequest(BaseModel):
     include_fines: bool = Field(True, description="Include fine calculations")
 
 
+class ReportJobCreate(BaseModel):
+    """Request schema for a queued report job"""
+    report_type: ReportType
+    parameters: Dict[str, Any] = Field(default_factory=dict, description="Fields of the report's request schema")
+    export_format: ExportFormat = ExportFormat.CSV
+
+
 class ReportData(BaseModel):
     """Report data response"""
     report_type: ReportType
@@ -177,3 +189,21 @@ class DashboardStats(BaseModel):
     financial: FinancialStats
     users: UserStats
     generated_at: datetime
+
+
+class CirculationStatsRow(BaseModel):
+    """Circulation totals of one period or dimension value"""
+    key: Optional[Any] = None
+    checkouts: int = 0
+    checkins: int = 0
+    renewals: int = 0
+    overdue: int = 0
+
+
+class CirculationStatsSeries(BaseModel):
+    """Circulation totals from the daily rollup"""
+    group_by: str
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    rows: List[CirculationStatsRow]
+    totals: CirculationStatsRow
@@ -4,6 +4,7 @@ User-related Pydantic schemas for request/response validation.
 
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from decimal import Decimal
 from uuid import UUID
 from pydantic import BaseModel, Field, EmailStr, field_validator
 
@@ -175,6 +176,16 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class RoleSummary(BaseModel):
+    """Role name without permissions, for list views."""
+    id: UUID
+    name: str
+    display_name: str
+
+    class Config:
+        from_attributes = True
+
+
 class UserListItem(BaseModel):
     """Schema for user list item (simplified)."""
     id: UUID
@@ -186,19 +197,39 @@ class UserListItem(BaseModel):
     personal: PersonalInfo
     patron_group_id: Optional[UUID] = None
     patron_group_name: Optional[str] = None
-    roles: List[RoleSimple] = []
+    roles: List[RoleSummary] = []
     created_date: datetime
 
     class Config:
         from_attributes = True
 
 
+class PatronAccountSummaryResponse(BaseModel):
+    """Schema for a patron's loan, request and fee totals."""
+    user_id: UUID
+    open_loans: int
+    overdue_loans: int
+    open_requests: int
+    total_fees: int
+    open_fees: int
+    total_owed: Decimal
+    total_paid: Decimal
+    oldest_fee_date: Optional[datetime] = None
+    updated_date: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 class PatronGroupBase(BaseModel):
     """Base patron group schema."""
     group_name: str = Field(..., max_length=255)
     description: Optional[str] = Field(None, max_length=500)
     loan_period_days: str = "14"
     renewals_allowed: bool = True
+    max_loans: Optional[int] = Field(None, ge=0, description="Block checkout at this many open loans")
+    max_overdue_loans: Optional[int] = Field(None, ge=0, description="Block checkout above this many overdue loans")
+    max_outstanding_fee_balance: Optional[Decimal] = Field(None, ge=0, description="Block checkout above this balance owed")
 
 
 class PatronGroupCreate(PatronGroupBase):
@@ -212,6 +243,9 @@ class PatronGroupUpdate(BaseModel):
     description: Optional[str] = None
     loan_period_days: Optional[str] = None
     renewals_allowed: Optional[bool] = None
+    max_loans: Optional[int] = Field(None, ge=0)
+    max_overdue_loans: Optional[int] = Field(None, ge=0)
+    max_outstanding_fee_balance: Optional[Decimal] = Field(None, ge=0)
 
 
 class PatronGroupResponse(PatronGroupBase):
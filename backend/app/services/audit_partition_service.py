@@ -0,0 +1,209 @@
+"""
+Audit Partition Service
+Create monthly audit_logs partitions ahead of time and archive expired ones
+"""
+
+import gzip
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "audit_logs"
+DEFAULT_PARTITION = "audit_logs_default"
+
+_PARTITION_NAME = re.compile(r"^audit_logs_p(\d{4})(\d{2})$")
+
+
+def month_start(moment: datetime) -> datetime:
+    """First instant (UTC) of the month containing a moment."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Shift a month start by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Partition table holding a month of audit logs."""
+    return f"audit_logs_p{month:%Y%m}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """Month held by a partition table, None for the default partition."""
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+
+
+def _bound(month: datetime) -> str:
+    return f"'{month:%Y-%m-%d %H:%M:%S}+00'"
+
+
+def create_partition_statements(month: datetime) -> List[str]:
+    """
+    DDL creating a month's partition.
+
+    The partition is built detached, takes over any of its rows that landed
+    in the default partition, and is then attached; attaching checks the
+    default partition no longer holds rows of that month.
+    """
+    name = partition_name(month)
+    lower, upper = _bound(month), _bound(add_months(month, 1))
+    return [
+        f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        f"WITH moved AS ("
+        f"DELETE FROM {DEFAULT_PARTITION} WHERE timestamp >= {lower} AND timestamp < {upper} RETURNING *"
+        f") INSERT INTO {name} SELECT * FROM moved",
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} FOR VALUES FROM ({lower}) TO ({upper})",
+    ]
+
+
+class AuditPartitionService:
+    """
+    Manage the monthly partitions of audit_logs.
+
+    Writers only ever insert into the current month, so each partition is
+    small and its indexes stay hot. Partitions are created a few months
+    ahead; a default partition catches rows outside every range so an
+    audited write never fails. Expired months are detached, written to
+    gzipped CSV files and dropped, which is far cheaper than DELETE.
+
+    Methods take an AsyncSession or AsyncConnection. Creating partitions
+    leaves committing to the caller; archiving commits per partition.
+    """
+
+    @staticmethod
+    async def list_partitions(db) -> Dict[str, datetime]:
+        """Attached monthly partitions by name."""
+        result = await db.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ), {"parent": PARENT_TABLE})
+
+        partitions = {}
+        for name in result.scalars().all():
+            month = partition_month(name)
+            if month is not None:
+                partitions[name] = month
+        return partitions
+
+    @staticmethod
+    async def ensure_partitions(
+        db,
+        now: Optional[datetime] = None,
+        months_ahead: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Create the default partition and the partitions of the current and next months.
+
+        Returns:
+            Names of the partitions created
+        """
+        months_ahead = settings.AUDIT_LOG_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+        current = month_start(now or datetime.now(timezone.utc))
+
+        await db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"
+        ))
+
+        existing = await AuditPartitionService.list_partitions(db)
+        created = []
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            for statement in create_partition_statements(month):
+                await db.execute(text(statement))
+            created.append(name)
+
+        return created
+
+    @staticmethod
+    async def archive_partitions(
+        db,
+        now: Optional[datetime] = None,
+        retention_months: Optional[int] = None,
+        archive_dir: Optional[str] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Archive partitions whose whole month is older than the retention period.
+
+        Each partition is copied to `<archive_dir>/<partition>.csv.gz` while
+        still attached (nothing writes to an expired month), then detached
+        and dropped in a short transaction of its own, so the ACCESS
+        EXCLUSIVE lock on audit_logs is not held during the copy. A failed
+        copy leaves the partition attached; a partition whose detach fails
+        after its copy is copied again on the next run.
+
+        Returns:
+            List of {"partition", "path"} dicts for the archived partitions
+        """
+        retention_months = settings.AUDIT_LOG_RETENTION_MONTHS if retention_months is None else retention_months
+        if retention_months <= 0:
+            return []
+
+        cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -retention_months)
+        directory = Path(archive_dir or settings.AUDIT_LOG_ARCHIVE_DIR)
+
+        expired = sorted(
+            (month, name)
+            for name, month in (await AuditPartitionService.list_partitions(db)).items()
+            if add_months(month, 1) <= cutoff
+        )
+
+        archived = []
+        for month, name in expired:
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"{name}.csv.gz"
+            partial = path.with_suffix(".partial")
+
+            try:
+                await _copy_table_to_gzip(db, name, partial)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                partial.unlink(missing_ok=True)
+                raise
+            os.replace(partial, path)
+
+            try:
+                await db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+                await db.execute(text(f"DROP TABLE {name}"))
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+            logger.info(f"Archived audit log partition {name} to {path}")
+            archived.append({"partition": name, "path": str(path)})
+
+        return archived
+
+
+async def _copy_table_to_gzip(db, table: str, path: Path):
+    """COPY a table out as CSV (with header) into a gzip file."""
+    connection = await db.connection() if isinstance(db, AsyncSession) else db
+    raw = await connection.get_raw_connection()
+
+    with gzip.open(path, "wb") as handle:
+        async def write(chunk: bytes):
+            handle.write(chunk)
+
+        await raw.driver_connection.copy_from_table(table, output=write, format="csv", header=True)
@@ -43,3 +43,22 @@ class CacheService:
     async def close(self):
         """Close Redis connection."""
         await self.redis.close()
+
+
+def dashboard_stats_key(tenant_id) -> str:
+    """Cache key of a tenant's dashboard statistics."""
+    return f"reports:dashboard_stats:{tenant_id}"
+
+
+# Singleton instance
+_cache_service: Optional[CacheService] = None
+
+
+def get_cache_service() -> CacheService:
+    """Get or create cache service singleton."""
+    global _cache_service
+
+    if _cache_service is None:
+        _cache_service = CacheService()
+
+    return _cache_service
@@ -0,0 +1,283 @@
+"""
+Circulation Rules Service
+Compile per-tenant circulation rules into an in-memory loan policy lookup table
+"""
+
+import asyncio
+import calendar
+import itertools
+import logging
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.circulation import CirculationRule, FixedDueDateSchedule, LoanPolicy
+from app.models.user import PatronGroup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOAN_PERIOD_DAYS = 14
+DEFAULT_MAX_RENEWALS = 3
+
+# Patron group block limits carried in the compiled table
+BLOCK_LIMITS = ("max_loans", "max_overdue_loans", "max_outstanding_fee_balance")
+
+# Every wildcard pattern over (patron group, material type, loan type, location)
+_PROBE_MASKS = list(itertools.product((True, False), repeat=4))
+
+
+def add_interval(start: datetime, duration: int, interval: Optional[str]) -> datetime:
+    """Add a policy period (Minutes, Hours, Days, Weeks or Months) to a date."""
+    interval = (interval or "Days").lower()
+    if interval == "minutes":
+        return start + timedelta(minutes=duration)
+    if interval == "hours":
+        return start + timedelta(hours=duration)
+    if interval == "weeks":
+        return start + timedelta(weeks=duration)
+    if interval == "months":
+        month_index = start.month - 1 + duration
+        year = start.year + month_index // 12
+        month = month_index % 12 + 1
+        day = min(start.day, calendar.monthrange(year, month)[1])
+        return start.replace(year=year, month=month, day=day)
+    return start + timedelta(days=duration)
+
+
+def _parse_schedule(schedules: Optional[List[Dict[str, Any]]]) -> List[Tuple[date, date, date]]:
+    windows = []
+    for window in schedules or []:
+        windows.append((
+            date.fromisoformat(window["from"]),
+            date.fromisoformat(window["to"]),
+            date.fromisoformat(window["due"]),
+        ))
+    return sorted(windows)
+
+
+def apply_schedule(due_date: datetime, start: datetime, schedule: List[Tuple[date, date, date]]) -> datetime:
+    """Cap a due date at the fixed due date of the window containing `start`."""
+    start_day = start.date()
+    for window_from, window_to, window_due in schedule:
+        if window_from <= start_day <= window_to:
+            fixed = datetime.combine(window_due, dt_time(23, 59, 59), tzinfo=start.tzinfo)
+            return min(due_date, fixed)
+    return due_date
+
+
+def calculate_due_date(policy: Dict[str, Any], loan_date: datetime) -> datetime:
+    """Due date of a new loan under a resolved policy."""
+    duration, interval = policy["loan_period"]
+    return apply_schedule(add_interval(loan_date, duration, interval), loan_date, policy["schedule"])
+
+
+def calculate_renewal_due_date(policy: Dict[str, Any], renewal_date: datetime) -> datetime:
+    """Due date of a loan renewed at `renewal_date` under a resolved policy."""
+    duration, interval = policy["renewal_period"]
+    return apply_schedule(add_interval(renewal_date, duration, interval), renewal_date, policy["schedule"])
+
+
+def default_loan_policy(patron_group: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Policy used when no circulation rule matches.
+
+    Falls back to the patron group's loan period, then to 14 days.
+    """
+    days = DEFAULT_LOAN_PERIOD_DAYS
+    renewable = True
+    if patron_group:
+        days = patron_group["loan_period_days"] or days
+        renewable = patron_group["renewals_allowed"]
+
+    return {
+        "id": None,
+        "code": None,
+        "loan_period": (days, "Days"),
+        "renewable": renewable,
+        "max_renewals": DEFAULT_MAX_RENEWALS if renewable else 0,
+        "renewal_period": (days, "Days"),
+        "schedule": [],
+    }
+
+
+def _policy_to_dict(policy: LoanPolicy, schedules: Dict[Any, List[Tuple[date, date, date]]]) -> Dict[str, Any]:
+    loan_period = (policy.loan_period_duration or DEFAULT_LOAN_PERIOD_DAYS, policy.loan_period_interval)
+    return {
+        "id": str(policy.id),
+        "code": policy.code,
+        "loan_period": loan_period,
+        "renewable": bool(policy.renewable),
+        "max_renewals": (policy.number_of_renewals_allowed or 0) if policy.renewable else 0,
+        "renewal_period": (
+            (policy.renewal_period_duration, policy.renewal_period_interval)
+            if policy.renewal_period_duration else loan_period
+        ),
+        "schedule": schedules.get(policy.fixed_due_date_schedule_id, []),
+    }
+
+
+def _key(value) -> Optional[str]:
+    return str(value) if value else None
+
+
+def item_criteria(item) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """(material type, effective loan type, effective location) of an item."""
+    return (
+        _key(item.material_type_id),
+        _key(item.temporary_loan_type_id or item.permanent_loan_type_id),
+        _key(item.effective_location_id or item.temporary_location_id or item.permanent_location_id),
+    )
+
+
+def resolve_from_table(
+    table: Dict[str, Any],
+    patron_group_id,
+    material_type_id=None,
+    loan_type_id=None,
+    location_id=None,
+) -> Dict[str, Any]:
+    """
+    Resolve the loan policy for a set of loan criteria.
+
+    Probes the 16 wildcard patterns of the criteria, so the cost does not
+    depend on the number of rules.
+    """
+    criteria = (_key(patron_group_id), _key(material_type_id), _key(loan_type_id), _key(location_id))
+
+    best = None
+    for mask in _PROBE_MASKS:
+        probe = tuple(value if keep else None for value, keep in zip(criteria, mask))
+        match = table["rules"].get(probe)
+        if match and (best is None or match[0] > best[0]):
+            best = match
+
+    if best:
+        return best[1]
+    return default_loan_policy(table["patron_groups"].get(criteria[0]))
+
+
+class CirculationRulesEngine:
+    """
+    Per-tenant compiled circulation rules.
+
+    A tenant's rules, loan policies, fixed due date schedules and patron
+    group loan periods and block limits are loaded once and kept in process memory until
+    invalidated by policy CRUD or until the TTL expires, so checkout and
+    renewal resolve policies without queries.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds or settings.CIRCULATION_RULES_CACHE_TTL_SECONDS
+
+        # {tenant_id: (expires_at, table)}
+        self._tables: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def compile(self, db: AsyncSession, tenant_id) -> Dict[str, Any]:
+        """Build the lookup table of a tenant from the database."""
+        schedule_result = await db.execute(
+            select(FixedDueDateSchedule).where(FixedDueDateSchedule.tenant_id == tenant_id)
+        )
+        schedules = {s.id: _parse_schedule(s.schedules) for s in schedule_result.scalars().all()}
+
+        policy_result = await db.execute(
+            select(LoanPolicy).where(
+                and_(LoanPolicy.tenant_id == tenant_id, LoanPolicy.is_active == True)
+            )
+        )
+        policies = {p.id: _policy_to_dict(p, schedules) for p in policy_result.scalars().all()}
+
+        rule_result = await db.execute(
+            select(CirculationRule).where(
+                and_(CirculationRule.tenant_id == tenant_id, CirculationRule.is_active == True)
+            )
+        )
+        rules: Dict[tuple, Tuple[tuple, Dict[str, Any]]] = {}
+        for rule in rule_result.scalars().all():
+            policy = policies.get(rule.loan_policy_id)
+            if policy is None:
+                logger.warning(f"Circulation rule {rule.id} points to missing or inactive loan policy")
+                continue
+
+            key = (
+                _key(rule.patron_group_id),
+                _key(rule.material_type_id),
+                _key(rule.loan_type_id),
+                _key(rule.location_id),
+            )
+            specificity = sum(value is not None for value in key)
+            rank = (rule.priority or 0, specificity)
+            if key not in rules or rank > rules[key][0]:
+                rules[key] = (rank, policy)
+
+        group_result = await db.execute(
+            select(
+                PatronGroup.id,
+                PatronGroup.loan_period_days,
+                PatronGroup.renewals_allowed,
+                PatronGroup.max_loans,
+                PatronGroup.max_overdue_loans,
+                PatronGroup.max_outstanding_fee_balance,
+            )
+            .where(PatronGroup.tenant_id == tenant_id)
+        )
+        patron_groups = {}
+        for group_id, loan_period_days, renewals_allowed, *limits in group_result.all():
+            try:
+                days = int(loan_period_days) if loan_period_days else None
+            except ValueError:
+                days = None
+            patron_groups[str(group_id)] = {
+                "loan_period_days": days,
+                "renewals_allowed": renewals_allowed is not False,
+                "limits": dict(zip(BLOCK_LIMITS, limits)),
+            }
+
+        return {"rules": rules, "patron_groups": patron_groups}
+
+    async def get_table(self, db: AsyncSession, tenant_id) -> Dict[str, Any]:
+        """Get the compiled lookup table of a tenant (cached)."""
+        key = str(tenant_id)
+        cached = self._tables.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._tables.get(key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+            table = await self.compile(db, tenant_id)
+            self._tables[key] = (time.monotonic() + self.ttl_seconds, table)
+            return table
+
+    async def resolve(self, db: AsyncSession, tenant_id, patron_group_id, item) -> Dict[str, Any]:
+        """Resolve the loan policy that applies to a patron borrowing an item."""
+        table = await self.get_table(db, tenant_id)
+        return resolve_from_table(table, patron_group_id, *item_criteria(item))
+
+    def invalidate(self, tenant_id=None):
+        """Drop the compiled table of one tenant (or all tenants)."""
+        if tenant_id is None:
+            self._tables.clear()
+        else:
+            self._tables.pop(str(tenant_id), None)
+
+
+# Singleton instance
+_circulation_rules_engine: Optional[CirculationRulesEngine] = None
+
+
+def get_circulation_rules_engine() -> CirculationRulesEngine:
+    """Get or create circulation rules engine singleton"""
+    global _circulation_rules_engine
+
+    if _circulation_rules_engine is None:
+        _circulation_rules_engine = CirculationRulesEngine()
+
+    return _circulation_rules_engine
@@ -0,0 +1,183 @@
+"""
+Domain Event Service
+Post-commit event bus for circulation, inventory and fee mutations
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Key under which pending events are kept in Session.info
+SESSION_EVENTS_KEY = "domain_events"
+
+# Redis list drained by app.tasks.search_tasks.drain_search_outbox
+SEARCH_OUTBOX_KEY = "search:outbox"
+
+# Event types are "<entity>.<verb>"; the entity decides the WebSocket channel
+ENTITY_CHANNELS = {
+    "loan": "circulation",
+    "request": "circulation",
+    "item": "inventory",
+    "holding": "inventory",
+    "instance": "inventory",
+    "fee": "fees",
+    "payment": "fees",
+}
+
+Subscriber = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+
+def publish(
+    session,
+    event_type: str,
+    tenant_id,
+    entity_id,
+    **data: Any
+):
+    """
+    Queue a domain event on a session.
+
+    The event is dispatched to subscribers only after the session's
+    transaction commits, together with every other event of that
+    transaction, and is discarded on rollback.
+
+    Args:
+        session: AsyncSession or Session doing the mutation
+        event_type: Event type, e.g. "loan.checked_out"
+        tenant_id: Tenant ID
+        entity_id: ID of the mutated entity
+        **data: Small JSON-serializable payload
+    """
+    entity_type = event_type.split(".", 1)[0]
+    session.info.setdefault(SESSION_EVENTS_KEY, []).append({
+        "type": event_type,
+        "tenant_id": str(tenant_id),
+        "entity_type": entity_type,
+        "entity_id": str(entity_id) if entity_id else None,
+        "data": data,
+        "occurred_at": datetime.utcnow().isoformat(),
+    })
+
+
+class DomainEventBus:
+    """
+    Dispatch committed domain events to subscribers.
+
+    Each committed transaction produces one batch; every subscriber receives
+    the whole batch once. Subscriber failures are logged and never reach the
+    request that committed.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Subscriber] = []
+        self._tasks: Set[asyncio.Task] = set()
+
+    def subscribe(self, subscriber: Subscriber):
+        """Register a coroutine that receives each committed batch."""
+        self._subscribers.append(subscriber)
+
+    async def dispatch(self, events: List[Dict[str, Any]]):
+        """Deliver a batch of events to every subscriber."""
+        for subscriber in self._subscribers:
+            try:
+                await subscriber(events)
+            except Exception as e:
+                logger.error(f"Domain event subscriber {subscriber.__name__} failed: {e}")
+
+    def dispatch_later(self, events: List[Dict[str, Any]]):
+        """Schedule a batch on the running event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning(f"No running event loop, dropping {len(events)} domain event(s)")
+            return
+
+        task = loop.create_task(self.dispatch(events))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+# ============================================================================
+# SUBSCRIBERS
+# ============================================================================
+
+async def push_to_websocket(events: List[Dict[str, Any]]):
+    """Emit one message per (tenant, channel) to the tenant's channel room."""
+    from app.services.websocket_service import get_websocket_service
+
+    batches: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+    for domain_event in events:
+        channel = ENTITY_CHANNELS.get(domain_event["entity_type"])
+        if channel:
+            batches[(domain_event["tenant_id"], channel)].append(domain_event)
+
+    ws_service = get_websocket_service()
+    for (tenant_id, channel), batch in batches.items():
+        await ws_service.send_domain_events(tenant_id, channel, batch)
+
+
+async def invalidate_dashboard_stats(events: List[Dict[str, Any]]):
+    """Drop the cached dashboard statistics of every affected tenant."""
+    from app.services.cache_service import dashboard_stats_key, get_cache_service
+
+    cache = get_cache_service()
+    for tenant_id in {e["tenant_id"] for e in events}:
+        await cache.delete(dashboard_stats_key(tenant_id))
+
+
+async def enqueue_search_updates(events: List[Dict[str, Any]]):
+    """Append instance changes to the search indexing outbox."""
+    from app.services.cache_service import get_cache_service
+
+    entries = [
+        json.dumps({
+            "op": "delete" if e["type"] == "instance.deleted" else "index",
+            "instance_id": e["entity_id"],
+            "tenant_id": e["tenant_id"],
+        })
+        for e in events
+        if e["entity_type"] == "instance" and e["entity_id"]
+    ]
+    if entries:
+        await get_cache_service().redis.rpush(SEARCH_OUTBOX_KEY, *entries)
+
+
+# ============================================================================
+# SESSION HOOKS
+# ============================================================================
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    events = session.info.pop(SESSION_EVENTS_KEY, None)
+    if events:
+        get_domain_event_bus().dispatch_later(events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop(SESSION_EVENTS_KEY, None)
+
+
+# Singleton instance
+_domain_event_bus: Optional[DomainEventBus] = None
+
+
+def get_domain_event_bus() -> DomainEventBus:
+    """Get or create domain event bus singleton"""
+    global _domain_event_bus
+
+    if _domain_event_bus is None:
+        _domain_event_bus = DomainEventBus()
+        _domain_event_bus.subscribe(push_to_websocket)
+        _domain_event_bus.subscribe(invalidate_dashboard_stats)
+        _domain_event_bus.subscribe(enqueue_search_updates)
+
+    return _domain_event_bus
@@ -541,6 +541,35 @@ class ElasticsearchService:
             return []
 
 
+def instance_to_dict(instance) -> Dict[str, Any]:
+    """Convert an Instance row into the dict accepted by index_instance"""
+    return {
+        "id": instance.id,
+        "title": instance.title,
+        "subtitle": instance.subtitle,
+        "index_title": instance.index_title,
+        "series": instance.series,
+        "edition": instance.edition,
+        "publication": instance.publication,
+        "publication_period": instance.publication_period,
+        "contributors": instance.contributors,
+        "subjects": instance.subjects,
+        "classifications": instance.classifications,
+        "languages": instance.languages,
+        "instance_type_id": instance.instance_type_id,
+        "instance_format_ids": instance.instance_format_ids,
+        "identifiers": instance.identifiers,
+        "cataloged_date": instance.cataloged_date,
+        "staff_suppress": instance.staff_suppress,
+        "discovery_suppress": instance.discovery_suppress,
+        "source": instance.source,
+        "tags": instance.tags,
+        "tenant_id": instance.tenant_id,
+        "created_date": instance.created_date,
+        "updated_date": instance.updated_date
+    }
+
+
 # ============================================================================
 # SINGLETON INSTANCE
 # ============================================================================
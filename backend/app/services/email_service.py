@@ -4,11 +4,12 @@ Send emails using SMTP with Jinja2 templates
 """
 
 import aiosmtplib
+from email.mime.application import MIMEApplication
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 
 from app.core.config import settings
@@ -47,6 +48,7 @@ class EmailService:
         text_body: Optional[str] = None,
         cc: Optional[List[str]] = None,
         bcc: Optional[List[str]] = None,
+        attachments: Optional[List[Tuple[str, bytes, str]]] = None,
     ) -> bool:
         """
         Send email via SMTP
@@ -58,6 +60,7 @@ class EmailService:
             text_body: Plain text email body (optional)
             cc: CC recipients (optional)
             bcc: BCC recipients (optional)
+            attachments: (filename, content, media type) files (optional)
 
         Returns:
             True if email sent successfully, False otherwise
@@ -65,6 +68,10 @@ class EmailService:
         try:
             # Create message
             message = MIMEMultipart('alternative')
+            body = message
+            if attachments:
+                message = MIMEMultipart('mixed')
+                message.attach(body)
             message['Subject'] = subject
             message['From'] = f"{self.from_name} <{self.from_email}>"
             message['To'] = to_email
@@ -77,10 +84,16 @@ class EmailService:
             # Add text and HTML parts
             if text_body:
                 text_part = MIMEText(text_body, 'plain')
-                message.attach(text_part)
+                body.attach(text_part)
 
             html_part = MIMEText(html_body, 'html')
-            message.attach(html_part)
+            body.attach(html_part)
+
+            for filename, content, media_type in attachments or []:
+                part = MIMEApplication(content, _subtype=media_type.split('/', 1)[-1])
+                part.replace_header('Content-Type', media_type)
+                part.add_header('Content-Disposition', 'attachment', filename=filename)
+                message.attach(part)
 
             # Send email
             await aiosmtplib.send(
@@ -126,6 +139,7 @@ class EmailService:
         context: Dict[str, Any],
         cc: Optional[List[str]] = None,
         bcc: Optional[List[str]] = None,
+        attachments: Optional[List[Tuple[str, bytes, str]]] = None,
     ) -> bool:
         """
         Send email using a template
@@ -137,6 +151,7 @@ class EmailService:
             context: Template context variables
             cc: CC recipients (optional)
             bcc: BCC recipients (optional)
+            attachments: (filename, content, media type) files (optional)
 
         Returns:
             True if email sent successfully, False otherwise
@@ -152,6 +167,7 @@ class EmailService:
                 html_body=html_body,
                 cc=cc,
                 bcc=bcc,
+                attachments=attachments,
             )
 
         except Exception as e:
@@ -221,6 +237,33 @@ class EmailService:
             context=context,
         )
 
+    async def send_scheduled_report(
+        self,
+        to_email: str,
+        report_name: str,
+        generated_at: str,
+        filename: str,
+        content: Optional[bytes],
+        media_type: str,
+        job_id: str,
+    ) -> bool:
+        """Send a scheduled report, with the file attached unless content is None (too large)"""
+        context = {
+            'report_name': report_name,
+            'generated_at': generated_at,
+            'filename': filename,
+            'attached': content is not None,
+            'download_path': f"{settings.API_V1_PREFIX}/reports/jobs/{job_id}/download",
+        }
+
+        return await self.send_templated_email(
+            to_email=to_email,
+            subject=f"Scheduled Report: {report_name}",
+            template_name='scheduled_report.html',
+            context=context,
+            attachments=[(filename, content, media_type)] if content is not None else None,
+        )
+
     async def send_welcome_email(
         self,
         user_email: str,
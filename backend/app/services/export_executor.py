@@ -0,0 +1,91 @@
+"""
+Export Executor
+Render report exports in a bounded process pool, off the event loop
+"""
+
+import logging
+import multiprocessing
+import time
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.services.pool_executor import BoundedPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class ExportExecutor:
+    """
+    Process pool for CPU-bound export rendering (xlsxwriter, reportlab,
+    pyarrow, csv), with render times per export format.
+
+    One worker per CPU by default (REPORT_EXPORT_WORKERS); at most
+    REPORT_EXPORT_MAX_QUEUE renders wait for a worker and further ones are
+    rejected with 503. Daemonic processes (Celery prefork workers) cannot
+    start children, so there the pool uses threads; such a worker runs one
+    job at a time and has no event loop to keep free.
+    """
+
+    def __init__(self, pool: Optional[BoundedPoolExecutor] = None):
+        if pool is None:
+            kind = "process"
+            if multiprocessing.current_process().daemon:
+                logger.warning("Exports render in a daemonic process, rendering with threads")
+                kind = "thread"
+            pool = BoundedPoolExecutor(
+                name="export",
+                kind=kind,
+                max_workers=settings.REPORT_EXPORT_WORKERS or None,
+                max_queue=settings.REPORT_EXPORT_MAX_QUEUE,
+            )
+        self.pool = pool
+        self._renders: Dict[str, Dict[str, float]] = {}
+
+    async def render(self, export_format: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a picklable render function in the pool and await its result.
+
+        Raises:
+            HTTPException: 503 when the queue is full
+        """
+        started_at = time.perf_counter()
+        result = await self.pool.run(fn, *args)
+        elapsed = time.perf_counter() - started_at
+
+        stats = self._renders.setdefault(export_format, {"count": 0, "total": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["total"] += elapsed
+        stats["max"] = max(stats["max"], elapsed)
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """Pool counters plus render times (queue wait included) per format."""
+        return {
+            **self.pool.metrics(),
+            "renders": {
+                export_format: {
+                    "count": int(stats["count"]),
+                    "avg_ms": round(stats["total"] / stats["count"] * 1000, 2),
+                    "max_ms": round(stats["max"] * 1000, 2),
+                }
+                for export_format, stats in self._renders.items()
+            },
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Shut the pool down; it is recreated on next use."""
+        self.pool.shutdown(wait=wait)
+
+
+# Singleton instance
+_export_executor: Optional[ExportExecutor] = None
+
+
+def get_export_executor() -> ExportExecutor:
+    """Get or create export executor singleton"""
+    global _export_executor
+
+    if _export_executor is None:
+        _export_executor = ExportExecutor()
+
+    return _export_executor
@@ -1,27 +1,574 @@
 """
 Export Service
-Generate reports in various formats (CSV, Excel, PDF)
+Generate reports in various formats (CSV, Excel, PDF, Parquet, Arrow)
 """
 
+import csv
 import io
+import itertools
 import logging
-from datetime import datetime
+import pickle
+import tempfile
+from datetime import date, datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from uuid import uuid4
+from typing import List, Dict, Any, AsyncIterable, BinaryIO, Callable, Iterable, Iterator, Optional, Tuple
+from uuid import UUID, uuid4
 
 import pandas as pd
+import xlsxwriter
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
+from reportlab.lib.pagesizes import letter, landscape, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
+from app.core.config import settings
 from app.schemas.report import ReportType, ExportFormat, ReportData
+from app.services.export_executor import get_export_executor
 
 logger = logging.getLogger(__name__)
 
+# Formats written with pyarrow (imported on first use)
+COLUMNAR_FORMATS = {ExportFormat.PARQUET, ExportFormat.ARROW}
+
+
+def arrow_schema(columns: List[Tuple[str, str]]):
+    """
+    Arrow schema of typed report columns.
+
+    Column types: string, int, float, bool, date, timestamp (UTC) and
+    money (decimal with 2 places, so amounts are exact).
+    """
+    import pyarrow as pa
+
+    types = {
+        "string": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "date": pa.date32(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "money": pa.decimal128(18, 2),
+    }
+    return pa.schema([(name, types[column_type]) for name, column_type in columns])
+
+
+class ColumnarWriter:
+    """Parquet or Arrow IPC file writer taking one record batch at a time."""
+
+    def __init__(self, sink: BinaryIO, schema, export_format: ExportFormat):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if export_format == ExportFormat.PARQUET:
+            self._writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        else:
+            self._writer = pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+        self._parquet = export_format == ExportFormat.PARQUET
+        self.schema = schema
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Write rows as one row group / record batch."""
+        import pyarrow as pa
+
+        batch = pa.RecordBatch.from_pylist(rows, schema=self.schema)
+        if self._parquet:
+            self._writer.write_batch(batch, row_group_size=len(rows))
+        else:
+            self._writer.write_batch(batch)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def write_columnar(
+    rows: Iterable[Dict[str, Any]],
+    columns: List[Tuple[str, str]],
+    sink: BinaryIO,
+    export_format: ExportFormat,
+    row_group_size: Optional[int] = None,
+) -> int:
+    """
+    Write typed rows to a Parquet or Arrow IPC file as they are read.
+
+    Only one row group (REPORT_EXPORT_ROW_GROUP_SIZE rows) is held in
+    memory at a time, whatever the size of the export.
+
+    Returns:
+        Number of rows written
+    """
+    row_group_size = row_group_size or settings.REPORT_EXPORT_ROW_GROUP_SIZE
+    writer = ColumnarWriter(sink, arrow_schema(columns), export_format)
+
+    written = 0
+    buffer = []
+    try:
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) >= row_group_size:
+                writer.write_rows(buffer)
+                written += len(buffer)
+                buffer = []
+
+        if buffer:
+            writer.write_rows(buffer)
+            written += len(buffer)
+    finally:
+        # Closing writes the footer, so an empty export is a valid schema-only file
+        writer.close()
+
+    return written
+
+
+# Rows sampled to size Excel columns, and the widest column
+EXCEL_WIDTH_SAMPLE_ROWS = 500
+EXCEL_MAX_COLUMN_WIDTH = 50
+
+
+def excel_cell(value):
+    """Value xlsxwriter can write natively (numbers, dates, text)."""
+    if isinstance(value, (dict, list, tuple, UUID)):
+        return str(value)
+    return value
+
+
+class XlsxStreamWriter:
+    """
+    XLSX workbook written row by row in xlsxwriter's constant_memory mode.
+
+    Each row is flushed to a temporary file as soon as the next one starts,
+    so memory use does not depend on the number of rows; rows of a sheet
+    must therefore be written in order, one sheet after another. Column
+    widths are estimated from a sample of the first rows.
+    """
+
+    def __init__(self, sink: BinaryIO):
+        self.workbook = xlsxwriter.Workbook(sink, {
+            'constant_memory': True,
+            'remove_timezone': True,
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+        })
+        self.header_format = self.workbook.add_format({
+            'bold': True,
+            'text_wrap': True,
+            'valign': 'top',
+            'fg_color': '#106BA3',
+            'font_color': 'white',
+            'border': 1
+        })
+        self._sheet = None
+        self._columns: List[str] = []
+        self._row = 0
+
+    def add_sheet(self, name: str, columns: List[str], sample: List[Dict[str, Any]]) -> None:
+        """Start a sheet: size columns from sample, write the header, then the sample rows."""
+        self._sheet = self.workbook.add_worksheet(name)
+        self._columns = columns
+        self._row = 0
+
+        for col_num, column in enumerate(columns):
+            column_len = max([len(column)] + [len(str(row.get(column, ''))) for row in sample])
+            self._sheet.set_column(col_num, col_num, min(column_len + 2, EXCEL_MAX_COLUMN_WIDTH))
+
+        if columns:
+            self._sheet.write_row(0, 0, columns, self.header_format)
+            self._row = 1
+
+        for row in sample:
+            self.write_row(row)
+
+    def write_row(self, row: Dict[str, Any]) -> None:
+        """Append a row to the current sheet."""
+        self._sheet.write_row(self._row, 0, [excel_cell(row.get(column)) for column in self._columns])
+        self._row += 1
+
+    def add_summary_sheet(self, summary: Dict[str, Any]) -> None:
+        """Add a 'Summary' sheet of one row of totals."""
+        self.add_sheet('Summary', list(summary.keys()), [summary])
+
+    def close(self) -> None:
+        self.workbook.close()
+
+
+def write_excel(
+    rows: Iterable[Dict[str, Any]],
+    columns: List[str],
+    sink: BinaryIO,
+    sheet_name: str = "Report",
+    summary: Optional[Callable[[], Optional[Dict[str, Any]]]] = None,
+) -> int:
+    """
+    Write rows to an XLSX file as they are read.
+
+    Only the width sample (EXCEL_WIDTH_SAMPLE_ROWS rows) is buffered. The
+    summary callable is called once the rows are exhausted, so it can
+    report totals accumulated while they streamed by.
+
+    Returns:
+        Number of rows written
+    """
+    writer = XlsxStreamWriter(sink)
+    try:
+        sample = []
+        written = 0
+        for row in rows:
+            if written < EXCEL_WIDTH_SAMPLE_ROWS:
+                sample.append(row)
+                if len(sample) == EXCEL_WIDTH_SAMPLE_ROWS:
+                    writer.add_sheet(sheet_name, columns, sample)
+            else:
+                writer.write_row(row)
+            written += 1
+
+        if written < EXCEL_WIDTH_SAMPLE_ROWS:
+            writer.add_sheet(sheet_name, columns, sample)
+
+        totals = summary() if summary else None
+        if totals:
+            writer.add_summary_sheet(totals)
+    finally:
+        writer.close()
+
+    return written
+
+
+# Paged PDF tables: rows have a fixed height, so a page holds a known number
+PDF_ROW_HEIGHT = 12
+PDF_FRAME_PADDING = 6  # SimpleDocTemplate frame padding on each side
+PDF_PORTRAIT_MAX_COLUMNS = 6  # Wider tables are printed landscape
+PDF_BRAND_COLOR = colors.HexColor('#106BA3')
+
+PDF_TABLE_STYLE = TableStyle([
+    # Header row
+    ('BACKGROUND', (0, 0), (-1, 0), PDF_BRAND_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 8),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    # Data rows
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 7),
+    ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('TOPPADDING', (0, 0), (-1, -1), 1),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+    # Grid
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    # Alternating row colors
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F9F9F9')]),
+])
+
+
+def pdf_cell(value, max_chars: int) -> str:
+    """Printable text of a report cell, clipped to its column."""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        text = value.strftime('%Y-%m-%d %H:%M')
+    elif isinstance(value, date):
+        text = value.isoformat()
+    else:
+        text = str(value)
+    return text if len(text) <= max_chars else text[:max_chars - 3] + '...'
+
+
+class FlowableStream(list):
+    """
+    Flowables produced on demand for SimpleDocTemplate.build.
+
+    build() consumes its list from the front; this list refills itself from
+    an iterator as it drains, so only the next few page tables exist at a
+    time however many rows the report has.
+    """
+
+    def __init__(self, flowables: Iterable[Any], lookahead: int = 2):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+        self._refill()
+
+    def _refill(self) -> None:
+        while list.__len__(self) < self._lookahead:
+            flowable = next(self._source, None)
+            if flowable is None:
+                break
+            self.append(flowable)
+
+    def __len__(self) -> int:
+        self._refill()
+        return list.__len__(self)
+
+
+def pdf_document(sink: BinaryIO, column_count: int) -> SimpleDocTemplate:
+    """Page setup of a report PDF."""
+    return SimpleDocTemplate(
+        sink,
+        pagesize=landscape(letter) if column_count > PDF_PORTRAIT_MAX_COLUMNS else letter,
+        rightMargin=0.5*inch,
+        leftMargin=0.5*inch,
+        topMargin=0.75*inch,
+        bottomMargin=0.5*inch,
+        pageCompression=1,
+    )
+
+
+def pdf_rows_per_page(doc: SimpleDocTemplate) -> int:
+    """Data rows of one page table (below its header row)."""
+    return max(1, int((doc.height - 2 * PDF_FRAME_PADDING) // PDF_ROW_HEIGHT) - 1)
+
+
+def build_pdf(sink: BinaryIO, meta: Dict[str, Any], rows: Iterable[List[Any]]) -> int:
+    """
+    Render a report PDF: a first page of metadata and summary, then the rows
+    as one fixed-size table per page.
+
+    Rows are value lists in meta['columns'] order and are consumed lazily,
+    one page at a time; a page table is never split, so layout cost is
+    linear in the number of rows.
+
+    Args:
+        sink: Binary file to write to
+        meta: title, description, report_type, generated_at,
+            total_records, summary and columns of the report
+        rows: Iterable of row values
+
+    Returns:
+        Number of pages
+    """
+    columns = meta['columns']
+    doc = pdf_document(sink, len(columns))
+    styles = getSampleStyleSheet()
+
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=PDF_BRAND_COLOR,
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=PDF_BRAND_COLOR,
+        spaceAfter=12,
+        spaceBefore=12
+    )
+
+    elements = [Paragraph(meta['title'], title_style)]
+    if meta.get('description'):
+        elements.append(Paragraph(meta['description'], styles['Normal']))
+    elements.append(Spacer(1, 0.2*inch))
+
+    metadata_table = Table([
+        ['Report Type:', meta['report_type'].title()],
+        ['Generated:', meta['generated_at'].strftime('%Y-%m-%d %H:%M:%S')],
+        ['Total Records:', str(meta['total_records'])]
+    ], colWidths=[2*inch, 4*inch])
+    metadata_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('TEXTCOLOR', (0, 0), (0, -1), PDF_BRAND_COLOR),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]))
+    elements.append(metadata_table)
+    elements.append(Spacer(1, 0.3*inch))
+
+    if meta.get('summary'):
+        elements.append(Paragraph('Summary', heading_style))
+
+        summary_table = Table(
+            [[k.replace('_', ' ').title(), str(v)] for k, v in meta['summary'].items()],
+            colWidths=[3*inch, 3*inch]
+        )
+        summary_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F4F4F4')),
+            ('TEXTCOLOR', (0, 0), (0, -1), PDF_BRAND_COLOR),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]))
+        elements.append(summary_table)
+
+    col_width = doc.width / max(len(columns), 1)
+    max_chars = max(4, int(col_width / 3.5))  # ~3.5pt per character at 7pt Helvetica
+    headers = [pdf_cell(column.replace('_', ' ').title(), max_chars) for column in columns]
+    per_page = pdf_rows_per_page(doc)
+
+    def page_tables():
+        page = []
+        for row in rows:
+            page.append([pdf_cell(value, max_chars) for value in row])
+            if len(page) == per_page:
+                yield from page_table(page)
+                page = []
+        if page:
+            yield from page_table(page)
+
+    def page_table(page):
+        table = Table(
+            [headers] + page,
+            colWidths=[col_width] * len(columns),
+            rowHeights=PDF_ROW_HEIGHT,
+            repeatRows=1,
+        )
+        table.setStyle(PDF_TABLE_STYLE)
+        yield PageBreak()
+        yield table
+
+    def footer(canvas, document):
+        canvas.saveState()
+        canvas.setFont('Helvetica', 8)
+        canvas.setFillColor(colors.grey)
+        canvas.drawString(document.leftMargin, 0.3*inch, meta['title'])
+        canvas.drawRightString(document.leftMargin + document.width, 0.3*inch, f"Page {document.page}")
+        canvas.restoreState()
+
+    if columns:
+        flowables = FlowableStream(itertools.chain(elements, page_tables()))
+    else:
+        flowables = elements + [Paragraph('<i>No records.</i>', styles['Italic'])]
+
+    doc.build(flowables, onFirstPage=footer, onLaterPages=footer)
+    return doc.page
+
+
+def csv_cell(value):
+    """CSV text of a typed report cell (csv writes None as empty)."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def write_csv(rows: Iterable[Dict[str, Any]], columns: List[str], sink: BinaryIO) -> int:
+    """
+    Write rows to a UTF-8 CSV file with a header row, as they are read.
+
+    Returns:
+        Number of rows written
+    """
+    text = io.TextIOWrapper(sink, encoding='utf-8', newline='')
+    writer = csv.writer(text)
+    writer.writerow(columns)
+
+    written = 0
+    for row in rows:
+        writer.writerow([csv_cell(row.get(column)) for column in columns])
+        written += 1
+
+    text.flush()
+    text.detach()
+    return written
+
+
+def read_spool(path: str) -> Iterator[List[Any]]:
+    """Rows of a spool file written by write_export, one batch in memory at a time."""
+    with open(path, 'rb') as handle:
+        while True:
+            try:
+                batch = pickle.load(handle)
+            except EOFError:
+                return
+            yield from batch
+
+
+def render_spool(spool_path: str, output_path: str, export_format: str, meta: Dict[str, Any]) -> int:
+    """
+    Render spooled rows into an export file (runs in the export pool).
+
+    Args:
+        spool_path: Spool file written by write_export
+        output_path: File to write
+        export_format: ExportFormat value (csv, excel, pdf, parquet, arrow)
+        meta: title, description, report_type, generated_at,
+            total_records, summary and typed columns of the report
+
+    Returns:
+        Number of rows (or, for PDF, pages) written
+    """
+    export_format = ExportFormat(export_format)
+    names = [name for name, _ in meta['columns']]
+    values = read_spool(spool_path)
+
+    with open(output_path, 'wb') as sink:
+        if export_format == ExportFormat.PDF:
+            return build_pdf(sink, {**meta, 'columns': names}, values)
+
+        rows = (dict(zip(names, row)) for row in values)
+        if export_format in COLUMNAR_FORMATS:
+            return write_columnar(rows, meta['columns'], sink, export_format)
+        if export_format == ExportFormat.EXCEL:
+            return write_excel(rows, names, sink, meta['title'][:31], summary=lambda: meta['summary'])
+        if export_format == ExportFormat.CSV:
+            return write_csv(rows, names, sink)
+
+    raise ValueError(f"Unsupported export format: {export_format}")
+
+
+async def write_export(
+    rows: AsyncIterable[Dict[str, Any]],
+    columns: List[Tuple[str, str]],
+    path,
+    export_format: ExportFormat,
+    meta: Dict[str, Any],
+    summary: Optional[Callable[[], Optional[Dict[str, Any]]]] = None,
+) -> int:
+    """
+    Write typed rows to an export file, rendered in the export pool.
+
+    Rows are pickled to a spool file beside `path` in batches as they
+    arrive (cheap, on the event loop); a pool worker then reads them back
+    batch by batch and does the formatting, so neither side holds the
+    report in memory and the loop stays free. The summary callable is
+    called once the rows are exhausted.
+
+    Args:
+        rows: Typed report rows
+        columns: Column names and types (see arrow_schema), in order
+        path: File to write
+        export_format: Format to render
+        meta: title, description, report_type and generated_at
+
+    Returns:
+        Number of rows written
+    """
+    batch_size = settings.REPORT_EXPORT_FETCH_SIZE
+    names = [name for name, _ in columns]
+    written = 0
+
+    with tempfile.NamedTemporaryFile(dir=Path(path).parent, suffix='.rows') as spool:
+        batch = []
+        async for row in rows:
+            batch.append([row.get(name) for name in names])
+            if len(batch) >= batch_size:
+                pickle.dump(batch, spool, pickle.HIGHEST_PROTOCOL)
+                written += len(batch)
+                batch = []
+        if batch:
+            pickle.dump(batch, spool, pickle.HIGHEST_PROTOCOL)
+            written += len(batch)
+        spool.flush()
+
+        meta = {
+            **meta,
+            'columns': columns,
+            'total_records': written,
+            'summary': summary() if summary else None,
+        }
+        await get_export_executor().render(
+            export_format.value, render_spool, spool.name, str(path), export_format.value, meta
+        )
+
+    return written
+
 
 class ExportService:
     """Service for exporting data to various formats"""
@@ -78,49 +625,21 @@ class ExportService:
             Excel file content as bytes
         """
         try:
-            df = pd.DataFrame(data)
-
-            # Create Excel file in memory
             output = io.BytesIO()
 
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                # Write main data
-                df.to_excel(writer, sheet_name=sheet_name, index=False, startrow=0)
-
-                # Get workbook and worksheet objects
-                workbook = writer.book
-                worksheet = writer.sheets[sheet_name]
-
-                # Add formats
-                header_format = workbook.add_format({
-                    'bold': True,
-                    'text_wrap': True,
-                    'valign': 'top',
-                    'fg_color': '#106BA3',
-                    'font_color': 'white',
-                    'border': 1
-                })
-
-                # Format header row
-                for col_num, value in enumerate(df.columns.values):
-                    worksheet.write(0, col_num, value, header_format)
-                    # Auto-adjust column width
-                    column_len = max(df[value].astype(str).map(len).max(), len(value))
-                    worksheet.set_column(col_num, col_num, min(column_len + 2, 50))
-
-                # Add summary sheet if provided
-                if summary:
-                    summary_df = pd.DataFrame([summary])
-                    summary_df.to_excel(writer, sheet_name='Summary', index=False)
+            writer = XlsxStreamWriter(output)
+            try:
+                columns = list(data[0].keys()) if data else []
+                writer.add_sheet(sheet_name, columns, data[:EXCEL_WIDTH_SAMPLE_ROWS])
+                for row in data[EXCEL_WIDTH_SAMPLE_ROWS:]:
+                    writer.write_row(row)
 
-                    summary_sheet = writer.sheets['Summary']
-                    for col_num, value in enumerate(summary_df.columns.values):
-                        summary_sheet.write(0, col_num, value, header_format)
-
-            excel_content = output.getvalue()
-            output.close()
+                if summary:
+                    writer.add_summary_sheet(summary)
+            finally:
+                writer.close()
 
-            return excel_content
+            return output.getvalue()
 
         except Exception as e:
             logger.error(f"Error exporting to Excel: {e}")
@@ -135,6 +654,8 @@ class ExportService:
         """
         Export data to PDF format with formatting
 
+        Every record is printed, one fixed-size table per page (see build_pdf).
+
         Args:
             report_data: ReportData object containing all report information
             filename: Optional filename (not used, for interface consistency)
@@ -144,159 +665,63 @@ class ExportService:
             PDF file content as bytes
         """
         try:
-            # Create PDF in memory
             output = io.BytesIO()
 
-            # Create document
-            doc = SimpleDocTemplate(
+            columns = list(report_data.data[0].keys()) if report_data.data else []
+            build_pdf(
                 output,
-                pagesize=letter,
-                rightMargin=0.5*inch,
-                leftMargin=0.5*inch,
-                topMargin=0.75*inch,
-                bottomMargin=0.5*inch
+                {
+                    'title': report_data.title,
+                    'description': report_data.description,
+                    'report_type': report_data.report_type.value,
+                    'generated_at': report_data.generated_at,
+                    'total_records': report_data.total_records,
+                    'summary': report_data.summary,
+                    'columns': columns,
+                },
+                ([row.get(column) for column in columns] for row in report_data.data),
             )
 
-            # Container for PDF elements
-            elements = []
-
-            # Styles
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#106BA3'),
-                spaceAfter=30,
-                alignment=TA_CENTER
-            )
+            return output.getvalue()
 
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=14,
-                textColor=colors.HexColor('#106BA3'),
-                spaceAfter=12,
-                spaceBefore=12
-            )
+        except Exception as e:
+            logger.error(f"Error exporting to PDF: {e}")
+            raise
 
-            # Title
-            title = Paragraph(report_data.title, title_style)
-            elements.append(title)
-
-            # Description
-            if report_data.description:
-                desc = Paragraph(report_data.description, styles['Normal'])
-                elements.append(desc)
-
-            elements.append(Spacer(1, 0.2*inch))
-
-            # Report metadata
-            metadata_data = [
-                ['Report Type:', report_data.report_type.value.title()],
-                ['Generated:', report_data.generated_at.strftime('%Y-%m-%d %H:%M:%S')],
-                ['Total Records:', str(report_data.total_records)]
-            ]
-
-            metadata_table = Table(metadata_data, colWidths=[2*inch, 4*inch])
-            metadata_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#106BA3')),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ]))
-
-            elements.append(metadata_table)
-            elements.append(Spacer(1, 0.3*inch))
-
-            # Summary section
-            if report_data.summary:
-                summary_heading = Paragraph('Summary', heading_style)
-                elements.append(summary_heading)
-
-                summary_data = [[k.replace('_', ' ').title(), str(v)] for k, v in report_data.summary.items()]
-
-                summary_table = Table(summary_data, colWidths=[3*inch, 3*inch])
-                summary_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F4F4F4')),
-                    ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#106BA3')),
-                    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10),
-                    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ]))
-
-                elements.append(summary_table)
-                elements.append(Spacer(1, 0.3*inch))
-
-            # Data table
-            if report_data.data:
-                data_heading = Paragraph('Report Data', heading_style)
-                elements.append(data_heading)
-
-                # Limit data for PDF (first 100 records)
-                data_subset = report_data.data[:100]
-
-                # Convert data to table format
-                if data_subset:
-                    # Get column headers
-                    headers = list(data_subset[0].keys())
-
-                    # Prepare table data
-                    table_data = [headers]
-                    for row in data_subset:
-                        table_data.append([str(row.get(h, '')) for h in headers])
-
-                    # Calculate column widths based on number of columns
-                    num_cols = len(headers)
-                    col_width = 6.5*inch / num_cols
-
-                    data_table = Table(table_data, colWidths=[col_width] * num_cols, repeatRows=1)
-                    data_table.setStyle(TableStyle([
-                        # Header row
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#106BA3')),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, 0), 9),
-                        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                        # Data rows
-                        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                        ('FONTSIZE', (0, 1), (-1, -1), 8),
-                        ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-                        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                        # Grid
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                        # Alternating row colors
-                        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F9F9F9')]),
-                    ]))
-
-                    elements.append(data_table)
-
-                    # Add note if data was truncated
-                    if len(report_data.data) > 100:
-                        note = Paragraph(
-                            f"<i>Note: Showing first 100 of {report_data.total_records} records. "
-                            f"Download CSV or Excel for complete data.</i>",
-                            styles['Italic']
-                        )
-                        elements.append(Spacer(1, 0.1*inch))
-                        elements.append(note)
-
-            # Build PDF
-            doc.build(elements)
-
-            pdf_content = output.getvalue()
-            output.close()
+    def export_to_columnar(
+        self,
+        data: List[Dict[str, Any]],
+        export_format: ExportFormat,
+        columns: Optional[List[Tuple[str, str]]] = None
+    ) -> bytes:
+        """
+        Export data to Parquet or Arrow IPC format
 
-            return pdf_content
+        Args:
+            data: List of dictionaries containing data
+            export_format: ExportFormat.PARQUET or ExportFormat.ARROW
+            columns: Optional (name, type) column types (see arrow_schema);
+                inferred from the values when omitted
+
+        Returns:
+            File content as bytes
+        """
+        import pyarrow as pa
+
+        try:
+            schema = arrow_schema(columns) if columns else pa.Table.from_pylist(data).schema
+            output = io.BytesIO()
+
+            writer = ColumnarWriter(output, schema, export_format)
+            try:
+                writer.write_rows(data)
+            finally:
+                writer.close()
+
+            return output.getvalue()
 
         except Exception as e:
-            logger.error(f"Error exporting to PDF: {e}")
+            logger.error(f"Error exporting to {export_format.value}: {e}")
             raise
 
     def export_report(
@@ -331,6 +756,8 @@ class ExportService:
             )
         elif export_format == ExportFormat.PDF:
             return self.export_to_pdf(report_data, filename)
+        elif export_format in COLUMNAR_FORMATS:
+            return self.export_to_columnar(report_data.data, export_format)
         else:
             raise ValueError(f"Unsupported export format: {export_format}")
 
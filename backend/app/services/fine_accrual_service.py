@@ -0,0 +1,352 @@
+"""
+Fine Accrual Service
+Apply FeePolicy overdue rules and keep automated overdue Fee rows current
+"""
+
+import logging
+import math
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.circulation import Loan, LoanStatus
+from app.models.fee import Fee, FeePolicy, FeeStatus, FeeType, OVERDUE_FEE_INDEX_WHERE
+from app.models.job import JobWatermark
+from app.services.patron_account_service import PatronAccountService
+
+logger = logging.getLogger(__name__)
+
+CENT = Decimal("0.01")
+
+
+def default_overdue_policy() -> Dict[str, Any]:
+    """Policy applied when a tenant has no active overdue FeePolicy."""
+    return {
+        "id": None,
+        "initial_amount": Decimal("0.00"),
+        "per_day_amount": Decimal(str(settings.DEFAULT_OVERDUE_FINE_PER_DAY)),
+        "grace_period_days": 0,
+        "max_amount": None,
+    }
+
+
+def overdue_policy_query(tenant_id):
+    """SELECT of a tenant's active overdue FeePolicy (most recently updated)."""
+    return select(FeePolicy).where(
+        and_(
+            FeePolicy.tenant_id == tenant_id,
+            FeePolicy.fee_type == FeeType.OVERDUE,
+            FeePolicy.is_active == True
+        )
+    ).order_by(FeePolicy.updated_date.desc().nullslast()).limit(1)
+
+
+def overdue_policy(fee_policy: Optional[FeePolicy]) -> Dict[str, Any]:
+    """Policy dict of an overdue FeePolicy, or the default policy when there is none."""
+    policy = default_overdue_policy()
+    if fee_policy:
+        policy = {
+            "id": str(fee_policy.id),
+            "initial_amount": fee_policy.initial_amount or Decimal("0.00"),
+            "per_day_amount": fee_policy.per_day_amount if fee_policy.per_day_amount is not None else policy["per_day_amount"],
+            "grace_period_days": fee_policy.grace_period_days or 0,
+            "max_amount": fee_policy.max_amount,
+        }
+    return policy
+
+
+def _utc_date(value: datetime) -> date:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+def _utc_midnight(value: datetime) -> datetime:
+    return datetime.combine(_utc_date(value), datetime.min.time(), tzinfo=timezone.utc)
+
+
+def chargeable_days(due_date: datetime, as_of: datetime, policy: Dict[str, Any]) -> int:
+    """Whole UTC days overdue beyond the grace period."""
+    days_overdue = (_utc_date(as_of) - _utc_date(due_date)).days
+    return max(0, days_overdue - (policy["grace_period_days"] or 0))
+
+
+def calculate_overdue_fine(due_date: datetime, as_of: datetime, policy: Dict[str, Any]) -> Decimal:
+    """
+    Calculate the overdue fine of a loan as of a point in time.
+
+    initial_amount + per_day_amount for every day past the grace period,
+    capped at max_amount. Nothing is charged inside the grace period.
+    """
+    days = chargeable_days(due_date, as_of, policy)
+    if days <= 0:
+        return Decimal("0.00")
+
+    amount = (policy["initial_amount"] or Decimal("0")) + days * (policy["per_day_amount"] or Decimal("0"))
+    if policy["max_amount"] is not None:
+        amount = min(amount, policy["max_amount"])
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def days_to_cap(policy: Dict[str, Any]) -> Optional[int]:
+    """Chargeable days after which the fine no longer changes (None if uncapped)."""
+    per_day = policy["per_day_amount"] or Decimal("0")
+    if per_day <= 0:
+        return 1
+    if policy["max_amount"] is None:
+        return None
+    remaining = policy["max_amount"] - (policy["initial_amount"] or Decimal("0"))
+    return max(1, math.ceil(remaining / per_day))
+
+
+def due_date_window(
+    policy: Dict[str, Any],
+    last_run_at: Optional[datetime],
+    now: datetime
+) -> Tuple[Optional[datetime], datetime]:
+    """
+    Due-date range of loans whose fine changed between two runs.
+
+    A loan's fine changes at a UTC day boundary while it has at least one
+    chargeable day now and had not yet reached the cap at the last run.
+
+    Returns:
+        (lower bound inclusive or None, upper bound exclusive)
+    """
+    grace = policy["grace_period_days"] or 0
+    upper = _utc_midnight(now) - timedelta(days=grace)
+
+    cap = days_to_cap(policy)
+    if last_run_at is None or cap is None:
+        return None, upper
+
+    lower = _utc_midnight(last_run_at) - timedelta(days=grace + cap - 1)
+    return lower, upper
+
+
+class FineAccrualService:
+    """
+    Nightly incremental overdue fine accrual.
+
+    Each run only reads open loans whose fine changed since the previous
+    run's watermark and upserts one automated overdue Fee per loan.
+    """
+
+    JOB_NAME = "overdue_fine_accrual"
+
+    def __init__(self, policy_ttl_seconds: Optional[int] = None, batch_size: Optional[int] = None):
+        self.policy_ttl_seconds = policy_ttl_seconds or settings.FEE_POLICY_CACHE_TTL_SECONDS
+        self.batch_size = batch_size or settings.FINE_ACCRUAL_BATCH_SIZE
+
+        # {tenant_id: (expires_at, policy)}
+        self._policies: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+    # ------------------------------------------------------------------
+    # Policy lookup
+    # ------------------------------------------------------------------
+
+    async def get_policy(self, db: AsyncSession, tenant_id) -> Dict[str, Any]:
+        """Get the tenant's active overdue fee policy (cached)."""
+        key = str(tenant_id)
+        cached = self._policies.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        result = await db.execute(overdue_policy_query(tenant_id))
+        policy = overdue_policy(result.scalar_one_or_none())
+
+        self._policies[key] = (time.monotonic() + self.policy_ttl_seconds, policy)
+        return policy
+
+    def invalidate_policy(self, tenant_id=None):
+        """Drop cached policies of one tenant (or all tenants)."""
+        if tenant_id is None:
+            self._policies.clear()
+        else:
+            self._policies.pop(str(tenant_id), None)
+
+    # ------------------------------------------------------------------
+    # Fee upserts
+    # ------------------------------------------------------------------
+
+    async def upsert_fees(self, db: AsyncSession, rows: List[Dict[str, Any]]):
+        """
+        Insert or update automated overdue fees in one statement.
+
+        Each row needs loan_id, user_id, item_id, tenant_id and amount.
+        Existing fees are only updated while still open; remaining is
+        recomputed from what has already been paid. The account summaries
+        of patrons whose fees changed are rebuilt in the same transaction.
+        """
+        if not rows:
+            return
+
+        now = datetime.utcnow()
+        values = [
+            {
+                "id": uuid.uuid4(),
+                "loan_id": row["loan_id"],
+                "user_id": row["user_id"],
+                "item_id": row["item_id"],
+                "tenant_id": row["tenant_id"],
+                "fee_type": FeeType.OVERDUE,
+                "status": FeeStatus.OPEN,
+                "amount": row["amount"],
+                "remaining": row["amount"],
+                "paid_amount": Decimal("0.00"),
+                "description": "Overdue fine",
+                "fee_date": now,
+                "automated": True,
+                "created_date": now,
+                "updated_date": now,
+            }
+            for row in rows
+        ]
+
+        stmt = pg_insert(Fee).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Fee.loan_id],
+            index_where=OVERDUE_FEE_INDEX_WHERE,
+            set_={
+                "amount": stmt.excluded.amount,
+                "remaining": func.greatest(stmt.excluded.amount - func.coalesce(Fee.paid_amount, 0), 0),
+                "updated_date": stmt.excluded.updated_date,
+            },
+            where=and_(Fee.status == FeeStatus.OPEN, Fee.amount != stmt.excluded.amount),
+        ).returning(Fee.user_id)
+        user_ids = set((await db.execute(stmt)).scalars().all())
+
+        if user_ids:
+            await PatronAccountService.rebuild(db, user_ids=user_ids)
+
+    async def assess_loan(self, db: AsyncSession, loan: Loan, as_of: datetime) -> Optional[Decimal]:
+        """
+        Settle the overdue fine of a single loan (e.g. at check-in).
+
+        Returns:
+            The fine amount, or None if nothing is owed
+        """
+        policy = await self.get_policy(db, loan.tenant_id)
+        amount = calculate_overdue_fine(loan.due_date, as_of, policy)
+        if amount <= 0:
+            return None
+
+        await self.upsert_fees(db, [{
+            "loan_id": loan.id,
+            "user_id": loan.user_id,
+            "item_id": loan.item_id,
+            "tenant_id": loan.tenant_id,
+            "amount": amount,
+        }])
+        return amount
+
+    # ------------------------------------------------------------------
+    # Nightly accrual
+    # ------------------------------------------------------------------
+
+    async def accrue(self, db: AsyncSession, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Accrue overdue fines for loans that crossed a day boundary.
+
+        Args:
+            db: Database session (committed by this method)
+            now: Accrual time (defaults to the current UTC time)
+
+        Returns:
+            Run statistics
+        """
+        now = now or datetime.now(timezone.utc)
+        watermark = await db.get(JobWatermark, self.JOB_NAME)
+        last_run_at = watermark.last_run_at if watermark else None
+
+        if last_run_at and _utc_date(last_run_at) >= _utc_date(now):
+            logger.info("Fine accrual already ran for this day, nothing to do")
+            return {"tenants": 0, "loans": 0, "skipped": True}
+
+        tenant_result = await db.execute(
+            select(Loan.tenant_id).where(
+                and_(
+                    Loan.status == LoanStatus.OPEN,
+                    Loan.due_date < _utc_midnight(now)
+                )
+            ).distinct()
+        )
+        tenant_ids = tenant_result.scalars().all()
+
+        loans_processed = 0
+        for tenant_id in tenant_ids:
+            loans_processed += await self._accrue_tenant(db, tenant_id, last_run_at, now)
+
+        if watermark is None:
+            watermark = JobWatermark(name=self.JOB_NAME, last_run_at=now)
+            db.add(watermark)
+        watermark.last_run_at = now
+        watermark.details = {"tenants": len(tenant_ids), "loans": loans_processed}
+
+        await db.commit()
+
+        logger.info(f"Fine accrual processed {loans_processed} loan(s) across {len(tenant_ids)} tenant(s)")
+        return {"tenants": len(tenant_ids), "loans": loans_processed, "skipped": False}
+
+    async def _accrue_tenant(
+        self,
+        db: AsyncSession,
+        tenant_id,
+        last_run_at: Optional[datetime],
+        now: datetime
+    ) -> int:
+        policy = await self.get_policy(db, tenant_id)
+        lower, upper = due_date_window(policy, last_run_at, now)
+
+        conditions = [
+            Loan.tenant_id == tenant_id,
+            Loan.status == LoanStatus.OPEN,
+            Loan.due_date < upper,
+        ]
+        if lower is not None:
+            conditions.append(Loan.due_date >= lower)
+
+        result = await db.stream(
+            select(Loan.id, Loan.user_id, Loan.item_id, Loan.due_date)
+            .where(and_(*conditions))
+            .execution_options(yield_per=self.batch_size)
+        )
+
+        processed = 0
+        async for partition in result.partitions(self.batch_size):
+            rows = []
+            for loan_id, user_id, item_id, due_date in partition:
+                amount = calculate_overdue_fine(due_date, now, policy)
+                if amount > 0:
+                    rows.append({
+                        "loan_id": loan_id,
+                        "user_id": user_id,
+                        "item_id": item_id,
+                        "tenant_id": tenant_id,
+                        "amount": amount,
+                    })
+            await self.upsert_fees(db, rows)
+            processed += len(partition)
+
+        return processed
+
+
+# Singleton instance
+_fine_accrual_service: Optional[FineAccrualService] = None
+
+
+def get_fine_accrual_service() -> FineAccrualService:
+    """Get or create fine accrual service singleton"""
+    global _fine_accrual_service
+
+    if _fine_accrual_service is None:
+        _fine_accrual_service = FineAccrualService()
+
+    return _fine_accrual_service
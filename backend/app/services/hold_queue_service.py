@@ -0,0 +1,169 @@
+"""
+Hold Queue Service
+Per-item request queues with dense integer positions
+"""
+
+from typing import Dict, List, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.circulation import Request, RequestStatus
+from app.models.inventory import Item
+
+# Requests that hold a place in an item's queue
+QUEUE_STATUSES = (RequestStatus.OPEN, RequestStatus.AWAITING_PICKUP, RequestStatus.IN_TRANSIT)
+
+
+def _in_queue(item_id):
+    return and_(Request.item_id == item_id, Request.status.in_(QUEUE_STATUSES))
+
+
+class HoldQueueService:
+    """
+    Maintain the request queue of each item.
+
+    Queued requests have positions 1..n with no gaps, served by the
+    (item_id, status, position) index. Every mutation first locks the item
+    row, so concurrent requests on one item are applied one at a time and
+    each operation is a constant number of statements regardless of the
+    queue length.
+    """
+
+    @staticmethod
+    async def lock(db: AsyncSession, item_id: UUID):
+        """Lock an item's queue until the transaction ends."""
+        await db.execute(select(Item.id).where(Item.id == item_id).with_for_update())
+
+    @staticmethod
+    async def next_position(db: AsyncSession, item_id: UUID) -> int:
+        """Position of a request appended to the queue (call after `lock`)."""
+        last = await db.scalar(select(func.max(Request.position)).where(_in_queue(item_id)))
+        return (last or 0) + 1
+
+    @staticmethod
+    async def next_request(db: AsyncSession, item_id: UUID) -> Optional[Request]:
+        """First request of the queue still waiting for the item."""
+        result = await db.execute(
+            select(Request)
+            .where(and_(Request.item_id == item_id, Request.status == RequestStatus.OPEN))
+            .order_by(Request.position)
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_queue(db: AsyncSession, item_id: UUID) -> List[Request]:
+        """Queued requests of an item in order."""
+        result = await db.execute(
+            select(Request).where(_in_queue(item_id)).order_by(Request.position)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def remove(db: AsyncSession, request: Request):
+        """
+        Take a request out of its queue and close the gap it leaves.
+
+        The caller sets the request's new status; call after `lock`.
+        """
+        position = request.position
+        request.position = None
+        if position is None:
+            return
+
+        await db.execute(
+            update(Request)
+            .where(and_(_in_queue(request.item_id), Request.position > position))
+            .values(position=Request.position - 1)
+            .execution_options(synchronize_session="fetch")
+        )
+
+    @staticmethod
+    async def move(db: AsyncSession, request: Request, new_position: int) -> int:
+        """
+        Move a queued request to another position (call after `lock`).
+
+        Requests in between shift by one. Positions past the end of the
+        queue move the request to the end.
+
+        Returns:
+            The request's new position
+        """
+        if request.position is None or request.status not in QUEUE_STATUSES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Request is not in the queue"
+            )
+
+        last = await db.scalar(select(func.max(Request.position)).where(_in_queue(request.item_id)))
+        new_position = max(1, min(new_position, last or 1))
+        old_position = request.position
+        if new_position == old_position:
+            return old_position
+
+        if new_position < old_position:
+            shift = and_(Request.position >= new_position, Request.position < old_position)
+            delta = 1
+        else:
+            shift = and_(Request.position > old_position, Request.position <= new_position)
+            delta = -1
+
+        await db.execute(
+            update(Request)
+            .where(and_(_in_queue(request.item_id), or_(shift, Request.id == request.id)))
+            .values(
+                position=case(
+                    (Request.id == request.id, new_position),
+                    else_=Request.position + delta,
+                )
+            )
+            .execution_options(synchronize_session="fetch")
+        )
+        request.position = new_position
+        return new_position
+
+    @staticmethod
+    async def reorder(db: AsyncSession, item_id: UUID, request_ids: Sequence[UUID]):
+        """
+        Replace the order of an item's queue in one statement (call after `lock`).
+
+        `request_ids` must list every queued request of the item exactly once.
+        """
+        queued = set(
+            (await db.execute(select(Request.id).where(_in_queue(item_id)))).scalars().all()
+        )
+        if len(request_ids) != len(set(request_ids)) or set(request_ids) != queued:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Reorder must list every queued request of the item exactly once"
+            )
+        if not request_ids:
+            return
+
+        await db.execute(
+            update(Request)
+            .where(_in_queue(item_id))
+            .values(
+                position=case(
+                    {request_id: index for index, request_id in enumerate(request_ids, start=1)},
+                    value=Request.id,
+                )
+            )
+            .execution_options(synchronize_session="fetch")
+        )
+
+    @staticmethod
+    async def queue_lengths(db: AsyncSession, item_ids: Sequence[UUID]) -> Dict[UUID, int]:
+        """Queue length of several items in one grouped query."""
+        if not item_ids:
+            return {}
+
+        result = await db.execute(
+            select(Request.item_id, func.count())
+            .where(and_(Request.item_id.in_(set(item_ids)), Request.status.in_(QUEUE_STATUSES)))
+            .group_by(Request.item_id)
+        )
+        return dict(result.all())
@@ -0,0 +1,246 @@
+"""
+Notification Counter Service
+Per-user unread notification counters kept in Redis
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import redis.asyncio as redis
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.notification import Notification
+
+logger = logging.getLogger(__name__)
+
+COUNTER_KEY = "notifications:unread:{tenant_id}:{user_id}"
+COUNTER_PATTERN = "notifications:unread:*"
+
+# Only adjust counters that are already cached; a missing key means the next
+# read recounts from the database. Counts never go below zero.
+INCREMENT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if value < 0 then
+    redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+    value = 0
+end
+return value
+"""
+
+
+def unread_filter(tenant_id: UUID, user_ids: Iterable[UUID], now: Optional[datetime] = None):
+    """Build the WHERE clause for a user's unread, unexpired notifications."""
+    now = now or datetime.utcnow()
+    return and_(
+        Notification.tenant_id == tenant_id,
+        Notification.user_id.in_(list(user_ids)),
+        Notification.is_read == False,
+        or_(
+            Notification.expires_at == None,
+            Notification.expires_at > now
+        )
+    )
+
+
+class NotificationCounterService:
+    """
+    Unread notification counters.
+
+    Counters live in Redis under a TTL and are adjusted as notifications are
+    created, read and deleted. A missing counter (or an unreachable Redis) is
+    answered from the database. Notifications that expire are not tracked
+    individually; the periodic reconciliation recounts cached counters.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, websocket_service=None):
+        self.ttl_seconds = ttl_seconds or settings.NOTIFICATION_UNREAD_COUNT_TTL_SECONDS
+        # WebSocket service counts are pushed through; the process singleton when not given
+        self.websocket_service = websocket_service
+        self._redis: Optional[redis.Redis] = None
+
+    def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        return self._redis
+
+    @staticmethod
+    def make_key(tenant_id, user_id) -> str:
+        return COUNTER_KEY.format(tenant_id=tenant_id, user_id=user_id)
+
+    async def count_from_db(self, db: AsyncSession, tenant_id, user_id) -> int:
+        """Count unread notifications for a user in the database."""
+        result = await db.execute(
+            select(func.count(Notification.id)).where(
+                unread_filter(UUID(str(tenant_id)), [UUID(str(user_id))])
+            )
+        )
+        return result.scalar() or 0
+
+    async def get_unread_count(self, db: AsyncSession, tenant_id, user_id) -> int:
+        """
+        Get a user's unread count, recounting from the database on a miss.
+
+        Args:
+            db: Database session used for the fallback count
+            tenant_id: Tenant ID
+            user_id: User ID
+
+        Returns:
+            Number of unread notifications
+        """
+        key = self.make_key(tenant_id, user_id)
+        try:
+            cached = await self._get_redis().get(key)
+            if cached is not None:
+                return int(cached)
+        except Exception as e:
+            logger.warning(f"Unread counter unavailable, counting from database: {e}")
+            return await self.count_from_db(db, tenant_id, user_id)
+
+        count = await self.count_from_db(db, tenant_id, user_id)
+        try:
+            # NX so a concurrent increment that raced the recount is kept
+            await self._get_redis().set(key, count, ex=self.ttl_seconds, nx=True)
+        except Exception as e:
+            logger.warning(f"Failed to cache unread counter for {key}: {e}")
+        return count
+
+    async def increment(self, tenant_id, user_id, amount: int = 1, notify: bool = True) -> Optional[int]:
+        """
+        Adjust a cached counter by ``amount`` (negative to decrement).
+
+        Returns:
+            The new count, or None if the counter was not cached
+        """
+        key = self.make_key(tenant_id, user_id)
+        try:
+            value = await self._get_redis().eval(INCREMENT_SCRIPT, 1, key, amount)
+        except Exception as e:
+            logger.warning(f"Failed to update unread counter {key}, dropping it: {e}")
+            await self.invalidate(tenant_id, user_id)
+            return None
+
+        count = int(value) if value is not None else None
+        if notify and count is not None:
+            await self._push(user_id, count)
+        return count
+
+    async def increment_many(self, tenant_id, user_ids: Iterable, notify: bool = True):
+        """Increment the counters of several users by the number of times they appear."""
+        amounts: Dict[str, int] = defaultdict(int)
+        for user_id in user_ids:
+            amounts[str(user_id)] += 1
+        for user_id, amount in amounts.items():
+            await self.increment(tenant_id, user_id, amount, notify=notify)
+
+    async def set_count(self, tenant_id, user_id, count: int, notify: bool = True):
+        """Overwrite a user's counter (e.g. after mark-all-read)."""
+        key = self.make_key(tenant_id, user_id)
+        try:
+            await self._get_redis().set(key, count, ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Failed to set unread counter {key}: {e}")
+            await self.invalidate(tenant_id, user_id)
+        if notify:
+            await self._push(user_id, count)
+
+    async def invalidate(self, tenant_id, user_id):
+        """Drop a user's counter so the next read recounts it."""
+        try:
+            await self._get_redis().delete(self.make_key(tenant_id, user_id))
+        except Exception as e:
+            logger.debug(f"Failed to invalidate unread counter: {e}")
+
+    async def reconcile(self, db: AsyncSession, batch_size: int = 500) -> int:
+        """
+        Recount every cached counter from the database and fix drift.
+
+        Args:
+            db: Database session
+            batch_size: Number of counters recounted per query
+
+        Returns:
+            Number of counters that were corrected
+        """
+        client = self._get_redis()
+        corrected = 0
+        batch: List[Tuple[str, str]] = []
+
+        async for key in client.scan_iter(match=COUNTER_PATTERN, count=batch_size):
+            _, _, tenant_id, user_id = key.split(":", 3)
+            batch.append((tenant_id, user_id))
+            if len(batch) >= batch_size:
+                corrected += await self._reconcile_batch(db, client, batch)
+                batch = []
+
+        if batch:
+            corrected += await self._reconcile_batch(db, client, batch)
+
+        logger.info(f"Reconciled unread counters, corrected {corrected}")
+        return corrected
+
+    async def _reconcile_batch(self, db: AsyncSession, client: redis.Redis, batch: List[Tuple[str, str]]) -> int:
+        """Recount one batch of counters with one grouped query per tenant."""
+        by_tenant: Dict[str, List[str]] = defaultdict(list)
+        for tenant_id, user_id in batch:
+            by_tenant[tenant_id].append(user_id)
+
+        corrected = 0
+        now = datetime.utcnow()
+        for tenant_id, user_ids in by_tenant.items():
+            result = await db.execute(
+                select(Notification.user_id, func.count(Notification.id))
+                .where(unread_filter(UUID(tenant_id), [UUID(u) for u in user_ids], now))
+                .group_by(Notification.user_id)
+            )
+            actual = {str(user_id): count for user_id, count in result.all()}
+
+            keys = [self.make_key(tenant_id, u) for u in user_ids]
+            cached = await client.mget(keys)
+            for user_id, key, value in zip(user_ids, keys, cached):
+                if value is None:
+                    continue
+                count = actual.get(user_id, 0)
+                if int(value) != count:
+                    await client.set(key, count, ex=self.ttl_seconds, xx=True)
+                    await self._push(user_id, count)
+                    corrected += 1
+
+        return corrected
+
+    async def _push(self, user_id, count: int):
+        """Push the new count to the user's connected clients."""
+        try:
+            from app.services.websocket_service import get_websocket_service
+            websocket_service = self.websocket_service or get_websocket_service()
+            await websocket_service.send_unread_count(str(user_id), count)
+        except Exception as e:
+            logger.debug(f"Failed to push unread count to user {user_id}: {e}")
+
+    async def close(self):
+        """Close the Redis connection."""
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+
+# Singleton instance
+_notification_counter_service: Optional[NotificationCounterService] = None
+
+
+def get_notification_counter_service() -> NotificationCounterService:
+    """Get or create notification counter service singleton"""
+    global _notification_counter_service
+
+    if _notification_counter_service is None:
+        _notification_counter_service = NotificationCounterService()
+
+    return _notification_counter_service
@@ -0,0 +1,406 @@
+"""
+Notification Digest Service
+Coalesce bursts of notifications per (user, type) into a single digest
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.models.notification import Notification, NotificationType
+from app.services.email_service import get_email_service
+
+logger = logging.getLogger(__name__)
+
+# Redis layout for buffers spilled out of process memory
+INDEX_KEY = "notification_digest:index"
+EVENTS_KEY = "notification_digest:events:{key}"
+
+# Maximum number of events kept in a digest notification's metadata
+MAX_EVENTS_IN_METADATA = 50
+
+PRIORITY_ORDER = ["low", "normal", "high", "urgent"]
+
+
+class NotificationDigestService:
+    """
+    Buffer notifications per (tenant, recipient, type) and emit one digest.
+
+    Events are held in a bounded in-memory buffer for a configurable window.
+    When the buffer is full, the largest per-recipient buffer is spilled to
+    Redis so any process (or the Celery beat flush task) can emit it later.
+    A window that collected a single event is delivered unchanged.
+    """
+
+    def __init__(
+        self,
+        window_seconds: Optional[int] = None,
+        max_buffered: Optional[int] = None,
+        counter_service=None,
+    ):
+        self.window_seconds = window_seconds or settings.NOTIFICATION_DIGEST_WINDOW_SECONDS
+        self.max_buffered = max_buffered or settings.NOTIFICATION_DIGEST_MAX_BUFFERED
+        # Unread counter service; the process singleton when not given
+        self.counter_service = counter_service
+
+        # {key: {"opened_at": float, "meta": dict, "events": [dict]}}
+        self._buffers: Dict[str, Dict[str, Any]] = {}
+        self._buffered = 0
+        self._lock = asyncio.Lock()
+        self._redis: Optional[redis.Redis] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Buffering
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(tenant_id: str, recipient: str, notification_type: str) -> str:
+        """Build the coalescing key for a recipient and notification type."""
+        return f"{tenant_id}:{recipient}:{notification_type}"
+
+    async def add(
+        self,
+        tenant_id: str,
+        notification_type: NotificationType,
+        title: str,
+        message: str,
+        user_id: Optional[str] = None,
+        user_email: Optional[str] = None,
+        user_name: Optional[str] = None,
+        priority: str = "normal",
+        entity_type: Optional[str] = None,
+        entity_id: Optional[str] = None,
+        template_name: Optional[str] = None,
+        subject: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Buffer a notification event.
+
+        Args:
+            tenant_id: Tenant ID
+            notification_type: Notification type (coalescing dimension)
+            title: In-app notification title
+            message: In-app notification message
+            user_id: Recipient user ID (an in-app row is only written when set)
+            user_email: Recipient email address (email is only sent when set)
+            user_name: Recipient display name used in the digest email
+            priority: Notification priority
+            entity_type: Related entity type
+            entity_id: Related entity ID
+            template_name: Email template used when the window holds one event
+            subject: Email subject used when the window holds one event
+            context: Email template context used when the window holds one event
+        """
+        recipient = str(user_id) if user_id else user_email
+        if not recipient:
+            return
+
+        type_value = NotificationType(notification_type).value
+        key = self.make_key(str(tenant_id), recipient, type_value)
+        event = {
+            "title": title,
+            "message": message,
+            "priority": priority,
+            "entity_type": entity_type,
+            "entity_id": str(entity_id) if entity_id else None,
+            "template_name": template_name,
+            "subject": subject,
+            "context": context or {},
+            "created_at": datetime.utcnow().isoformat(),
+        }
+
+        overflow: List[Tuple[str, Dict[str, Any]]] = []
+        async with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = {
+                    "opened_at": time.time(),
+                    "meta": {
+                        "tenant_id": str(tenant_id),
+                        "user_id": str(user_id) if user_id else None,
+                        "user_email": user_email,
+                        "user_name": user_name,
+                        "type": type_value,
+                    },
+                    "events": [],
+                }
+                self._buffers[key] = buffer
+            buffer["events"].append(event)
+            self._buffered += 1
+
+            # Keep the in-memory buffer bounded by spilling the largest buffers
+            while self._buffered > self.max_buffered and self._buffers:
+                largest = max(self._buffers, key=lambda k: len(self._buffers[k]["events"]))
+                spilled = self._buffers.pop(largest)
+                self._buffered -= len(spilled["events"])
+                overflow.append((largest, spilled))
+
+        for spill_key, spilled in overflow:
+            await self._spill(spill_key, spilled)
+
+    async def _spill(self, key: str, buffer: Dict[str, Any]):
+        """Move a buffer to Redis, or deliver it right away if Redis is down."""
+        try:
+            client = self._get_redis()
+            index_value = json.dumps({**buffer["meta"], "opened_at": buffer["opened_at"]})
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.rpush(EVENTS_KEY.format(key=key), *[json.dumps(e) for e in buffer["events"]])
+                pipe.hsetnx(INDEX_KEY, key, index_value)
+                await pipe.execute()
+            logger.info(f"Spilled {len(buffer['events'])} buffered notification(s) for {key} to Redis")
+        except Exception as e:
+            logger.warning(f"Notification digest spill failed for {key}, delivering now: {e}")
+            await self.deliver([buffer])
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    async def flush_due(self, force: bool = False) -> int:
+        """
+        Emit every buffer whose window has elapsed.
+
+        Args:
+            force: Emit all buffers regardless of their window
+
+        Returns:
+            Number of digests emitted
+        """
+        now = time.time()
+        due: Dict[str, Dict[str, Any]] = {}
+
+        async with self._lock:
+            for key in list(self._buffers):
+                buffer = self._buffers[key]
+                if force or now - buffer["opened_at"] >= self.window_seconds:
+                    due[key] = self._buffers.pop(key)
+                    self._buffered -= len(buffer["events"])
+
+        for key, spilled in (await self._drain_spilled(now, force)).items():
+            if key in due:
+                due[key]["events"] = spilled["events"] + due[key]["events"]
+            else:
+                due[key] = spilled
+
+        if due:
+            await self.deliver(list(due.values()))
+        return len(due)
+
+    async def _drain_spilled(self, now: float, force: bool) -> Dict[str, Dict[str, Any]]:
+        """Atomically take due buffers out of Redis."""
+        drained: Dict[str, Dict[str, Any]] = {}
+        try:
+            client = self._get_redis()
+            index = await client.hgetall(INDEX_KEY)
+        except Exception as e:
+            logger.debug(f"Notification digest Redis index unavailable: {e}")
+            return drained
+
+        for key, raw_meta in index.items():
+            meta = json.loads(raw_meta)
+            opened_at = meta.pop("opened_at", now)
+            if not force and now - opened_at < self.window_seconds:
+                continue
+
+            try:
+                async with client.pipeline(transaction=True) as pipe:
+                    pipe.lrange(EVENTS_KEY.format(key=key), 0, -1)
+                    pipe.delete(EVENTS_KEY.format(key=key))
+                    pipe.hdel(INDEX_KEY, key)
+                    raw_events, _, removed = await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Failed to drain spilled notifications for {key}: {e}")
+                continue
+
+            # Another process drained this key first
+            if not removed or not raw_events:
+                continue
+
+            drained[key] = {
+                "opened_at": opened_at,
+                "meta": meta,
+                "events": [json.loads(e) for e in raw_events],
+            }
+
+        return drained
+
+    # ------------------------------------------------------------------
+    # Delivery
+    # ------------------------------------------------------------------
+
+    async def deliver(self, buffers: List[Dict[str, Any]]):
+        """Write one notification row per buffer and send one email per buffer."""
+        from app.db.session import AsyncSessionLocal
+
+        from app.services.notification_counter_service import get_notification_counter_service
+
+        rows = [self._build_notification(b) for b in buffers if b["meta"].get("user_id")]
+        if rows:
+            try:
+                async with AsyncSessionLocal() as db:
+                    db.add_all(rows)
+                    await db.commit()
+            except Exception as e:
+                logger.error(f"Failed to write digest notifications: {e}")
+            else:
+                counter_service = self.counter_service or get_notification_counter_service()
+                for row in rows:
+                    await counter_service.increment(row.tenant_id, row.user_id)
+
+        email_service = get_email_service()
+        for buffer in buffers:
+            if not buffer["meta"].get("user_email"):
+                continue
+            try:
+                await self._send_email(email_service, buffer)
+            except Exception as e:
+                logger.error(f"Failed to send digest email to {buffer['meta']['user_email']}: {e}")
+
+        logger.info(
+            f"Delivered {len(buffers)} notification digest(s) covering "
+            f"{sum(len(b['events']) for b in buffers)} event(s)"
+        )
+
+    @staticmethod
+    def _build_notification(buffer: Dict[str, Any]) -> Notification:
+        """Build the in-app notification row for a buffer."""
+        meta = buffer["meta"]
+        events = buffer["events"]
+        first = events[0]
+
+        if len(events) == 1:
+            return Notification(
+                user_id=UUID(meta["user_id"]),
+                tenant_id=UUID(meta["tenant_id"]),
+                type=NotificationType(meta["type"]),
+                title=first["title"],
+                message=first["message"],
+                priority=first["priority"],
+                entity_type=first["entity_type"],
+                entity_id=UUID(first["entity_id"]) if first["entity_id"] else None,
+            )
+
+        titles = [e["title"] for e in events[:5]]
+        message = "; ".join(titles)
+        if len(events) > 5:
+            message += f" and {len(events) - 5} more"
+
+        return Notification(
+            user_id=UUID(meta["user_id"]),
+            tenant_id=UUID(meta["tenant_id"]),
+            type=NotificationType(meta["type"]),
+            title=f"{len(events)} new {meta['type'].replace('_', ' ')} notifications",
+            message=message,
+            priority=max(
+                (e["priority"] for e in events),
+                key=lambda p: PRIORITY_ORDER.index(p) if p in PRIORITY_ORDER else 1,
+            ),
+            notification_metadata={
+                "digest": True,
+                "count": len(events),
+                "events": [
+                    {k: e[k] for k in ("title", "message", "entity_type", "entity_id", "created_at")}
+                    for e in events[:MAX_EVENTS_IN_METADATA]
+                ],
+            },
+        )
+
+    @staticmethod
+    async def _send_email(email_service, buffer: Dict[str, Any]):
+        """Send the single-event email or one digest email for a buffer."""
+        meta = buffer["meta"]
+        events = buffer["events"]
+
+        if len(events) == 1:
+            event = events[0]
+            if not event["template_name"]:
+                return
+            template_name = event["template_name"]
+            if not template_name.endswith(".html"):
+                template_name = f"{template_name}.html"
+            await email_service.send_templated_email(
+                to_email=meta["user_email"],
+                subject=event["subject"] or event["title"],
+                template_name=template_name,
+                context=event["context"],
+            )
+            return
+
+        await email_service.send_templated_email(
+            to_email=meta["user_email"],
+            subject=f"Library Notice: {len(events)} new {meta['type'].replace('_', ' ')} notifications",
+            template_name="notification_digest.html",
+            context={
+                "user_name": meta.get("user_name") or "Library User",
+                "notification_type": meta["type"].replace("_", " "),
+                "events": events[:MAX_EVENTS_IN_METADATA],
+                "total_events": len(events),
+            },
+        )
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        return self._redis
+
+    async def _run(self):
+        """Periodically flush due buffers."""
+        interval = max(1, min(self.window_seconds // 2, 30))
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush_due()
+            except Exception as e:
+                logger.error(f"Notification digest flush failed: {e}")
+
+    def start(self):
+        """Start the background flush loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and hand pending buffers over to Redis."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        async with self._lock:
+            pending = list(self._buffers.items())
+            self._buffers.clear()
+            self._buffered = 0
+
+        for key, buffer in pending:
+            await self._spill(key, buffer)
+
+    async def close(self):
+        """Close the Redis connection."""
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+
+# Singleton instance
+_notification_digest_service: Optional[NotificationDigestService] = None
+
+
+def get_notification_digest_service() -> NotificationDigestService:
+    """Get or create notification digest service singleton"""
+    global _notification_digest_service
+
+    if _notification_digest_service is None:
+        _notification_digest_service = NotificationDigestService()
+
+    return _notification_digest_service
@@ -6,33 +6,46 @@ Automatically send notifications based on system events
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import logging
 
 from app.models.notification import Notification, NotificationType
 from app.models.user import User
 from app.models.inventory import Item, ItemStatus
 from app.models.circulation import Loan, LoanStatus
+from app.core.config import settings
 from app.services.email_service import EmailService
+from app.services.notification_digest import NotificationDigestService, get_notification_digest_service
+from app.services.notification_counter_service import get_notification_counter_service
 from app.tasks.email_tasks import send_notification_email
 
 logger = logging.getLogger(__name__)
 
 
 class NotificationTriggersService:
-    """Service for triggering notifications based on system events"""
+    """
+    Service for triggering notifications based on system events
+
+    When notification digesting is enabled, events are handed to the
+    NotificationDigestService, which coalesces them per (user, type) and
+    writes one notification row and one email per window.
+    """
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, digest_service: Optional[NotificationDigestService] = None):
         self.db = db
         self.email_service = EmailService()
 
+        if digest_service is None and settings.NOTIFICATION_DIGEST_ENABLED:
+            digest_service = get_notification_digest_service()
+        self.digest_service = digest_service
+
     async def notify_item_added(
         self,
         item_id: str,
         title: str,
         added_by_user_id: str,
         tenant_id: str,
-        admin_emails: List[str]
+        admins: List[Tuple[str, str]]
     ):
         """
         Send notification when a new item is added to the system
@@ -42,29 +55,62 @@ class NotificationTriggersService:
             title: Title of the item
             added_by_user_id: User who added the item
             tenant_id: Tenant ID
-            admin_emails: List of admin email addresses
+            admins: (user ID, email) of each admin to notify
         """
         try:
             # Create notification for admins
             notification_message = f"New item added to the collection: {title}"
+            notified_user_ids = []
 
             # Send email to all admins
-            for email in admin_emails:
+            for admin_id, email in admins:
+                context = {
+                    "title": title,
+                    "item_id": item_id,
+                    "added_by": added_by_user_id,
+                    "date": datetime.utcnow().strftime("%Y-%m-%d %H:%M")
+                }
+
+                if self.digest_service:
+                    await self.digest_service.add(
+                        tenant_id=tenant_id,
+                        notification_type=NotificationType.INFO,
+                        title=f"New item added: {title}",
+                        message=notification_message,
+                        user_id=str(admin_id),
+                        user_email=email,
+                        entity_type="item",
+                        entity_id=item_id,
+                        template_name="item_added",
+                        subject="New Item Added to Collection",
+                        context=context
+                    )
+                    continue
+
                 await self.email_service.send_template_email(
                     to_email=email,
                     template_name="item_added",
-                    context={
-                        "title": title,
-                        "item_id": item_id,
-                        "added_by": added_by_user_id,
-                        "date": datetime.utcnow().strftime("%Y-%m-%d %H:%M")
-                    }
+                    context=context
                 )
 
+                self.db.add(Notification(
+                    user_id=admin_id,
+                    type=NotificationType.INFO,
+                    title=f"New item added: {title}",
+                    message=notification_message,
+                    tenant_id=tenant_id,
+                    entity_type="item",
+                    entity_id=item_id
+                ))
+                notified_user_ids.append(admin_id)
+
+            await self.db.commit()
+            await get_notification_counter_service().increment_many(tenant_id, notified_user_ids)
             logger.info(f"Sent item added notifications for item {item_id}")
 
         except Exception as e:
             logger.error(f"Error sending item added notification: {e}")
+            await self.db.rollback()
 
     async def notify_item_removed(
         self,
@@ -72,7 +118,7 @@ class NotificationTriggersService:
         title: str,
         removed_by_user_id: str,
         tenant_id: str,
-        admin_emails: List[str]
+        admins: List[Tuple[str, str]]
     ):
         """
         Send notification when an item is removed from the system
@@ -82,26 +128,60 @@ class NotificationTriggersService:
             title: Title of the item
             removed_by_user_id: User who removed the item
             tenant_id: Tenant ID
-            admin_emails: List of admin email addresses
+            admins: (user ID, email) of each admin to notify
         """
         try:
+            notified_user_ids = []
+
             # Send email to all admins
-            for email in admin_emails:
+            for admin_id, email in admins:
+                context = {
+                    "title": title,
+                    "item_id": item_id,
+                    "removed_by": removed_by_user_id,
+                    "date": datetime.utcnow().strftime("%Y-%m-%d %H:%M")
+                }
+
+                if self.digest_service:
+                    await self.digest_service.add(
+                        tenant_id=tenant_id,
+                        notification_type=NotificationType.INFO,
+                        title=f"Item removed: {title}",
+                        message=f"Item removed from the collection: {title}",
+                        user_id=str(admin_id),
+                        user_email=email,
+                        entity_type="item",
+                        entity_id=item_id,
+                        template_name="item_removed",
+                        subject="Item Removed from Collection",
+                        context=context
+                    )
+                    continue
+
                 await self.email_service.send_template_email(
                     to_email=email,
                     template_name="item_removed",
-                    context={
-                        "title": title,
-                        "item_id": item_id,
-                        "removed_by": removed_by_user_id,
-                        "date": datetime.utcnow().strftime("%Y-%m-%d %H:%M")
-                    }
+                    context=context
                 )
 
+                self.db.add(Notification(
+                    user_id=admin_id,
+                    type=NotificationType.INFO,
+                    title=f"Item removed: {title}",
+                    message=f"Item removed from the collection: {title}",
+                    tenant_id=tenant_id,
+                    entity_type="item",
+                    entity_id=item_id
+                ))
+                notified_user_ids.append(admin_id)
+
+            await self.db.commit()
+            await get_notification_counter_service().increment_many(tenant_id, notified_user_ids)
             logger.info(f"Sent item removed notifications for item {item_id}")
 
         except Exception as e:
             logger.error(f"Error sending item removed notification: {e}")
+            await self.db.rollback()
 
     async def notify_item_missing(
         self,
@@ -110,7 +190,7 @@ class NotificationTriggersService:
         barcode: str,
         last_known_location: Optional[str],
         tenant_id: str,
-        admin_emails: List[str]
+        admins: List[Tuple[str, str]]
     ):
         """
         Send urgent notification when an item is marked as missing
@@ -121,28 +201,64 @@ class NotificationTriggersService:
             barcode: Item barcode
             last_known_location: Last known location
             tenant_id: Tenant ID
-            admin_emails: List of admin email addresses
+            admins: (user ID, email) of each admin to notify
         """
         try:
+            notified_user_ids = []
+
             # Send urgent email to all admins
-            for email in admin_emails:
+            for admin_id, email in admins:
+                context = {
+                    "title": title,
+                    "item_id": item_id,
+                    "barcode": barcode,
+                    "location": last_known_location or "Unknown",
+                    "date": datetime.utcnow().strftime("%Y-%m-%d %H:%M"),
+                    "priority": "URGENT"
+                }
+
+                if self.digest_service:
+                    await self.digest_service.add(
+                        tenant_id=tenant_id,
+                        notification_type=NotificationType.WARNING,
+                        title=f"Item missing: {title}",
+                        message=f"Item {barcode} was marked as missing",
+                        user_id=str(admin_id),
+                        user_email=email,
+                        priority="urgent",
+                        entity_type="item",
+                        entity_id=item_id,
+                        template_name="item_missing",
+                        subject="URGENT: Item Marked as Missing",
+                        context=context
+                    )
+                    continue
+
                 await self.email_service.send_template_email(
                     to_email=email,
                     template_name="item_missing",
-                    context={
-                        "title": title,
-                        "item_id": item_id,
-                        "barcode": barcode,
-                        "location": last_known_location or "Unknown",
-                        "date": datetime.utcnow().strftime("%Y-%m-%d %H:%M"),
-                        "priority": "URGENT"
-                    }
+                    context=context
                 )
 
+                self.db.add(Notification(
+                    user_id=admin_id,
+                    type=NotificationType.WARNING,
+                    title=f"Item missing: {title}",
+                    message=f"Item {barcode} was marked as missing",
+                    tenant_id=tenant_id,
+                    priority="urgent",
+                    entity_type="item",
+                    entity_id=item_id
+                ))
+                notified_user_ids.append(admin_id)
+
+            await self.db.commit()
+            await get_notification_counter_service().increment_many(tenant_id, notified_user_ids)
             logger.info(f"Sent missing item alert for item {item_id}")
 
         except Exception as e:
             logger.error(f"Error sending missing item notification: {e}")
+            await self.db.rollback()
 
     async def notify_overdue_items(self, tenant_id: str):
         """
@@ -164,6 +280,7 @@ class NotificationTriggersService:
                 )
             )
             overdue_loans = result.scalars().all()
+            notified_user_ids = []
 
             for loan in overdue_loans:
                 # Get user
@@ -174,16 +291,37 @@ class NotificationTriggersService:
 
                 if user and user.email:
                     days_overdue = (datetime.utcnow() - loan.due_date).days
+                    user_name = f"{user.first_name} {user.last_name}"
+                    message = f"You have an item that is {days_overdue} days overdue. Please return it as soon as possible."
+                    context = {
+                        "user_name": user_name,
+                        "due_date": loan.due_date.strftime("%Y-%m-%d"),
+                        "days_overdue": days_overdue,
+                        "loan_id": str(loan.id)
+                    }
+
+                    if self.digest_service:
+                        await self.digest_service.add(
+                            tenant_id=tenant_id,
+                            notification_type=NotificationType.OVERDUE,
+                            title="Overdue Item",
+                            message=message,
+                            user_id=str(user.id),
+                            user_email=user.email,
+                            user_name=user_name,
+                            priority="high",
+                            entity_type="loan",
+                            entity_id=str(loan.id),
+                            template_name="overdue_reminder",
+                            subject="Library Notice: Overdue Item",
+                            context=context
+                        )
+                        continue
 
                     await self.email_service.send_template_email(
                         to_email=user.email,
                         template_name="overdue_reminder",
-                        context={
-                            "user_name": f"{user.first_name} {user.last_name}",
-                            "due_date": loan.due_date.strftime("%Y-%m-%d"),
-                            "days_overdue": days_overdue,
-                            "loan_id": str(loan.id)
-                        }
+                        context=context
                     )
 
                     # Create in-app notification
@@ -191,15 +329,17 @@ class NotificationTriggersService:
                         user_id=user.id,
                         type=NotificationType.OVERDUE,
                         title="Overdue Item",
-                        message=f"You have an item that is {days_overdue} days overdue. Please return it as soon as possible.",
+                        message=message,
                         tenant_id=tenant_id,
                         priority="high",
                         entity_type="loan",
                         entity_id=loan.id
                     )
                     self.db.add(notification)
+                    notified_user_ids.append(user.id)
 
             await self.db.commit()
+            await get_notification_counter_service().increment_many(tenant_id, notified_user_ids)
             logger.info(f"Sent {len(overdue_loans)} overdue notifications")
 
         except Exception as e:
@@ -229,16 +369,36 @@ class NotificationTriggersService:
             tenant_id: Tenant ID
         """
         try:
+            message = f"'{title}' is ready for pickup at {pickup_location}. Please collect by {expiry_date.strftime('%Y-%m-%d')}."
+            context = {
+                "user_name": user_name,
+                "title": title,
+                "pickup_location": pickup_location,
+                "expiry_date": expiry_date.strftime("%Y-%m-%d"),
+                "days_to_pickup": (expiry_date - datetime.utcnow()).days
+            }
+
+            if self.digest_service:
+                await self.digest_service.add(
+                    tenant_id=tenant_id,
+                    notification_type=NotificationType.HOLD_AVAILABLE,
+                    title="Hold Ready for Pickup",
+                    message=message,
+                    user_id=str(user_id),
+                    user_email=user_email,
+                    user_name=user_name,
+                    priority="high",
+                    template_name="hold_available",
+                    subject="Library Notice: Your Hold is Available",
+                    context=context
+                )
+                logger.info(f"Queued hold available notification for user {user_id}")
+                return
+
             await self.email_service.send_template_email(
                 to_email=user_email,
                 template_name="hold_available",
-                context={
-                    "user_name": user_name,
-                    "title": title,
-                    "pickup_location": pickup_location,
-                    "expiry_date": expiry_date.strftime("%Y-%m-%d"),
-                    "days_to_pickup": (expiry_date - datetime.utcnow()).days
-                }
+                context=context
             )
 
             # Create in-app notification
@@ -246,12 +406,13 @@ class NotificationTriggersService:
                 user_id=user_id,
                 type=NotificationType.HOLD_AVAILABLE,
                 title="Hold Ready for Pickup",
-                message=f"'{title}' is ready for pickup at {pickup_location}. Please collect by {expiry_date.strftime('%Y-%m-%d')}.",
+                message=message,
                 tenant_id=tenant_id,
                 priority="high"
             )
             self.db.add(notification)
             await self.db.commit()
+            await get_notification_counter_service().increment(tenant_id, user_id)
 
             logger.info(f"Sent hold available notification to user {user_id}")
 
@@ -282,6 +443,7 @@ class NotificationTriggersService:
                 )
             )
             due_soon_loans = result.scalars().all()
+            notified_user_ids = []
 
             for loan in due_soon_loans:
                 user_result = await self.db.execute(
@@ -290,21 +452,56 @@ class NotificationTriggersService:
                 user = user_result.scalar_one_or_none()
 
                 if user and user.email:
+                    context = {
+                        "user_name": f"{user.first_name} {user.last_name}",
+                        "due_date": loan.due_date.strftime("%Y-%m-%d"),
+                        "days_until_due": (loan.due_date - datetime.utcnow()).days,
+                        "loan_id": str(loan.id)
+                    }
+
+                    if self.digest_service:
+                        await self.digest_service.add(
+                            tenant_id=tenant_id,
+                            notification_type=NotificationType.INFO,
+                            title="Item Due Soon",
+                            message=f"An item is due on {context['due_date']}",
+                            user_id=str(user.id),
+                            user_email=user.email,
+                            user_name=context["user_name"],
+                            entity_type="loan",
+                            entity_id=str(loan.id),
+                            template_name="due_soon_reminder",
+                            subject="Library Notice: Item Due Soon",
+                            context=context
+                        )
+                        continue
+
                     await self.email_service.send_template_email(
                         to_email=user.email,
                         template_name="due_soon_reminder",
-                        context={
-                            "user_name": f"{user.first_name} {user.last_name}",
-                            "due_date": loan.due_date.strftime("%Y-%m-%d"),
-                            "days_until_due": (loan.due_date - datetime.utcnow()).days,
-                            "loan_id": str(loan.id)
-                        }
+                        context=context
                     )
 
+                    # Create in-app notification
+                    notification = Notification(
+                        user_id=user.id,
+                        type=NotificationType.INFO,
+                        title="Item Due Soon",
+                        message=f"An item is due on {context['due_date']}",
+                        tenant_id=tenant_id,
+                        entity_type="loan",
+                        entity_id=loan.id
+                    )
+                    self.db.add(notification)
+                    notified_user_ids.append(user.id)
+
+            await self.db.commit()
+            await get_notification_counter_service().increment_many(tenant_id, notified_user_ids)
             logger.info(f"Sent {len(due_soon_loans)} due soon reminders")
 
         except Exception as e:
             logger.error(f"Error sending due soon notifications: {e}")
+            await self.db.rollback()
 
     async def notify_checkout(
         self,
@@ -329,16 +526,35 @@ class NotificationTriggersService:
             tenant_id: Tenant ID
         """
         try:
+            message = f"You have checked out '{title}'. Due date: {due_date.strftime('%Y-%m-%d')}"
+            context = {
+                "user_name": user_name,
+                "title": title,
+                "barcode": barcode,
+                "checkout_date": datetime.utcnow().strftime("%Y-%m-%d"),
+                "due_date": due_date.strftime("%Y-%m-%d")
+            }
+
+            if self.digest_service:
+                await self.digest_service.add(
+                    tenant_id=tenant_id,
+                    notification_type=NotificationType.CHECKOUT,
+                    title="Item Checked Out",
+                    message=message,
+                    user_id=str(user_id),
+                    user_email=user_email,
+                    user_name=user_name,
+                    template_name="checkout_confirmation",
+                    subject="Library Receipt: Item Checked Out",
+                    context=context
+                )
+                logger.info(f"Queued checkout confirmation for user {user_id}")
+                return
+
             await self.email_service.send_template_email(
                 to_email=user_email,
                 template_name="checkout_confirmation",
-                context={
-                    "user_name": user_name,
-                    "title": title,
-                    "barcode": barcode,
-                    "checkout_date": datetime.utcnow().strftime("%Y-%m-%d"),
-                    "due_date": due_date.strftime("%Y-%m-%d")
-                }
+                context=context
             )
 
             # Create in-app notification
@@ -346,11 +562,12 @@ class NotificationTriggersService:
                 user_id=user_id,
                 type=NotificationType.CHECKOUT,
                 title="Item Checked Out",
-                message=f"You have checked out '{title}'. Due date: {due_date.strftime('%Y-%m-%d')}",
+                message=message,
                 tenant_id=tenant_id
             )
             self.db.add(notification)
             await self.db.commit()
+            await get_notification_counter_service().increment(tenant_id, user_id)
 
             logger.info(f"Sent checkout confirmation to user {user_id}")
 
@@ -359,19 +576,19 @@ class NotificationTriggersService:
             await self.db.rollback()
 
 
-async def get_admin_emails(db: AsyncSession, tenant_id: str) -> List[str]:
+async def get_admin_recipients(db: AsyncSession, tenant_id: str) -> List[Tuple[str, str]]:
     """
-    Get all admin email addresses for a tenant
+    Get the admins of a tenant to notify
 
     Args:
         db: Database session
         tenant_id: Tenant ID
 
     Returns:
-        List of admin email addresses
+        List of (user ID, email address) of the admins
     """
     result = await db.execute(
-        select(User.email)
+        select(User.id, User.email)
         .where(
             and_(
                 User.tenant_id == tenant_id,
@@ -381,5 +598,4 @@ async def get_admin_emails(db: AsyncSession, tenant_id: str) -> List[str]:
             )
         )
     )
-    emails = [email for (email,) in result.all() if email]
-    return emails
+    return [(str(user_id), email) for user_id, email in result.all() if email]
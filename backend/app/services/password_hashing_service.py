@@ -0,0 +1,75 @@
+"""
+Password Hashing Service
+Hash and verify passwords in a bounded worker pool instead of on the event loop
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+from app.services.pool_executor import BoundedPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashingService:
+    """
+    Async front-end for bcrypt.
+
+    bcrypt releases the GIL while hashing, so a thread pool already spreads
+    work across cores; a process pool can be configured instead.
+    """
+
+    def __init__(self, executor: Optional[BoundedPoolExecutor] = None):
+        self.executor = executor or BoundedPoolExecutor(
+            name="password-hashing",
+            kind=settings.PASSWORD_HASHING_EXECUTOR,
+            max_workers=settings.PASSWORD_HASHING_MAX_WORKERS or None,
+            max_queue=settings.PASSWORD_HASHING_MAX_QUEUE,
+        )
+
+    async def hash(self, password: str) -> str:
+        """Hash a password."""
+        return await self.executor.run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash."""
+        return await self.executor.run(verify_password, plain_password, hashed_password)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        Hash several passwords in parallel, preserving order.
+
+        Work is submitted in chunks no larger than the pool so that a large
+        batch never trips the queue limit meant for interactive requests.
+        """
+        chunk_size = self.executor.max_workers
+        hashes: List[str] = []
+        for start in range(0, len(passwords), chunk_size):
+            chunk = passwords[start:start + chunk_size]
+            hashes.extend(await asyncio.gather(*(self.hash(p) for p in chunk)))
+        return hashes
+
+    def metrics(self) -> Dict[str, Any]:
+        """Worker pool metrics."""
+        return self.executor.metrics()
+
+    def shutdown(self):
+        """Shut down the worker pool."""
+        self.executor.shutdown()
+
+
+# Singleton instance
+_password_hashing_service: Optional[PasswordHashingService] = None
+
+
+def get_password_hashing_service() -> PasswordHashingService:
+    """Get or create password hashing service singleton"""
+    global _password_hashing_service
+
+    if _password_hashing_service is None:
+        _password_hashing_service = PasswordHashingService()
+
+    return _password_hashing_service
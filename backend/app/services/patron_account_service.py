@@ -0,0 +1,259 @@
+"""
+Patron Account Service
+Incremental maintenance of per-patron loan, hold and fee totals
+"""
+
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.circulation import Loan, LoanStatus, Request
+from app.models.fee import Fee, FeeStatus
+from app.models.patron_account import PatronAccountSummary
+from app.models.user import User
+from app.services.hold_queue_service import QUEUE_STATUSES
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_COLUMNS = (
+    "open_loans",
+    "overdue_loans",
+    "open_requests",
+    "total_fees",
+    "open_fees",
+    "total_owed",
+    "total_paid",
+    "oldest_fee_date",
+)
+
+
+def _overdue_count(user_id, now: datetime):
+    return (
+        select(func.count())
+        .where(and_(Loan.user_id == user_id, Loan.status == LoanStatus.OPEN, Loan.due_date < now))
+        .scalar_subquery()
+    )
+
+
+def _oldest_open_fee(user_id):
+    return (
+        select(func.min(Fee.fee_date))
+        .where(and_(Fee.user_id == user_id, Fee.status == FeeStatus.OPEN))
+        .scalar_subquery()
+    )
+
+
+def computed_summaries(now: datetime, user_ids: Optional[Iterable[UUID]] = None, tenant_id=None):
+    """SELECT of freshly aggregated summaries, one row per user."""
+    user_ids = list(user_ids) if user_ids is not None else None
+
+    def scoped(query, column):
+        return query.where(column.in_(user_ids)) if user_ids is not None else query
+
+    loans = scoped(
+        select(
+            Loan.user_id,
+            func.count().label("open_loans"),
+            func.count().filter(Loan.due_date < now).label("overdue_loans"),
+        ).where(Loan.status == LoanStatus.OPEN),
+        Loan.user_id,
+    ).group_by(Loan.user_id).subquery()
+
+    requests = scoped(
+        select(Request.user_id, func.count().label("open_requests"))
+        .where(Request.status.in_(QUEUE_STATUSES)),
+        Request.user_id,
+    ).group_by(Request.user_id).subquery()
+
+    is_open = Fee.status == FeeStatus.OPEN
+    fees = scoped(
+        select(
+            Fee.user_id,
+            func.count().label("total_fees"),
+            func.count().filter(is_open).label("open_fees"),
+            func.sum(Fee.remaining).filter(is_open).label("total_owed"),
+            func.sum(Fee.paid_amount).label("total_paid"),
+            func.min(Fee.fee_date).filter(is_open).label("oldest_fee_date"),
+        ),
+        Fee.user_id,
+    ).group_by(Fee.user_id).subquery()
+
+    query = (
+        select(
+            User.id.label("user_id"),
+            User.tenant_id,
+            func.coalesce(loans.c.open_loans, 0).label("open_loans"),
+            func.coalesce(loans.c.overdue_loans, 0).label("overdue_loans"),
+            func.coalesce(requests.c.open_requests, 0).label("open_requests"),
+            func.coalesce(fees.c.total_fees, 0).label("total_fees"),
+            func.coalesce(fees.c.open_fees, 0).label("open_fees"),
+            func.coalesce(fees.c.total_owed, 0).label("total_owed"),
+            func.coalesce(fees.c.total_paid, 0).label("total_paid"),
+            fees.c.oldest_fee_date,
+        )
+        .outerjoin(loans, loans.c.user_id == User.id)
+        .outerjoin(requests, requests.c.user_id == User.id)
+        .outerjoin(fees, fees.c.user_id == User.id)
+    )
+    if user_ids is not None:
+        query = query.where(User.id.in_(user_ids))
+    if tenant_id is not None:
+        query = query.where(User.tenant_id == tenant_id)
+    return query
+
+
+class PatronAccountService:
+    """
+    Maintain patron_account_summaries.
+
+    Mutations apply deltas to the patron's row inside their own
+    transaction; a row that does not exist yet is built from the base
+    tables instead. `rebuild` recomputes rows set-wise and only writes
+    the ones that drifted.
+    """
+
+    @staticmethod
+    async def get(db: AsyncSession, user_id: UUID) -> PatronAccountSummary:
+        """Get a patron's summary, building it on first access."""
+        summary = await db.get(PatronAccountSummary, user_id)
+        if summary is None:
+            await PatronAccountService.rebuild(db, user_ids=[user_id])
+            summary = await db.get(PatronAccountSummary, user_id)
+        return summary
+
+    @staticmethod
+    async def apply_delta(
+        db: AsyncSession,
+        user_id: UUID,
+        open_loans: int = 0,
+        open_requests: int = 0,
+        total_fees: int = 0,
+        open_fees: int = 0,
+        total_owed: Decimal = Decimal("0"),
+        total_paid: Decimal = Decimal("0"),
+        fee_date: Optional[datetime] = None,
+        refresh_overdue: bool = False,
+        refresh_oldest_fee: bool = False,
+    ):
+        """
+        Adjust a patron's summary by the effect of one mutation.
+
+        Call after the mutation is applied to the session; the statement
+        autoflushes it first.
+
+        Args:
+            fee_date: Date of a newly opened fee (may become the oldest)
+            refresh_overdue: Recount the patron's overdue loans
+            refresh_oldest_fee: Re-read the oldest open fee (after one closed)
+        """
+        S = PatronAccountSummary
+        values = {}
+        for name, delta in (
+            ("open_loans", open_loans),
+            ("open_requests", open_requests),
+            ("total_fees", total_fees),
+            ("open_fees", open_fees),
+            ("total_owed", total_owed),
+            ("total_paid", total_paid),
+        ):
+            if delta:
+                values[name] = getattr(S, name) + delta
+
+        if refresh_overdue:
+            values["overdue_loans"] = _overdue_count(user_id, datetime.utcnow())
+        if refresh_oldest_fee:
+            values["oldest_fee_date"] = _oldest_open_fee(user_id)
+        elif fee_date is not None:
+            values["oldest_fee_date"] = func.least(func.coalesce(S.oldest_fee_date, fee_date), fee_date)
+
+        if not values:
+            return
+
+        result = await db.execute(
+            update(S).where(S.user_id == user_id).values(**values)
+            .returning(S.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.first() is None:
+            await PatronAccountService.rebuild(db, user_ids=[user_id])
+
+    @staticmethod
+    async def rebuild(
+        db: AsyncSession,
+        user_ids: Optional[Iterable[UUID]] = None,
+        tenant_id=None,
+        now: Optional[datetime] = None,
+    ) -> int:
+        """
+        Recompute summaries from loans, requests and fees.
+
+        Rows that are missing or differ from the recomputed values are
+        written; matching rows are left alone.
+
+        Returns:
+            Number of rows inserted or corrected
+        """
+        computed = computed_summaries(now or datetime.utcnow(), user_ids, tenant_id)
+        columns = ["user_id", "tenant_id", *SUMMARY_COLUMNS]
+
+        stmt = pg_insert(PatronAccountSummary).from_select(columns, computed)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PatronAccountSummary.user_id],
+            set_={
+                **{name: stmt.excluded[name] for name in SUMMARY_COLUMNS},
+                "updated_date": func.now(),
+            },
+            where=or_(*(
+                getattr(PatronAccountSummary, name).is_distinct_from(stmt.excluded[name])
+                for name in SUMMARY_COLUMNS
+            )),
+        ).returning(PatronAccountSummary.user_id)
+
+        result = await db.execute(stmt, execution_options={"synchronize_session": False})
+        return len(result.all())
+
+    @staticmethod
+    async def refresh_overdue(db: AsyncSession, now: Optional[datetime] = None) -> int:
+        """
+        Recount overdue loans of every patron whose count changed.
+
+        Loans turn overdue with time rather than through a mutation, so this
+        runs on a schedule.
+
+        Returns:
+            Number of summaries updated
+        """
+        now = now or datetime.utcnow()
+        S = PatronAccountSummary
+
+        overdue = (
+            select(Loan.user_id, func.count().label("overdue_loans"))
+            .where(and_(Loan.status == LoanStatus.OPEN, Loan.due_date < now))
+            .group_by(Loan.user_id)
+            .subquery()
+        )
+        raised = await db.execute(
+            update(S)
+            .where(and_(S.user_id == overdue.c.user_id, S.overdue_loans != overdue.c.overdue_loans))
+            .values(overdue_loans=overdue.c.overdue_loans)
+            .execution_options(synchronize_session=False)
+        )
+
+        has_overdue = (
+            select(Loan.id)
+            .where(and_(Loan.user_id == S.user_id, Loan.status == LoanStatus.OPEN, Loan.due_date < now))
+            .exists()
+        )
+        cleared = await db.execute(
+            update(S)
+            .where(and_(S.overdue_loans > 0, ~has_overdue))
+            .values(overdue_loans=0)
+            .execution_options(synchronize_session=False)
+        )
+        return raised.rowcount + cleared.rowcount
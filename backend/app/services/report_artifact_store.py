@@ -0,0 +1,137 @@
+"""
+Report Artifact Store
+Rendered report files on local disk, addressed by a hash of their inputs
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def report_cache_key(
+    tenant_id,
+    report_type: str,
+    parameters: Dict[str, Any],
+    export_format: str,
+    watermark: str,
+) -> str:
+    """
+    Address of a report artifact.
+
+    Parameters must already be normalized (defaults filled in), so
+    equivalent requests hash alike; the data watermark changes whenever
+    the underlying rows do, which retires stale artifacts.
+    """
+    payload = json.dumps(
+        {
+            "tenant_id": str(tenant_id),
+            "report_type": report_type,
+            "parameters": parameters,
+            "export_format": export_format,
+            "watermark": watermark,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ReportArtifactStore:
+    """
+    Directory of rendered reports, fanned out by key prefix.
+
+    Writes go to a temporary file renamed into place, so readers never see
+    a partial artifact and concurrent producers of the same key are safe.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.REPORT_ARTIFACT_DIR)
+
+    def path(self, key: str, extension: str) -> Path:
+        """Location of an artifact, whether or not it exists."""
+        return self.root / key[:2] / f"{key}.{extension}"
+
+    def get(self, key: str, extension: str) -> Optional[Path]:
+        """Path of a stored artifact, or None."""
+        path = self.path(key, extension)
+        return path if path.is_file() else None
+
+    @contextmanager
+    def reserve(self, key: str, extension: str) -> Iterator[Path]:
+        """
+        Temporary path to write an artifact to, e.g. from another process.
+
+        The file appears under its key only once the block exits cleanly.
+        """
+        path = self.path(key, extension)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        partial = path.with_name(f"{path.name}.{uuid.uuid4().hex}.partial")
+        try:
+            yield partial
+            os.replace(partial, path)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+
+    @contextmanager
+    def open(self, key: str, extension: str) -> Iterator[BinaryIO]:
+        """
+        Write an artifact incrementally.
+
+        The file appears under its key only once the block exits cleanly.
+        """
+        with self.reserve(key, extension) as partial:
+            with open(partial, "wb") as handle:
+                yield handle
+
+    def put(self, key: str, extension: str, content: bytes) -> Path:
+        """Store an artifact."""
+        with self.open(key, extension) as handle:
+            handle.write(content)
+        return self.path(key, extension)
+
+    def purge(self, max_age_days: Optional[int] = None, now: Optional[float] = None) -> int:
+        """
+        Delete artifacts older than max_age_days (REPORT_ARTIFACT_MAX_AGE_DAYS).
+
+        Returns:
+            Number of files deleted
+        """
+        if not self.root.exists():
+            return 0
+
+        max_age_days = settings.REPORT_ARTIFACT_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        cutoff = (now or time.time()) - max_age_days * 86400
+
+        purged = 0
+        for path in self.root.glob("*/*"):
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                purged += 1
+        return purged
+
+
+# Singleton instance
+_report_artifact_store: Optional[ReportArtifactStore] = None
+
+
+def get_report_artifact_store() -> ReportArtifactStore:
+    """Get or create report artifact store singleton"""
+    global _report_artifact_store
+
+    if _report_artifact_store is None:
+        _report_artifact_store = ReportArtifactStore()
+
+    return _report_artifact_store
@@ -0,0 +1,891 @@
+"""
+Report Service
+Build reports, cache rendered artifacts by data watermark and run report jobs
+"""
+
+import enum
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import JSON, Select, and_, case, cast, column, func, literal, select, table, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.acquisition import Fund
+from app.models.circulation import Loan, LoanStatus
+from app.models.fee import FeePolicy
+from app.models.inventory import Holding, Instance, Item
+from app.models.job import BackgroundJob, JobStatus
+from app.models.report import ReportSchedule
+from app.models.user import User
+from app.schemas.report import (
+    CirculationReportRequest,
+    CollectionReportRequest,
+    ExportFormat,
+    FinancialReportRequest,
+    OverdueReportRequest,
+    ReportData,
+    ReportType,
+)
+from app.services.email_service import get_email_service
+from app.services.export_service import get_export_service, write_export
+from app.services.fine_accrual_service import calculate_overdue_fine, get_fine_accrual_service
+from app.services.report_artifact_store import get_report_artifact_store, report_cache_key
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE = "report"
+
+# Media type and file extension of each export format
+EXPORT_FORMATS = {
+    ExportFormat.CSV: ("text/csv", "csv"),
+    ExportFormat.EXCEL: ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    ExportFormat.PDF: ("application/pdf", "pdf"),
+    ExportFormat.JSON: ("application/json", "json"),
+    ExportFormat.PARQUET: ("application/vnd.apache.parquet", "parquet"),
+    ExportFormat.ARROW: ("application/vnd.apache.arrow.file", "arrow"),
+}
+
+# Formats rendered from streamed rows in the export pool (JSON is built in memory)
+STREAMED_FORMATS = {ExportFormat.CSV, ExportFormat.EXCEL, ExportFormat.PDF, ExportFormat.PARQUET, ExportFormat.ARROW}
+
+# Streamed formats that print the report summary
+SUMMARIZED_FORMATS = {ExportFormat.EXCEL, ExportFormat.PDF}
+
+
+# ============================================================================
+# Report rows
+#
+# Each report reads typed rows (datetimes, Decimal money) streamed from a
+# server-side cursor. Columnar and Excel exports write them as they arrive;
+# the other formats go through ReportData, whose rows are JSON-friendly.
+# ============================================================================
+
+async def stream_query(db: AsyncSession, query: Select) -> AsyncIterator:
+    """Rows of a query through a server-side cursor, fetched in batches."""
+    result = await db.stream(query.execution_options(yield_per=settings.REPORT_EXPORT_FETCH_SIZE))
+    async for row in result:
+        yield row
+
+
+def paginate(query: Select, request: BaseModel) -> Select:
+    """Apply a request's offset and limit."""
+    if request.filters:
+        query = query.offset(request.filters.offset).limit(request.filters.limit)
+    return query
+
+
+def loan_query(tenant_id, *columns) -> Select:
+    """Loans with their borrower and title joined in."""
+    return (
+        select(*columns)
+        .select_from(Loan)
+        .outerjoin(User, User.id == Loan.user_id)
+        .outerjoin(Item, Item.id == Loan.item_id)
+        .outerjoin(Holding, Holding.id == Item.holding_id)
+        .outerjoin(Instance, Instance.id == Holding.instance_id)
+        .where(Loan.tenant_id == tenant_id)
+    )
+
+
+CIRCULATION_COLUMNS = [
+    ("loan_id", "string"),
+    ("user", "string"),
+    ("item_title", "string"),
+    ("checkout_date", "timestamp"),
+    ("due_date", "timestamp"),
+    ("return_date", "timestamp"),
+    ("status", "string"),
+    ("renewal_count", "int"),
+]
+
+
+async def circulation_rows(db: AsyncSession, tenant_id, request: CirculationReportRequest) -> AsyncIterator[Dict[str, Any]]:
+    """Loans with borrower and title."""
+    query = loan_query(
+        tenant_id,
+        Loan.id, User.username, Instance.title, Loan.loan_date,
+        Loan.due_date, Loan.return_date, Loan.status, Loan.renewal_count,
+    )
+
+    if request.filters:
+        if request.filters.date_range:
+            if request.filters.date_range.start_date:
+                query = query.where(Loan.loan_date >= request.filters.date_range.start_date)
+            if request.filters.date_range.end_date:
+                query = query.where(Loan.loan_date <= request.filters.date_range.end_date)
+
+        if request.filters.user_id:
+            query = query.where(Loan.user_id == request.filters.user_id)
+
+        if request.filters.status:
+            query = query.where(Loan.status == request.filters.status)
+
+    query = paginate(query.order_by(Loan.loan_date.desc(), Loan.id), request)
+
+    async for loan_id, username, title, checkout_date, due_date, return_date, loan_status, renewal_count in stream_query(db, query):
+        yield {
+            'loan_id': str(loan_id),
+            'user': username or 'Unknown',
+            'item_title': title or 'Unknown',
+            'checkout_date': checkout_date,
+            'due_date': due_date,
+            'return_date': return_date,
+            'status': loan_status.value if loan_status else None,
+            'renewal_count': int(renewal_count or 0)
+        }
+
+
+COLLECTION_COLUMNS = [
+    ("instance_id", "string"),
+    ("title", "string"),
+    ("subtitle", "string"),
+    ("author", "string"),
+    ("publisher", "string"),
+    ("publication_year", "string"),
+    ("isbn", "string"),
+    ("instance_type", "string"),
+    ("language", "string"),
+    ("subjects", "string"),
+]
+
+
+def _first(entries, key: Optional[str] = None):
+    """First entry of a JSON list column (or a key of it)."""
+    if not entries:
+        return None
+    entry = entries[0]
+    if key is None:
+        return entry
+    return entry.get(key) if isinstance(entry, dict) else None
+
+
+def collection_filters(tenant_id, request: CollectionReportRequest) -> list:
+    """Conditions selecting the instances of a collection report."""
+    filters = [Instance.tenant_id == tenant_id]
+    if request.filters and request.filters.instance_id:
+        filters.append(Instance.id == request.filters.instance_id)
+    return filters
+
+
+async def collection_rows(db: AsyncSession, tenant_id, request: CollectionReportRequest) -> AsyncIterator[Dict[str, Any]]:
+    """Instances with their main contributor, publication and identifier."""
+    if not request.include_details:
+        return
+
+    query = select(
+        Instance.id, Instance.title, Instance.subtitle, Instance.contributors, Instance.publication,
+        Instance.identifiers, Instance.instance_type, Instance.languages, Instance.subjects,
+    ).where(*collection_filters(tenant_id, request))
+
+    query = paginate(query.order_by(Instance.title, Instance.id), request)
+
+    async for row in stream_query(db, query):
+        instance_id, title, subtitle, contributors, publication, identifiers, instance_type, languages, subjects = row
+        yield {
+            'instance_id': str(instance_id),
+            'title': title,
+            'subtitle': subtitle,
+            'author': _first(contributors, 'name'),
+            'publisher': _first(publication, 'publisher'),
+            'publication_year': _first(publication, 'dateOfPublication'),
+            'isbn': _first(identifiers, 'value'),
+            'instance_type': instance_type.value if instance_type else None,
+            'language': _first(languages),
+            'subjects': ', '.join(str(subject) for subject in subjects) if subjects else None
+        }
+
+
+# Collection breakdowns computed in the GROUPING SETS query, by group_by name
+COLLECTION_BREAKDOWNS = {
+    'type': ('by_type', lambda: Instance.instance_type),
+    'language': ('by_language', lambda: Instance.languages[0].as_string()),
+}
+
+# Most frequent subjects listed in a collection summary
+COLLECTION_TOP_SUBJECTS = 50
+
+
+def collection_breakdown_query(filters: list, breakdowns: List[str]) -> Select:
+    """
+    Instance counts per breakdown value, plus the total, in one scan.
+
+    Rows carry one GROUPING() flag per breakdown; the row with every flag
+    set is the grand total (the empty grouping set).
+    """
+    base = select(
+        *(expression().label(name) for name, (_, expression) in COLLECTION_BREAKDOWNS.items() if name in breakdowns)
+    ).where(*filters).subquery()
+    keys = [base.c[name] for name in breakdowns]
+
+    return select(
+        *(func.grouping(key).label(f"grouping_{key.name}") for key in keys),
+        *keys,
+        func.count().label("count"),
+    ).group_by(func.grouping_sets(*keys, tuple_()))
+
+
+def collection_subject_query(filters: list, limit: int = COLLECTION_TOP_SUBJECTS) -> Select:
+    """Most frequent subjects, unnesting each instance's subject list."""
+    subjects = case(
+        (func.json_typeof(Instance.subjects) == 'array', Instance.subjects),
+        else_=cast(literal('[]'), JSON),
+    )
+    subject = func.json_array_elements_text(subjects).column_valued("subject")
+    return (
+        select(subject, func.count().label("count"))
+        .select_from(Instance)
+        .where(*filters)
+        .group_by(subject)
+        .order_by(func.count().desc(), subject)
+        .limit(limit)
+    )
+
+
+async def collection_statistics(db: AsyncSession, tenant_id, request: CollectionReportRequest) -> Dict[str, Any]:
+    """
+    Summary of every instance matching a collection report's filters.
+
+    Counts come from SQL aggregates, so they cover the whole filtered
+    collection whatever page of detail rows is exported. group_by limits
+    the summary to one breakdown.
+    """
+    filters = collection_filters(tenant_id, request)
+    breakdowns = [name for name in COLLECTION_BREAKDOWNS if request.group_by in (None, name)]
+
+    summary: Dict[str, Any] = {'total_instances': 0}
+    for name in breakdowns:
+        summary[COLLECTION_BREAKDOWNS[name][0]] = {}
+
+    if breakdowns:
+        result = await db.execute(collection_breakdown_query(filters, breakdowns))
+        for row in result.all():
+            flags = row[:len(breakdowns)]
+            values = row[len(breakdowns):-1]
+            count = row[-1]
+            if all(flags):
+                summary['total_instances'] = count
+                continue
+            position = flags.index(0)
+            value = values[position]
+            if isinstance(value, enum.Enum):
+                value = value.value
+            summary[COLLECTION_BREAKDOWNS[breakdowns[position]][0]][value or 'Unknown'] = count
+    else:
+        summary['total_instances'] = await db.scalar(select(func.count()).select_from(Instance).where(*filters)) or 0
+
+    if request.group_by in (None, 'subject'):
+        result = await db.execute(collection_subject_query(filters))
+        summary['by_subject'] = {subject: count for subject, count in result.all()}
+
+    return summary
+
+
+OVERDUE_COLUMNS = [
+    ("loan_id", "string"),
+    ("user", "string"),
+    ("user_email", "string"),
+    ("item_title", "string"),
+    ("checkout_date", "timestamp"),
+    ("due_date", "timestamp"),
+    ("days_overdue", "int"),
+    ("fine_amount", "money"),
+]
+
+
+async def overdue_rows(db: AsyncSession, tenant_id, request: OverdueReportRequest) -> AsyncIterator[Dict[str, Any]]:
+    """Unreturned loans overdue by at least min_days_overdue, with accrued fines."""
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=request.min_days_overdue)
+    fine_policy = await get_fine_accrual_service().get_policy(db, tenant_id) if request.include_fines else None
+
+    query = loan_query(
+        tenant_id,
+        Loan.id, User.username, User.email, Instance.title, Loan.loan_date, Loan.due_date,
+    ).where(
+        and_(
+            Loan.status.in_([LoanStatus.OPEN, LoanStatus.OVERDUE]),
+            Loan.due_date <= cutoff
+        )
+    )
+
+    if request.filters and request.filters.user_id:
+        query = query.where(Loan.user_id == request.filters.user_id)
+
+    query = paginate(query.order_by(Loan.due_date, Loan.id), request)
+
+    async for loan_id, username, email, title, checkout_date, due_date in stream_query(db, query):
+        yield {
+            'loan_id': str(loan_id),
+            'user': username or 'Unknown',
+            'user_email': email,
+            'item_title': title or 'Unknown',
+            'checkout_date': checkout_date,
+            'due_date': due_date,
+            'days_overdue': (now - due_date).days,
+            'fine_amount': calculate_overdue_fine(due_date, now, fine_policy) if request.include_fines else None
+        }
+
+
+FINANCIAL_COLUMNS = [
+    ("fund_id", "string"),
+    ("fund_name", "string"),
+    ("fund_code", "string"),
+    ("status", "string"),
+    ("allocated_amount", "money"),
+    ("expended_amount", "money"),
+    ("available_amount", "money"),
+    ("description", "string"),
+]
+
+
+async def financial_rows(db: AsyncSession, tenant_id, request: FinancialReportRequest) -> AsyncIterator[Dict[str, Any]]:
+    """Fund allocations and expenditures."""
+    query = select(
+        Fund.id, Fund.name, Fund.code, Fund.fund_status, Fund.allocated_amount, Fund.description,
+    ).where(Fund.tenant_id == tenant_id).order_by(Fund.code)
+
+    async for fund_id, name, code, fund_status, allocated_amount, description in stream_query(db, query):
+        allocated = allocated_amount or Decimal("0.00")
+        # Fund model doesn't have expended_amount yet - using 0
+        expended = Decimal("0.00")
+        yield {
+            'fund_id': str(fund_id),
+            'fund_name': name,
+            'fund_code': code,
+            'status': fund_status or 'active',
+            'allocated_amount': allocated,
+            'expended_amount': expended,
+            'available_amount': allocated - expended,
+            'description': description
+        }
+
+
+def display_value(value):
+    """JSON-friendly value of a typed report cell."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+# ============================================================================
+# Report summaries
+#
+# Summaries are accumulated row by row, so a streamed export can write its
+# summary once the rows have gone by without keeping them. Summaries with a
+# load() coroutine are instead computed in SQL before the rows stream.
+# ============================================================================
+
+class CollectionSummary:
+    """
+    Instance counts by type, language and subject.
+
+    Loaded in SQL over the whole filtered collection (collection_statistics)
+    before the detail rows stream, rather than counted from them.
+    """
+
+    def __init__(self):
+        self.statistics: Dict[str, Any] = {}
+
+    async def load(self, db: AsyncSession, tenant_id, request: CollectionReportRequest) -> None:
+        self.statistics = await collection_statistics(db, tenant_id, request)
+
+    def add(self, row: Dict[str, Any]) -> None:
+        pass
+
+    def result(self) -> Dict[str, Any]:
+        return self.statistics
+
+
+class OverdueSummary:
+    """Overdue item count, fine total and average lateness."""
+
+    def __init__(self, include_fines: bool):
+        self.include_fines = include_fines
+        self.total = 0
+        self.total_fines = Decimal("0.00")
+        self.total_days = 0
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.total += 1
+        self.total_days += row['days_overdue']
+        if self.include_fines:
+            self.total_fines += row['fine_amount']
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            'total_overdue_items': self.total,
+            'total_fines': float(self.total_fines) if self.include_fines else None,
+            'average_days_overdue': self.total_days / self.total if self.total else 0
+        }
+
+
+class FinancialSummary:
+    """Fund totals and expenditure rate."""
+
+    def __init__(self):
+        self.allocated = Decimal("0.00")
+        self.expended = Decimal("0.00")
+        self.available = Decimal("0.00")
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.allocated += row['allocated_amount']
+        self.expended += row['expended_amount']
+        self.available += row['available_amount']
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            'total_allocated': float(self.allocated),
+            'total_expended': float(self.expended),
+            'total_available': float(self.available),
+            'expenditure_rate': float(self.expended / self.allocated * 100) if self.allocated > 0 else 0
+        }
+
+
+class ReportDefinition(NamedTuple):
+    """How a report is requested, read, summarized and watermarked."""
+    request_schema: Type[BaseModel]
+    title: str
+    description: str  # Formatted with the request's fields
+    rows: Any  # async iterator (db, tenant_id, request) -> typed row dicts
+    columns: List[Tuple[str, str]]  # Column names and types of the typed rows
+    summary: Any  # (request) -> summary accumulator, or None
+    tables: tuple  # Every model read (joined or looked up); their changes invalidate cached artifacts
+
+
+# Reports that can be generated and queued
+REPORTS: Dict[ReportType, ReportDefinition] = {
+    ReportType.CIRCULATION: ReportDefinition(
+        CirculationReportRequest,
+        "Circulation Report",
+        "Report of circulation activity including checkouts, checkins, and renewals",
+        circulation_rows,
+        CIRCULATION_COLUMNS,
+        lambda request: None,
+        (Loan, User, Item, Holding, Instance),
+    ),
+    ReportType.COLLECTION: ReportDefinition(
+        CollectionReportRequest,
+        "Collection Report",
+        "Report of library collection/inventory",
+        collection_rows,
+        COLLECTION_COLUMNS,
+        lambda request: CollectionSummary() if request.include_statistics else None,
+        (Instance,),
+    ),
+    ReportType.OVERDUE: ReportDefinition(
+        OverdueReportRequest,
+        "Overdue Items Report",
+        "Report of items overdue by at least {min_days_overdue} day(s)",
+        overdue_rows,
+        OVERDUE_COLUMNS,
+        lambda request: OverdueSummary(request.include_fines),
+        (Loan, User, Item, Holding, Instance, FeePolicy),
+    ),
+    ReportType.FINANCIAL: ReportDefinition(
+        FinancialReportRequest,
+        "Financial Report",
+        "Report of fund allocation and expenditures",
+        financial_rows,
+        FINANCIAL_COLUMNS,
+        lambda request: FinancialSummary(),
+        (Fund,),
+    ),
+}
+
+# Reports whose content also changes with the date alone
+DATE_DEPENDENT_REPORTS = {ReportType.OVERDUE}
+
+
+async def summarized_rows(report: ReportDefinition, db: AsyncSession, tenant_id, request: BaseModel, summary) -> AsyncIterator[Dict[str, Any]]:
+    """A report's typed rows, fed to its summary on the way through."""
+    if summary is not None and hasattr(summary, "load"):
+        await summary.load(db, tenant_id, request)
+
+    async for row in report.rows(db, tenant_id, request):
+        if summary is not None:
+            summary.add(row)
+        yield row
+
+
+async def build_report(db: AsyncSession, tenant_id, request: BaseModel) -> ReportData:
+    """Report data of a request, for the formats rendered in memory."""
+    report = REPORTS[request.report_type]
+    summary = report.summary(request)
+
+    data = [
+        {key: display_value(value) for key, value in row.items()}
+        async for row in summarized_rows(report, db, tenant_id, request, summary)
+    ]
+
+    return ReportData(
+        report_type=request.report_type,
+        title=report.title,
+        description=report.description.format(**request.model_dump()),
+        generated_at=datetime.utcnow(),
+        filters_applied=request.filters.model_dump() if request.filters else {},
+        total_records=len(data),
+        data=data,
+        summary=summary.result() if summary is not None else None
+    )
+
+
+def parse_report_request(report_type: ReportType, parameters: Dict[str, Any]) -> BaseModel:
+    """
+    Validate report parameters into the report's request schema.
+
+    Raises:
+        ValueError: If the report type cannot be generated
+        pydantic.ValidationError: If the parameters are invalid
+    """
+    if report_type not in REPORTS:
+        raise ValueError(f"Report type '{report_type.value}' is not available")
+    request_schema = REPORTS[report_type].request_schema
+    return request_schema(**{**parameters, "report_type": report_type})
+
+
+def normalized_parameters(request: BaseModel) -> Dict[str, Any]:
+    """Request parameters with defaults filled in, as they are hashed."""
+    return request.model_dump(mode="json", exclude={"report_type", "export_format"})
+
+
+def render_report(report_data: ReportData, export_format: ExportFormat) -> bytes:
+    """Render report data in an export format."""
+    if export_format == ExportFormat.JSON:
+        return report_data.model_dump_json().encode()
+    return get_export_service().export_report(report_data, export_format)
+
+
+def artifact_filename(report_type: ReportType, export_format: ExportFormat, generated_at: datetime) -> str:
+    """Download name of a report artifact."""
+    return f"{report_type.value}_report_{generated_at:%Y%m%d_%H%M%S}.{EXPORT_FORMATS[export_format][1]}"
+
+
+def artifact_info(
+    request: BaseModel,
+    key: str,
+    watermark: str,
+    generated_at: Optional[datetime] = None,
+) -> Optional[Dict[str, Any]]:
+    """Description of a stored artifact (as kept in a job's result), or None."""
+    media_type, extension = EXPORT_FORMATS[request.export_format]
+    path = get_report_artifact_store().get(key, extension)
+    if path is None:
+        return None
+    return {
+        "artifact": key,
+        "extension": extension,
+        "media_type": media_type,
+        "filename": artifact_filename(request.report_type, request.export_format, generated_at or datetime.utcnow()),
+        "size": path.stat().st_size,
+        "watermark": watermark,
+        "cached": True,
+    }
+
+
+PG_STAT_USER_TABLES = table("pg_stat_user_tables", column("relname"), column("n_tup_del"))
+
+
+def watermark_query(tenant_id, models):
+    """
+    One-row SELECT of the latest updated_date of each model's tenant rows,
+    followed by the deletes counted in those tables.
+    """
+    return select(
+        *(
+            select(func.max(model.updated_date)).where(model.tenant_id == tenant_id).scalar_subquery()
+            for model in models
+        ),
+        select(func.sum(PG_STAT_USER_TABLES.c.n_tup_del))
+        .where(PG_STAT_USER_TABLES.c.relname.in_([model.__tablename__ for model in models]))
+        .scalar_subquery(),
+    )
+
+
+class ReportService:
+    """
+    Report generation through the artifact cache.
+
+    A report's artifact is keyed by tenant, report type, normalized
+    parameters, format and a watermark of the tables it reads. Repeating a
+    request while the data is unchanged serves the stored file; any
+    parameter or data change gives a new key and the report is built again.
+    """
+
+    @staticmethod
+    async def data_watermark(db: AsyncSession, tenant_id, report_type: ReportType) -> str:
+        """
+        Fingerprint of the data a report reads, in one cheap statement.
+
+        Inserts and updates move the tenant's latest updated_date of a
+        table (an index lookup on (tenant_id, updated_date)); deletes move
+        the table's delete counter in pg_stat_user_tables, which is shared
+        by all tenants and so only costs other tenants a rebuild.
+        """
+        models = REPORTS[report_type].tables
+        *latest, deletes = (await db.execute(watermark_query(tenant_id, models))).one()
+        parts = [
+            f"{model.__tablename__}:{value.isoformat() if value else '-'}"
+            for model, value in zip(models, latest)
+        ]
+        parts.append(f"deleted:{deletes or 0}")
+        if report_type in DATE_DEPENDENT_REPORTS:
+            parts.append(datetime.now(timezone.utc).date().isoformat())
+        return "|".join(parts)
+
+    @staticmethod
+    async def cache_key(db: AsyncSession, tenant_id, request: BaseModel) -> Tuple[str, str]:
+        """(artifact key, watermark) of a report request against the current data."""
+        watermark = await ReportService.data_watermark(db, tenant_id, request.report_type)
+        key = report_cache_key(
+            tenant_id,
+            request.report_type.value,
+            normalized_parameters(request),
+            request.export_format.value,
+            watermark,
+        )
+        return key, watermark
+
+    @staticmethod
+    async def cached_artifact(db: AsyncSession, tenant_id, request: BaseModel) -> Optional[Dict[str, Any]]:
+        """Artifact info of a request if its artifact is already stored."""
+        key, watermark = await ReportService.cache_key(db, tenant_id, request)
+        return artifact_info(request, key, watermark)
+
+    @staticmethod
+    async def generate(db: AsyncSession, tenant_id, request: BaseModel) -> Dict[str, Any]:
+        """
+        Artifact of a report request, built and stored unless already cached.
+
+        The watermark is read before the report, so an artifact is never
+        labelled with data newer than it contains.
+
+        Returns:
+            Artifact info: artifact key, extension, media_type, filename,
+            size, watermark and whether it was cached
+        """
+        key, watermark = await ReportService.cache_key(db, tenant_id, request)
+        cached = artifact_info(request, key, watermark)
+        if cached:
+            return cached
+
+        report = REPORTS[request.report_type]
+        extension = EXPORT_FORMATS[request.export_format][1]
+        store = get_report_artifact_store()
+
+        if request.export_format in STREAMED_FORMATS:
+            # Typed rows are spooled to disk as they stream from the cursor and
+            # rendered in the export process pool; Excel and PDF summaries are
+            # accumulated on the way through
+            generated_at = datetime.utcnow()
+            summary = report.summary(request) if request.export_format in SUMMARIZED_FORMATS else None
+            with store.reserve(key, extension) as path:
+                records = await write_export(
+                    summarized_rows(report, db, tenant_id, request, summary),
+                    report.columns,
+                    path,
+                    request.export_format,
+                    {
+                        "title": report.title,
+                        "description": report.description.format(**request.model_dump()),
+                        "report_type": request.report_type.value,
+                        "generated_at": generated_at,
+                    },
+                    summary=summary.result if summary is not None else None,
+                )
+        else:
+            report_data = await build_report(db, tenant_id, request)
+            generated_at, records = report_data.generated_at, report_data.total_records
+            store.put(key, extension, render_report(report_data, request.export_format))
+
+        return {
+            **artifact_info(request, key, watermark, generated_at),
+            "cached": False,
+            "records": records,
+        }
+
+    @staticmethod
+    async def create_job(
+        db: AsyncSession,
+        tenant_id,
+        created_by,
+        request: BaseModel,
+        schedule_id=None,
+    ) -> Tuple[BackgroundJob, bool]:
+        """
+        Create a report job (committed).
+
+        A request whose artifact is already stored completes immediately.
+
+        Returns:
+            (job, queued): queued is True if a worker must still run it
+        """
+        cached = await ReportService.cached_artifact(db, tenant_id, request)
+        now = datetime.now(timezone.utc)
+
+        parameters = {
+            "report_type": request.report_type.value,
+            "export_format": request.export_format.value,
+            "parameters": normalized_parameters(request),
+        }
+        if schedule_id:
+            parameters["schedule_id"] = str(schedule_id)
+
+        job = BackgroundJob(
+            id=uuid.uuid4(),
+            job_type=JOB_TYPE,
+            status=JobStatus.COMPLETED if cached else JobStatus.QUEUED,
+            parameters=parameters,
+            result=cached or {},
+            errors=[],
+            started_at=now if cached else None,
+            finished_at=now if cached else None,
+            tenant_id=tenant_id,
+            created_by_user_id=created_by,
+        )
+        db.add(job)
+        await db.commit()
+        return job, cached is None
+
+    @staticmethod
+    async def run_job(db: AsyncSession, job_id) -> Dict[str, Any]:
+        """Build the artifact of a queued report job."""
+        job = await db.get(BackgroundJob, job_id)
+        if job is None or job.status != JobStatus.QUEUED:
+            logger.warning(f"Report job {job_id} is missing or not queued")
+            return {"skipped": True}
+
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        await db.commit()
+
+        try:
+            request = parse_report_request(
+                ReportType(job.parameters["report_type"]),
+                {**job.parameters["parameters"], "export_format": job.parameters["export_format"]},
+            )
+            job.result = await ReportService.generate(db, job.tenant_id, request)
+            job.status = JobStatus.COMPLETED
+
+        except Exception as exc:
+            logger.exception(f"Report job {job_id} failed")
+            await db.rollback()
+            job = await db.get(BackgroundJob, job_id)
+            job.status = JobStatus.FAILED
+            job.error_message = str(exc)
+
+        job.finished_at = datetime.now(timezone.utc)
+        await db.commit()
+
+        if job.status == JobStatus.COMPLETED:
+            await ReportService.deliver_scheduled(db, job)
+        return {"status": job.status.value, **job.result}
+
+    @staticmethod
+    async def deliver_scheduled(db: AsyncSession, job: BackgroundJob) -> int:
+        """
+        Email the artifact of a completed scheduled report job to the
+        schedule's recipients.
+
+        Artifacts over REPORT_EMAIL_MAX_ATTACHMENT_MB are not attached; the
+        email then points to the job's download instead.
+
+        Returns:
+            Number of recipients the report was sent to
+        """
+        schedule_id = job.parameters.get("schedule_id")
+        if not schedule_id:
+            return 0
+        schedule = await db.get(ReportSchedule, uuid.UUID(schedule_id))
+        if schedule is None or not schedule.recipients:
+            return 0
+
+        path = get_report_artifact_store().get(job.result["artifact"], job.result["extension"])
+        if path is None:
+            logger.warning(f"Artifact of report job {job.id} is gone; schedule {schedule_id} not delivered")
+            return 0
+        content = None
+        if path.stat().st_size <= settings.REPORT_EMAIL_MAX_ATTACHMENT_MB * 1024 * 1024:
+            content = path.read_bytes()
+
+        email_service = get_email_service()
+        sent = 0
+        for recipient in schedule.recipients:
+            sent += await email_service.send_scheduled_report(
+                to_email=recipient,
+                report_name=schedule.name,
+                generated_at=f"{job.finished_at:%Y-%m-%d %H:%M} UTC",
+                filename=job.result["filename"],
+                content=content,
+                media_type=job.result["media_type"],
+                job_id=str(job.id),
+            )
+        return sent
+
+    @staticmethod
+    async def queue_due_schedules(db: AsyncSession, now: Optional[datetime] = None) -> list:
+        """
+        Create report jobs for enabled schedules due within the lookahead window.
+
+        Each schedule advances to its next cron occurrence after now. Jobs
+        served from the cache are delivered to the recipients at once; the
+        others when their worker completes them.
+
+        Returns:
+            Jobs a worker must run (cached ones are already complete)
+        """
+        now = now or datetime.now(timezone.utc)
+        horizon = now + timedelta(hours=settings.REPORT_SCHEDULE_LOOKAHEAD_HOURS)
+
+        result = await db.execute(
+            select(ReportSchedule).where(
+                and_(ReportSchedule.enabled.is_(True), ReportSchedule.next_run_at <= horizon)
+            ).order_by(ReportSchedule.next_run_at)
+        )
+
+        queued = []
+        for schedule in result.scalars().all():
+            try:
+                request = parse_report_request(
+                    ReportType(schedule.report_type),
+                    {**schedule.parameters, "export_format": schedule.export_format},
+                )
+                job, needs_worker = await ReportService.create_job(
+                    db, schedule.tenant_id, schedule.created_by_user_id, request, schedule_id=schedule.id
+                )
+            except Exception:
+                logger.exception(f"Could not queue report schedule {schedule.id}")
+                await db.rollback()
+                continue
+
+            schedule.last_run_at = now
+            schedule.last_job_id = job.id
+            schedule.next_run_at = next_run_after(schedule.schedule, max(schedule.next_run_at, now))
+            await db.commit()
+
+            if needs_worker:
+                queued.append(job)
+            else:
+                await ReportService.deliver_scheduled(db, job)
+
+        return queued
+
+
+def next_run_after(expression: str, after: datetime) -> datetime:
+    """
+    Next occurrence of a cron expression (UTC) after a moment.
+
+    Raises:
+        ValueError: If the expression is invalid
+    """
+    from croniter import croniter
+
+    if not croniter.is_valid(expression):
+        raise ValueError("Invalid cron expression")
+    return croniter(expression, after).get_next(datetime)
@@ -0,0 +1,569 @@
+"""
+User Import Service
+Stream CSV/NDJSON patron loads into users in batches as a background job
+"""
+
+import csv
+import json
+import logging
+import multiprocessing
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.job import BackgroundJob, JobStatus
+from app.models.permission import Role, user_roles
+from app.models.user import Address, PatronGroup, User
+from app.schemas.user import UserCreate
+from app.services.password_hashing_service import PasswordHashingService
+from app.services.pool_executor import BoundedPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE = "user_import"
+FORMATS = ("csv", "ndjson")
+ON_EXISTING = ("skip", "update")
+
+# CSV columns that map into the personal JSON
+CSV_PERSONAL_COLUMNS = {
+    "first_name": "firstName",
+    "last_name": "lastName",
+    "middle_name": "middleName",
+    "preferred_first_name": "preferredFirstName",
+    "pronouns": "pronouns",
+    "phone": "phone",
+    "mobile_phone": "mobilePhone",
+    "date_of_birth": "dateOfBirth",
+}
+CSV_LIST_SEPARATOR = ";"
+
+# Profile fields overwritten when an existing user is updated (never the password)
+UPDATE_FIELDS = (
+    "email", "barcode", "active", "user_type", "patron_group_id", "personal",
+    "enrollment_date", "expiration_date", "custom_fields", "tags",
+    "preferred_email_communication",
+)
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> Optional[str]:
+    """Import format of an upload from its extension or content type."""
+    extension = Path(filename or "").suffix.lower()
+    if extension == ".csv" or content_type == "text/csv":
+        return "csv"
+    if extension in (".ndjson", ".jsonl") or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+def upload_path(job_id) -> Path:
+    """Location of a job's uploaded file."""
+    return Path(settings.USER_IMPORT_DIR) / f"{job_id}.upload"
+
+
+def _blank_to_none(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def csv_record_to_user(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map a flat CSV record to the UserCreate shape.
+
+    Columns: username, email, password, barcode, active, user_type,
+    patron_group (name) or patron_group_id, enrollment_date,
+    expiration_date, tags and role_ids (separated by ";") and the
+    personal columns of CSV_PERSONAL_COLUMNS. Unknown columns are ignored.
+    """
+    record = {key.strip().lower(): _blank_to_none(value) for key, value in record.items() if key}
+
+    data: Dict[str, Any] = {
+        key: record[key]
+        for key in (
+            "username", "email", "password", "barcode", "user_type",
+            "patron_group", "patron_group_id", "enrollment_date", "expiration_date",
+        )
+        if record.get(key) is not None
+    }
+    if record.get("active") is not None:
+        data["active"] = record["active"].lower() in ("1", "true", "yes", "y")
+    for key in ("tags", "role_ids"):
+        if record.get(key):
+            data[key] = [part.strip() for part in record[key].split(CSV_LIST_SEPARATOR) if part.strip()]
+
+    data["personal"] = {
+        target: record[column]
+        for column, target in CSV_PERSONAL_COLUMNS.items()
+        if record.get(column) is not None
+    }
+    if record.get("email"):
+        data["personal"].setdefault("email", record["email"])
+    return data
+
+
+def iter_records(path: Path, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (row number, UserCreate-shaped dict) from an upload.
+
+    Rows that cannot be parsed are yielded as (row number, exception).
+    Row numbers are 1-based data rows (the CSV header is not counted).
+    """
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        if fmt == "csv":
+            for row_number, record in enumerate(csv.DictReader(handle), start=1):
+                yield row_number, csv_record_to_user(record)
+            return
+
+        row_number = 0
+        for line in handle:
+            if not line.strip():
+                continue
+            row_number += 1
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("Expected a JSON object")
+                yield row_number, record
+            except ValueError as exc:
+                yield row_number, exc
+
+
+def count_records(path: Path, fmt: str) -> int:
+    """Number of data rows in an upload (one cheap pass, for progress)."""
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        if fmt == "csv":
+            # Blank lines are skipped by csv.DictReader, so they are not records
+            return max(sum(1 for row in csv.reader(handle) if row) - 1, 0)
+        return sum(1 for line in handle if line.strip())
+
+
+def row_error(row: int, code: str, message: str, **details) -> Dict[str, Any]:
+    error = {"row": row, "code": code, "message": message}
+    if details:
+        error["details"] = details
+    return error
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
+
+
+class UserImportService:
+    """
+    Bulk user import.
+
+    The API stores the upload and queues a BackgroundJob; a Celery worker
+    then streams the file in batches. Each batch is checked against
+    existing users with one set-based query, its new passwords are hashed
+    in a worker pool, and it is written with one multi-row INSERT (plus a
+    bulk UPDATE when existing users are updated) and committed together
+    with the job's progress.
+    """
+
+    def __init__(self, hashing: Optional[PasswordHashingService] = None, batch_size: Optional[int] = None):
+        self.batch_size = batch_size or settings.USER_IMPORT_BATCH_SIZE
+        self._hashing = hashing
+
+    @property
+    def hashing(self) -> PasswordHashingService:
+        """Password hashing pool of the import worker (created on first use)."""
+        if self._hashing is None:
+            kind = settings.USER_IMPORT_HASHING_EXECUTOR
+            if kind == "process" and multiprocessing.current_process().daemon:
+                # Daemonic pool workers (e.g. Celery prefork) cannot start children;
+                # bcrypt releases the GIL, so threads still use every core
+                logger.warning("User import runs in a daemonic process, hashing with threads")
+                kind = "thread"
+            self._hashing = PasswordHashingService(BoundedPoolExecutor(
+                name="user-import-hashing",
+                kind=kind,
+                max_workers=settings.USER_IMPORT_HASHING_WORKERS or None,
+                max_queue=self.batch_size,
+            ))
+        return self._hashing
+
+    # ------------------------------------------------------------------
+    # Job creation (API)
+    # ------------------------------------------------------------------
+
+    async def create_job(
+        self,
+        db: AsyncSession,
+        tenant_id: uuid.UUID,
+        created_by: uuid.UUID,
+        filename: str,
+        fmt: str,
+        on_existing: str,
+        chunks: AsyncIterator[bytes],
+    ) -> BackgroundJob:
+        """
+        Store an upload and queue its import job (committed).
+
+        Raises:
+            ValueError: If the upload exceeds USER_IMPORT_MAX_UPLOAD_SIZE
+        """
+        job = BackgroundJob(
+            id=uuid.uuid4(),
+            job_type=JOB_TYPE,
+            status=JobStatus.QUEUED,
+            parameters={"filename": filename, "format": fmt, "on_existing": on_existing},
+            result={},
+            errors=[],
+            tenant_id=tenant_id,
+            created_by_user_id=created_by,
+        )
+
+        path = upload_path(job.id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = 0
+        try:
+            with open(path, "wb") as handle:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > settings.USER_IMPORT_MAX_UPLOAD_SIZE:
+                        raise ValueError(
+                            f"Upload exceeds the maximum size of {settings.USER_IMPORT_MAX_UPLOAD_SIZE} bytes"
+                        )
+                    handle.write(chunk)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+
+        job.parameters = {**job.parameters, "size": size}
+        db.add(job)
+        await db.commit()
+        return job
+
+    # ------------------------------------------------------------------
+    # Job execution (worker)
+    # ------------------------------------------------------------------
+
+    async def run(self, db: AsyncSession, job_id) -> Dict[str, Any]:
+        """
+        Run a queued import job to completion.
+
+        Batches are committed as they finish, so a failure part-way keeps
+        the rows already imported and marks the job failed.
+        """
+        job = await db.get(BackgroundJob, job_id)
+        if job is None or job.status != JobStatus.QUEUED:
+            logger.warning(f"User import job {job_id} is missing or not queued")
+            return {"skipped": True}
+
+        path = upload_path(job.id)
+        fmt = job.parameters["format"]
+
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        job.total_rows = count_records(path, fmt)
+        job.result = {"created": 0, "updated": 0}
+        await db.commit()
+
+        try:
+            context = await self._load_context(db, job)
+            batch: List[Tuple[int, Any]] = []
+            for record in iter_records(path, fmt):
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    await self._import_batch(db, job, context, batch)
+                    batch = []
+            if batch:
+                await self._import_batch(db, job, context, batch)
+
+            job.status = JobStatus.COMPLETED
+
+        except Exception as exc:
+            logger.exception(f"User import job {job.id} failed")
+            await db.rollback()
+            job = await db.get(BackgroundJob, job_id)
+            job.status = JobStatus.FAILED
+            job.error_message = str(exc)
+
+        job.finished_at = datetime.now(timezone.utc)
+        await db.commit()
+        path.unlink(missing_ok=True)
+
+        logger.info(
+            f"User import job {job.id} {job.status.value}: "
+            f"{job.succeeded_rows} imported, {job.failed_rows} failed of {job.total_rows}"
+        )
+        return {
+            "status": job.status.value,
+            "processed": job.processed_rows,
+            "succeeded": job.succeeded_rows,
+            "failed": job.failed_rows,
+        }
+
+    async def _load_context(self, db: AsyncSession, job: BackgroundJob) -> Dict[str, Any]:
+        """Per-job lookups: patron groups and roles of the tenant, identifiers seen so far."""
+        groups = await db.execute(
+            select(PatronGroup.id, PatronGroup.group_name).where(PatronGroup.tenant_id == job.tenant_id)
+        )
+        roles = await db.execute(select(Role.id).where(Role.tenant_id == job.tenant_id))
+
+        group_ids = {}
+        group_names = {}
+        for group_id, group_name in groups.all():
+            group_ids[group_id] = group_id
+            group_names[group_name.lower()] = group_id
+
+        return {
+            "tenant_id": job.tenant_id,
+            "created_by": job.created_by_user_id,
+            "on_existing": job.parameters.get("on_existing", "skip"),
+            "group_ids": group_ids,
+            "group_names": group_names,
+            "role_ids": set(roles.scalars().all()),
+            "seen": {"username": set(), "email": set(), "barcode": set()},
+        }
+
+    def _validate(self, context: Dict[str, Any], row: int, record: Any):
+        """Validate a record into a UserCreate, or return a row error."""
+        if isinstance(record, Exception):
+            return None, row_error(row, "INVALID_ROW", f"Could not parse row: {record}")
+
+        record = dict(record)
+        group_name = record.pop("patron_group", None)
+        if group_name and not record.get("patron_group_id"):
+            group_id = context["group_names"].get(str(group_name).lower())
+            if group_id is None:
+                return None, row_error(row, "UNKNOWN_PATRON_GROUP", f"Patron group '{group_name}' not found")
+            record["patron_group_id"] = group_id
+
+        try:
+            user_data = UserCreate(**record)
+        except ValidationError as exc:
+            return None, row_error(row, "INVALID_ROW", _validation_message(exc), username=record.get("username"))
+
+        if user_data.patron_group_id and user_data.patron_group_id not in context["group_ids"]:
+            return None, row_error(row, "UNKNOWN_PATRON_GROUP", "Patron group not found")
+        unknown_roles = set(user_data.role_ids) - context["role_ids"]
+        if unknown_roles:
+            return None, row_error(row, "UNKNOWN_ROLE", "Role not found", role_ids=[str(r) for r in unknown_roles])
+
+        # Duplicates within the file
+        seen = context["seen"]
+        keys = {"username": user_data.username, "email": user_data.email.lower(), "barcode": user_data.barcode}
+        for field, value in keys.items():
+            if value is not None and value in seen[field]:
+                return None, row_error(row, "DUPLICATE_IN_FILE", f"Duplicate {field} earlier in the file", **{field: value})
+        for field, value in keys.items():
+            if value is not None:
+                seen[field].add(value)
+
+        return user_data, None
+
+    async def _import_batch(
+        self,
+        db: AsyncSession,
+        job: BackgroundJob,
+        context: Dict[str, Any],
+        batch: Sequence[Tuple[int, Any]],
+    ):
+        errors = []
+        valid = []
+        for row, record in batch:
+            user_data, error = self._validate(context, row, record)
+            if error:
+                errors.append(error)
+            else:
+                valid.append((row, user_data))
+
+        existing = await find_existing_users(db, context["tenant_id"], [user_data for _, user_data in valid])
+
+        inserts, updates = [], []
+        for row, user_data in valid:
+            target, error = classify(existing, context["tenant_id"], context["on_existing"], row, user_data)
+            if error:
+                errors.append(error)
+            elif target is None:
+                inserts.append((row, user_data))
+            else:
+                updates.append((row, user_data, target))
+
+        created = await self._insert_users(db, context, inserts, errors)
+        updated = await self._update_users(db, context, updates)
+
+        job.processed_rows += len(batch)
+        job.succeeded_rows += created + updated
+        job.failed_rows += len(errors)
+        job.result = {
+            "created": job.result.get("created", 0) + created,
+            "updated": job.result.get("updated", 0) + updated,
+        }
+        room = settings.USER_IMPORT_MAX_ERRORS - len(job.errors)
+        if room > 0 and errors:
+            job.errors = job.errors + sorted(errors, key=lambda e: e["row"])[:room]
+
+        await db.commit()
+
+    async def _insert_users(
+        self,
+        db: AsyncSession,
+        context: Dict[str, Any],
+        inserts: List[Tuple[int, UserCreate]],
+        errors: List[Dict[str, Any]],
+    ) -> int:
+        """Insert new users in one statement; rows lost to concurrent inserts become errors."""
+        if not inserts:
+            return 0
+
+        hashed_passwords = await self.hashing.hash_many([user_data.password for _, user_data in inserts])
+
+        now = datetime.now(timezone.utc)
+        values = []
+        for (_, user_data), hashed_password in zip(inserts, hashed_passwords):
+            values.append({
+                **user_data.model_dump(exclude={"password", "addresses", "role_ids"}),
+                "id": uuid.uuid4(),
+                "hashed_password": hashed_password,
+                "tenant_id": context["tenant_id"],
+                "created_by_user_id": context["created_by"],
+                "created_date": now,
+                "updated_date": now,
+            })
+
+        result = await db.execute(
+            pg_insert(User).values(values).on_conflict_do_nothing().returning(User.id)
+        )
+        inserted = set(result.scalars().all())
+
+        addresses, roles = [], []
+        for (row, user_data), value in zip(inserts, values):
+            if value["id"] not in inserted:
+                errors.append(row_error(row, "DUPLICATE_USER", "User was created concurrently", username=user_data.username))
+                continue
+            addresses.extend(
+                {**address.model_dump(), "id": uuid.uuid4(), "user_id": value["id"]}
+                for address in user_data.addresses
+            )
+            roles.extend({"user_id": value["id"], "role_id": role_id} for role_id in set(user_data.role_ids))
+
+        if addresses:
+            await db.execute(insert(Address), addresses)
+        if roles:
+            await db.execute(insert(user_roles), roles)
+
+        return len(inserted)
+
+    async def _update_users(
+        self,
+        db: AsyncSession,
+        context: Dict[str, Any],
+        updates: List[Tuple[int, UserCreate, Any]],
+    ) -> int:
+        """
+        Overwrite the profile fields supplied by the file in one bulk UPDATE by primary key.
+
+        Fields a row leaves out keep their stored values; supplied personal
+        fields are merged into the stored personal data.
+        """
+        if not updates:
+            return 0
+
+        result = await db.execute(
+            select(User.id, User.personal).where(User.id.in_([target for _, _, target in updates]))
+        )
+        stored_personal = {user_id: personal or {} for user_id, personal in result.all()}
+
+        now = datetime.now(timezone.utc)
+        values = []
+        for _, user_data, target in updates:
+            value = user_data.model_dump(include=set(UPDATE_FIELDS), exclude_unset=True)
+            if "personal" in value:
+                value["personal"] = {**stored_personal.get(target, {}), **value["personal"]}
+            values.append({
+                **value,
+                "id": target,
+                "updated_by_user_id": context["created_by"],
+                "updated_date": now,
+            })
+
+        await db.execute(update(User), values)
+        return len(updates)
+
+
+async def find_existing_users(db: AsyncSession, tenant_id, users: Sequence[Any]) -> Dict[str, Dict[Any, Any]]:
+    """
+    Existing users clashing with any username, email or barcode, in one query.
+
+    Usernames are unique across tenants; emails (compared case-insensitively)
+    and barcodes per tenant.
+
+    Returns:
+        {"username": {value: (id, tenant_id)}, "email": {...}, "barcode": {...}}
+    """
+    existing = {"username": {}, "email": {}, "barcode": {}}
+    if not users:
+        return existing
+
+    usernames = {user.username for user in users}
+    emails = {user.email.lower() for user in users}
+    barcodes = {user.barcode for user in users if user.barcode}
+
+    result = await db.execute(
+        select(User.id, User.tenant_id, User.username, User.email, User.barcode).where(
+            or_(
+                User.username.in_(usernames),
+                and_(
+                    User.tenant_id == tenant_id,
+                    or_(func.lower(User.email).in_(emails), User.barcode.in_(barcodes)),
+                ),
+            )
+        )
+    )
+    for user_id, user_tenant_id, username, email, barcode in result.all():
+        existing["username"][username] = (user_id, user_tenant_id)
+        if user_tenant_id == tenant_id:
+            existing["email"][email.lower()] = (user_id, user_tenant_id)
+            if barcode:
+                existing["barcode"][barcode] = (user_id, user_tenant_id)
+    return existing
+
+
+def classify(existing: Dict[str, Dict[Any, Any]], tenant_id, on_existing: str, row: int, user_data):
+    """
+    Decide what to do with a valid row.
+
+    Returns:
+        (None, None) to insert, (user_id, None) to update that user,
+        or (None, error) to reject the row
+    """
+    by_username = existing["username"].get(user_data.username)
+    same_user = by_username is not None and by_username[1] == tenant_id and on_existing == "update"
+    if by_username is not None and not same_user:
+        return None, row_error(row, "DUPLICATE_USER", "Username already exists", username=user_data.username)
+
+    own_id = by_username[0] if same_user else None
+    for field in ("email", "barcode"):
+        value = getattr(user_data, field)
+        key = value.lower() if value and field == "email" else value
+        owner = existing[field].get(key) if value else None
+        if owner is not None and owner[0] != own_id:
+            return None, row_error(row, "DUPLICATE_USER", f"{field.capitalize()} already in use", **{field: value})
+
+    return own_id, None
+
+
+# Singleton instance
+_user_import_service: Optional[UserImportService] = None
+
+
+def get_user_import_service() -> UserImportService:
+    """Get or create user import service singleton"""
+    global _user_import_service
+
+    if _user_import_service is None:
+        _user_import_service = UserImportService()
+
+    return _user_import_service
@@ -0,0 +1,99 @@
+"""
+User Search Service
+Indexed patron lookup: exact identifier matches first, then ranked trigram search
+"""
+
+import re
+from typing import Optional
+
+from sqlalchemy import Select, and_, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+
+# Exact identifier matches returned before falling back to text search
+EXACT_MATCH_LIMIT = 20
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_search_term(term: Optional[str]) -> str:
+    """Lowercase a search term and collapse whitespace, as in users.search_text."""
+    return _WHITESPACE.sub(" ", (term or "").strip()).lower()
+
+
+def like_pattern(token: str) -> str:
+    """Substring LIKE pattern for a token with LIKE wildcards escaped."""
+    escaped = token.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def exact_match_condition(term: str):
+    """
+    Condition matching a single-token term as a barcode or email.
+
+    Each branch is served by a unique or functional index. Usernames are
+    left out: they are often plain names, and an exact username hit would
+    hide every other user the text search finds for that word. Returns None
+    for multi-word terms, which cannot be identifiers.
+    """
+    raw = (term or "").strip()
+    if not raw or " " in raw:
+        return None
+
+    conditions = [User.barcode == raw]
+    if "@" in raw:
+        conditions.append(func.lower(User.email) == raw.lower())
+    return or_(*conditions)
+
+
+def text_search_condition(normalized: str):
+    """Every word of the term must occur in the user's search text."""
+    return and_(*(
+        User.search_text.ilike(like_pattern(token), escape="\\")
+        for token in normalized.split(" ")
+    ))
+
+
+def text_search_rank(normalized: str):
+    """Rank of a user for a term: closest word match first."""
+    return func.word_similarity(normalized, User.search_text)
+
+
+class UserSearchService:
+    """
+    Search users through the users.search_text trigram index.
+
+    Desk lookups are usually a scanned barcode or a typed email, so those
+    are resolved through their unique indexes before running the text
+    search. Text search matches each word as a substring (served by the
+    GIN trigram index for words of three or more characters) and orders
+    results by word similarity.
+    """
+
+    @staticmethod
+    async def apply(db: AsyncSession, query: Select, term: Optional[str]) -> Select:
+        """
+        Restrict and order a users query (entities or columns) by a search term.
+
+        Other filters already on the query (tenant, status, group) also
+        apply to the exact match probe.
+        """
+        normalized = normalize_search_term(term)
+        if not normalized:
+            return query
+
+        exact = exact_match_condition(term)
+        if exact is not None:
+            result = await db.execute(
+                query.with_only_columns(User.id).where(exact).limit(EXACT_MATCH_LIMIT)
+            )
+            user_ids = result.scalars().all()
+            if user_ids:
+                return query.where(User.id.in_(user_ids))
+
+        return (
+            query
+            .where(text_search_condition(normalized))
+            .order_by(text_search_rank(normalized).desc())
+        )
@@ -5,33 +5,86 @@ Real-time communication using Socket.IO
 
 import socketio
 import logging
-from typing import Dict, Set, Optional, Any
-from uuid import UUID
+import redis.asyncio as redis
+from typing import Dict, List, Optional, Any
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+# Redis set of a user's session IDs across all server processes
+USER_SIDS_KEY = "ws:user_sids:{user_id}"
+USER_SIDS_TTL_SECONDS = 86400
+
+
+def user_room(user_id: str) -> str:
+    """Room joined by every session of a user"""
+    return f"user:{user_id}"
+
+
+def tenant_room(tenant_id: str) -> str:
+    """Room joined by every session of a tenant"""
+    return f"tenant:{tenant_id}"
+
+
+def channel_room(tenant_id: str, channel: str) -> str:
+    """Room of a tenant's real-time channel (e.g. "circulation")"""
+    return f"tenant:{tenant_id}:{channel}"
+
+
 class WebSocketService:
-    """WebSocket service for real-time notifications"""
+    """
+    WebSocket service for real-time notifications
+
+    Sessions join a `user:<id>` and a `tenant:<id>` room when they
+    authenticate. With the Redis client manager, emits to a room are
+    published once and delivered by whichever process holds the sessions.
+    """
 
     def __init__(self):
         """Initialize Socket.IO server"""
+        client_manager = None
+        if settings.WEBSOCKET_REDIS_MANAGER_ENABLED:
+            client_manager = socketio.AsyncRedisManager(
+                settings.REDIS_URL,
+                channel=settings.WEBSOCKET_REDIS_CHANNEL
+            )
+
         self.sio = socketio.AsyncServer(
             async_mode='asgi',
+            client_manager=client_manager,
             cors_allowed_origins='*',
             logger=True,
             engineio_logger=True
         )
-
-        # Track connected users: {user_id: set(session_ids)}
-        self.user_sessions: Dict[str, Set[str]] = {}
-
-        # Track session metadata: {session_id: {"user_id": str, "tenant_id": str}}
-        self.session_metadata: Dict[str, Dict[str, str]] = {}
+        self._redis: Optional[redis.Redis] = None
 
         # Setup event handlers
         self._setup_handlers()
 
+    def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        return self._redis
+
+    async def _get_user_sids(self, user_id: str) -> List[str]:
+        """Get the session IDs of a user across all processes"""
+        try:
+            return list(await self._get_redis().smembers(USER_SIDS_KEY.format(user_id=user_id)))
+        except Exception as e:
+            logger.warning(f"Failed to load sessions of user {user_id}: {e}")
+            return []
+
+    async def _channel_room(self, sid: str, channel: str) -> str:
+        """Scope a channel to the session's tenant once authenticated"""
+        try:
+            session = await self.sio.get_session(sid)
+        except KeyError:
+            return channel
+        tenant_id = session.get("tenant_id")
+        return channel_room(tenant_id, channel) if tenant_id else channel
+
     def _setup_handlers(self):
         """Setup Socket.IO event handlers"""
 
@@ -51,17 +104,18 @@ class WebSocketService:
             """Handle client disconnection"""
             logger.info(f"Client disconnected: {sid}")
 
-            # Remove session from tracking
-            if sid in self.session_metadata:
-                metadata = self.session_metadata[sid]
-                user_id = metadata.get("user_id")
-
-                if user_id and user_id in self.user_sessions:
-                    self.user_sessions[user_id].discard(sid)
-                    if not self.user_sessions[user_id]:
-                        del self.user_sessions[user_id]
+            # Rooms are left automatically; only the user's sid set needs cleanup
+            try:
+                session = await self.sio.get_session(sid)
+            except KeyError:
+                return
 
-                del self.session_metadata[sid]
+            user_id = session.get("user_id")
+            if user_id:
+                try:
+                    await self._get_redis().srem(USER_SIDS_KEY.format(user_id=user_id), sid)
+                except Exception as e:
+                    logger.warning(f"Failed to untrack session {sid}: {e}")
 
         @self.sio.event
         async def authenticate(sid, data):
@@ -73,16 +127,27 @@ class WebSocketService:
                 await self.sio.emit('error', {'message': 'Invalid authentication data'}, room=sid)
                 return
 
-            # Store session metadata
-            self.session_metadata[sid] = {
-                "user_id": str(user_id),
-                "tenant_id": str(tenant_id)
-            }
+            user_id = str(user_id)
+            tenant_id = str(tenant_id)
 
-            # Track user sessions
-            if user_id not in self.user_sessions:
-                self.user_sessions[str(user_id)] = set()
-            self.user_sessions[str(user_id)].add(sid)
+            # Store session metadata
+            await self.sio.save_session(sid, {
+                "user_id": user_id,
+                "tenant_id": tenant_id
+            })
+
+            await self.sio.enter_room(sid, user_room(user_id))
+            await self.sio.enter_room(sid, tenant_room(tenant_id))
+
+            try:
+                key = USER_SIDS_KEY.format(user_id=user_id)
+                async with self._get_redis().pipeline(transaction=False) as pipe:
+                    pipe.sadd(key, sid)
+                    # Sessions of crashed processes age out with the set
+                    pipe.expire(key, USER_SIDS_TTL_SECONDS)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Failed to track session {sid}: {e}")
 
             logger.info(f"User {user_id} authenticated on session {sid}")
 
@@ -94,7 +159,7 @@ class WebSocketService:
             """Subscribe to specific event channels"""
             channel = data.get("channel")
             if channel:
-                await self.sio.enter_room(sid, channel)
+                await self.sio.enter_room(sid, await self._channel_room(sid, channel))
                 logger.info(f"Session {sid} subscribed to channel: {channel}")
                 await self.sio.emit('subscribed', {'channel': channel}, room=sid)
 
@@ -103,7 +168,7 @@ class WebSocketService:
             """Unsubscribe from specific event channels"""
             channel = data.get("channel")
             if channel:
-                await self.sio.leave_room(sid, channel)
+                await self.sio.leave_room(sid, await self._channel_room(sid, channel))
                 logger.info(f"Session {sid} unsubscribed from channel: {channel}")
                 await self.sio.emit('unsubscribed', {'channel': channel}, room=sid)
 
@@ -132,15 +197,24 @@ class WebSocketService:
         """
         user_id_str = str(user_id)
 
-        if user_id_str not in self.user_sessions:
-            logger.info(f"User {user_id_str} not connected, notification will be stored only")
-            return
+        # Sessions of the user on any process receive it; nobody connected is a no-op
+        await self.sio.emit('notification', notification, room=user_room(user_id_str))
 
-        # Send to all user's active sessions
-        for session_id in self.user_sessions[user_id_str]:
-            await self.sio.emit('notification', notification, room=session_id)
+        logger.info(f"Notification sent to user {user_id_str}")
 
-        logger.info(f"Notification sent to user {user_id_str} ({len(self.user_sessions[user_id_str])} sessions)")
+    async def send_unread_count(
+        self,
+        user_id: str,
+        unread_count: int
+    ):
+        """
+        Push a user's unread notification count to their sessions
+
+        Args:
+            user_id: User ID
+            unread_count: Current number of unread notifications
+        """
+        await self.sio.emit('unread_count', {'unread_count': unread_count}, room=user_room(str(user_id)))
 
     async def send_notification_to_tenant(
         self,
@@ -157,19 +231,19 @@ class WebSocketService:
             exclude_user_id: Optional user ID to exclude from broadcast
         """
         tenant_id_str = str(tenant_id)
-        exclude_user_id_str = str(exclude_user_id) if exclude_user_id else None
 
-        count = 0
-        for session_id, metadata in self.session_metadata.items():
-            if metadata.get("tenant_id") == tenant_id_str:
-                # Skip excluded user
-                if exclude_user_id_str and metadata.get("user_id") == exclude_user_id_str:
-                    continue
+        skip_sid = None
+        if exclude_user_id:
+            skip_sid = await self._get_user_sids(str(exclude_user_id)) or None
 
-                await self.sio.emit('notification', notification, room=session_id)
-                count += 1
+        await self.sio.emit(
+            'notification',
+            notification,
+            room=tenant_room(tenant_id_str),
+            skip_sid=skip_sid
+        )
 
-        logger.info(f"Notification broadcast to tenant {tenant_id_str} ({count} sessions)")
+        logger.info(f"Notification broadcast to tenant {tenant_id_str}")
 
     async def broadcast_system_message(
         self,
@@ -194,14 +268,16 @@ class WebSocketService:
 
     async def send_realtime_update(
         self,
+        tenant_id: str,
         channel: str,
         event_type: str,
         data: Dict[str, Any]
     ):
         """
-        Send real-time update to a specific channel
+        Send real-time update to a tenant's channel
 
         Args:
+            tenant_id: Tenant ID
             channel: Channel name (e.g., "circulation", "acquisitions")
             event_type: Event type (e.g., "checkout", "checkin")
             data: Event data
@@ -211,8 +287,28 @@ class WebSocketService:
             "data": data
         }
 
-        await self.sio.emit('realtime_update', event_data, room=channel)
-        logger.info(f"Real-time update sent to channel {channel}: {event_type}")
+        await self.sio.emit('realtime_update', event_data, room=channel_room(str(tenant_id), channel))
+        logger.info(f"Real-time update sent to channel {channel} of tenant {tenant_id}: {event_type}")
+
+    async def send_domain_events(
+        self,
+        tenant_id: str,
+        channel: str,
+        events: List[Dict[str, Any]]
+    ):
+        """
+        Send a committed batch of domain events to a tenant's channel
+
+        Args:
+            tenant_id: Tenant ID
+            channel: Channel name (e.g., "circulation", "inventory", "fees")
+            events: Domain events committed in one transaction
+        """
+        await self.sio.emit(
+            'domain_events',
+            {'channel': channel, 'events': events},
+            room=channel_room(str(tenant_id), channel)
+        )
 
     def get_asgi_app(self):
         """Get ASGI app for integration with FastAPI"""
@@ -224,7 +320,9 @@ class WebSocketService:
     async def shutdown(self):
         """Shutdown WebSocket service"""
         logger.info("Shutting down WebSocket service")
-        await self.sio.disconnect()
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
 
 
 # Singleton instance
@@ -4,6 +4,12 @@ Celery tasks for asynchronous background processing.
 This package contains task modules for:
 - Email sending (email_tasks)
 - Scheduled notifications (notification_tasks)
+- Search index maintenance (search_tasks)
+- Overdue fine accrual (fine_tasks)
+- Patron account summary maintenance (patron_tasks)
+- Bulk user imports (user_import_tasks)
+- Audit log partition rotation and exports (audit_tasks)
+- Cached and scheduled report generation, circulation rollups (report_tasks)
 """
 
 from app.tasks.email_tasks import (
@@ -17,9 +23,28 @@ from app.tasks.email_tasks import (
 from app.tasks.notification_tasks import (
     send_overdue_notifications,
     send_hold_available_notifications,
+    flush_notification_digests,
+    reconcile_unread_counters,
     cleanup_old_notifications,
 )
 
+from app.tasks.search_tasks import drain_search_outbox
+from app.tasks.fine_tasks import accrue_overdue_fines
+from app.tasks.patron_tasks import (
+    refresh_overdue_counts,
+    rebuild_patron_account_summaries,
+)
+from app.tasks.user_import_tasks import import_users
+from app.tasks.audit_tasks import (
+    maintain_audit_log_partitions,
+    export_audit_logs,
+)
+from app.tasks.report_tasks import (
+    generate_report,
+    run_report_schedules,
+    refresh_circulation_rollups,
+)
+
 __all__ = [
     # Email tasks
     'send_welcome_email_task',
@@ -30,5 +55,23 @@ __all__ = [
     # Scheduled notification tasks
     'send_overdue_notifications',
     'send_hold_available_notifications',
+    'flush_notification_digests',
+    'reconcile_unread_counters',
     'cleanup_old_notifications',
+    # Search tasks
+    'drain_search_outbox',
+    # Fine tasks
+    'accrue_overdue_fines',
+    # Patron account tasks
+    'refresh_overdue_counts',
+    'rebuild_patron_account_summaries',
+    # User import tasks
+    'import_users',
+    # Audit log tasks
+    'maintain_audit_log_partitions',
+    'export_audit_logs',
+    # Report tasks
+    'generate_report',
+    'run_report_schedules',
+    'refresh_circulation_rollups',
 ]
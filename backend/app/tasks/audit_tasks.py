@@ -0,0 +1,74 @@
+"""
+Audit log maintenance and export tasks.
+
+The maintenance task runs on a schedule (via Celery Beat) to keep the
+monthly audit_logs partitions created ahead of time, archive expired ones
+and purge old export files. The export task runs background exports
+queued by `POST /audit-logs/export?background=true`.
+"""
+
+import logging
+
+from app.core.celery_app import celery_app
+from app.db.session import AsyncSessionLocal, run_async
+from app.services.audit_export_service import AuditExportService
+from app.services.audit_partition_service import AuditPartitionService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name='app.tasks.audit_tasks.maintain_audit_log_partitions')
+def maintain_audit_log_partitions():
+    """
+    Scheduled task to rotate audit log partitions.
+
+    Creates the partitions of the coming months, then detaches partitions
+    older than AUDIT_LOG_RETENTION_MONTHS into gzipped CSV archives and
+    deletes export files older than AUDIT_EXPORT_RETENTION_HOURS.
+    """
+    async def _maintain():
+        async with AsyncSessionLocal() as db:
+            created = await AuditPartitionService.ensure_partitions(db)
+            await db.commit()
+            archived = await AuditPartitionService.archive_partitions(db)
+            return created, archived
+
+    try:
+        logger.info("Starting audit log partition maintenance task")
+        created, archived = run_async(_maintain())
+        purged = AuditExportService.purge_expired_files()
+        logger.info(
+            f"Audit log partitions: created {len(created)}, archived {len(archived)}; "
+            f"purged {purged} export file(s)"
+        )
+        return {
+            'status': 'success',
+            'created': created,
+            'archived': [entry['partition'] for entry in archived],
+            'purged_exports': purged,
+        }
+
+    except Exception as exc:
+        logger.error(f"Error in audit log partition maintenance task: {exc}")
+        raise
+
+
+@celery_app.task(
+    name='app.tasks.audit_tasks.export_audit_logs',
+    time_limit=4 * 60 * 60,
+    soft_time_limit=4 * 60 * 60 - 5 * 60,
+)
+def export_audit_logs(job_id: str):
+    """
+    Run a queued audit log export job.
+
+    Streams the matching logs into a gzipped CSV file; memory use stays
+    flat however large the range.
+    """
+    try:
+        logger.info(f"Starting audit export job {job_id}")
+        return run_async(AuditExportService.run(job_id))
+
+    except Exception as exc:
+        logger.error(f"Error in audit export job {job_id}: {exc}")
+        raise
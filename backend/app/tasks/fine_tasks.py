@@ -0,0 +1,36 @@
+"""
+Fine accrual tasks.
+
+These tasks run on a schedule (via Celery Beat) to keep automated overdue
+fines in line with each tenant's fee policy.
+"""
+
+import logging
+
+from app.core.celery_app import celery_app
+from app.db.session import AsyncSessionLocal, run_async
+from app.services.fine_accrual_service import FineAccrualService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name='app.tasks.fine_tasks.accrue_overdue_fines')
+def accrue_overdue_fines():
+    """
+    Scheduled task to accrue overdue fines.
+
+    Runs nightly just after midnight UTC and only touches loans whose fine
+    changed since the previous run.
+    """
+    async def _accrue():
+        async with AsyncSessionLocal() as db:
+            return await FineAccrualService().accrue(db)
+
+    try:
+        logger.info("Starting overdue fine accrual task")
+        result = run_async(_accrue())
+        return {'status': 'success', **result}
+
+    except Exception as exc:
+        logger.error(f"Error in overdue fine accrual task: {exc}")
+        raise
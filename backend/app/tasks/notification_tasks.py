@@ -12,11 +12,12 @@ from sqlalchemy import select, and_, or_
 from sqlalchemy.orm import joinedload
 
 from app.core.celery_app import celery_app
-from app.db.session import get_session
+from app.db.session import get_session, run_async
 from app.models.circulation import Loan, LoanStatus, Request as Hold, RequestStatus as HoldStatus
 from app.models.user import User
 from app.models.inventory import Instance, Item
 from app.models.notification import Notification
+from app.services.fine_accrual_service import calculate_overdue_fine, overdue_policy, overdue_policy_query
 from app.tasks.email_tasks import (
     send_overdue_notice_task,
     send_hold_available_task
@@ -62,6 +63,8 @@ def send_overdue_notifications():
 
             # Group loans by user
             user_overdue_items: Dict[str, List[Dict]] = {}
+            # Overdue fee policy per tenant, looked up once per run
+            fine_policies: Dict[str, Dict] = {}
 
             for loan in overdue_loans:
                 user_id = str(loan.user_id)
@@ -75,8 +78,13 @@ def send_overdue_notifications():
                 # Calculate days overdue
                 days_overdue = (today - loan.due_date).days
 
-                # Calculate fine (e.g., $0.25 per day)
-                fine_amount = days_overdue * 0.25
+                # Estimate the fine with the tenant's overdue policy
+                tenant_key = str(loan.tenant_id)
+                if tenant_key not in fine_policies:
+                    fine_policies[tenant_key] = overdue_policy(
+                        session.execute(overdue_policy_query(loan.tenant_id)).scalar_one_or_none()
+                    )
+                fine_amount = float(calculate_overdue_fine(loan.due_date, datetime.utcnow(), fine_policies[tenant_key]))
 
                 item_data = {
                     'title': loan.item.instance.title if loan.item and loan.item.instance else 'Unknown',
@@ -199,6 +207,72 @@ def send_hold_available_notifications():
         raise
 
 
+@celery_app.task(name='app.tasks.notification_tasks.flush_notification_digests')
+def flush_notification_digests():
+    """
+    Scheduled task to emit notification digests.
+
+    Runs every minute and delivers digests that were spilled to Redis by the
+    API processes (buffer overflow or shutdown) once their window elapsed.
+    """
+    from app.services.notification_counter_service import NotificationCounterService
+    from app.services.notification_digest import NotificationDigestService
+    from app.services.websocket_service import WebSocketService
+
+    async def _flush():
+        # run_async uses a new event loop per run, so Redis clients are per run too
+        websocket_service = WebSocketService()
+        counter_service = NotificationCounterService(websocket_service=websocket_service)
+        digest_service = NotificationDigestService(counter_service=counter_service)
+        try:
+            return await digest_service.flush_due()
+        finally:
+            await digest_service.close()
+            await counter_service.close()
+            await websocket_service.shutdown()
+
+    try:
+        emitted = run_async(_flush())
+        logger.info(f"Notification digest flush completed. Emitted {emitted} digest(s)")
+        return {'status': 'success', 'digests_emitted': emitted}
+
+    except Exception as exc:
+        logger.error(f"Error in notification digest flush task: {exc}")
+        raise
+
+
+@celery_app.task(name='app.tasks.notification_tasks.reconcile_unread_counters')
+def reconcile_unread_counters():
+    """
+    Scheduled task to recount cached unread notification counters.
+
+    Runs every 15 minutes to correct drift from expired notifications or
+    counter updates lost while Redis was unavailable.
+    """
+    from app.db.session import AsyncSessionLocal
+    from app.services.notification_counter_service import NotificationCounterService
+    from app.services.websocket_service import WebSocketService
+
+    async def _reconcile():
+        websocket_service = WebSocketService()
+        counter_service = NotificationCounterService(websocket_service=websocket_service)
+        try:
+            async with AsyncSessionLocal() as db:
+                return await counter_service.reconcile(db)
+        finally:
+            await counter_service.close()
+            await websocket_service.shutdown()
+
+    try:
+        corrected = run_async(_reconcile())
+        logger.info(f"Unread counter reconciliation completed. Corrected {corrected} counter(s)")
+        return {'status': 'success', 'counters_corrected': corrected}
+
+    except Exception as exc:
+        logger.error(f"Error in unread counter reconciliation task: {exc}")
+        raise
+
+
 @celery_app.task(name='app.tasks.notification_tasks.cleanup_old_notifications')
 def cleanup_old_notifications():
     """
@@ -0,0 +1,65 @@
+"""
+Patron account summary tasks.
+
+These tasks run on a schedule (via Celery Beat) to keep the maintained
+patron account summaries in line with loans, requests and fees.
+"""
+
+import logging
+
+from app.core.celery_app import celery_app
+from app.db.session import AsyncSessionLocal, run_async
+from app.services.patron_account_service import PatronAccountService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name='app.tasks.patron_tasks.refresh_overdue_counts')
+def refresh_overdue_counts():
+    """
+    Scheduled task to recount overdue loans in patron account summaries.
+
+    Loans become overdue as time passes rather than through a mutation, so
+    the counts are refreshed hourly.
+    """
+    async def _refresh():
+        async with AsyncSessionLocal() as db:
+            updated = await PatronAccountService.refresh_overdue(db)
+            await db.commit()
+            return updated
+
+    try:
+        updated = run_async(_refresh())
+        logger.info(f"Refreshed overdue counts of {updated} patron account(s)")
+        return {'status': 'success', 'updated': updated}
+
+    except Exception as exc:
+        logger.error(f"Error in overdue count refresh task: {exc}")
+        raise
+
+
+@celery_app.task(name='app.tasks.patron_tasks.rebuild_patron_account_summaries')
+def rebuild_patron_account_summaries():
+    """
+    Scheduled task to verify patron account summaries against the base tables.
+
+    Runs nightly after fine accrual. Missing rows are created and rows that
+    drifted from the recomputed totals are corrected; a non-zero correction
+    count points at a mutation path that does not maintain the summary.
+    """
+    async def _rebuild():
+        async with AsyncSessionLocal() as db:
+            corrected = await PatronAccountService.rebuild(db)
+            await db.commit()
+            return corrected
+
+    try:
+        logger.info("Starting patron account summary rebuild task")
+        corrected = run_async(_rebuild())
+        if corrected:
+            logger.warning(f"Patron account summary rebuild corrected {corrected} row(s)")
+        return {'status': 'success', 'corrected': corrected}
+
+    except Exception as exc:
+        logger.error(f"Error in patron account summary rebuild task: {exc}")
+        raise
@@ -0,0 +1,96 @@
+"""
+Report generation tasks.
+
+The generation task builds report jobs queued by `POST /reports/jobs`
+into the report artifact cache. The schedule task runs (via Celery Beat)
+during the off-peak window to queue scheduled reports that fall due and
+purge expired artifacts. The rollup task keeps the daily circulation
+statistics read by long-range reports up to date.
+"""
+
+import logging
+
+from app.core.celery_app import celery_app
+from app.db.session import AsyncSessionLocal, run_async
+from app.services.circulation_rollup_service import CirculationRollupService
+from app.services.report_artifact_store import get_report_artifact_store
+from app.services.report_service import ReportService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    name='app.tasks.report_tasks.generate_report',
+    time_limit=4 * 60 * 60,
+    soft_time_limit=4 * 60 * 60 - 5 * 60,
+)
+def generate_report(job_id: str):
+    """
+    Run a queued report job.
+
+    Builds the report unless an identical artifact was stored in the
+    meantime; rendering goes through the export executor, as for the
+    report endpoints.
+    """
+    async def _generate():
+        async with AsyncSessionLocal() as db:
+            return await ReportService.run_job(db, job_id)
+
+    try:
+        logger.info(f"Starting report job {job_id}")
+        return run_async(_generate())
+
+    except Exception as exc:
+        logger.error(f"Error in report job {job_id}: {exc}")
+        raise
+
+
+@celery_app.task(name='app.tasks.report_tasks.run_report_schedules')
+def run_report_schedules():
+    """
+    Scheduled task to produce scheduled reports off-peak.
+
+    Queues a job for every enabled schedule due within
+    REPORT_SCHEDULE_LOOKAHEAD_HOURS (reports whose artifact is still cached
+    complete at once), then deletes artifacts older than
+    REPORT_ARTIFACT_MAX_AGE_DAYS.
+    """
+    async def _queue():
+        async with AsyncSessionLocal() as db:
+            return await ReportService.queue_due_schedules(db)
+
+    try:
+        logger.info("Starting report schedule task")
+        jobs = run_async(_queue())
+        for job in jobs:
+            generate_report.delay(str(job.id))
+
+        purged = get_report_artifact_store().purge()
+        logger.info(f"Queued {len(jobs)} scheduled report(s); purged {purged} artifact(s)")
+        return {'status': 'success', 'queued': len(jobs), 'purged_artifacts': purged}
+
+    except Exception as exc:
+        logger.error(f"Error in report schedule task: {exc}")
+        raise
+
+
+@celery_app.task(name='app.tasks.report_tasks.refresh_circulation_rollups')
+def refresh_circulation_rollups(full: bool = False):
+    """
+    Scheduled task to update circulation_daily_stats.
+
+    Recomputes the days touched since the last run; the first run (or
+    full=True, e.g. after items were relocated) rebuilds every day.
+    """
+    async def _refresh():
+        async with AsyncSessionLocal() as db:
+            return await CirculationRollupService.refresh(db, full=full)
+
+    try:
+        logger.info("Starting circulation rollup task")
+        stats = run_async(_refresh())
+        return {'status': 'success', **stats}
+
+    except Exception as exc:
+        logger.error(f"Error in circulation rollup task: {exc}")
+        raise
@@ -0,0 +1,103 @@
+"""
+Search indexing tasks.
+
+These tasks keep the Elasticsearch index in sync with instance changes
+recorded in the search outbox by the domain event bus.
+"""
+
+import json
+import logging
+from typing import Dict, List
+from uuid import UUID
+
+import redis.asyncio as redis
+from sqlalchemy import select
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, run_async
+from app.models.inventory import Instance
+from app.services.domain_events import SEARCH_OUTBOX_KEY
+from app.services.elasticsearch_service import ElasticsearchService, instance_to_dict
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of outbox entries applied per task run
+OUTBOX_BATCH_SIZE = 1000
+
+
+async def _take_outbox_batch(client: redis.Redis, batch_size: int) -> List[str]:
+    """Atomically take the oldest entries off the outbox."""
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.lrange(SEARCH_OUTBOX_KEY, 0, batch_size - 1)
+        pipe.ltrim(SEARCH_OUTBOX_KEY, batch_size, -1)
+        entries, _ = await pipe.execute()
+    return entries
+
+
+async def _drain_outbox(batch_size: int) -> Dict[str, int]:
+    client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    es_service = ElasticsearchService()
+    try:
+        if not await es_service.ping():
+            logger.warning("Elasticsearch unavailable, leaving search outbox in place")
+            return {"indexed": 0, "deleted": 0, "failed": 0}
+
+        entries = await _take_outbox_batch(client, batch_size)
+        if not entries:
+            return {"indexed": 0, "deleted": 0, "failed": 0}
+
+        # The latest operation per instance wins
+        latest: Dict[str, str] = {}
+        for raw in entries:
+            entry = json.loads(raw)
+            latest[entry["instance_id"]] = entry["op"]
+
+        to_index = [UUID(i) for i, op in latest.items() if op == "index"]
+        to_delete = [i for i, op in latest.items() if op == "delete"]
+
+        indexed = failed = 0
+        if to_index:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(select(Instance).where(Instance.id.in_(to_index)))
+                instances = [instance_to_dict(i) for i in result.scalars().all()]
+            if instances:
+                counts = await es_service.bulk_index_instances(instances)
+                indexed, failed = counts["success"], counts["failed"]
+
+        deleted = 0
+        for instance_id in to_delete:
+            if await es_service.delete_instance(instance_id):
+                deleted += 1
+
+        if failed:
+            # Retry the whole batch on the next run rather than lose updates.
+            # It goes back to the head of the outbox, in its original order,
+            # so it is applied before any newer change to the same instances
+            await client.lpush(SEARCH_OUTBOX_KEY, *reversed(entries))
+
+        return {"indexed": indexed, "deleted": deleted, "failed": failed}
+    finally:
+        await es_service.close()
+        await client.close()
+
+
+@celery_app.task(name='app.tasks.search_tasks.drain_search_outbox')
+def drain_search_outbox(batch_size: int = OUTBOX_BATCH_SIZE):
+    """
+    Scheduled task to apply queued instance changes to the search index.
+
+    Runs every minute; repeated changes to one instance within a batch are
+    indexed once.
+    """
+    try:
+        result = run_async(_drain_outbox(batch_size))
+        logger.info(
+            f"Search outbox drained: {result['indexed']} indexed, "
+            f"{result['deleted']} deleted, {result['failed']} failed"
+        )
+        return {'status': 'success', **result}
+
+    except Exception as exc:
+        logger.error(f"Error in search outbox task: {exc}")
+        raise
@@ -0,0 +1,38 @@
+"""
+Bulk user import tasks.
+
+These tasks run the user import jobs queued by `POST /users/imports`.
+"""
+
+import logging
+
+from app.core.celery_app import celery_app
+from app.db.session import AsyncSessionLocal, run_async
+from app.services.user_import_service import get_user_import_service
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    name='app.tasks.user_import_tasks.import_users',
+    time_limit=4 * 60 * 60,
+    soft_time_limit=4 * 60 * 60 - 5 * 60,
+)
+def import_users(job_id: str):
+    """
+    Run a queued user import job.
+
+    Progress and row errors are written to the job as each batch commits,
+    so a long import can be followed through the job status endpoint.
+    """
+    async def _import():
+        async with AsyncSessionLocal() as db:
+            return await get_user_import_service().run(db, job_id)
+
+    try:
+        logger.info(f"Starting user import job {job_id}")
+        return run_async(_import())
+
+    except Exception as exc:
+        logger.error(f"Error in user import job {job_id}: {exc}")
+        raise
@@ -16,6 +16,7 @@ async def paginate(
     query,
     page: int,
     page_size: int,
+    scalars: bool = True,
 ) -> PaginatedResponse:
     """
     Paginate a SQLAlchemy query.
@@ -25,6 +26,8 @@ async def paginate(
         query: SQLAlchemy select query
         page: Page number (1-indexed)
         page_size: Items per page
+        scalars: Return the first column of each row (ORM entities);
+            False returns whole rows, for column projections
 
     Returns:
         PaginatedResponse with data and metadata
@@ -40,7 +43,7 @@ async def paginate(
     # Fetch paginated data
     query = query.limit(page_size).offset(offset)
     result = await db.execute(query)
-    data = result.scalars().all()
+    data = result.scalars().all() if scalars else result.all()
 
     return PaginatedResponse(
         data=data,
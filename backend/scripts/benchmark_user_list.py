@@ -0,0 +1,139 @@
+"""
+Benchmark the user list endpoint's data path.
+
+Compares, page by page against the configured database:
+1. entity: select(User) with roles and permissions eager loaded, converted
+   through model_validate + model_dump + UserListItem(**dict)
+2. projection: USER_LIST_COLUMNS with the patron group name join, one role
+   name query per page and model_construct (what list_users does)
+
+For each path it reports wall time, peak traced memory and the number of
+memory blocks allocated while building a page (tracemalloc).
+
+Usage:
+    python -m scripts.benchmark_user_list --tenant-id <uuid>
+    python -m scripts.benchmark_user_list --tenant-id <uuid> --page-size 100 --pages 20
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import tracemalloc
+from pathlib import Path
+from statistics import mean
+from uuid import UUID
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.api.v1.users import USER_LIST_COLUMNS, build_user_list_items, load_role_summaries
+from app.db.session import AsyncSessionLocal
+from app.models.permission import Role
+from app.models.user import PatronGroup, User
+from app.schemas.user import UserListItem
+
+
+async def entity_page(db, tenant_id: UUID, page: int, page_size: int):
+    """The previous list_users data path."""
+    result = await db.execute(
+        select(User)
+        .where(User.tenant_id == tenant_id)
+        .options(
+            selectinload(User.patron_group),
+            selectinload(User.roles).selectinload(Role.permissions)
+        )
+        .order_by(User.created_date.desc())
+        .limit(page_size)
+        .offset((page - 1) * page_size)
+    )
+
+    users = []
+    for user in result.scalars().all():
+        user_dict = UserListItem.model_validate(user).model_dump()
+        if user.patron_group:
+            user_dict['patron_group_name'] = user.patron_group.group_name
+        users.append(UserListItem(**user_dict))
+    return users
+
+
+async def projection_page(db, tenant_id: UUID, page: int, page_size: int):
+    """The current list_users data path."""
+    result = await db.execute(
+        select(*USER_LIST_COLUMNS)
+        .outerjoin(PatronGroup, PatronGroup.id == User.patron_group_id)
+        .where(User.tenant_id == tenant_id)
+        .order_by(User.created_date.desc())
+        .limit(page_size)
+        .offset((page - 1) * page_size)
+    )
+    rows = result.all()
+    roles = await load_role_summaries(db, [row.id for row in rows])
+    return build_user_list_items(rows, roles)
+
+
+async def measure(build_page, tenant_id: UUID, pages: int, page_size: int):
+    """Time and trace allocations of building each page in a fresh session."""
+    timings, peaks, blocks = [], [], []
+    rendered = 0
+
+    for page in range(1, pages + 1):
+        async with AsyncSessionLocal() as db:
+            tracemalloc.start()
+            before = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+            started = time.perf_counter()
+
+            items = await build_page(db, tenant_id, page, page_size)
+            # Serialize as the response would
+            [item.model_dump(mode="json") for item in items]
+
+            timings.append((time.perf_counter() - started) * 1000)
+            after = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+            peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+            blocks.append(after - before)
+            tracemalloc.stop()
+            rendered += len(items)
+
+    return {
+        "rows": rendered,
+        "ms": mean(timings),
+        "peak_kib": mean(peaks),
+        "blocks": mean(blocks),
+    }
+
+
+async def run(args):
+    tenant_id = UUID(args.tenant_id)
+
+    # Warm up connections and compiled statement caches
+    async with AsyncSessionLocal() as db:
+        await entity_page(db, tenant_id, 1, args.page_size)
+        await projection_page(db, tenant_id, 1, args.page_size)
+
+    print(f"User list benchmark: {args.pages} page(s) of {args.page_size}")
+    print(f"{'path':<12} {'rows':>6} {'ms/page':>10} {'peak KiB':>10} {'blocks/page':>12}")
+    for name, build_page in (("entity", entity_page), ("projection", projection_page)):
+        stats = await measure(build_page, tenant_id, args.pages, args.page_size)
+        print(
+            f"{name:<12} {stats['rows']:>6} {stats['ms']:>10.2f} "
+            f"{stats['peak_kib']:>10.1f} {stats['blocks']:>12.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark allocations of the FOLIO LMS user list"
+    )
+    parser.add_argument("--tenant-id", required=True, help="Tenant whose users are listed")
+    parser.add_argument("--page-size", type=int, default=20, help="Users per page")
+    parser.add_argument("--pages", type=int, default=10, help="Number of pages to measure")
+
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Load test the WebSocket fan-out.
+
+This script connects many simulated Socket.IO clients, authenticates them
+into a handful of tenants and users, then publishes tenant and user
+notifications through the Redis client manager (exactly as an API worker or
+Celery task would) and measures:
+1. Connection and authentication throughput
+2. Delivery latency (p50/p95/p99) for tenant and user broadcasts
+3. Missed and misrouted deliveries
+
+Run it against a server started with several workers, e.g.
+``uvicorn app.main:app --workers 4``, so clients spread across processes.
+
+Usage:
+    python -m scripts.websocket_load_test                        # 10k clients
+    python -m scripts.websocket_load_test --clients 2000 --tenants 5
+    python -m scripts.websocket_load_test --url http://localhost:8000
+"""
+
+import sys
+import time
+import uuid
+import asyncio
+import argparse
+from pathlib import Path
+from statistics import quantiles
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import socketio
+
+from app.core.config import settings
+from app.services.websocket_service import tenant_room, user_room
+
+
+class SimulatedClient:
+    """One Socket.IO client that records delivery latencies."""
+
+    def __init__(self, tenant_id: str, user_id: str):
+        self.tenant_id = tenant_id
+        self.user_id = user_id
+        self.received = {}
+        self.misrouted = 0
+        self.authenticated = asyncio.Event()
+        self.sio = socketio.AsyncClient(reconnection=False)
+
+        @self.sio.on("authenticated")
+        async def on_authenticated(data):
+            self.authenticated.set()
+
+        @self.sio.on("notification")
+        async def on_notification(data):
+            target = data.get("target")
+            if target not in (tenant_room(self.tenant_id), user_room(self.user_id)):
+                self.misrouted += 1
+            self.received[data["id"]] = time.perf_counter() - data["sent_at"]
+
+    async def connect(self, url: str, timeout: float):
+        await self.sio.connect(url, transports=["websocket"], socketio_path="socket.io", wait_timeout=timeout)
+        await self.sio.emit("authenticate", {"user_id": self.user_id, "tenant_id": self.tenant_id})
+        await asyncio.wait_for(self.authenticated.wait(), timeout)
+
+    async def disconnect(self):
+        await self.sio.disconnect()
+
+
+def percentiles(values):
+    """Return p50/p95/p99 in milliseconds."""
+    if len(values) < 2:
+        return [values[0] * 1000] * 3 if values else [0.0, 0.0, 0.0]
+    cuts = quantiles(values, n=100)
+    return [cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000]
+
+
+async def connect_all(clients, url: str, concurrency: int, timeout: float):
+    """Connect clients with bounded concurrency, returning the failures."""
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = []
+
+    async def connect_one(client):
+        async with semaphore:
+            try:
+                await client.connect(url, timeout)
+            except Exception as e:
+                failures.append((client, e))
+
+    await asyncio.gather(*(connect_one(c) for c in clients))
+    return failures
+
+
+async def run_load_test(args) -> int:
+    tenants = [str(uuid.uuid4()) for _ in range(args.tenants)]
+    users = [str(uuid.uuid4()) for _ in range(args.users)]
+
+    clients = [
+        SimulatedClient(tenants[i % len(tenants)], users[i % len(users)])
+        for i in range(args.clients)
+    ]
+
+    print(f"Connecting {len(clients)} clients to {args.url} ({args.concurrency} at a time)...")
+    started = time.perf_counter()
+    failures = await connect_all(clients, args.url, args.concurrency, args.timeout)
+    elapsed = time.perf_counter() - started
+    connected = [c for c in clients if c.authenticated.is_set()]
+    print(f"  connected {len(connected)} in {elapsed:.1f}s ({len(connected) / max(elapsed, 1e-9):.0f}/s), "
+          f"{len(failures)} failed")
+    if failures:
+        print(f"  first failure: {failures[0][1]!r}")
+
+    # Publish the way an API worker or Celery task does: through Redis only
+    manager = socketio.AsyncRedisManager(settings.REDIS_URL, channel=settings.WEBSOCKET_REDIS_CHANNEL,
+                                         write_only=True)
+    expected = {}
+
+    print(f"Publishing {args.messages} tenant and {args.messages} user notifications...")
+    for n in range(args.messages):
+        tenant_id = tenants[n % len(tenants)]
+        user_id = users[n % len(users)]
+        for kind, room, recipients in (
+            ("tenant", tenant_room(tenant_id), [c for c in connected if c.tenant_id == tenant_id]),
+            ("user", user_room(user_id), [c for c in connected if c.user_id == user_id]),
+        ):
+            message_id = str(uuid.uuid4())
+            expected[message_id] = (kind, recipients)
+            await manager.emit(
+                "notification",
+                {"id": message_id, "target": room, "sent_at": time.perf_counter()},
+                room=room,
+                namespace="/",
+            )
+        await asyncio.sleep(args.interval)
+
+    await asyncio.sleep(args.settle)
+
+    latencies = {"tenant": [], "user": []}
+    missed = 0
+    for message_id, (kind, recipients) in expected.items():
+        for client in recipients:
+            latency = client.received.get(message_id)
+            if latency is None:
+                missed += 1
+            else:
+                latencies[kind].append(latency)
+
+    misrouted = sum(c.misrouted for c in connected)
+    deliveries = sum(len(r) for _, r in expected.values())
+
+    print("\nResults")
+    print(f"  expected deliveries: {deliveries}")
+    print(f"  missed deliveries:   {missed}")
+    print(f"  misrouted:           {misrouted}")
+    for kind, values in latencies.items():
+        p50, p95, p99 = percentiles(values)
+        print(f"  {kind:6} latency ms:  p50={p50:.1f} p95={p95:.1f} p99={p99:.1f} (n={len(values)})")
+
+    print("\nDisconnecting...")
+    await asyncio.gather(*(c.disconnect() for c in connected), return_exceptions=True)
+
+    return 0 if not missed and not misrouted and not failures else 1
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Load test the FOLIO LMS WebSocket fan-out"
+    )
+    parser.add_argument("--url", default="http://localhost:8000", help="Server URL")
+    parser.add_argument("--clients", type=int, default=10000, help="Number of simulated clients")
+    parser.add_argument("--tenants", type=int, default=10, help="Number of tenants to spread clients over")
+    parser.add_argument("--users", type=int, default=5000, help="Number of users (clients per user = clients/users)")
+    parser.add_argument("--concurrency", type=int, default=200, help="Concurrent connection attempts")
+    parser.add_argument("--messages", type=int, default=20, help="Notifications published per room type")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between publishes")
+    parser.add_argument("--settle", type=float, default=5.0, help="Seconds to wait for deliveries")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Connect/authenticate timeout")
+
+    args = parser.parse_args()
+
+    try:
+        exit_code = asyncio.run(run_load_test(args))
+        sys.exit(exit_code)
+    except Exception as e:
+        print(f"❌ Error running load test: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,14 @@ import pytest
 import pytest_asyncio
 from typing import AsyncGenerator, Generator
 from httpx import AsyncClient
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import NullPool
 
 from app.main import app
 from app.db.base import Base
 from app.db.session import get_db
+from app.services.audit_partition_service import AuditPartitionService
 from app.core.security import get_password_hash, create_access_token
 from app.models.user import User
 from app.models.permission import Role, Permission
@@ -54,7 +56,9 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """Create a fresh database session for each test."""
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
+        await AuditPartitionService.ensure_partitions(conn)
 
     async with TestSessionLocal() as session:
         yield session
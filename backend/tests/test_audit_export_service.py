@@ -0,0 +1,168 @@
+"""
+Test Audit Export Service
+Test incremental CSV encoding, on-the-fly gzip, export jobs and file retention
+"""
+
+import csv
+import gzip
+import io
+import os
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.audit import AuditAction, AuditLog, AuditStatus
+from app.models.job import JobStatus
+from app.services.audit_export_service import (
+    CSV_HEADER,
+    AuditExportService,
+    csv_chunks,
+    csv_row,
+    export_query,
+    gzip_chunks,
+)
+
+TIMESTAMP = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def make_row(n=0, username="jdoe"):
+    return (
+        TIMESTAMP, username, AuditAction.UPDATE, "user", f"users/{n}",
+        AuditStatus.SUCCESS, "10.0.0.1", {"field": "email"},
+    )
+
+
+async def aiter(items):
+    for item in items:
+        yield item
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+class TestExportQuery:
+    """Test the export query"""
+
+    def test_joins_actor_and_has_no_limit(self):
+        sql = str(export_query([AuditLog.tenant_id == uuid.uuid4()]).compile(dialect=postgresql.dialect()))
+
+        assert "LEFT OUTER JOIN users ON users.id = audit_logs.actor" in sql
+        assert "LIMIT" not in sql
+        assert "ORDER BY audit_logs.timestamp DESC, audit_logs.id DESC" in sql
+
+
+class TestCsvChunks:
+    """Test incremental CSV encoding"""
+
+    def test_row_cells(self):
+        assert csv_row(make_row(username=None)) == [
+            "2026-10-19T12:00:00+00:00", "System", "update", "user", "users/0",
+            "success", "10.0.0.1", "{'field': 'email'}",
+        ]
+
+    async def test_chunks_are_bounded(self):
+        chunks = await collect(csv_chunks(aiter(make_row(n) for n in range(1000)), chunk_size=4096))
+
+        assert len(chunks) > 1
+        # Each chunk stops at the first row crossing the threshold
+        assert all(len(chunk) < 4096 + 200 for chunk in chunks)
+
+        rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+        assert rows[0] == CSV_HEADER
+        assert len(rows) == 1001
+        assert rows[-1][4] == "users/999"
+
+    async def test_header_only_for_no_rows(self):
+        chunks = await collect(csv_chunks(aiter([])))
+
+        assert b"".join(chunks).decode().strip() == ",".join(CSV_HEADER)
+
+    async def test_gzip_round_trip(self):
+        plain = await collect(csv_chunks(aiter(make_row(n) for n in range(500)), chunk_size=1024))
+        compressed = await collect(gzip_chunks(aiter(plain)))
+
+        assert gzip.decompress(b"".join(compressed)) == b"".join(plain)
+
+
+class TestPurgeExpiredFiles:
+    """Test export file retention"""
+
+    def test_old_files_are_deleted(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.services.audit_export_service.settings.AUDIT_EXPORT_DIR", str(tmp_path))
+        monkeypatch.setattr("app.services.audit_export_service.settings.AUDIT_EXPORT_RETENTION_HOURS", 1)
+        old = tmp_path / "old.csv.gz"
+        new = tmp_path / "new.csv.gz"
+        old.write_bytes(b"")
+        new.write_bytes(b"")
+        now = new.stat().st_mtime
+        os.utime(old, (now - 7200, now - 7200))
+
+        assert AuditExportService.purge_expired_files(now=now) == 1
+        assert not old.exists() and new.exists()
+
+    def test_missing_directory(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.services.audit_export_service.settings.AUDIT_EXPORT_DIR", str(tmp_path / "none"))
+
+        assert AuditExportService.purge_expired_files() == 0
+
+
+class ExpiringJob:
+    """A job row whose attributes cannot be read once its session rolled back."""
+
+    def __init__(self, job_id):
+        self._id = job_id
+        self.expired = False
+        self.status = JobStatus.QUEUED
+        self.tenant_id = uuid.uuid4()
+        self.parameters = {}
+
+    @property
+    def id(self):
+        assert not self.expired, "expired attribute loaded after rollback"
+        return self._id
+
+
+class JobSession:
+    """Serves the job; a rollback expires it and the next get reloads it."""
+
+    def __init__(self, job):
+        self.job = job
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def get(self, model, key):
+        if self.job.expired:
+            self.job = ExpiringJob(self.job._id)
+            self.job.status = JobStatus.RUNNING
+        return self.job
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        self.job.expired = True
+
+
+class TestRun:
+    """Test running an export job"""
+
+    async def test_failure_reloads_the_job_by_id(self, tmp_path, monkeypatch):
+        job_id = uuid.uuid4()
+        sessions = iter([JobSession(ExpiringJob(job_id)), JobSession(None)])
+        monkeypatch.setattr("app.services.audit_export_service.settings.AUDIT_EXPORT_DIR", str(tmp_path))
+        monkeypatch.setattr("app.services.audit_export_service.AsyncSessionLocal", lambda: next(sessions))
+
+        def failing_filters(tenant_id, filters):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr("app.services.audit_export_service.audit_filters", failing_filters)
+
+        result = await AuditExportService.run(job_id)
+
+        assert result == {"status": "failed", "rows": 0}
@@ -0,0 +1,171 @@
+"""
+Test Audit Partition Service
+Test monthly partition naming, creation ahead of time and archival selection
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services import audit_partition_service
+from app.services.audit_partition_service import (
+    AuditPartitionService,
+    add_months,
+    create_partition_statements,
+    month_start,
+    partition_month,
+    partition_name,
+)
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeResult:
+    def __init__(self, names):
+        self.names = names
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.names
+
+
+class FakeSession:
+    """Answers the partition listing and records every other statement."""
+
+    def __init__(self, partitions=()):
+        self.partitions = list(partitions)
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        if "pg_inherits" in sql:
+            return FakeResult(self.partitions)
+        self.statements.append(sql)
+        return FakeResult([])
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+class TestMonths:
+    """Test month arithmetic and partition names"""
+
+    def test_month_start_is_utc(self):
+        moment = datetime(2026, 11, 1, 1, 0, tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=-5)))
+        assert month_start(moment) == datetime(2026, 11, 1, tzinfo=timezone.utc)
+
+    def test_add_months_crosses_years(self):
+        assert add_months(month_start(NOW), 3) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+        assert add_months(month_start(NOW), -10) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+    def test_partition_name_round_trip(self):
+        month = month_start(NOW)
+        assert partition_name(month) == "audit_logs_p202610"
+        assert partition_month("audit_logs_p202610") == month
+        assert partition_month("audit_logs_default") is None
+
+    def test_partition_statements_bounds(self):
+        statements = create_partition_statements(month_start(NOW))
+
+        assert statements[0].startswith("CREATE TABLE audit_logs_p202610 (LIKE audit_logs")
+        assert "DELETE FROM audit_logs_default" in statements[1]
+        assert statements[2].endswith(
+            "FOR VALUES FROM ('2026-10-01 00:00:00+00') TO ('2026-11-01 00:00:00+00')"
+        )
+
+
+class TestEnsurePartitions:
+    """Test creating partitions ahead of time"""
+
+    async def test_creates_missing_months(self):
+        db = FakeSession(partitions=["audit_logs_default", "audit_logs_p202610"])
+
+        created = await AuditPartitionService.ensure_partitions(db, now=NOW, months_ahead=2)
+
+        assert created == ["audit_logs_p202611", "audit_logs_p202612"]
+        assert "PARTITION OF audit_logs DEFAULT" in db.statements[0]
+        assert len(db.statements) == 1 + 3 * 2
+        assert db.commits == 0
+
+    async def test_nothing_to_create(self):
+        db = FakeSession(partitions=["audit_logs_p202610", "audit_logs_p202611"])
+
+        assert await AuditPartitionService.ensure_partitions(db, now=NOW, months_ahead=1) == []
+
+
+class TestArchivePartitions:
+    """Test archiving expired partitions"""
+
+    @pytest.fixture
+    def copies(self, monkeypatch):
+        copied = []
+
+        async def fake_copy(db, table, path):
+            copied.append(table)
+            path.write_bytes(b"")
+
+        monkeypatch.setattr(audit_partition_service, "_copy_table_to_gzip", fake_copy)
+        return copied
+
+    async def test_archives_months_older_than_retention(self, tmp_path, copies):
+        db = FakeSession(partitions=[
+            "audit_logs_default", "audit_logs_p202608", "audit_logs_p202609", "audit_logs_p202610",
+        ])
+
+        archived = await AuditPartitionService.archive_partitions(
+            db, now=NOW, retention_months=1, archive_dir=str(tmp_path)
+        )
+
+        assert [entry["partition"] for entry in archived] == ["audit_logs_p202608"]
+        assert copies == ["audit_logs_p202608"]
+        assert db.statements == [
+            "ALTER TABLE audit_logs DETACH PARTITION audit_logs_p202608",
+            "DROP TABLE audit_logs_p202608",
+        ]
+        # Copy and detach/drop commit separately
+        assert db.commits == 2
+        assert (tmp_path / "audit_logs_p202608.csv.gz").exists()
+
+    async def test_copies_before_detaching(self, tmp_path, monkeypatch):
+        db = FakeSession(partitions=["audit_logs_p202501"])
+
+        async def checking_copy(session, table, path):
+            assert db.statements == []
+            path.write_bytes(b"")
+
+        monkeypatch.setattr(audit_partition_service, "_copy_table_to_gzip", checking_copy)
+
+        await AuditPartitionService.archive_partitions(db, now=NOW, retention_months=6, archive_dir=str(tmp_path))
+
+        assert db.statements[0] == "ALTER TABLE audit_logs DETACH PARTITION audit_logs_p202501"
+
+    async def test_zero_retention_keeps_everything(self, tmp_path, copies):
+        db = FakeSession(partitions=["audit_logs_p201001"])
+
+        assert await AuditPartitionService.archive_partitions(db, now=NOW, retention_months=0) == []
+        assert copies == []
+
+    async def test_failed_copy_rolls_back(self, tmp_path, monkeypatch):
+        async def failing_copy(db, table, path):
+            path.write_bytes(b"partial")
+            raise OSError("disk full")
+
+        monkeypatch.setattr(audit_partition_service, "_copy_table_to_gzip", failing_copy)
+        db = FakeSession(partitions=["audit_logs_p202501"])
+
+        with pytest.raises(OSError):
+            await AuditPartitionService.archive_partitions(
+                db, now=NOW, retention_months=6, archive_dir=str(tmp_path)
+            )
+
+        assert db.statements == []
+        assert db.rollbacks == 1
+        assert db.commits == 0
+        assert list(tmp_path.iterdir()) == []
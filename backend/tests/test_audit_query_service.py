@@ -0,0 +1,156 @@
+"""
+Test Audit Query Service
+Test audit log cursors, keyset page queries, capped counts and actor lookups
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.audit import AuditAction, AuditLog
+from app.services.audit_query_service import (
+    AuditQueryService,
+    audit_filters,
+    decode_cursor,
+    encode_cursor,
+    explain_statement,
+    page_query,
+)
+
+TENANT = uuid.uuid4()
+FILTERS = [AuditLog.tenant_id == TENANT, AuditLog.action == AuditAction.UPDATE]
+
+
+def compiled(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+    def all(self):
+        return self.value
+
+
+class FakeSession:
+    """Returns queued results in order and records statements."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.results.pop(0))
+
+    async def scalar(self, statement):
+        self.statements.append(statement)
+        return self.results.pop(0)
+
+
+class TestAuditFilters:
+    """Test filters built from stored parameters"""
+
+    def test_tenant_only(self):
+        assert len(audit_filters(TENANT, {})) == 1
+
+    def test_all_parameters(self):
+        actor = uuid.uuid4()
+        filters = audit_filters(TENANT, {
+            "action": "LOGIN",
+            "resource_type": "user",
+            "actor": str(actor),
+            "start": "2026-01-01T00:00:00+00:00",
+            "end": "2026-02-01T00:00:00+00:00",
+            "search": "users/",
+        })
+
+        sql = " AND ".join(compiled(condition) for condition in filters)
+        assert len(filters) == 7
+        assert "audit_logs.timestamp >=" in sql and "audit_logs.timestamp <=" in sql
+        assert "ILIKE" in sql
+
+
+class TestCursor:
+    """Test cursor encoding"""
+
+    def test_round_trip(self):
+        log = SimpleNamespace(timestamp=datetime(2026, 10, 19, 12, 30, 15, 123456, tzinfo=timezone.utc), id=uuid.uuid4())
+
+        assert decode_cursor(encode_cursor(log)) == (log.timestamp, log.id)
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", "bm8gc2VwYXJhdG9y"])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestPageQuery:
+    """Test page query construction"""
+
+    def test_keyset_page(self):
+        log = SimpleNamespace(timestamp=datetime(2026, 10, 19, tzinfo=timezone.utc), id=uuid.uuid4())
+
+        sql = compiled(page_query(FILTERS, 20, cursor=encode_cursor(log), offset=400))
+
+        assert "(audit_logs.timestamp, audit_logs.id) < (" in sql
+        assert "ORDER BY audit_logs.timestamp DESC, audit_logs.id DESC" in sql
+        assert "OFFSET" not in sql
+
+    def test_offset_page_without_cursor(self):
+        query = page_query(FILTERS, 20, offset=40)
+
+        assert "OFFSET" in compiled(query)
+        assert query._limit_clause.value == 21
+
+
+class TestCount:
+    """Test capped counts"""
+
+    async def test_exact_below_limit(self, monkeypatch):
+        monkeypatch.setattr("app.services.audit_query_service.settings.AUDIT_LOG_EXACT_COUNT_LIMIT", 100)
+        db = FakeSession(42)
+
+        assert await AuditQueryService.count(db, FILTERS) == (42, False)
+        assert len(db.statements) == 1
+        assert "LIMIT" in compiled(db.statements[0])
+
+    async def test_estimate_above_limit(self, monkeypatch):
+        monkeypatch.setattr("app.services.audit_query_service.settings.AUDIT_LOG_EXACT_COUNT_LIMIT", 100)
+        plan = json.dumps([{"Plan": {"Plan Rows": 2500000}}])
+        db = FakeSession(101, plan)
+
+        assert await AuditQueryService.count(db, FILTERS) == (2500000, True)
+        assert str(db.statements[1]).startswith("EXPLAIN (FORMAT JSON) SELECT")
+
+    def test_explain_binds_typed_parameters(self):
+        statement = explain_statement(page_query(FILTERS, 20))
+
+        sql = str(statement)
+        assert ":tenant_id_1" in sql and ":action_1" in sql
+        assert statement._bindparams["action_1"].type.__class__.__name__ == "Enum"
+
+
+class TestActorNames:
+    """Test batched actor resolution"""
+
+    async def test_one_query_for_the_page(self):
+        actor = uuid.uuid4()
+        db = FakeSession([(actor, "jdoe")])
+
+        assert await AuditQueryService.actor_names(db, [actor, actor, None]) == {actor: "jdoe"}
+        assert len(db.statements) == 1
+
+    async def test_no_actors_no_query(self):
+        db = FakeSession()
+
+        assert await AuditQueryService.actor_names(db, [None]) == {}
+        assert db.statements == []
@@ -48,6 +48,31 @@ async def test_check_out_unavailable_item(client: AsyncClient, auth_headers: dic
     assert "not available" in response.json()["detail"].lower()
 
 
+@pytest.mark.asyncio
+async def test_check_out_item_with_open_loan(client: AsyncClient, auth_headers: dict, test_item: Item, test_user: User, db_session):
+    """Test that an item with an open loan cannot be checked out again, even if its status is stale."""
+    loan = Loan(
+        user_id=test_user.id,
+        item_id=test_item.id,
+        loan_date=datetime.now(),
+        due_date=datetime.now() + timedelta(days=14),
+        status="open",
+        tenant_id=test_user.tenant_id,
+    )
+    db_session.add(loan)
+    await db_session.commit()
+
+    checkout_data = {
+        "item_barcode": test_item.barcode,
+        "user_barcode": test_user.barcode,
+        "service_point_id": str(test_item.effective_location_id or test_item.permanent_location_id),
+    }
+
+    response = await client.post("/api/v1/circulation/check-out", json=checkout_data, headers=auth_headers)
+    assert response.status_code == 400
+    assert "already checked out" in response.json()["detail"].lower()
+
+
 @pytest.mark.asyncio
 async def test_check_in_item(client: AsyncClient, auth_headers: dict, test_item: Item, test_user: User, db_session):
     """Test checking in an item."""
@@ -104,6 +129,51 @@ async def test_renew_loan(client: AsyncClient, auth_headers: dict, test_item: It
     assert datetime.fromisoformat(data["due_date"].replace('Z', '+00:00')) > due_date
 
 
+@pytest.mark.asyncio
+async def test_renew_batch_reports_per_loan_results(client: AsyncClient, auth_headers: dict, test_item: Item, test_user: User, db_session):
+    """Test batch renewal renews eligible loans and reports blocked or unknown ones."""
+    import uuid
+
+    due_date = datetime.now() + timedelta(days=2)
+    renewable_loan = Loan(
+        user_id=test_user.id,
+        item_id=test_item.id,
+        loan_date=datetime.now(),
+        due_date=due_date,
+        status="open",
+        renewal_count="0",
+        tenant_id=test_user.tenant_id,
+    )
+    maxed_loan = Loan(
+        user_id=test_user.id,
+        item_id=test_item.id,
+        loan_date=datetime.now(),
+        due_date=due_date,
+        status="closed",
+        renewal_count="3",
+        tenant_id=test_user.tenant_id,
+    )
+    db_session.add_all([renewable_loan, maxed_loan])
+    await db_session.commit()
+
+    missing_loan_id = uuid.uuid4()
+    response = await client.post(
+        "/api/v1/circulation/renew/batch",
+        json={"loan_ids": [str(renewable_loan.id), str(maxed_loan.id), str(missing_loan_id)]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["renewed_count"] == 1
+    assert data["failed_count"] == 2
+
+    results = {r["loan_id"]: r for r in data["results"]}
+    assert results[str(renewable_loan.id)]["renewed"] is True
+    assert results[str(renewable_loan.id)]["renewal_count"] == 1
+    assert results[str(maxed_loan.id)]["error"] == "Open loan not found"
+    assert results[str(missing_loan_id)]["error"] == "Open loan not found"
+
+
 @pytest.mark.asyncio
 async def test_list_loans(client: AsyncClient, auth_headers: dict, test_item: Item, test_user: User, db_session):
     """Test listing loans."""
@@ -186,6 +256,56 @@ async def test_filter_overdue_loans(client: AsyncClient, auth_headers: dict, tes
             assert due_date < datetime.now(due_date.tzinfo)
 
 
+@pytest.mark.asyncio
+async def test_account_summary_follows_checkout_and_request(client: AsyncClient, auth_headers: dict, test_item: Item, test_user: User):
+    """Test that the patron account summary is maintained by checkout and request mutations."""
+    response = await client.get(f"/api/v1/users/{test_user.id}/account-summary", headers=auth_headers)
+    assert response.status_code == 200
+    before = response.json()
+
+    checkout_data = {
+        "user_id": str(test_user.id),
+        "item_barcode": test_item.barcode,
+    }
+    response = await client.post("/api/v1/circulation/check-out", json=checkout_data, headers=auth_headers)
+    assert response.status_code == 201
+
+    request_data = {
+        "user_id": str(test_user.id),
+        "item_id": str(test_item.id),
+        "request_type": "hold",
+    }
+    response = await client.post("/api/v1/circulation/requests", json=request_data, headers=auth_headers)
+    assert response.status_code == 201
+
+    response = await client.get(f"/api/v1/users/{test_user.id}/account-summary", headers=auth_headers)
+    assert response.status_code == 200
+    after = response.json()
+    assert after["open_loans"] == before["open_loans"] + 1
+    assert after["open_requests"] == before["open_requests"] + 1
+
+
+@pytest.mark.asyncio
+async def test_check_patron_blocks_batch(client: AsyncClient, auth_headers: dict, test_user: User):
+    """Test batch patron block check reports a decision per patron, including unknown ones."""
+    response = await client.post(
+        "/api/v1/circulation/patron-blocks/check",
+        json={"user_ids": [str(test_user.id)], "user_barcodes": ["NO-SUCH-PATRON"]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 2
+
+    known = next(r for r in results if r["user_id"] == str(test_user.id))
+    assert known["found"] is True
+    assert known["can_checkout"] == (not known["blocks"])
+
+    unknown = next(r for r in results if r["user_barcode"] == "NO-SUCH-PATRON")
+    assert unknown["found"] is False
+    assert unknown["can_checkout"] is False
+
+
 @pytest.mark.asyncio
 async def test_create_request(client: AsyncClient, auth_headers: dict, test_item: Item, test_user: User):
     """Test creating a hold request."""
@@ -310,6 +430,64 @@ async def test_request_queue_position(client: AsyncClient, auth_headers: dict, t
     assert data2["queue_position"] == 2
 
 
+@pytest.mark.asyncio
+async def test_request_queue_cancel_and_reorder(client: AsyncClient, auth_headers: dict, test_item: Item, test_user: User, db_session):
+    """Test that cancelling compacts the queue and that reordering and moving keep positions dense."""
+    requests = []
+    for position in range(1, 13):
+        request = Request(
+            user_id=test_user.id,
+            item_id=test_item.id,
+            request_type="hold",
+            status="open",
+            position=position,
+            tenant_id=test_user.tenant_id,
+        )
+        db_session.add(request)
+        requests.append(request)
+    await db_session.commit()
+
+    # Cancelling position 2 moves everyone behind it up one place
+    response = await client.delete(f"/api/v1/circulation/requests/{requests[1].id}", headers=auth_headers)
+    assert response.status_code == 204
+
+    response = await client.get(f"/api/v1/circulation/items/{test_item.id}/request-queue", headers=auth_headers)
+    assert response.status_code == 200
+    queue = response.json()
+    assert [r["position"] for r in queue] == list(range(1, 12))
+    assert queue[1]["id"] == str(requests[2].id)
+    assert all(r["queue_length"] == 11 for r in queue)
+
+    # Move the last request to the front (integer ordering, so 11 sorts after 2)
+    response = await client.post(
+        f"/api/v1/circulation/requests/{requests[11].id}/move",
+        json={"position": 1},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["position"] == 1
+
+    # Reverse the whole queue
+    ids = [r["id"] for r in queue]
+    ids.remove(str(requests[11].id))
+    ids.insert(0, str(requests[11].id))
+    response = await client.put(
+        f"/api/v1/circulation/items/{test_item.id}/request-queue",
+        json={"request_ids": list(reversed(ids))},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert [r["id"] for r in response.json()] == list(reversed(ids))
+
+    # Reordering with a missing request is rejected
+    response = await client.put(
+        f"/api/v1/circulation/items/{test_item.id}/request-queue",
+        json={"request_ids": ids[1:]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_check_out_with_invalid_barcode(client: AsyncClient, auth_headers: dict, test_user: User):
     """Test check-out with invalid item barcode."""
@@ -0,0 +1,192 @@
+"""
+Test Circulation Rollup Service
+Test rollup and changed-day queries, incremental refresh and rollup reads
+"""
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.job import JobWatermark
+from app.services.circulation_rollup_service import (
+    JOB_NAME,
+    CirculationRollupService,
+    changed_days_query,
+    rollup_query,
+)
+
+TENANT = uuid.uuid4()
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def compiled(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def all(self):
+        return self.value
+
+    def one(self):
+        return self.value
+
+
+class FakeSession:
+    """Returns queued results in order and records statements."""
+
+    def __init__(self, watermark=None, *results):
+        self.watermark = watermark
+        self.results = list(results)
+        self.statements = []
+        self.added = []
+        self.committed = False
+
+    async def get(self, model, key):
+        assert model is JobWatermark and key == JOB_NAME
+        return self.watermark
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.results.pop(0) if self.results else None)
+
+    def add(self, instance):
+        self.added.append(instance)
+
+    async def commit(self):
+        self.committed = True
+
+
+class TestRollupQuery:
+    """Test rollup query construction"""
+
+    def test_counts_every_event_kind(self):
+        sql = compiled(rollup_query(NOW))
+
+        assert sql.count("UNION ALL") == 3
+        for measure in ("checkouts", "checkins", "renewals", "overdue"):
+            assert f"AS {measure}" in sql
+        assert "count(*) FILTER (WHERE" in sql
+        assert "date(timezone(%(timezone_1)s, loans.loan_date))" in sql
+        assert "GROUP BY" in sql
+
+    def test_renewals_join_through_loans(self):
+        sql = compiled(rollup_query(NOW))
+
+        assert "FROM loan_renewals JOIN loans ON loans.id = loan_renewals.loan_id JOIN items" in sql
+
+    def test_days_are_range_bounded(self):
+        query = rollup_query(NOW, TENANT, [date(2026, 10, 3), date(2026, 10, 1)])
+        sql = compiled(query)
+        params = query.compile(dialect=postgresql.dialect()).params
+
+        assert "loans.loan_date >=" in sql and "loans.loan_date <" in sql
+        assert "loan_renewals.tenant_id = " in sql
+        assert datetime(2026, 10, 1, tzinfo=timezone.utc) in params.values()
+        assert datetime(2026, 10, 4, tzinfo=timezone.utc) in params.values()
+
+    def test_unscoped_rebuild_has_no_day_filter(self):
+        sql = compiled(rollup_query(NOW))
+
+        assert " IN (" not in sql
+
+
+class TestChangedDays:
+    """Test changed-day detection"""
+
+    def test_query_covers_loans_renewals_and_passed_due_dates(self):
+        sql = compiled(changed_days_query(NOW - timedelta(hours=1), NOW))
+
+        assert "loans.updated_date >" in sql
+        assert "loan_renewals.renewed_at >" in sql
+        assert "loan_renewals.previous_due_date" in sql
+        assert "loans.due_date <=" in sql
+
+    async def test_groups_days_by_tenant(self):
+        other = uuid.uuid4()
+        db = FakeSession(None, [
+            (TENANT, date(2026, 10, 18)),
+            (TENANT, date(2026, 10, 19)),
+            (other, date(2026, 10, 19)),
+            (other, None),
+        ])
+
+        days = await CirculationRollupService.changed_days(db, NOW - timedelta(hours=1), NOW)
+
+        assert days == {TENANT: {date(2026, 10, 18), date(2026, 10, 19)}, other: {date(2026, 10, 19)}}
+
+
+class TestRefresh:
+    """Test incremental refresh and the watermark"""
+
+    async def test_first_run_rebuilds(self):
+        db = FakeSession()
+
+        stats = await CirculationRollupService.refresh(db, now=NOW)
+
+        assert stats["rebuilt"] is True
+        assert compiled(db.statements[0]).startswith("DELETE FROM circulation_daily_stats")
+        assert "gen_random_uuid()" in compiled(db.statements[1])
+        assert (
+            "ON CONFLICT (tenant_id, day, location_id, patron_group_id, material_type_id) DO UPDATE"
+            in compiled(db.statements[1])
+        )
+        assert db.added[0].name == JOB_NAME and db.added[0].last_run_at == NOW
+        assert db.committed
+
+    async def test_recomputes_changed_days_with_overlap(self, monkeypatch):
+        monkeypatch.setattr("app.services.circulation_rollup_service.settings.CIRCULATION_ROLLUP_OVERLAP_MINUTES", 10)
+        watermark = SimpleNamespace(last_run_at=NOW - timedelta(minutes=15), details=None)
+        db = FakeSession(watermark, [(TENANT, date(2026, 10, 19))])
+
+        stats = await CirculationRollupService.refresh(db, now=NOW)
+
+        assert stats == {"rebuilt": False, "tenants": 1, "days": 1}
+        since = db.statements[0].compile(dialect=postgresql.dialect()).params["updated_date_1"]
+        assert since == NOW - timedelta(minutes=25)
+        delete_sql = compiled(db.statements[1])
+        assert delete_sql.startswith("DELETE FROM circulation_daily_stats")
+        assert "circulation_daily_stats.day IN" in delete_sql
+        assert watermark.last_run_at == NOW and watermark.details == stats
+        assert db.added == []
+
+    async def test_batches_many_days(self, monkeypatch):
+        monkeypatch.setattr("app.services.circulation_rollup_service.DAYS_PER_BATCH", 2)
+        db = FakeSession()
+
+        days = [date(2026, 10, day) for day in range(1, 6)]
+        await CirculationRollupService.recompute_days(db, TENANT, days, NOW)
+
+        # Delete and insert per batch of two days
+        assert len(db.statements) == 6
+
+
+class TestReads:
+    """Test rollup reads"""
+
+    async def test_totals(self):
+        db = FakeSession(None, (12, 9, 3, 1))
+
+        totals = await CirculationRollupService.totals(db, TENANT, date(2026, 1, 1), date(2026, 12, 31))
+
+        assert totals == {"checkouts": 12, "checkins": 9, "renewals": 3, "overdue": 1}
+        sql = compiled(db.statements[0])
+        assert "circulation_daily_stats.day >=" in sql and "circulation_daily_stats.day <=" in sql
+
+    async def test_series_by_month(self):
+        row = SimpleNamespace(key=date(2026, 10, 1), checkouts=5, checkins=4, renewals=1, overdue=0)
+        db = FakeSession(None, [row])
+
+        rows = await CirculationRollupService.series(db, TENANT, "month")
+
+        assert rows == [{"key": date(2026, 10, 1), "checkouts": 5, "checkins": 4, "renewals": 1, "overdue": 0}]
+        assert "date_trunc" in compiled(db.statements[0])
+
+    async def test_series_rejects_unknown_grouping(self):
+        with pytest.raises(ValueError):
+            await CirculationRollupService.series(FakeSession(), TENANT, "week")
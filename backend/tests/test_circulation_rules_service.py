@@ -0,0 +1,161 @@
+"""
+Test Circulation Rules Service
+Test loan policy resolution, due date calculation and table caching
+"""
+
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+
+from app.services.circulation_rules_service import (
+    CirculationRulesEngine,
+    add_interval,
+    apply_schedule,
+    calculate_due_date,
+    calculate_renewal_due_date,
+    item_criteria,
+    resolve_from_table,
+)
+
+GRADUATE = str(uuid.uuid4())
+FACULTY = str(uuid.uuid4())
+BOOK = str(uuid.uuid4())
+DVD = str(uuid.uuid4())
+RESERVE_ROOM = str(uuid.uuid4())
+
+
+def make_policy(code, days, renewals=3, renewable=True, schedule=None):
+    return {
+        "id": code,
+        "code": code,
+        "loan_period": (days, "Days"),
+        "renewable": renewable,
+        "max_renewals": renewals if renewable else 0,
+        "renewal_period": (days, "Days"),
+        "schedule": schedule or [],
+    }
+
+
+def make_table():
+    """Rules: anything -> 21 days, DVDs -> 7 days, faculty -> 90 days,
+    reserve room -> 2 days at priority 10."""
+    return {
+        "rules": {
+            (None, None, None, None): ((0, 0), make_policy("standard", 21)),
+            (None, DVD, None, None): ((0, 1), make_policy("media", 7)),
+            (FACULTY, None, None, None): ((0, 1), make_policy("faculty", 90)),
+            (None, None, None, RESERVE_ROOM): ((10, 1), make_policy("reserve", 2, renewable=False)),
+        },
+        "patron_groups": {GRADUATE: {"loan_period_days": 28, "renewals_allowed": True}},
+    }
+
+
+class TestResolveFromTable:
+    """Test suite for resolve_from_table"""
+
+    def test_catch_all_rule(self):
+        """Test that the wildcard rule applies when nothing more specific matches"""
+        assert resolve_from_table(make_table(), GRADUATE, BOOK)["code"] == "standard"
+
+    def test_specific_rule_wins(self):
+        """Test that a more specific rule beats the catch-all"""
+        assert resolve_from_table(make_table(), GRADUATE, DVD)["code"] == "media"
+        assert resolve_from_table(make_table(), FACULTY, BOOK)["code"] == "faculty"
+
+    def test_priority_beats_specificity(self):
+        """Test that a higher priority rule wins over more specific ones"""
+        policy = resolve_from_table(make_table(), FACULTY, DVD, None, RESERVE_ROOM)
+        assert policy["code"] == "reserve"
+
+    def test_patron_group_fallback(self):
+        """Test the patron group loan period is used when no rule matches"""
+        table = {"rules": {}, "patron_groups": make_table()["patron_groups"]}
+        policy = resolve_from_table(table, GRADUATE, BOOK)
+        assert policy["id"] is None
+        assert policy["loan_period"] == (28, "Days")
+
+    def test_default_fallback(self):
+        """Test the built-in 14 day policy is used without rules or group"""
+        policy = resolve_from_table({"rules": {}, "patron_groups": {}}, None)
+        assert policy["loan_period"] == (14, "Days")
+        assert policy["max_renewals"] == 3
+
+
+class TestDueDates:
+    """Test suite for due date calculation"""
+
+    def test_add_interval_months_clamps_day(self):
+        """Test that adding months clamps to the end of shorter months"""
+        assert add_interval(datetime(2024, 1, 31, 10), 1, "Months") == datetime(2024, 2, 29, 10)
+        assert add_interval(datetime(2024, 11, 15), 3, "Months") == datetime(2025, 2, 15)
+
+    def test_add_interval_weeks_and_hours(self):
+        """Test week and hour intervals"""
+        start = datetime(2024, 3, 1, 9)
+        assert add_interval(start, 2, "Weeks") == datetime(2024, 3, 15, 9)
+        assert add_interval(start, 4, "Hours") == datetime(2024, 3, 1, 13)
+
+    def test_fixed_schedule_caps_due_date(self):
+        """Test that a fixed schedule window caps the rolling due date"""
+        schedule = [(date(2024, 1, 8), date(2024, 5, 10), date(2024, 5, 17))]
+        policy = make_policy("semester", 90, schedule=schedule)
+
+        assert calculate_due_date(policy, datetime(2024, 5, 1, 12)) == datetime(2024, 5, 17, 23, 59, 59)
+        assert calculate_due_date(policy, datetime(2024, 1, 9, 12)) == datetime(2024, 4, 8, 12)
+
+    def test_outside_schedule_windows(self):
+        """Test that loans outside every window keep the rolling due date"""
+        schedule = [(date(2024, 1, 8), date(2024, 5, 10), date(2024, 5, 17))]
+        due = datetime(2024, 7, 1)
+        assert apply_schedule(due, datetime(2024, 6, 1), schedule) == due
+
+    def test_renewal_period(self):
+        """Test that renewals use the renewal period"""
+        policy = make_policy("standard", 21)
+        policy["renewal_period"] = (7, "Days")
+        assert calculate_renewal_due_date(policy, datetime(2024, 3, 1)) == datetime(2024, 3, 8)
+
+
+class TestCirculationRulesEngine:
+    """Test suite for CirculationRulesEngine caching"""
+
+    async def test_table_is_cached_until_invalidated(self, monkeypatch):
+        """Test that compile runs once per tenant until invalidated"""
+        engine = CirculationRulesEngine(ttl_seconds=300)
+        calls = []
+
+        async def fake_compile(db, tenant_id):
+            calls.append(tenant_id)
+            return make_table()
+
+        monkeypatch.setattr(engine, "compile", fake_compile)
+        tenant_id = uuid.uuid4()
+        item = SimpleNamespace(
+            material_type_id=DVD,
+            temporary_loan_type_id=None,
+            permanent_loan_type_id=None,
+            effective_location_id=None,
+            temporary_location_id=None,
+            permanent_location_id=None,
+        )
+
+        for _ in range(3):
+            policy = await engine.resolve(None, tenant_id, GRADUATE, item)
+            assert policy["code"] == "media"
+        assert len(calls) == 1
+
+        engine.invalidate(str(tenant_id))
+        await engine.resolve(None, tenant_id, GRADUATE, item)
+        assert len(calls) == 2
+
+    def test_item_criteria_prefers_effective_values(self):
+        """Test temporary loan type and effective location take precedence"""
+        item = SimpleNamespace(
+            material_type_id=BOOK,
+            temporary_loan_type_id="short",
+            permanent_loan_type_id="normal",
+            effective_location_id=None,
+            temporary_location_id=RESERVE_ROOM,
+            permanent_location_id="stacks",
+        )
+        assert item_criteria(item) == (BOOK, "short", RESERVE_ROOM)
@@ -0,0 +1,77 @@
+"""
+Test Domain Events
+Test post-commit batching and dispatch of domain events
+"""
+
+import asyncio
+import pytest
+from sqlalchemy.orm import Session
+
+from app.services import domain_events
+from app.services.domain_events import DomainEventBus, SESSION_EVENTS_KEY, publish
+
+
+TENANT_ID = "00000000-0000-0000-0000-000000000001"
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    """Replace the bus with one that records dispatched batches"""
+    batches = []
+    bus = DomainEventBus()
+
+    async def record(events):
+        batches.append(events)
+
+    bus.subscribe(record)
+    monkeypatch.setattr(domain_events, "_domain_event_bus", bus)
+    return batches
+
+
+class TestDomainEvents:
+    """Test suite for the domain event bus"""
+
+    async def test_events_dispatched_once_per_commit(self, recorded):
+        """Test that events of one transaction arrive as one batch after commit"""
+        session = Session()
+        publish(session, "loan.checked_out", TENANT_ID, "loan-1", item_id="item-1")
+        publish(session, "loan.checked_in", TENANT_ID, "loan-2")
+
+        assert recorded == []
+        session.commit()
+        await asyncio.sleep(0)
+
+        assert len(recorded) == 1
+        assert [e["type"] for e in recorded[0]] == ["loan.checked_out", "loan.checked_in"]
+        assert recorded[0][0]["entity_type"] == "loan"
+        assert recorded[0][0]["data"] == {"item_id": "item-1"}
+        assert SESSION_EVENTS_KEY not in session.info
+
+    async def test_rollback_discards_events(self, recorded):
+        """Test that rolled back events are never dispatched"""
+        session = Session()
+        session.begin()
+        publish(session, "fee.created", TENANT_ID, "fee-1")
+
+        session.rollback()
+        session.commit()
+        await asyncio.sleep(0)
+
+        assert recorded == []
+
+    async def test_failing_subscriber_is_isolated(self):
+        """Test that one failing subscriber does not stop the others"""
+        bus = DomainEventBus()
+        received = []
+
+        async def broken(events):
+            raise RuntimeError("boom")
+
+        async def working(events):
+            received.extend(events)
+
+        bus.subscribe(broken)
+        bus.subscribe(working)
+        await bus.dispatch([{"type": "item.created"}])
+
+        assert received == [{"type": "item.created"}]
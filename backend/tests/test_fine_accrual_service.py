@@ -0,0 +1,106 @@
+"""
+Test Fine Accrual Service
+Test overdue fine calculation and incremental accrual windows
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from app.services.fine_accrual_service import (
+    calculate_overdue_fine,
+    days_to_cap,
+    default_overdue_policy,
+    due_date_window,
+    overdue_policy,
+)
+from app.models.fee import FeePolicy
+
+
+def make_policy(per_day="0.50", grace=0, max_amount=None, initial="0.00"):
+    return {
+        "id": None,
+        "initial_amount": Decimal(initial),
+        "per_day_amount": Decimal(per_day),
+        "grace_period_days": grace,
+        "max_amount": Decimal(max_amount) if max_amount is not None else None,
+    }
+
+
+NOW = datetime(2024, 3, 10, 1, 30, tzinfo=timezone.utc)
+
+
+class TestCalculateOverdueFine:
+    """Test suite for calculate_overdue_fine"""
+
+    def test_per_day_rate(self):
+        """Test that each whole day overdue is charged"""
+        due = datetime(2024, 3, 6, 17, 0, tzinfo=timezone.utc)
+        assert calculate_overdue_fine(due, NOW, make_policy()) == Decimal("2.00")
+
+    def test_grace_period(self):
+        """Test that nothing is charged inside the grace period"""
+        due = datetime(2024, 3, 8, 12, 0, tzinfo=timezone.utc)
+        assert calculate_overdue_fine(due, NOW, make_policy(grace=2)) == Decimal("0.00")
+        assert calculate_overdue_fine(due, NOW, make_policy(grace=1)) == Decimal("0.50")
+
+    def test_max_amount_cap(self):
+        """Test that the fine never exceeds max_amount"""
+        due = NOW - timedelta(days=100)
+        assert calculate_overdue_fine(due, NOW, make_policy(max_amount="10.00")) == Decimal("10.00")
+
+    def test_initial_amount(self):
+        """Test that the initial amount is added once the fine starts"""
+        due = NOW - timedelta(days=3)
+        assert calculate_overdue_fine(due, NOW, make_policy(initial="1.00")) == Decimal("2.50")
+
+    def test_not_overdue(self):
+        """Test that loans due today or later owe nothing"""
+        assert calculate_overdue_fine(NOW, NOW, make_policy()) == Decimal("0.00")
+        assert calculate_overdue_fine(NOW + timedelta(days=1), NOW, make_policy()) == Decimal("0.00")
+
+
+class TestOverduePolicy:
+    """Test suite for overdue_policy"""
+
+    def test_fee_policy_fields(self):
+        """Test that a tenant's FeePolicy sets the rates"""
+        fee_policy = FeePolicy(initial_amount=None, per_day_amount=Decimal("1.25"), grace_period_days=2, max_amount=Decimal("20.00"))
+
+        policy = overdue_policy(fee_policy)
+
+        assert policy["initial_amount"] == Decimal("0.00")
+        assert policy["per_day_amount"] == Decimal("1.25")
+        assert policy["grace_period_days"] == 2
+        assert policy["max_amount"] == Decimal("20.00")
+
+    def test_default_without_policy(self):
+        """Test that tenants without a FeePolicy use the default rate"""
+        assert overdue_policy(None) == default_overdue_policy()
+
+
+class TestAccrualWindow:
+    """Test suite for the incremental accrual due-date window"""
+
+    def test_days_to_cap(self):
+        """Test the number of chargeable days before the cap is reached"""
+        assert days_to_cap(make_policy(max_amount="10.00")) == 20
+        assert days_to_cap(make_policy(max_amount="10.00", initial="1.00")) == 18
+        assert days_to_cap(make_policy()) is None
+
+    def test_first_run_has_no_lower_bound(self):
+        """Test that the first run covers every overdue loan"""
+        lower, upper = due_date_window(make_policy(max_amount="10.00"), None, NOW)
+        assert lower is None
+        assert upper == datetime(2024, 3, 10, tzinfo=timezone.utc)
+
+    def test_window_matches_changed_fines(self):
+        """Test that exactly the loans whose fine changed fall in the window"""
+        policy = make_policy(max_amount="2.00", grace=1)
+        last_run = NOW - timedelta(days=1)
+        lower, upper = due_date_window(policy, last_run, NOW)
+
+        for offset in range(0, 15):
+            due = datetime(2024, 3, 10, 12, tzinfo=timezone.utc) - timedelta(days=offset)
+            changed = calculate_overdue_fine(due, NOW, policy) != calculate_overdue_fine(due, last_run, policy)
+            in_window = lower <= due < upper
+            assert changed == in_window, offset
@@ -0,0 +1,108 @@
+"""
+Test Notification Counter Service
+Test unread counter caching and database fallback
+"""
+
+from app.services.notification_counter_service import NotificationCounterService
+
+
+TENANT_ID = "00000000-0000-0000-0000-000000000001"
+USER_ID = "00000000-0000-0000-0000-000000000002"
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the Redis commands the service uses"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False, xx=False):
+        if nx and key in self.values:
+            return None
+        if xx and key not in self.values:
+            return None
+        self.values[key] = str(value)
+        return True
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+class FailingRedis:
+    """Redis stand-in whose commands always fail"""
+
+    def __getattr__(self, name):
+        async def fail(*args, **kwargs):
+            raise ConnectionError("redis unavailable")
+        return fail
+
+
+class StubCounterService(NotificationCounterService):
+    """Counter service with a fixed database count"""
+
+    def __init__(self, client, db_count=7):
+        super().__init__(ttl_seconds=60)
+        self._redis = client
+        self.db_count = db_count
+        self.db_queries = 0
+
+    async def count_from_db(self, db, tenant_id, user_id):
+        self.db_queries += 1
+        return self.db_count
+
+    @staticmethod
+    async def _push(user_id, count):
+        pass
+
+
+class TestNotificationCounterService:
+    """Test suite for NotificationCounterService"""
+
+    async def test_miss_recounts_and_caches(self):
+        """Test that a cache miss counts once and then serves from Redis"""
+        service = StubCounterService(FakeRedis())
+
+        assert await service.get_unread_count(None, TENANT_ID, USER_ID) == 7
+        service.db_count = 99
+        assert await service.get_unread_count(None, TENANT_ID, USER_ID) == 7
+        assert service.db_queries == 1
+
+    async def test_redis_unavailable_falls_back_to_database(self):
+        """Test that the database answers when Redis is down"""
+        service = StubCounterService(FailingRedis(), db_count=3)
+
+        assert await service.get_unread_count(None, TENANT_ID, USER_ID) == 3
+        assert await service.increment(TENANT_ID, USER_ID) is None
+
+    async def test_set_count_overwrites(self):
+        """Test that set_count replaces the cached value"""
+        client = FakeRedis()
+        service = StubCounterService(client)
+
+        await service.get_unread_count(None, TENANT_ID, USER_ID)
+        await service.set_count(TENANT_ID, USER_ID, 0)
+
+        assert await service.get_unread_count(None, TENANT_ID, USER_ID) == 0
+
+    def test_key_layout(self):
+        """Test that counter keys are scoped by tenant and user"""
+        key = NotificationCounterService.make_key(TENANT_ID, USER_ID)
+        assert key == f"notifications:unread:{TENANT_ID}:{USER_ID}"
+
+    async def test_pushes_through_given_websocket_service(self):
+        """Test that a per-run WebSocket service receives count pushes"""
+        pushed = []
+
+        class RecordingWebSocketService:
+            async def send_unread_count(self, user_id, unread_count):
+                pushed.append((user_id, unread_count))
+
+        service = NotificationCounterService(ttl_seconds=60, websocket_service=RecordingWebSocketService())
+        service._redis = FakeRedis()
+
+        await service.set_count(TENANT_ID, USER_ID, 4)
+
+        assert pushed == [(USER_ID, 4)]
@@ -0,0 +1,161 @@
+"""
+Test Notification Digest Service
+Test coalescing of notification bursts per user and type
+"""
+
+from app.models.notification import NotificationType
+from app.services.notification_digest import NotificationDigestService
+
+
+TENANT_ID = "00000000-0000-0000-0000-000000000001"
+USER_ID = "00000000-0000-0000-0000-000000000002"
+
+
+class RecordingDigestService(NotificationDigestService):
+    """Digest service that records deliveries instead of writing them"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delivered = []
+
+    async def deliver(self, buffers):
+        self.delivered.extend(buffers)
+
+    async def _drain_spilled(self, now, force):
+        return {}
+
+
+class UnavailableRedisDigestService(RecordingDigestService):
+    """Digest service whose Redis connection always fails"""
+
+    def _get_redis(self):
+        raise ConnectionError("redis unavailable")
+
+
+async def add_event(service, title, notification_type=NotificationType.CHECKOUT, user_id=USER_ID, **kwargs):
+    await service.add(
+        tenant_id=TENANT_ID,
+        notification_type=notification_type,
+        title=title,
+        message=f"{title} message",
+        user_id=user_id,
+        user_email="patron@example.com",
+        **kwargs
+    )
+
+
+class TestNotificationDigestService:
+    """Test suite for NotificationDigestService"""
+
+    async def test_events_coalesce_per_user_and_type(self):
+        """Test that a burst for one user and type becomes one buffer"""
+        service = RecordingDigestService(window_seconds=60, max_buffered=100)
+
+        for i in range(5):
+            await add_event(service, f"Checkout {i}")
+        await add_event(service, "Overdue", notification_type=NotificationType.OVERDUE)
+
+        emitted = await service.flush_due(force=True)
+
+        assert emitted == 2
+        by_type = {b["meta"]["type"]: b for b in service.delivered}
+        assert len(by_type["checkout"]["events"]) == 5
+        assert len(by_type["overdue"]["events"]) == 1
+
+    async def test_window_not_elapsed(self):
+        """Test that buffers are held until the window elapses"""
+        service = RecordingDigestService(window_seconds=60, max_buffered=100)
+        await add_event(service, "Checkout")
+
+        assert await service.flush_due() == 0
+        assert service.delivered == []
+
+        # Age the buffer past the window
+        for buffer in service._buffers.values():
+            buffer["opened_at"] -= 61
+
+        assert await service.flush_due() == 1
+        assert service._buffered == 0
+
+    async def test_recipient_required(self):
+        """Test that events without a user or email are dropped"""
+        service = RecordingDigestService(window_seconds=60, max_buffered=100)
+        await service.add(
+            tenant_id=TENANT_ID,
+            notification_type=NotificationType.INFO,
+            title="Nobody",
+            message="No recipient",
+        )
+
+        assert service._buffers == {}
+
+    async def test_overflow_delivers_when_redis_unavailable(self):
+        """Test that overflowing buffers are delivered when they cannot spill"""
+        service = UnavailableRedisDigestService(window_seconds=60, max_buffered=3)
+
+        for i in range(3):
+            await add_event(service, f"Checkout {i}")
+        assert service.delivered == []
+
+        await add_event(service, "Checkout 3")
+
+        assert len(service.delivered) == 1
+        assert len(service.delivered[0]["events"]) == 4
+        assert service._buffered == 0
+
+    def test_digest_notification_row(self):
+        """Test that a multi-event buffer builds one digest row"""
+        buffer = {
+            "opened_at": 0,
+            "meta": {
+                "tenant_id": TENANT_ID,
+                "user_id": USER_ID,
+                "user_email": "patron@example.com",
+                "user_name": "Pat Ron",
+                "type": "checkout",
+            },
+            "events": [
+                {
+                    "title": f"Checkout {i}",
+                    "message": "message",
+                    "priority": "high" if i == 1 else "normal",
+                    "entity_type": None,
+                    "entity_id": None,
+                    "created_at": "2024-01-01T00:00:00",
+                }
+                for i in range(3)
+            ],
+        }
+
+        notification = NotificationDigestService._build_notification(buffer)
+
+        assert notification.title == "3 new checkout notifications"
+        assert notification.priority == "high"
+        assert notification.notification_metadata["count"] == 3
+        assert len(notification.notification_metadata["events"]) == 3
+
+    def test_single_event_row_unchanged(self):
+        """Test that a single-event buffer keeps its own title"""
+        buffer = {
+            "opened_at": 0,
+            "meta": {
+                "tenant_id": TENANT_ID,
+                "user_id": USER_ID,
+                "user_email": None,
+                "user_name": None,
+                "type": "overdue",
+            },
+            "events": [{
+                "title": "Overdue Item",
+                "message": "message",
+                "priority": "high",
+                "entity_type": "loan",
+                "entity_id": USER_ID,
+                "created_at": "2024-01-01T00:00:00",
+            }],
+        }
+
+        notification = NotificationDigestService._build_notification(buffer)
+
+        assert notification.title == "Overdue Item"
+        assert notification.notification_metadata is None
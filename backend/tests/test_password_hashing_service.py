@@ -0,0 +1,96 @@
+"""
+Test Password Hashing Service
+Test the bounded worker pool and async password hashing
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.security import verify_password
+from app.services.password_hashing_service import PasswordHashingService
+from app.services.pool_executor import BoundedPoolExecutor
+
+
+class TestBoundedPoolExecutor:
+    """Test suite for BoundedPoolExecutor"""
+
+    async def test_runs_in_worker_thread(self):
+        """Test that calls run off the event loop thread"""
+        executor = BoundedPoolExecutor("test", max_workers=2, max_queue=2)
+        try:
+            thread_id = await executor.run(threading.get_ident)
+            assert thread_id != threading.get_ident()
+            assert executor.metrics()["completed"] == 1
+        finally:
+            executor.shutdown()
+
+    async def test_rejects_when_queue_full(self):
+        """Test that calls beyond workers + queue are rejected with 503"""
+        executor = BoundedPoolExecutor("test", max_workers=1, max_queue=1)
+        release = threading.Event()
+        try:
+            running = [asyncio.create_task(executor.run(release.wait, 5)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            assert executor.queue_depth == 1
+
+            with pytest.raises(HTTPException) as exc_info:
+                await executor.run(release.wait, 5)
+            assert exc_info.value.status_code == 503
+            assert exc_info.value.headers["Retry-After"] == "1"
+
+            release.set()
+            await asyncio.gather(*running)
+
+            metrics = executor.metrics()
+            assert metrics["rejected"] == 1
+            assert metrics["completed"] == 2
+            assert metrics["in_flight"] == 0
+            assert metrics["max_in_flight"] == 2
+        finally:
+            release.set()
+            executor.shutdown()
+
+    async def test_counts_failures(self):
+        """Test that exceptions propagate and are counted"""
+        executor = BoundedPoolExecutor("test", max_workers=1, max_queue=0)
+        try:
+            with pytest.raises(ZeroDivisionError):
+                await executor.run(divmod, 1, 0)
+            assert executor.metrics()["failed"] == 1
+            assert executor.metrics()["in_flight"] == 0
+        finally:
+            executor.shutdown()
+
+    def test_rejects_unknown_kind(self):
+        """Test that only thread and process pools are supported"""
+        with pytest.raises(ValueError):
+            BoundedPoolExecutor("test", kind="fiber")
+
+
+class TestPasswordHashingService:
+    """Test suite for PasswordHashingService"""
+
+    @pytest.fixture
+    def service(self):
+        service = PasswordHashingService(BoundedPoolExecutor("test", max_workers=2, max_queue=2))
+        yield service
+        service.shutdown()
+
+    async def test_hash_and_verify(self, service):
+        """Test hashing and verifying a password"""
+        hashed = await service.hash("S3cure!Passw0rd")
+        assert verify_password("S3cure!Passw0rd", hashed)
+        assert await service.verify("S3cure!Passw0rd", hashed)
+        assert not await service.verify("wrong", hashed)
+
+    async def test_hash_many_preserves_order(self, service):
+        """Test that a batch larger than the queue is hashed in order"""
+        passwords = [f"Passw0rd!{i}" for i in range(5)]
+        hashes = await service.hash_many(passwords)
+
+        assert len(hashes) == 5
+        assert all(verify_password(p, h) for p, h in zip(passwords, hashes))
+        assert service.metrics()["rejected"] == 0
@@ -0,0 +1,129 @@
+"""
+Test Patron Account Service
+Test summary deltas, fallback rebuilds and the recompute query
+"""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.patron_account_service import PatronAccountService, computed_summaries
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Records executed statements; UPDATEs match `existing` rows only."""
+
+    def __init__(self, existing=True):
+        self.existing = existing
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        if statement.is_update:
+            return FakeResult([("row",)] if self.existing else [])
+        return FakeResult([("row",)])
+
+
+def sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestApplyDelta:
+    """Test incremental summary updates"""
+
+    async def test_only_changed_columns_are_updated(self):
+        db = FakeSession()
+        await PatronAccountService.apply_delta(db, uuid.uuid4(), open_loans=1)
+
+        assert len(db.statements) == 1
+        statement = sql(db.statements[0])
+        assert "open_loans=(patron_account_summaries.open_loans +" in statement
+        assert "open_requests" not in statement.split("WHERE")[0]
+        assert "overdue_loans" not in statement
+
+    async def test_no_delta_executes_nothing(self):
+        db = FakeSession()
+        await PatronAccountService.apply_delta(db, uuid.uuid4())
+        assert db.statements == []
+
+    async def test_payment_closing_fee_refreshes_oldest_fee(self):
+        db = FakeSession()
+        await PatronAccountService.apply_delta(
+            db, uuid.uuid4(),
+            total_owed=Decimal("-2.50"), total_paid=Decimal("2.50"),
+            open_fees=-1, refresh_oldest_fee=True,
+        )
+
+        statement = sql(db.statements[0])
+        assert "total_owed=(patron_account_summaries.total_owed +" in statement
+        assert "total_paid=(patron_account_summaries.total_paid +" in statement
+        assert "oldest_fee_date=(SELECT min(fees.fee_date)" in statement
+
+    async def test_new_fee_keeps_earliest_fee_date(self):
+        db = FakeSession()
+        await PatronAccountService.apply_delta(
+            db, uuid.uuid4(), total_fees=1, open_fees=1,
+            total_owed=Decimal("1.00"), fee_date=datetime(2026, 1, 1),
+        )
+        assert "oldest_fee_date=least(" in sql(db.statements[0])
+
+    async def test_overdue_is_recounted_on_request(self):
+        db = FakeSession()
+        await PatronAccountService.apply_delta(db, uuid.uuid4(), open_loans=-1, refresh_overdue=True)
+        assert "overdue_loans=(SELECT count(*)" in sql(db.statements[0])
+
+    async def test_missing_row_is_rebuilt(self):
+        db = FakeSession(existing=False)
+        await PatronAccountService.apply_delta(db, uuid.uuid4(), open_requests=1)
+
+        assert len(db.statements) == 2
+        rebuild = sql(db.statements[1])
+        assert rebuild.startswith("INSERT INTO patron_account_summaries")
+        assert "ON CONFLICT (user_id) DO UPDATE" in rebuild
+
+
+class TestRebuild:
+    """Test the verifying rebuild"""
+
+    async def test_only_drifted_rows_are_written(self):
+        db = FakeSession()
+        corrected = await PatronAccountService.rebuild(db)
+
+        assert corrected == 1
+        statement = sql(db.statements[0])
+        assert "IS DISTINCT FROM excluded.open_loans" in statement
+        assert "IS DISTINCT FROM excluded.oldest_fee_date" in statement
+        assert "RETURNING patron_account_summaries.user_id" in statement
+
+    def test_recompute_is_scoped_to_users(self):
+        user_id = uuid.uuid4()
+        statement = sql(computed_summaries(datetime(2026, 1, 1), user_ids=[user_id]))
+
+        # Every aggregate and the outer user query are restricted
+        assert statement.count("user_id IN (__[POSTCOMPILE_") == 3
+        assert "WHERE users.id IN (__[POSTCOMPILE_" in statement
+        assert statement.count("GROUP BY") == 3
+
+    def test_recompute_counts_open_fees_only_for_owed(self):
+        statement = sql(computed_summaries(datetime(2026, 1, 1)))
+        assert "sum(fees.remaining) FILTER (WHERE fees.status = " in statement
+        assert "sum(fees.paid_amount)" in statement
+        assert "LEFT OUTER JOIN" in statement
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,106 @@
+"""
+Test Patron Block Service
+Test block evaluation against patron counters and patron group limits
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.patron_block_service import NO_LIMITS, evaluate_blocks, group_limits
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+GROUP = uuid.uuid4()
+
+
+def make_user(active=True, expiration_date=None):
+    return SimpleNamespace(active=active, expiration_date=expiration_date, patron_group_id=GROUP)
+
+
+def make_summary(open_loans=0, overdue_loans=0, total_owed="0.00"):
+    return SimpleNamespace(open_loans=open_loans, overdue_loans=overdue_loans, total_owed=Decimal(total_owed))
+
+
+def limits(max_loans=None, max_overdue_loans=None, max_outstanding_fee_balance=None):
+    return {
+        "max_loans": max_loans,
+        "max_overdue_loans": max_overdue_loans,
+        "max_outstanding_fee_balance": max_outstanding_fee_balance,
+    }
+
+
+def codes(blocks):
+    return [block["code"] for block in blocks]
+
+
+class TestEvaluateBlocks:
+    """Test block evaluation"""
+
+    def test_no_limits_no_blocks(self):
+        assert evaluate_blocks(make_user(), make_summary(50, 10, "999.00"), NO_LIMITS, NOW) == []
+
+    def test_inactive_user(self):
+        assert codes(evaluate_blocks(make_user(active=False), make_summary(), NO_LIMITS, NOW)) == ["inactive"]
+
+    def test_expired_user(self):
+        user = make_user(expiration_date=NOW - timedelta(days=1))
+        assert codes(evaluate_blocks(user, make_summary(), NO_LIMITS, NOW)) == ["expired"]
+
+    def test_naive_expiration_is_treated_as_utc(self):
+        user = make_user(expiration_date=(NOW + timedelta(hours=1)).replace(tzinfo=None))
+        assert evaluate_blocks(user, make_summary(), NO_LIMITS, NOW) == []
+
+    def test_loan_limit_blocks_at_limit(self):
+        assert evaluate_blocks(make_user(), make_summary(open_loans=4), limits(max_loans=5), NOW) == []
+        blocks = evaluate_blocks(make_user(), make_summary(open_loans=5), limits(max_loans=5), NOW)
+        assert codes(blocks) == ["max_loans"]
+
+    def test_overdue_limit_blocks_when_exceeded(self):
+        assert evaluate_blocks(make_user(), make_summary(overdue_loans=2), limits(max_overdue_loans=2), NOW) == []
+        blocks = evaluate_blocks(make_user(), make_summary(overdue_loans=3), limits(max_overdue_loans=2), NOW)
+        assert codes(blocks) == ["max_overdue_loans"]
+
+    def test_zero_overdue_limit(self):
+        blocks = evaluate_blocks(make_user(), make_summary(overdue_loans=1), limits(max_overdue_loans=0), NOW)
+        assert codes(blocks) == ["max_overdue_loans"]
+
+    def test_balance_limit_blocks_when_exceeded(self):
+        limit = limits(max_outstanding_fee_balance=Decimal("10.00"))
+        assert evaluate_blocks(make_user(), make_summary(total_owed="10.00"), limit, NOW) == []
+        blocks = evaluate_blocks(make_user(), make_summary(total_owed="10.01"), limit, NOW)
+        assert codes(blocks) == ["max_outstanding_fee_balance"]
+
+    def test_all_blocks_are_reported(self):
+        user = make_user(active=False, expiration_date=NOW)
+        blocks = evaluate_blocks(
+            user,
+            make_summary(open_loans=3, overdue_loans=3, total_owed="20.00"),
+            limits(max_loans=3, max_overdue_loans=1, max_outstanding_fee_balance=Decimal("5")),
+            NOW,
+        )
+        assert codes(blocks) == [
+            "inactive", "expired", "max_loans", "max_overdue_loans", "max_outstanding_fee_balance"
+        ]
+
+    def test_missing_summary_only_checks_account(self):
+        assert evaluate_blocks(make_user(), None, limits(max_loans=0), NOW) == []
+
+
+class TestGroupLimits:
+    """Test limit lookup in the compiled circulation rules table"""
+
+    def test_known_group(self):
+        table = {"patron_groups": {str(GROUP): {"limits": limits(max_loans=5)}}}
+        assert group_limits(table, GROUP)["max_loans"] == 5
+
+    def test_unknown_or_missing_group(self):
+        table = {"patron_groups": {}}
+        assert group_limits(table, GROUP) == NO_LIMITS
+        assert group_limits(table, None) == NO_LIMITS
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
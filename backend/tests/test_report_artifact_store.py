@@ -0,0 +1,86 @@
+"""
+Test Report Artifact Store
+Test cache keys, atomic artifact writes and purging
+"""
+
+import os
+import time
+import uuid
+
+import pytest
+
+from app.services.report_artifact_store import ReportArtifactStore, report_cache_key
+
+TENANT = uuid.uuid4()
+PARAMETERS = {"filters": {"limit": 1000, "offset": 0}, "include_fines": True}
+
+
+class TestReportCacheKey:
+    """Test artifact addressing"""
+
+    def test_key_ignores_parameter_order(self):
+        reordered = {"include_fines": True, "filters": {"offset": 0, "limit": 1000}}
+
+        assert report_cache_key(TENANT, "overdue", PARAMETERS, "csv", "w1") == \
+            report_cache_key(TENANT, "overdue", reordered, "csv", "w1")
+
+    def test_every_input_changes_the_key(self):
+        key = report_cache_key(TENANT, "overdue", PARAMETERS, "csv", "w1")
+
+        assert key != report_cache_key(uuid.uuid4(), "overdue", PARAMETERS, "csv", "w1")
+        assert key != report_cache_key(TENANT, "circulation", PARAMETERS, "csv", "w1")
+        assert key != report_cache_key(TENANT, "overdue", {**PARAMETERS, "include_fines": False}, "csv", "w1")
+        assert key != report_cache_key(TENANT, "overdue", PARAMETERS, "pdf", "w1")
+        assert key != report_cache_key(TENANT, "overdue", PARAMETERS, "csv", "w2")
+
+
+class TestReportArtifactStore:
+    """Test artifact storage"""
+
+    def test_put_then_get(self, tmp_path):
+        store = ReportArtifactStore(str(tmp_path))
+        key = "ab" + "0" * 62
+
+        assert store.get(key, "csv") is None
+        path = store.put(key, "csv", b"a,b\n1,2\n")
+
+        assert store.get(key, "csv") == path
+        assert path.parent.name == "ab"
+        assert path.read_bytes() == b"a,b\n1,2\n"
+
+    def test_put_leaves_no_partial_files(self, tmp_path):
+        store = ReportArtifactStore(str(tmp_path))
+        key = "cd" + "0" * 62
+
+        store.put(key, "pdf", b"first")
+        store.put(key, "pdf", b"second")
+
+        assert [path.name for path in (tmp_path / "cd").iterdir()] == [f"{key}.pdf"]
+        assert store.get(key, "pdf").read_bytes() == b"second"
+
+    def test_reserved_path_appears_on_success_only(self, tmp_path):
+        store = ReportArtifactStore(str(tmp_path))
+        key = "ef" + "0" * 62
+
+        with pytest.raises(RuntimeError):
+            with store.reserve(key, "pdf") as path:
+                path.write_bytes(b"partial")
+                raise RuntimeError("render failed")
+        assert list((tmp_path / "ef").iterdir()) == []
+
+        with store.reserve(key, "pdf") as path:
+            path.write_bytes(b"done")
+        assert store.get(key, "pdf").read_bytes() == b"done"
+
+    def test_purge_removes_only_old_artifacts(self, tmp_path):
+        store = ReportArtifactStore(str(tmp_path))
+        old = store.put("aa" + "0" * 62, "csv", b"old")
+        fresh = store.put("bb" + "0" * 62, "csv", b"fresh")
+        week_ago = time.time() - 8 * 86400
+        os.utime(old, (week_ago, week_ago))
+
+        assert store.purge(max_age_days=7) == 1
+        assert not old.exists() and fresh.exists()
+
+    def test_purge_without_directory(self, tmp_path):
+        assert ReportArtifactStore(str(tmp_path / "missing")).purge() == 0
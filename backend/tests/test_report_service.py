@@ -0,0 +1,746 @@
+"""
+Test Report Service
+Test report request parsing, watermarks, cached generation, streamed and paged exports
+"""
+
+import io
+import json
+import math
+import re
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.models.inventory import InstanceType
+from app.schemas.report import ExportFormat, ReportData, ReportType
+from app.services import export_executor, report_service
+from app.services.export_service import (
+    FlowableStream,
+    build_pdf,
+    get_export_service,
+    pdf_document,
+    pdf_rows_per_page,
+    write_columnar,
+    write_csv,
+    write_excel,
+    write_export,
+)
+from app.services.export_executor import ExportExecutor
+from app.services.pool_executor import BoundedPoolExecutor
+from app.services.report_artifact_store import ReportArtifactStore
+from app.services.report_service import (
+    ReportService,
+    normalized_parameters,
+    parse_report_request,
+    render_report,
+)
+
+TENANT = uuid.uuid4()
+
+
+def compiled(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class FakeResult:
+    def __init__(self, row):
+        self.row = row
+
+    def one(self):
+        return self.row
+
+
+class FakeSession:
+    """Answers every watermark query with the same (latest, deletes) row."""
+
+    def __init__(self, row):
+        self.row = row
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.row)
+
+
+@pytest.fixture(autouse=True)
+def export_pool(monkeypatch):
+    """Render exports on a thread, so tests do not spawn processes."""
+    executor = ExportExecutor(BoundedPoolExecutor("export", kind="thread", max_workers=1))
+    monkeypatch.setattr(export_executor, "_export_executor", executor)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ReportArtifactStore(str(tmp_path))
+    monkeypatch.setattr(report_service, "get_report_artifact_store", lambda: store)
+    return store
+
+
+def loan_records():
+    """Typed circulation rows."""
+    for number in range(5):
+        yield {
+            "loan_id": str(number),
+            "user": "jdoe",
+            "item_title": "Dune",
+            "checkout_date": datetime(2026, 10, 1, tzinfo=timezone.utc),
+            "due_date": datetime(2026, 10, 15, tzinfo=timezone.utc),
+            "return_date": None,
+            "status": "open",
+            "renewal_count": number,
+        }
+
+
+async def loan_rows(db, tenant_id, request):
+    """Typed circulation rows, as streamed from the cursor."""
+    for row in loan_records():
+        yield row
+
+
+async def fund_rows(db, tenant_id, request):
+    """Typed financial rows."""
+    for allocated in (Decimal("100.00"), Decimal("50.50")):
+        yield {
+            "fund_id": "f",
+            "fund_name": "Books",
+            "fund_code": "BK",
+            "status": "active",
+            "allocated_amount": allocated,
+            "expended_amount": Decimal("0.00"),
+            "available_amount": allocated,
+            "description": None,
+        }
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Serve circulation rows from loan_rows, counting the reads."""
+    calls = []
+
+    async def rows(db, tenant_id, request):
+        calls.append(request)
+        async for row in loan_rows(db, tenant_id, request):
+            yield row
+
+    report = report_service.REPORTS[ReportType.CIRCULATION]
+    monkeypatch.setitem(report_service.REPORTS, ReportType.CIRCULATION, report._replace(rows=rows))
+    return calls
+
+
+
+class TestParseReportRequest:
+    """Test report parameter validation"""
+
+    def test_defaults_are_filled_in(self):
+        request = parse_report_request(ReportType.OVERDUE, {"export_format": "json"})
+
+        parameters = normalized_parameters(request)
+        assert parameters["min_days_overdue"] == 1
+        assert parameters["filters"]["limit"] == 1000
+        assert "export_format" not in parameters and "report_type" not in parameters
+
+    def test_equivalent_requests_normalize_alike(self):
+        explicit = parse_report_request(ReportType.OVERDUE, {"min_days_overdue": 1, "include_fines": True})
+
+        assert normalized_parameters(explicit) == normalized_parameters(parse_report_request(ReportType.OVERDUE, {}))
+
+    def test_unavailable_report_type(self):
+        with pytest.raises(ValueError):
+            parse_report_request(ReportType.HOLDS, {})
+
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            parse_report_request(ReportType.OVERDUE, {"min_days_overdue": 0})
+
+
+class TestRenderReport:
+    """Test artifact rendering"""
+
+    def test_json(self):
+        report = ReportData(
+            report_type=ReportType.COLLECTION,
+            title="Collection Report",
+            generated_at=datetime(2026, 10, 19),
+            filters_applied={},
+            total_records=0,
+            data=[],
+        )
+
+        assert json.loads(render_report(report, ExportFormat.JSON))["title"] == "Collection Report"
+
+
+class TestBuildReport:
+    """Test in-memory report data"""
+
+    async def test_rows_are_displayed_and_summarized(self, monkeypatch):
+        report = report_service.REPORTS[ReportType.FINANCIAL]
+        monkeypatch.setitem(report_service.REPORTS, ReportType.FINANCIAL, report._replace(rows=fund_rows))
+
+        data = await report_service.build_report(None, TENANT, parse_report_request(ReportType.FINANCIAL, {}))
+
+        assert data.title == "Financial Report" and data.total_records == 2
+        assert data.data[1]["allocated_amount"] == 50.5
+        assert data.summary["total_allocated"] == 150.5
+
+    async def test_description_uses_request(self, monkeypatch):
+        async def no_rows(db, tenant_id, request):
+            return
+            yield
+
+        report = report_service.REPORTS[ReportType.OVERDUE]
+        monkeypatch.setitem(report_service.REPORTS, ReportType.OVERDUE, report._replace(rows=no_rows))
+
+        data = await report_service.build_report(None, TENANT, parse_report_request(ReportType.OVERDUE, {"min_days_overdue": 7}))
+
+        assert data.description == "Report of items overdue by at least 7 day(s)"
+        assert data.summary == {"total_overdue_items": 0, "total_fines": 0.0, "average_days_overdue": 0}
+
+
+class QueuedResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class QueuedSession:
+    """Answers queries with queued results, in order."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return QueuedResult(self.results.pop(0))
+
+    async def scalar(self, statement):
+        self.statements.append(statement)
+        return self.results.pop(0)
+
+
+class TestCollectionStatistics:
+    """Test SQL collection summaries"""
+
+    def test_breakdowns_use_grouping_sets(self):
+        sql = compiled(report_service.collection_breakdown_query([], ["type", "language"]))
+
+        assert "GROUP BY GROUPING SETS(anon_1.type, anon_1.language, ())" in sql
+        assert "grouping(anon_1.type)" in sql
+        assert "instances.languages ->>" in sql
+
+    def test_subjects_are_unnested(self):
+        sql = compiled(report_service.collection_subject_query([]))
+
+        assert "json_array_elements_text(CASE WHEN (json_typeof(instances.subjects)" in sql
+        assert "ORDER BY count(*) DESC" in sql
+
+    async def test_summary_covers_the_filtered_set(self):
+        db = QueuedSession(
+            [
+                (0, 1, InstanceType.TEXT, None, 1200),
+                (0, 1, None, None, 5),
+                (1, 0, None, "eng", 1100),
+                (1, 0, None, None, 105),
+                (1, 1, None, None, 1205),
+            ],
+            [("History", 40), ("Science", 12)],
+        )
+        request = parse_report_request(ReportType.COLLECTION, {"filters": {"limit": 10}})
+
+        summary = await report_service.collection_statistics(db, TENANT, request)
+
+        assert summary == {
+            "total_instances": 1205,
+            "by_type": {"text": 1200, "Unknown": 5},
+            "by_language": {"eng": 1100, "Unknown": 105},
+            "by_subject": {"History": 40, "Science": 12},
+        }
+        assert "LIMIT" not in compiled(db.statements[0])
+
+    async def test_group_by_subject_only(self):
+        db = QueuedSession(1205, [("History", 40)])
+        request = parse_report_request(ReportType.COLLECTION, {"group_by": "subject"})
+
+        summary = await report_service.collection_statistics(db, TENANT, request)
+
+        assert summary == {"total_instances": 1205, "by_subject": {"History": 40}}
+        assert len(db.statements) == 2
+
+    def test_unknown_group_by(self):
+        with pytest.raises(ValueError):
+            parse_report_request(ReportType.COLLECTION, {"group_by": "publisher"})
+
+    async def test_summary_without_detail_rows(self):
+        db = QueuedSession([(0, None, 3), (1, None, 3)])
+        request = parse_report_request(ReportType.COLLECTION, {"group_by": "type", "include_details": False})
+
+        data = await report_service.build_report(db, TENANT, request)
+
+        assert data.data == [] and data.total_records == 0
+        assert data.summary == {"total_instances": 3, "by_type": {"Unknown": 3}}
+        assert len(db.statements) == 1
+
+
+class TestDataWatermark:
+    """Test data watermarks"""
+
+    async def test_changes_with_the_data(self):
+        latest = datetime(2026, 10, 19, 8, tzinfo=timezone.utc)
+        later = datetime(2026, 10, 19, 9, tzinfo=timezone.utc)
+
+        first = await ReportService.data_watermark(FakeSession((latest, latest, 10)), TENANT, ReportType.CIRCULATION)
+        again = await ReportService.data_watermark(FakeSession((latest, latest, 10)), TENANT, ReportType.CIRCULATION)
+        updated = await ReportService.data_watermark(FakeSession((latest, later, 10)), TENANT, ReportType.CIRCULATION)
+        deleted = await ReportService.data_watermark(FakeSession((latest, latest, 11)), TENANT, ReportType.CIRCULATION)
+
+        assert first == again
+        assert len({first, updated, deleted}) == 3
+
+    async def test_one_statement_over_every_joined_table(self):
+        db = FakeSession((None, 0))
+
+        await ReportService.data_watermark(db, TENANT, ReportType.OVERDUE)
+
+        assert len(db.statements) == 1
+        sql = compiled(db.statements[0])
+        tables = re.findall(r"max\((\w+)\.updated_date\)", sql)
+        assert tables == ["loans", "users", "items", "holdings", "instances", "fee_policies"]
+        assert "count(" not in sql
+        assert "pg_stat_user_tables.n_tup_del" in sql
+
+    async def test_overdue_includes_the_date(self):
+        watermark = await ReportService.data_watermark(FakeSession((None, 0)), TENANT, ReportType.OVERDUE)
+
+        assert watermark.endswith(datetime.now(timezone.utc).date().isoformat())
+
+
+class TestGenerate:
+    """Test cached generation"""
+
+    async def test_identical_request_is_served_from_cache(self, store, builds):
+        db = FakeSession((datetime(2026, 10, 19, tzinfo=timezone.utc), 3))
+        request = parse_report_request(ReportType.CIRCULATION, {"export_format": "json"})
+
+        first = await ReportService.generate(db, TENANT, request)
+        second = await ReportService.generate(db, TENANT, request)
+
+        assert len(builds) == 1
+        assert first["cached"] is False and second["cached"] is True
+        assert first["artifact"] == second["artifact"]
+        assert store.get(first["artifact"], "json") is not None
+
+    async def test_parameter_change_recomputes(self, store, builds):
+        db = FakeSession((datetime(2026, 10, 19, tzinfo=timezone.utc), 3))
+
+        await ReportService.generate(db, TENANT, parse_report_request(ReportType.CIRCULATION, {"export_format": "json"}))
+        result = await ReportService.generate(db, TENANT, parse_report_request(
+            ReportType.CIRCULATION, {"export_format": "json", "filters": {"limit": 50}}
+        ))
+
+        assert len(builds) == 2
+        assert result["cached"] is False
+
+    async def test_data_change_recomputes(self, store, builds):
+        request = parse_report_request(ReportType.CIRCULATION, {"export_format": "json"})
+
+        await ReportService.generate(FakeSession((datetime(2026, 10, 19, tzinfo=timezone.utc), 3)), TENANT, request)
+        await ReportService.generate(FakeSession((datetime(2026, 10, 19, tzinfo=timezone.utc), 4)), TENANT, request)
+
+        assert len(builds) == 2
+
+
+class FakeEmailService:
+    def __init__(self):
+        self.sent = []
+
+    async def send_scheduled_report(self, **email):
+        self.sent.append(email)
+        return True
+
+
+class ScheduleSession:
+    """Serves one report schedule by id."""
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+
+    async def get(self, model, key):
+        return self.schedule if key == self.schedule.id else None
+
+
+class TestDeliverScheduled:
+    """Test emailing scheduled report artifacts"""
+
+    @pytest.fixture
+    def emails(self, monkeypatch):
+        email_service = FakeEmailService()
+        monkeypatch.setattr(report_service, "get_email_service", lambda: email_service)
+        return email_service.sent
+
+    def job(self, store, schedule):
+        store.put("key", "csv", b"loan_id\n1\n")
+        return SimpleNamespace(
+            id=uuid.uuid4(),
+            parameters={"schedule_id": str(schedule.id)},
+            result={"artifact": "key", "extension": "csv", "media_type": "text/csv", "filename": "loans.csv"},
+            finished_at=datetime(2026, 10, 19, 3, tzinfo=timezone.utc),
+        )
+
+    async def test_every_recipient_gets_the_artifact(self, store, emails):
+        schedule = SimpleNamespace(id=uuid.uuid4(), name="Daily loans", recipients=["a@example.org", "b@example.org"])
+
+        sent = await ReportService.deliver_scheduled(ScheduleSession(schedule), self.job(store, schedule))
+
+        assert sent == 2
+        assert [email["to_email"] for email in emails] == schedule.recipients
+        assert emails[0]["content"] == b"loan_id\n1\n" and emails[0]["filename"] == "loans.csv"
+
+    async def test_large_artifact_is_not_attached(self, store, emails, monkeypatch):
+        monkeypatch.setattr(report_service.settings, "REPORT_EMAIL_MAX_ATTACHMENT_MB", 0)
+        schedule = SimpleNamespace(id=uuid.uuid4(), name="Daily loans", recipients=["a@example.org"])
+
+        await ReportService.deliver_scheduled(ScheduleSession(schedule), self.job(store, schedule))
+
+        assert emails[0]["content"] is None
+
+    async def test_unscheduled_job_is_not_emailed(self, store, emails):
+        schedule = SimpleNamespace(id=uuid.uuid4(), name="Daily loans", recipients=["a@example.org"])
+        job = self.job(store, schedule)
+        job.parameters = {}
+
+        assert await ReportService.deliver_scheduled(ScheduleSession(schedule), job) == 0
+        assert emails == []
+
+
+class TestColumnarExport:
+    """Test Parquet and Arrow exports"""
+
+    @staticmethod
+    def rows(count):
+        for number in range(count):
+            yield {
+                "due_date": datetime(2026, 10, 1, tzinfo=timezone.utc),
+                "fine_amount": Decimal("1.25") * number,
+                "days_overdue": number,
+            }
+
+    COLUMNS = [("due_date", "timestamp"), ("fine_amount", "money"), ("days_overdue", "int")]
+
+    def test_parquet_row_groups_and_types(self):
+        pq = pytest.importorskip("pyarrow.parquet")
+        sink = io.BytesIO()
+
+        written = write_columnar(self.rows(5), self.COLUMNS, sink, ExportFormat.PARQUET, row_group_size=2)
+
+        parquet = pq.ParquetFile(io.BytesIO(sink.getvalue()))
+        assert written == 5
+        assert parquet.metadata.num_row_groups == 3
+        assert str(parquet.schema_arrow.field("fine_amount").type) == "decimal128(18, 2)"
+        assert str(parquet.schema_arrow.field("due_date").type) == "timestamp[us, tz=UTC]"
+        assert parquet.read().column("fine_amount").to_pylist()[4] == Decimal("5.00")
+
+    def test_arrow_ipc(self):
+        pa = pytest.importorskip("pyarrow")
+        sink = io.BytesIO()
+
+        write_columnar(self.rows(3), self.COLUMNS, sink, ExportFormat.ARROW, row_group_size=2)
+
+        table = pa.ipc.open_file(io.BytesIO(sink.getvalue())).read_all()
+        assert table.num_rows == 3
+        assert table.column("days_overdue").type == pa.int64()
+
+    def test_empty_export_keeps_schema(self):
+        pq = pytest.importorskip("pyarrow.parquet")
+        sink = io.BytesIO()
+
+        assert write_columnar(self.rows(0), self.COLUMNS, sink, ExportFormat.PARQUET) == 0
+        assert pq.read_table(io.BytesIO(sink.getvalue())).schema.names == ["due_date", "fine_amount", "days_overdue"]
+
+    def test_export_report_infers_types(self):
+        pq = pytest.importorskip("pyarrow.parquet")
+        report = ReportData(
+            report_type=ReportType.COLLECTION,
+            title="Collection Report",
+            generated_at=datetime(2026, 10, 19),
+            filters_applied={},
+            total_records=1,
+            data=[{"title": "Dune", "copies": 3}],
+        )
+
+        content = get_export_service().export_report(report, ExportFormat.PARQUET)
+
+        assert pq.read_table(io.BytesIO(content)).to_pylist() == [{"title": "Dune", "copies": 3}]
+
+    async def test_generate_streams_typed_rows(self, store, monkeypatch):
+        pq = pytest.importorskip("pyarrow.parquet")
+        report = report_service.REPORTS[ReportType.CIRCULATION]
+        monkeypatch.setitem(report_service.REPORTS, ReportType.CIRCULATION, report._replace(rows=loan_rows))
+        db = FakeSession((datetime(2026, 10, 19, tzinfo=timezone.utc), 5))
+        request = parse_report_request(ReportType.CIRCULATION, {"export_format": "parquet"})
+
+        result = await ReportService.generate(db, TENANT, request)
+
+        table = pq.read_table(store.get(result["artifact"], "parquet"))
+        assert result["records"] == 5 and result["filename"].endswith(".parquet")
+        assert table.schema.names == [name for name, _ in report_service.CIRCULATION_COLUMNS]
+        assert str(table.schema.field("checkout_date").type) == "timestamp[us, tz=UTC]"
+
+
+class TestExcelExport:
+    """Test streamed XLSX exports"""
+
+    COLUMNS = [name for name, _ in report_service.CIRCULATION_COLUMNS]
+
+    def test_rows_and_summary_sheet(self, monkeypatch):
+        openpyxl = pytest.importorskip("openpyxl")
+        monkeypatch.setattr("app.services.export_service.EXCEL_WIDTH_SAMPLE_ROWS", 2)
+        sink = io.BytesIO()
+
+        written = write_excel(
+            loan_records(), self.COLUMNS, sink, "Circulation Report", summary=lambda: {"total": 5}
+        )
+
+        workbook = openpyxl.load_workbook(io.BytesIO(sink.getvalue()))
+        sheet = workbook["Circulation Report"]
+        rows = list(sheet.iter_rows(values_only=True))
+        assert written == 5
+        assert rows[0] == tuple(self.COLUMNS)
+        assert [row[-1] for row in rows[1:]] == [0, 1, 2, 3, 4]
+        assert rows[1][3] == datetime(2026, 10, 1)
+        assert list(workbook["Summary"].iter_rows(values_only=True)) == [("total",), (5,)]
+
+    def test_widths_come_from_the_sample(self, monkeypatch):
+        openpyxl = pytest.importorskip("openpyxl")
+        monkeypatch.setattr("app.services.export_service.EXCEL_WIDTH_SAMPLE_ROWS", 1)
+
+        rows = [{"title": "Dune"}, {"title": "x" * 200}]
+
+        sink = io.BytesIO()
+        write_excel(rows, ["title"], sink)
+
+        sheet = openpyxl.load_workbook(io.BytesIO(sink.getvalue())).active
+        assert sheet.max_row == 3
+        assert 7 <= sheet.column_dimensions["A"].width < 10
+
+    def test_empty_export_has_header(self):
+        openpyxl = pytest.importorskip("openpyxl")
+        sink = io.BytesIO()
+
+        assert write_excel([], ["a", "b"], sink) == 0
+        assert list(openpyxl.load_workbook(io.BytesIO(sink.getvalue())).active.iter_rows(values_only=True)) == [("a", "b")]
+
+    def test_export_to_excel(self):
+        openpyxl = pytest.importorskip("openpyxl")
+
+        content = get_export_service().export_to_excel(
+            [{"title": "Dune", "subjects": ["sf"]}], summary={"by_type": {"text": 1}}
+        )
+
+        workbook = openpyxl.load_workbook(io.BytesIO(content))
+        assert list(workbook["Report"].iter_rows(values_only=True)) == [("title", "subjects"), ("Dune", "['sf']")]
+        assert list(workbook["Summary"].iter_rows(values_only=True))[1] == ("{'text': 1}",)
+
+    async def test_generate_streams_with_summary(self, store, monkeypatch):
+        openpyxl = pytest.importorskip("openpyxl")
+        report = report_service.REPORTS[ReportType.FINANCIAL]
+        monkeypatch.setitem(report_service.REPORTS, ReportType.FINANCIAL, report._replace(rows=fund_rows))
+        db = FakeSession((datetime(2026, 10, 19, tzinfo=timezone.utc), 2))
+        request = parse_report_request(ReportType.FINANCIAL, {"export_format": "excel"})
+
+        result = await ReportService.generate(db, TENANT, request)
+
+        workbook = openpyxl.load_workbook(store.get(result["artifact"], "xlsx"))
+        assert result["records"] == 2
+        assert workbook.sheetnames == ["Financial Report", "Summary"]
+        assert list(workbook["Summary"].iter_rows(values_only=True))[1][0] == 150.5
+
+
+def pdf_pages(content: bytes) -> int:
+    return len(re.findall(rb"/Type /Page\b(?!s)", content))
+
+
+class TestPdfExport:
+    """Test paged PDF exports"""
+
+    COLUMNS = [name for name, _ in report_service.CIRCULATION_COLUMNS]
+    META = {
+        "title": "Circulation Report",
+        "description": "All loans",
+        "report_type": "circulation",
+        "generated_at": datetime(2026, 10, 19),
+    }
+
+    def test_one_table_per_page(self):
+        per_page = pdf_rows_per_page(pdf_document(io.BytesIO(), len(self.COLUMNS)))
+        rows = ([str(number)] * len(self.COLUMNS) for number in range(per_page * 2 + 1))
+        sink = io.BytesIO()
+
+        pages = build_pdf(sink, {**self.META, "total_records": per_page * 2 + 1, "summary": None, "columns": self.COLUMNS}, rows)
+
+        # First page, two full pages and one page with the last row
+        assert pages == 4
+        assert pdf_pages(sink.getvalue()) == 4
+
+    def test_flowables_are_produced_lazily(self):
+        produced = []
+
+        def flowables():
+            for number in range(100):
+                produced.append(number)
+                yield number
+
+        stream = FlowableStream(flowables())
+        assert len(produced) == 2
+
+        del stream[0]
+        assert len(stream) == 2 and len(produced) == 3
+
+    def test_export_to_pdf_prints_every_record(self):
+        report = ReportData(
+            report_type=ReportType.CIRCULATION,
+            title="Circulation Report",
+            generated_at=datetime(2026, 10, 19),
+            filters_applied={},
+            total_records=250,
+            data=[{"loan_id": str(number), "user": "jdoe"} for number in range(250)],
+            summary={"total": 250},
+        )
+
+        content = get_export_service().export_to_pdf(report)
+
+        per_page = pdf_rows_per_page(pdf_document(io.BytesIO(), 2))
+        assert pdf_pages(content) == 1 + math.ceil(250 / per_page)
+
+    async def test_generate_renders_in_the_pool(self, store, export_pool, monkeypatch):
+        report = report_service.REPORTS[ReportType.FINANCIAL]
+        monkeypatch.setitem(report_service.REPORTS, ReportType.FINANCIAL, report._replace(rows=fund_rows))
+        db = FakeSession((datetime(2026, 10, 19, tzinfo=timezone.utc), 2))
+        request = parse_report_request(ReportType.FINANCIAL, {"export_format": "pdf"})
+
+        result = await ReportService.generate(db, TENANT, request)
+
+        assert result["records"] == 2 and result["filename"].endswith(".pdf")
+        assert store.get(result["artifact"], "pdf").read_bytes().startswith(b"%PDF")
+        assert export_pool.metrics()["renders"]["pdf"]["count"] == 1
+
+
+class TestPooledExport:
+    """Test spooled exports rendered in the export pool"""
+
+    META = {
+        "title": "Circulation Report",
+        "description": "All loans",
+        "report_type": "circulation",
+        "generated_at": datetime(2026, 10, 19),
+    }
+
+    @pytest.mark.parametrize("export_format", ["csv", "excel", "pdf", "parquet", "arrow"])
+    async def test_every_format_renders_from_the_spool(self, tmp_path, export_pool, export_format):
+        if export_format in ("parquet", "arrow"):
+            pytest.importorskip("pyarrow")
+        path = tmp_path / f"report.{export_format}"
+
+        written = await write_export(
+            loan_rows(None, TENANT, None),
+            report_service.CIRCULATION_COLUMNS,
+            path,
+            ExportFormat(export_format),
+            self.META,
+            summary=lambda: {"total": 5},
+        )
+
+        assert written == 5
+        assert path.stat().st_size > 0
+        # The spool file is gone once the render completes
+        assert [entry.name for entry in tmp_path.iterdir()] == [path.name]
+        assert export_pool.metrics()["renders"][export_format]["count"] == 1
+
+    async def test_csv_rows(self, tmp_path):
+        path = tmp_path / "report.csv"
+
+        await write_export(
+            fund_rows(None, TENANT, None), report_service.FINANCIAL_COLUMNS, path, ExportFormat.CSV, self.META
+        )
+
+        lines = path.read_text().splitlines()
+        assert lines[0] == ",".join(name for name, _ in report_service.FINANCIAL_COLUMNS)
+        assert lines[2].startswith("f,Books,BK,active,50.50,0.00,50.50")
+
+    def test_write_csv_formats_dates(self):
+        sink = io.BytesIO()
+
+        assert write_csv(loan_records(), ["loan_id", "due_date", "return_date"], sink) == 5
+        assert sink.getvalue().decode().splitlines()[1] == "0,2026-10-15T00:00:00+00:00,"
+
+    async def test_render_failure_leaves_no_spool(self, tmp_path):
+        async def broken_rows():
+            yield {"loan_id": "1"}
+            raise RuntimeError("cursor lost")
+
+        with pytest.raises(RuntimeError):
+            await write_export(broken_rows(), [("loan_id", "string")], tmp_path / "report.csv", ExportFormat.CSV, self.META)
+
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestExportExecutor:
+    """Test export pool metrics"""
+
+    async def test_render_times_per_format(self, export_pool):
+        assert await export_pool.render("csv", sum, [1, 2]) == 3
+        await export_pool.render("csv", sum, [3])
+
+        metrics = export_pool.metrics()
+        assert metrics["name"] == "export" and metrics["completed"] == 2
+        assert metrics["renders"]["csv"]["count"] == 2
+        assert metrics["queue_depth"] == 0
+
+    async def test_saturated_pool_rejects(self):
+        executor = ExportExecutor(BoundedPoolExecutor("export", kind="thread", max_workers=1, max_queue=0))
+        executor.pool._in_flight = 1
+
+        with pytest.raises(HTTPException) as error:
+            await executor.render("pdf", sum, [1])
+
+        assert error.value.status_code == 503
+        assert executor.metrics()["rejected"] == 1
+
+    async def test_endpoint_passes_rejection_through(self, monkeypatch):
+        from app.api.v1 import reports
+
+        async def saturated(db, tenant_id, request):
+            raise HTTPException(status_code=503, detail="Export pool is busy", headers={"Retry-After": "5"})
+
+        monkeypatch.setattr(reports, "report_file_response", saturated)
+        request = parse_report_request(ReportType.CIRCULATION, {"export_format": "pdf"})
+
+        with pytest.raises(HTTPException) as error:
+            await reports.generate_circulation_report(request, db=None, current_user=SimpleNamespace(tenant_id=TENANT))
+
+        assert error.value.status_code == 503
+        assert error.value.headers == {"Retry-After": "5"}
+
+
+class TestNextRunAfter:
+    """Test cron schedule evaluation"""
+
+    def test_next_occurrence(self):
+        pytest.importorskip("croniter")
+
+        after = datetime(2026, 10, 19, 10, tzinfo=timezone.utc)
+        assert report_service.next_run_after("0 9 * * *", after) == datetime(2026, 10, 20, 9, tzinfo=timezone.utc)
+
+    def test_invalid_expression(self):
+        pytest.importorskip("croniter")
+
+        with pytest.raises(ValueError):
+            report_service.next_run_after("not a cron", datetime.now(timezone.utc))
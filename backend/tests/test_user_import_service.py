@@ -0,0 +1,334 @@
+"""
+Test User Import Service
+Test upload parsing, row validation and classification against existing users
+"""
+
+import json
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.schemas.user import UserCreate
+from app.services.user_import_service import (
+    UserImportService,
+    classify,
+    count_records,
+    csv_record_to_user,
+    detect_format,
+    find_existing_users,
+    iter_records,
+)
+
+TENANT = uuid.uuid4()
+OTHER_TENANT = uuid.uuid4()
+GROUP = uuid.uuid4()
+PASSWORD = "Str0ng!Pass"
+
+
+def make_record(username="jdoe", email="jdoe@example.org", barcode="B1", **extra):
+    return {
+        "username": username,
+        "email": email,
+        "barcode": barcode,
+        "password": PASSWORD,
+        "personal": {"firstName": "Jane", "lastName": "Doe", "email": email},
+        **extra,
+    }
+
+
+def make_context(on_existing="skip"):
+    return {
+        "tenant_id": TENANT,
+        "created_by": uuid.uuid4(),
+        "on_existing": on_existing,
+        "group_ids": {GROUP: GROUP},
+        "group_names": {"undergraduate": GROUP},
+        "role_ids": set(),
+        "seen": {"username": set(), "email": set(), "barcode": set()},
+    }
+
+
+def no_existing():
+    return {"username": {}, "email": {}, "barcode": {}}
+
+
+class FakeResult:
+    def all(self):
+        return []
+
+
+class FakeSession:
+    """Records executed statements."""
+
+    def __init__(self):
+        self.statements = []
+        self.added = []
+        self.commits = 0
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return FakeResult()
+
+    def add(self, instance):
+        self.added.append(instance)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def compiled(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestDetectFormat:
+    """Test upload format detection"""
+
+    def test_by_extension(self):
+        assert detect_format("patrons.CSV") == "csv"
+        assert detect_format("patrons.ndjson") == "ndjson"
+        assert detect_format("patrons.jsonl") == "ndjson"
+
+    def test_by_content_type(self):
+        assert detect_format("upload", "text/csv") == "csv"
+        assert detect_format("upload", "application/x-ndjson") == "ndjson"
+
+    def test_unsupported(self):
+        assert detect_format("patrons.xlsx", "application/octet-stream") is None
+        assert detect_format(None) is None
+
+
+class TestCsvMapping:
+    """Test mapping flat CSV columns to the user shape"""
+
+    def test_personal_and_lists(self):
+        data = csv_record_to_user({
+            "Username": " jdoe ",
+            "email": "jdoe@example.org",
+            "password": PASSWORD,
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "phone": "",
+            "tags": "staff; faculty;",
+            "active": "no",
+            "patron_group": "Undergraduate",
+            "unknown": "ignored",
+        })
+
+        assert data["username"] == "jdoe"
+        assert data["personal"] == {"firstName": "Jane", "lastName": "Doe", "email": "jdoe@example.org"}
+        assert data["tags"] == ["staff", "faculty"]
+        assert data["active"] is False
+        assert data["patron_group"] == "Undergraduate"
+        assert "unknown" not in data
+
+    def test_blank_values_are_omitted(self):
+        data = csv_record_to_user({"username": "jdoe", "barcode": " ", "active": ""})
+        assert "barcode" not in data
+        assert "active" not in data
+
+
+class TestIterRecords:
+    """Test streaming rows out of uploads"""
+
+    def test_csv(self, tmp_path):
+        path = tmp_path / "users.upload"
+        path.write_text("username,email,first_name,last_name\njdoe,jdoe@example.org,Jane,Doe\n\nasmith,a@example.org,Al,Smith\n\n")
+
+        rows = list(iter_records(path, "csv"))
+
+        assert [row for row, _ in rows] == [1, 2]
+        assert rows[1][1]["personal"]["lastName"] == "Smith"
+        assert count_records(path, "csv") == 2
+
+    def test_ndjson_skips_blank_lines_and_reports_bad_rows(self, tmp_path):
+        path = tmp_path / "users.upload"
+        path.write_text(json.dumps(make_record()) + "\n\n{not json\n[1, 2]\n")
+
+        rows = list(iter_records(path, "ndjson"))
+
+        assert [row for row, _ in rows] == [1, 2, 3]
+        assert rows[0][1]["username"] == "jdoe"
+        assert isinstance(rows[1][1], ValueError)
+        assert isinstance(rows[2][1], ValueError)
+        assert count_records(path, "ndjson") == 3
+
+
+class TestValidate:
+    """Test per-row validation"""
+
+    def test_valid_row(self):
+        user_data, error = UserImportService(batch_size=10)._validate(make_context(), 1, make_record())
+        assert error is None
+        assert user_data.username == "jdoe"
+
+    def test_patron_group_name_is_resolved(self):
+        record = make_record(patron_group="UNDERGRADUATE")
+        user_data, error = UserImportService(batch_size=10)._validate(make_context(), 1, record)
+        assert error is None
+        assert user_data.patron_group_id == GROUP
+
+    def test_unknown_patron_group(self):
+        record = make_record(patron_group="Alumni")
+        _, error = UserImportService(batch_size=10)._validate(make_context(), 4, record)
+        assert error["code"] == "UNKNOWN_PATRON_GROUP"
+        assert error["row"] == 4
+
+    def test_invalid_row(self):
+        record = make_record(email="not-an-email")
+        _, error = UserImportService(batch_size=10)._validate(make_context(), 2, record)
+        assert error["code"] == "INVALID_ROW"
+        assert "email" in error["message"]
+
+    def test_duplicate_in_file(self):
+        service = UserImportService(batch_size=10)
+        context = make_context()
+
+        _, first = service._validate(context, 1, make_record())
+        _, second = service._validate(context, 2, make_record(username="other", barcode="B2"))
+
+        assert first is None
+        assert second["code"] == "DUPLICATE_IN_FILE"
+        assert second["details"] == {"email": "jdoe@example.org"}
+
+
+class TestClassify:
+    """Test insert/update/reject decisions"""
+
+    def user(self, **kwargs):
+        return UserCreate(**make_record(**kwargs))
+
+    def test_new_user_is_inserted(self):
+        assert classify(no_existing(), TENANT, "skip", 1, self.user()) == (None, None)
+
+    def test_existing_username_is_skipped(self):
+        existing = no_existing()
+        existing["username"]["jdoe"] = (uuid.uuid4(), TENANT)
+
+        target, error = classify(existing, TENANT, "skip", 1, self.user())
+
+        assert target is None
+        assert error["code"] == "DUPLICATE_USER"
+
+    def test_existing_username_is_updated(self):
+        user_id = uuid.uuid4()
+        existing = no_existing()
+        existing["username"]["jdoe"] = (user_id, TENANT)
+        existing["email"]["jdoe@example.org"] = (user_id, TENANT)
+
+        assert classify(existing, TENANT, "update", 1, self.user()) == (user_id, None)
+
+    def test_username_of_other_tenant_is_never_updated(self):
+        existing = no_existing()
+        existing["username"]["jdoe"] = (uuid.uuid4(), OTHER_TENANT)
+
+        _, error = classify(existing, TENANT, "update", 1, self.user())
+
+        assert error["code"] == "DUPLICATE_USER"
+
+    def test_update_rejects_barcode_of_another_user(self):
+        existing = no_existing()
+        existing["username"]["jdoe"] = (uuid.uuid4(), TENANT)
+        existing["barcode"]["B1"] = (uuid.uuid4(), TENANT)
+
+        _, error = classify(existing, TENANT, "update", 1, self.user())
+
+        assert error["details"] == {"barcode": "B1"}
+
+    def test_email_clash_ignores_case(self):
+        existing = no_existing()
+        existing["email"]["jdoe@example.org"] = (uuid.uuid4(), TENANT)
+
+        _, error = classify(existing, TENANT, "skip", 1, self.user(email="JDoe@example.org"))
+
+        assert error["code"] == "DUPLICATE_USER"
+
+
+class StoredPersonalSession(FakeSession):
+    """Answers the stored-personal lookup of updated users."""
+
+    def __init__(self, personal):
+        super().__init__()
+        self.personal = personal
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append((statement, *args))
+        result = FakeResult()
+        result.all = lambda: list(self.personal.items())
+        return result
+
+
+class TestUpdateUsers:
+    """Test updating existing users from partial files"""
+
+    async def test_only_supplied_columns_are_overwritten(self):
+        user_id = uuid.uuid4()
+        stored = {"firstName": "Jane", "lastName": "Doe", "email": "jdoe@example.org", "phone": "555-0100"}
+        db = StoredPersonalSession({user_id: stored})
+        user_data = UserCreate(**csv_record_to_user({
+            "username": "jdoe", "email": "jdoe@example.org", "password": PASSWORD,
+            "first_name": "Jane", "last_name": "Smith",
+        }))
+
+        updated = await UserImportService()._update_users(db, make_context("update"), [(1, user_data, user_id)])
+
+        assert updated == 1
+        _, values = db.statements[-1]
+        assert set(values[0]) == {"id", "email", "personal", "updated_by_user_id", "updated_date"}
+        assert values[0]["personal"] == {
+            "firstName": "Jane", "lastName": "Smith", "email": "jdoe@example.org", "phone": "555-0100",
+        }
+
+
+class TestFindExistingUsers:
+    """Test the set-based duplicate probe"""
+
+    async def test_one_query_for_the_batch(self):
+        db = FakeSession()
+        users = [UserCreate(**make_record(username=f"user{i}", email=f"u{i}@example.org", barcode=f"B{i}")) for i in range(50)]
+
+        await find_existing_users(db, TENANT, users)
+
+        assert len(db.statements) == 1
+        sql = compiled(db.statements[0])
+        assert "users.username IN" in sql
+        assert "lower(users.email) IN" in sql
+        assert "users.barcode IN" in sql
+
+    async def test_empty_batch_runs_no_query(self):
+        db = FakeSession()
+        assert await find_existing_users(db, TENANT, []) == no_existing()
+        assert db.statements == []
+
+
+class TestCreateJob:
+    """Test storing uploads"""
+
+    async def chunks(self, *parts):
+        for part in parts:
+            yield part
+
+    async def test_upload_is_stored(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.services.user_import_service.settings.USER_IMPORT_DIR", str(tmp_path))
+        db = FakeSession()
+
+        job = await UserImportService(batch_size=10).create_job(
+            db, TENANT, uuid.uuid4(), "users.csv", "csv", "skip", self.chunks(b"username\n", b"jdoe\n")
+        )
+
+        assert db.added == [job] and db.commits == 1
+        assert job.parameters == {"filename": "users.csv", "format": "csv", "on_existing": "skip", "size": 14}
+        assert (tmp_path / f"{job.id}.upload").read_bytes() == b"username\njdoe\n"
+
+    async def test_oversized_upload_is_rejected(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.services.user_import_service.settings.USER_IMPORT_DIR", str(tmp_path))
+        monkeypatch.setattr("app.services.user_import_service.settings.USER_IMPORT_MAX_UPLOAD_SIZE", 8)
+        db = FakeSession()
+
+        with pytest.raises(ValueError):
+            await UserImportService(batch_size=10).create_job(
+                db, TENANT, uuid.uuid4(), "users.csv", "csv", "skip", self.chunks(b"12345", b"67890")
+            )
+
+        assert db.added == []
+        assert list(tmp_path.iterdir()) == []
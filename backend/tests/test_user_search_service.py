@@ -0,0 +1,122 @@
+"""
+Test User Search Service
+Test term normalization, exact match short-circuiting and ranked text search
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.models.user import User
+from app.services.user_search_service import (
+    UserSearchService,
+    exact_match_condition,
+    like_pattern,
+    normalize_search_term,
+)
+
+
+class FakeResult:
+    def __init__(self, values):
+        self.values = values
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.values
+
+
+class FakeSession:
+    """Answers the exact match probe with `exact_ids`."""
+
+    def __init__(self, exact_ids=()):
+        self.exact_ids = list(exact_ids)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.exact_ids)
+
+
+def sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def base_query():
+    return select(User).where(User.tenant_id == uuid.uuid4())
+
+
+class TestTermHelpers:
+    """Test search term helpers"""
+
+    def test_normalize(self):
+        assert normalize_search_term("  Jane   DOE ") == "jane doe"
+        assert normalize_search_term(None) == ""
+
+    def test_like_pattern_escapes_wildcards(self):
+        assert like_pattern("50%_off\\") == "%50\\%\\_off\\\\%"
+
+    def test_exact_match_needs_single_token(self):
+        assert exact_match_condition("jane doe") is None
+        assert exact_match_condition("   ") is None
+
+    def test_exact_match_checks_email_only_for_addresses(self):
+        assert "lower(users.email)" not in sql(exact_match_condition("P123456"))
+        assert "lower(users.email)" in sql(exact_match_condition("Jane@Example.org"))
+
+    def test_exact_match_ignores_usernames(self):
+        assert "users.username" not in sql(exact_match_condition("smith"))
+
+
+class TestApply:
+    """Test applying a search to a user query"""
+
+    async def test_empty_term_leaves_query_alone(self):
+        db = FakeSession()
+        query = base_query()
+        assert await UserSearchService.apply(db, query, "  ") is query
+        assert db.statements == []
+
+    async def test_exact_match_short_circuits(self):
+        user_id = uuid.uuid4()
+        db = FakeSession(exact_ids=[user_id])
+        query = await UserSearchService.apply(db, base_query(), "P123456")
+
+        probe = sql(db.statements[0])
+        assert probe.startswith("SELECT users.id")
+        assert "users.tenant_id" in probe
+        statement = sql(query)
+        assert "users.id IN" in statement
+        assert "ILIKE" not in statement
+
+    async def test_falls_back_to_ranked_text_search(self):
+        db = FakeSession()
+        query = await UserSearchService.apply(db, base_query(), "smith")
+
+        statement = sql(query)
+        assert "users.search_text ILIKE" in statement
+        assert "ORDER BY word_similarity(" in statement
+
+    async def test_multi_word_term_skips_exact_probe(self):
+        db = FakeSession()
+        query = await UserSearchService.apply(db, base_query(), "Jane Smith")
+
+        assert db.statements == []
+        assert sql(query).count("users.search_text ILIKE") == 2
+
+
+class TestSearchIndex:
+    """Test the trigram index definition"""
+
+    def test_gin_trigram_index(self):
+        index = next(i for i in User.__table__.indexes if i.name == "ix_users_search_text_trgm")
+        ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        assert "USING gin (search_text gin_trgm_ops)" in ddl
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -20,6 +20,19 @@ async def test_list_users(client: AsyncClient, auth_headers: dict, test_user: Us
     assert data["total"] >= 1
 
 
+@pytest.mark.asyncio
+async def test_list_users_returns_role_names_only(client: AsyncClient, auth_headers: dict, test_user: User):
+    """Test that list items carry role names but not role permissions."""
+    response = await client.get("/api/v1/users/", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+
+    for user in data["data"]:
+        assert "patron_group_name" in user
+        for role in user["roles"]:
+            assert set(role) == {"id", "name", "display_name"}
+
+
 @pytest.mark.asyncio
 async def test_create_user(client: AsyncClient, admin_headers: dict):
     """Test creating a new user."""
@@ -283,6 +296,28 @@ async def test_bulk_create_users(client: AsyncClient, admin_headers: dict):
     assert len(data) == 5
 
 
+@pytest.mark.asyncio
+async def test_bulk_create_users_reports_duplicates_in_payload(client: AsyncClient, admin_headers: dict):
+    """Test that users sharing an email within one bulk request are reported, not a 500."""
+    users_data = [
+        {
+            "username": f"sharedmail{i}",
+            "email": "shared@example.com",
+            "full_name": f"Shared Mail {i}",
+            "password": "Password123!",
+        }
+        for i in range(2)
+    ]
+
+    response = await client.post("/api/v1/users/bulk", json={"users": users_data}, headers=admin_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success_count"] == 1
+    assert data["failure_count"] == 1
+    assert data["errors"][0]["code"] == "DUPLICATE_USER"
+    assert data["errors"][0]["details"] == {"email": "shared@example.com"}
+
+
 @pytest.mark.asyncio
 async def test_pagination_users(client: AsyncClient, auth_headers: dict, db_session, test_tenant):
     """Test pagination for users."""
@@ -346,3 +381,22 @@ async def test_password_not_in_response(client: AsyncClient, admin_headers: dict
     data = response.json()
     assert "password" not in data
     assert "hashed_password" not in data
+
+
+@pytest.mark.asyncio
+async def test_import_users_rejects_unsupported_file(client: AsyncClient, admin_headers: dict):
+    """Test that user imports only accept CSV and NDJSON uploads."""
+    response = await client.post(
+        "/api/v1/users/imports",
+        files={"file": ("users.xlsx", b"PK\x03\x04", "application/octet-stream")},
+        headers=admin_headers
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_user_import_not_found(client: AsyncClient, admin_headers: dict):
+    """Test getting a non-existent import job."""
+    import uuid
+    response = await client.get(f"/api/v1/users/imports/{uuid.uuid4()}", headers=admin_headers)
+    assert response.status_code == 404
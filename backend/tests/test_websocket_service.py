@@ -0,0 +1,64 @@
+"""
+Test WebSocket Service
+Test room-based fan-out of notifications
+"""
+
+from app.services.websocket_service import WebSocketService, channel_room, tenant_room, user_room
+
+
+class RecordingWebSocketService(WebSocketService):
+    """WebSocket service that records emits instead of publishing them"""
+
+    def __init__(self, user_sids=None):
+        super().__init__()
+        self.emitted = []
+        self.user_sids = user_sids or {}
+
+        async def emit(event, data, room=None, skip_sid=None, **kwargs):
+            self.emitted.append({"event": event, "room": room, "skip_sid": skip_sid})
+
+        self.sio.emit = emit
+
+    async def _get_user_sids(self, user_id):
+        return self.user_sids.get(user_id, [])
+
+
+class TestWebSocketService:
+    """Test suite for WebSocketService"""
+
+    async def test_user_notification_targets_user_room(self):
+        """Test that user notifications are emitted once to the user's room"""
+        service = RecordingWebSocketService()
+
+        await service.send_notification_to_user("u1", {"title": "Hello"})
+
+        assert service.emitted == [{"event": "notification", "room": user_room("u1"), "skip_sid": None}]
+
+    async def test_tenant_notification_skips_excluded_user(self):
+        """Test that tenant broadcasts skip every session of the excluded user"""
+        service = RecordingWebSocketService(user_sids={"u1": ["sid-a", "sid-b"]})
+
+        await service.send_notification_to_tenant("t1", {"title": "Hello"}, exclude_user_id="u1")
+
+        assert len(service.emitted) == 1
+        assert service.emitted[0]["room"] == tenant_room("t1")
+        assert sorted(service.emitted[0]["skip_sid"]) == ["sid-a", "sid-b"]
+
+    async def test_unread_count_targets_user_room(self):
+        """Test that unread counts are pushed to the user's room"""
+        service = RecordingWebSocketService()
+
+        await service.send_unread_count("u1", 4)
+
+        assert service.emitted[0]["event"] == "unread_count"
+        assert service.emitted[0]["room"] == user_room("u1")
+
+    async def test_realtime_update_targets_tenant_channel(self):
+        """Test that real-time updates only reach the tenant's channel room"""
+        service = RecordingWebSocketService()
+
+        await service.send_realtime_update("t1", "circulation", "checkout", {"loan_id": "l1"})
+
+        assert service.emitted == [
+            {"event": "realtime_update", "room": channel_room("t1", "circulation"), "skip_sid": None}
+        ]